@@ -0,0 +1,130 @@
+"""Asyncio Coursera API client for resolving many items concurrently."""
+
+import asyncio
+import json
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+from .coursera_client import CourseraClient
+from .http_session import create_download_session
+from ..utils.exceptions import (
+    APIError, AuthenticationError, RateLimitError,
+    CourseNotFoundError, InvalidResponseError
+)
+from ..utils.logger import LoggerMixin, log_api_request
+
+# Statuses worth retrying, as in CourseraClient's urllib3 Retry
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncCourseraClient(LoggerMixin):
+    """
+    Concurrent GET requests against the Coursera API.
+
+    Wraps a CourseraClient and shares its auth, endpoint configuration,
+    timeout, retry settings and token bucket, so sync and async requests draw
+    from one request budget. Use as ``async with AsyncCourseraClient(client) as api``.
+    """
+
+    def __init__(self, client: CourseraClient, max_concurrent: int = 5):
+        """Initialize the async client around a configured CourseraClient."""
+        self.client = client
+        self.max_concurrent = max(1, max_concurrent)
+        self.timeout = aiohttp.ClientTimeout(total=client.timeout)
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> 'AsyncCourseraClient':
+        self.session = create_download_session(
+            self.client.auth,
+            limit=self.max_concurrent,
+            limit_per_host=self.max_concurrent
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.session.close()
+        self.session = None
+
+    async def get(self, endpoint_name: str, **url_params) -> Dict[str, Any]:
+        """Make GET request to a configured endpoint, served from the shared response cache when fresh."""
+        if endpoint_name not in self.client.api_config.endpoints:
+            raise ValueError(f"Unknown endpoint: {endpoint_name}")
+
+        cache = self.client.response_cache
+        if cache:
+            cached = cache.get(endpoint_name, url_params)
+            if cached is not None:
+                return cached
+
+        endpoint = self.client.api_config.endpoints[endpoint_name]
+        url = self.client.api_config.get_endpoint_url(endpoint_name, **url_params)
+        data = await self.get_json(url, endpoint_headers=endpoint.headers)
+        if cache:
+            cache.put(endpoint_name, url_params, data)
+        return data
+
+    async def get_lecture_video(self, course_id: str, lecture_id: str) -> Dict[str, Any]:
+        """Get lecture video details including sources, subtitles, etc."""
+        self.logger.debug("Fetching video details for lecture: %s in course: %s", lecture_id, course_id)
+        return await self.get('lecture_video', course_id=course_id, lecture_id=lecture_id)
+
+    async def get_json(self, url: str, endpoint_headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        GET a URL and decode its JSON body, with rate limiting and retries.
+
+        Raises the same exceptions as CourseraClient._make_request.
+        """
+        headers = self.client.auth.get_headers(include_csrf=False, custom_headers=endpoint_headers)
+        body, _ = await self._get_body(url, headers)
+        try:
+            return json.loads(body)
+        except json.JSONDecodeError as e:
+            self.logger.error(f"Invalid JSON response from {url}: {e}")
+            raise InvalidResponseError(f"Invalid JSON response: {e}")
+
+    async def get_text(self, url: str, headers: Optional[Dict[str, str]] = None) -> str:
+        """GET a page (e.g. a course landing page) as text, with rate limiting and retries."""
+        body, charset = await self._get_body(url, headers)
+        return body.decode(charset or 'utf-8', errors='replace')
+
+    async def _get_body(self, url: str, headers: Optional[Dict[str, str]]) -> Tuple[bytes, Optional[str]]:
+        """GET a URL and return (body, charset), mapping error statuses to scraper exceptions."""
+        attempts = self.client.max_retries + 1
+
+        for attempt in range(1, attempts + 1):
+            await self.client.rate_limiter.acquire()
+            try:
+                async with self.session.get(url, headers=headers, timeout=self.timeout) as response:
+                    log_api_request(self.logger, 'GET', url, response.status)
+
+                    if response.status in RETRY_STATUSES and attempt < attempts:
+                        await self._backoff(attempt, f"HTTP {response.status}")
+                        continue
+
+                    if response.status == 401:
+                        raise AuthenticationError("Invalid or expired authentication cookies")
+                    elif response.status == 403:
+                        raise AuthenticationError("Access forbidden - check cookie permissions or CSRF token")
+                    elif response.status == 404:
+                        raise CourseNotFoundError(f"Resource not found: {url}")
+                    elif response.status == 429:
+                        raise RateLimitError("API rate limit exceeded")
+                    elif response.status >= 400:
+                        raise APIError(f"API request failed with status {response.status}: {await response.text()}")
+
+                    return await response.read(), response.charset
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == attempts:
+                    self.logger.error(f"Request failed: {e}")
+                    raise APIError(f"Network error: {e!r}")
+                await self._backoff(attempt, repr(e))
+
+        raise APIError(f"Request failed after {attempts} attempts: {url}")
+
+    async def _backoff(self, attempt: int, reason: str) -> None:
+        """Sleep before the next attempt, mirroring urllib3's exponential backoff."""
+        delay = self.client.backoff_factor * (2 ** (attempt - 1))
+        self.logger.debug("%s, retrying in %.1fs (attempt %d)", reason, delay, attempt)
+        await asyncio.sleep(delay)
@@ -1,6 +1,5 @@
 """Main Coursera API client."""
 
-import time
 import json
 from typing import Dict, Any, Optional, Union
 from pathlib import Path
@@ -9,12 +8,14 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from .auth import CourseraAuth
+from .response_cache import ResponseCache
 from ..core.course_models import APIConfig, APIEndpointConfig
 from ..utils.exceptions import (
     APIError, AuthenticationError, RateLimitError,
     CourseNotFoundError, InvalidResponseError
 )
 from ..utils.logger import LoggerMixin, log_api_request
+from ..utils.rate_limiter import TokenBucket
 
 
 class CourseraClient(LoggerMixin):
@@ -27,14 +28,26 @@ class CourseraClient(LoggerMixin):
         timeout: int = 30,
         max_retries: int = 3,
         backoff_factor: float = 2.0,
-        rate_limit_delay: float = 1.0
+        rate_limit_delay: float = 1.0,
+        rate_limit_burst: int = 1,
+        response_cache: Optional[ResponseCache] = None
     ):
-        """Initialize the API client."""
+        """
+        Initialize the API client.
+
+        Requests are spaced ``rate_limit_delay`` seconds apart on average, with
+        bursts of up to ``rate_limit_burst``. The token bucket is shared with
+        AsyncCourseraClient instances created from this client, and so is the
+        optional ``response_cache`` for configured endpoints.
+        """
         self.auth = auth
         self.api_config = api_config
         self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
         self.rate_limit_delay = rate_limit_delay
-        self.last_request_time = 0
+        self.rate_limiter = TokenBucket(rate=1.0 / rate_limit_delay, capacity=rate_limit_burst)
+        self.response_cache = response_cache
 
         # Configure session with retry strategy
         self.session = requests.Session()
@@ -52,15 +65,9 @@ class CourseraClient(LoggerMixin):
 
     def _wait_for_rate_limit(self) -> None:
         """Implement rate limiting between requests."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-
-        if time_since_last < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last
-            self.logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f}s")
-            time.sleep(sleep_time)
-
-        self.last_request_time = time.time()
+        waited = self.rate_limiter.acquire_blocking()
+        if waited:
+            self.logger.debug("Rate limiting: slept for %.2fs", waited)
 
     def _make_request(self, method: str, url: str, endpoint_headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
         """Make HTTP request with cookie-based authentication and error handling."""
@@ -105,11 +112,17 @@ class CourseraClient(LoggerMixin):
             self.logger.error(f"Request failed: {e}")
             raise APIError(f"Network error: {e}")
 
-    def get(self, endpoint_name: str, **url_params) -> Dict[str, Any]:
-        """Make GET request to a configured endpoint."""
+    def get(self, endpoint_name: str, use_cache: bool = True, **url_params) -> Dict[str, Any]:
+        """Make GET request to a configured endpoint, served from the response cache when fresh."""
         if endpoint_name not in self.api_config.endpoints:
             raise ValueError(f"Unknown endpoint: {endpoint_name}")
 
+        cache = self.response_cache if use_cache else None
+        if cache:
+            cached = cache.get(endpoint_name, url_params)
+            if cached is not None:
+                return cached
+
         # Get endpoint configuration
         endpoint = self.api_config.endpoints[endpoint_name]
         url = self.api_config.get_endpoint_url(endpoint_name, **url_params)
@@ -118,6 +131,8 @@ class CourseraClient(LoggerMixin):
             # Pass endpoint-specific headers
             response = self._make_request('GET', url, endpoint_headers=endpoint.headers)
             data = response.json()
+            if cache:
+                cache.put(endpoint_name, url_params, data)
             return data
 
         except json.JSONDecodeError as e:
@@ -157,7 +172,8 @@ class CourseraClient(LoggerMixin):
             # Test with the video endpoint we know works
             course_id = "46b4tHEkEeWbbw5cIAKQrw"  # business-english-intro
             lecture_id = "sf1NL"  # Video email guidelines
-            test_data = self.get_lecture_video(course_id, lecture_id)
+            # Always ask the server: a cached response says nothing about the current cookies
+            test_data = self.get('lecture_video', use_cache=False, course_id=course_id, lecture_id=lecture_id)
             if 'elements' in test_data and 'linked' in test_data:
                 self.logger.info("API connection test successful")
                 return True
@@ -170,8 +186,8 @@ class CourseraClient(LoggerMixin):
             return False
 
     @classmethod
-    def from_config_file(cls, config_path: Union[str, Path], auth: CourseraAuth) -> 'CourseraClient':
-        """Create client from API configuration file."""
+    def from_config_file(cls, config_path: Union[str, Path], auth: CourseraAuth, **client_options) -> 'CourseraClient':
+        """Create client from API configuration file; client_options are passed to the constructor."""
         config_path = Path(config_path)
 
         if not config_path.exists():
@@ -192,7 +208,7 @@ class CourseraClient(LoggerMixin):
                 endpoints=endpoints
             )
 
-            return cls(auth=auth, api_config=api_config)
+            return cls(auth=auth, api_config=api_config, **client_options)
 
         except (json.JSONDecodeError, KeyError, ValueError) as e:
             raise InvalidResponseError(f"Invalid API configuration file: {e}")
@@ -0,0 +1,97 @@
+"""Order in which a download run hands its media files to workers."""
+
+import os
+import socket
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+from ..core.course_manifest import CourseManifest
+
+# Lesson order finishes early modules first so they can be watched; the others order by expected size
+SCHEDULE_POLICIES = ('lesson', 'shortest', 'largest')
+
+# Seconds a shared worker's claim on a file lasts without a heartbeat; renewed every third of that
+DEFAULT_LEASE_SECONDS = 60.0
+
+# Expected bytes per media type when the asset's size is unknown; only their order matters
+SIZE_ESTIMATES = {'subtitle': 100 * 1024, 'supplement': 100 * 1024, 'file': 1024 * 1024, 'video': 100 * 1024 * 1024}
+
+
+def expected_size(media: Dict) -> int:
+    """The asset's recorded size, else the estimate for its media type."""
+    size = (media.get('asset_info') or {}).get('file_size')
+    return size if size else SIZE_ESTIMATES.get(media['type'], SIZE_ESTIMATES['file'])
+
+
+class DownloadScheduler:
+    """
+    Hand out media files one at a time in the order of a policy.
+
+    ``lesson`` keeps discovery (course) order, ``shortest`` starts with the
+    smallest files (subtitles and supplements before videos), ``largest``
+    starts with the biggest to keep the link saturated. Files within a size
+    keep lesson order. The queue only holds references to the run's media
+    dicts, and workers draw from it lazily, so there is never a task per file.
+    """
+
+    def __init__(self, media_files: List[Dict], policy: str = 'lesson'):
+        if policy not in SCHEDULE_POLICIES:
+            raise ValueError(f"policy must be one of {SCHEDULE_POLICIES}, got {policy!r}")
+        self.policy = policy
+        self._queue = deque(self._ordered(media_files))
+
+    def _ordered(self, media_files: List[Dict]) -> List[Dict]:
+        if self.policy == 'lesson':
+            return media_files
+        return sorted(media_files, key=expected_size, reverse=self.policy == 'largest')
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Yield media files until the queue is empty; several workers may share one iterator."""
+        while self._queue:
+            yield self._queue.popleft()
+
+    def pending(self) -> Iterator[Dict]:
+        """Media files not handed out yet, in the order they will be."""
+        return iter(self._queue)
+
+
+def default_worker_id() -> str:
+    """Host name and process id, unique among the workers sharing a course."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeasedScheduler(DownloadScheduler):
+    """
+    Scheduler for a worker sharing a course with other download workers.
+
+    Every file is claimed in the course manifest before it is handed out;
+    files that another worker holds a live lease on are skipped, so each
+    file is fetched by one worker. The caller renews the leases while files
+    are in flight and retries the skipped files once their leases expire;
+    ``claimed`` holds the files this scheduler handed out.
+    """
+
+    def __init__(
+        self,
+        media_files: List[Dict],
+        policy: str,
+        manifest: CourseManifest,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ):
+        super().__init__(media_files, policy)
+        self.manifest = manifest
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.claimed: Set[Path] = set()
+
+    def __iter__(self) -> Iterator[Dict]:
+        while self._queue:
+            media = self._queue.popleft()
+            if self.manifest.claim_file(media['local_path'], self.worker_id, self.lease_seconds):
+                self.claimed.add(media['local_path'])
+                yield media
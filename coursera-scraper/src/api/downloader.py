@@ -1,12 +1,11 @@
 """Video downloader for Coursera course content."""
 
 import os
-import json
-import re
 import time
 import asyncio
 import aiohttp
 import aiofiles
+from contextlib import asynccontextmanager
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
@@ -14,11 +13,17 @@ from rich.console import Console
 from rich.progress import Progress, TaskID, SpinnerColumn, TextColumn, BarColumn, DownloadColumn, TimeRemainingColumn
 
 from .auth import CourseraAuth
+from .http_session import FILE_TIMEOUT, ConnectionStats, create_download_session
+from ..core.course_manifest import FILE_COMPLETE, FILE_FAILED, CourseManifest, walk_lesson_metadata
 from ..core.file_manager import FileManager
 from ..utils.exceptions import DownloadError
 from ..utils.logger import LoggerMixin
+from ..utils.partial_download import PartialDownload, chunk_size_for
 from ..utils.sanitizer import sanitize_sequential_video_name
 
+# Attempts per file; later attempts continue from the bytes already on disk
+DOWNLOAD_ATTEMPTS = 3
+
 
 class VideoDownloader(LoggerMixin):
     """Video downloader with progress tracking and resume capability."""
@@ -34,8 +39,17 @@ class VideoDownloader(LoggerMixin):
         self.auth = auth
         self.file_manager = file_manager
         self.max_concurrent = max_concurrent
+        self.resume = False
         self.console = Console()
 
+        # One pooled session per run, shared by all video tasks
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.connection_stats = ConnectionStats()
+
+        # Course manifest for the current run; finished videos are recorded in it
+        self.manifest: Optional[CourseManifest] = None
+        self._completed: Dict[Path, int] = {}
+
         # Download statistics
         self.stats = {
             'downloaded': 0,
@@ -55,6 +69,9 @@ class VideoDownloader(LoggerMixin):
         """Download all videos in a course at specified resolution."""
         try:
             self.logger.info(f"Starting video download for course: {course_path}")
+            self.resume = resume
+            self.manifest = CourseManifest(course_path)
+            self._completed = self.manifest.completed_files()
 
             # Discover all video files to download
             video_files = self._discover_video_files(course_path, target_resolution)
@@ -65,10 +82,9 @@ class VideoDownloader(LoggerMixin):
 
             self.console.print(f"[blue]Found {len(video_files)} videos to download[/blue]")
 
-            # Filter out already downloaded files if not resuming
-            if not resume:
-                video_files = self._filter_existing_files(video_files)
-                self.console.print(f"[blue]Will download {len(video_files)} new videos[/blue]")
+            # Skip completed files; interrupted ones are continued from their .part file when resuming
+            video_files = self._filter_existing_files(video_files)
+            self.console.print(f"[blue]Will download {len(video_files)} new videos[/blue]")
 
             if not video_files:
                 self.console.print("[yellow]All videos already downloaded[/yellow]")
@@ -81,50 +97,26 @@ class VideoDownloader(LoggerMixin):
             self.logger.error(f"Failed to download course videos: {e}")
             raise DownloadError(f"Download failed: {e}")
 
-    def _sort_lesson_directories(self, lesson_dirs: List[Path]) -> List[Path]:
-        """Sort lesson directories by module order and then by lesson order."""
-        def extract_order_numbers(lesson_path: Path):
-            """Extract module and lesson order numbers from path."""
-            # Extract module number from path like: .../module-01-name/lesson-02-name
-            module_order = 0
-            lesson_order = 0
-
-            # Get module order from parent directory
-            module_parent = lesson_path.parent.name
-            module_match = re.search(r'module-(\d+)', module_parent)
-            if module_match:
-                module_order = int(module_match.group(1))
-
-            # Get lesson order from directory name
-            lesson_name = lesson_path.name
-            lesson_match = re.search(r'lesson-(\d+)', lesson_name)
-            if lesson_match:
-                lesson_order = int(lesson_match.group(1))
-
-            return (module_order, lesson_order)
-
-        # Sort by module order first, then by lesson order
-        return sorted(lesson_dirs, key=extract_order_numbers)
+        finally:
+            if self.manifest:
+                self.manifest.close()
+                self.manifest = None
 
     def _discover_video_files(self, course_path: Path, target_resolution: str) -> List[Dict]:
-        """Discover all video files to download from lesson metadata."""
+        """Discover all video files to download from the course manifest (or lesson metadata files)."""
         video_files = []
 
-        # Get all lesson directories and sort them by module and lesson order
-        lesson_dirs = [d for d in course_path.rglob("lesson-*") if d.is_dir()]
-        sorted_lesson_dirs = self._sort_lesson_directories(lesson_dirs)
+        # Lessons in module and lesson order; courses scraped before the manifest existed fall back to a tree walk
+        lessons = self.manifest.lessons() if self.manifest else []
+        if not lessons:
+            lessons = walk_lesson_metadata(course_path)
 
         video_counter = 1  # Global sequential counter for all videos
 
-        for lesson_dir in sorted_lesson_dirs:
-            metadata_file = lesson_dir / "lesson_metadata.json"
-            if not metadata_file.exists():
-                continue
+        for lesson_metadata in lessons:
+            lesson_dir = lesson_metadata['path']
 
             try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    lesson_metadata = json.load(f)
-
                 # Find all video assets with target resolution and MP4 format
                 lesson_name = lesson_metadata.get('name', 'Unknown Lesson')
 
@@ -162,9 +154,10 @@ class VideoDownloader(LoggerMixin):
                             target_local_path = lesson_dir / sequential_filename
 
                             # Only add if the actual video file doesn't exist
-                            if not target_local_path.exists():
+                            if not self._is_downloaded(target_local_path):
                                 video_files.append({
                                     'lesson_path': lesson_dir,
+                                    'lesson_id': lesson_metadata.get('id'),
                                     'lesson_name': lesson_name,
                                     'filename': sequential_filename,
                                     'original_filename': asset_name,
@@ -179,10 +172,28 @@ class VideoDownloader(LoggerMixin):
                             video_counter += 1
 
             except Exception as e:
-                self.logger.warning(f"Failed to read lesson metadata from {metadata_file}: {e}")
+                self.logger.warning(f"Failed to read lesson metadata for {lesson_dir}: {e}")
 
         return video_files
 
+    def _is_downloaded(self, local_path: Path) -> bool:
+        """Check the manifest first; only files it does not list as complete are looked up on disk."""
+        return local_path in self._completed or local_path.exists()
+
+    def _record_result(self, video: Dict, status: str) -> None:
+        """Record a finished or failed download in the manifest."""
+        if not self.manifest:
+            return
+
+        size = video['local_path'].stat().st_size if status == FILE_COMPLETE else None
+        try:
+            self.manifest.record_file(
+                video['local_path'], 'video', status, video.get('lesson_id'), size,
+                content_length=video.get('content_length'), sha256=video.get('sha256')
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to record {video['filename']} in course manifest: {e}")
+
     def _get_video_url(self, lesson_dir: Path, target_resolution: str) -> Optional[str]:
         """Extract video URL from content_urls.txt file for specific resolution."""
         content_urls_file = lesson_dir / "content_urls.txt"
@@ -217,15 +228,52 @@ class VideoDownloader(LoggerMixin):
         """Filter out files that already exist."""
         new_files = []
         for video in video_files:
-            if not video['local_path'].exists():
+            if not self._is_downloaded(video['local_path']):
                 new_files.append(video)
             else:
                 self.stats['skipped'] += 1
 
         return new_files
 
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create the pooled session for a run, sized to the concurrency limit."""
+        return create_download_session(
+            self.auth,
+            limit=self.max_concurrent,
+            limit_per_host=self.max_concurrent,
+            stats=self.connection_stats
+        )
+
+    @asynccontextmanager
+    async def _session_scope(self):
+        """Yield the run's shared session, or a short-lived one when called outside a run."""
+        if self.session is not None and not self.session.closed:
+            yield self.session
+            return
+
+        async with self._create_session() as session:
+            yield session
+
     async def _download_videos_async(self, video_files: List[Dict]) -> Dict:
         """Download videos asynchronously with progress tracking."""
+        async with self._create_session() as session:
+            self.session = session
+            try:
+                await self._run_download_tasks(video_files)
+            finally:
+                self.session = None
+
+        self.logger.info(f"Connection reuse: {self.connection_stats.summary()}")
+
+        return {
+            'downloaded': self.stats['downloaded'],
+            'skipped': self.stats['skipped'],
+            'failed': self.stats['failed'],
+            'connections': self.connection_stats.as_dict()
+        }
+
+    async def _run_download_tasks(self, video_files: List[Dict]) -> None:
+        """Run one download task per video under the concurrency semaphore."""
         # Create download progress display
         with Progress(
             SpinnerColumn(),
@@ -259,12 +307,6 @@ class VideoDownloader(LoggerMixin):
 
             progress.update(main_task, description="Download completed")
 
-        return {
-            'downloaded': self.stats['downloaded'],
-            'skipped': self.stats['skipped'],
-            'failed': self.stats['failed']
-        }
-
     async def _download_single_video(
         self,
         video: Dict,
@@ -284,7 +326,7 @@ class VideoDownloader(LoggerMixin):
                 video['local_path'].parent.mkdir(parents=True, exist_ok=True)
 
                 # Download the file
-                await self._download_file(
+                video['content_length'], video['sha256'] = await self._download_file(
                     url=video['url'],
                     local_path=video['local_path'],
                     progress=progress,
@@ -292,11 +334,13 @@ class VideoDownloader(LoggerMixin):
                 )
 
                 self.stats['downloaded'] += 1
+                self._record_result(video, FILE_COMPLETE)
                 progress.update(video_task, description=f"  SUCCESS: {video['lesson_name'][:40]}")
 
             except Exception as e:
                 self.stats['failed'] += 1
                 self.logger.error(f"Failed to download {video['filename']}: {e}")
+                self._record_result(video, FILE_FAILED)
                 progress.update(video_task, description=f"  FAILED: {video['lesson_name'][:40]}")
 
             finally:
@@ -309,48 +353,67 @@ class VideoDownloader(LoggerMixin):
         local_path: Path,
         progress: Progress,
         task_id: TaskID
-    ):
-        """Download a file from URL with progress tracking."""
-        headers = self.auth.get_headers(include_csrf=False)
-        cookies = self.auth.get_cookies()
-
-        timeout = aiohttp.ClientTimeout(total=30 * 60)  # 30 minute timeout
-
-        async with aiohttp.ClientSession(
-            headers=headers,
-            cookies=cookies,
-            timeout=timeout
-        ) as session:
-
-            async with session.get(url) as response:
-                if response.status != 200:
-                    raise DownloadError(f"HTTP {response.status}: {url}")
-
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded_size = 0
-
-                # Create temporary file
-                temp_path = local_path.with_suffix('.tmp')
-
+    ) -> Tuple[Optional[int], str]:
+        """
+        Download a file from URL with progress tracking, continuing partial downloads with Range requests.
+
+        Returns the server's content length and the file's SHA-256 for the course manifest.
+        """
+        partial = PartialDownload(local_path)
+        offset = partial.prepare(url, resume=self.resume)
+        if offset:
+            self.logger.info(f"Resuming {local_path.name} from byte {offset}")
+
+        async with self._session_scope() as session:
+            for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
                 try:
-                    async with aiofiles.open(temp_path, 'wb') as file:
-                        async for chunk in response.content.iter_chunked(8192):
-                            await file.write(chunk)
-                            downloaded_size += len(chunk)
-
-                            # Update progress
-                            if total_size > 0:
-                                percentage = (downloaded_size / total_size) * 100
-                                progress.update(task_id, completed=percentage)
-
-                    # Move temp file to final location
-                    temp_path.replace(local_path)
-
-                    # Update total downloaded size
-                    self.stats['total_size'] += downloaded_size
-
-                except Exception as e:
-                    # Clean up temp file on error
-                    if temp_path.exists():
-                        temp_path.unlink()
-                    raise e
\ No newline at end of file
+                    await self._fetch_into_partial(session, url, partial, offset, progress, task_id)
+                    partial.verify()
+                    break
+                except (aiohttp.ClientError, asyncio.TimeoutError, DownloadError) as e:
+                    if attempt == DOWNLOAD_ATTEMPTS:
+                        raise
+                    # Keep the partial file: the next attempt asks only for the missing bytes
+                    offset = partial.downloaded_size
+                    self.logger.warning(f"Download attempt {attempt} failed for {local_path.name}: {e}. Retrying from byte {offset}...")
+                    await asyncio.sleep(2 ** attempt)
+
+        # Hashed while streaming; only a resume from an earlier run reads the file again
+        await asyncio.to_thread(partial.finish_hash)
+
+        # Move the verified partial file to its final location
+        self.stats['total_size'] += partial.commit()
+        return partial.expected_length, partial.sha256
+
+    async def _fetch_into_partial(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        partial: PartialDownload,
+        offset: int,
+        progress: Progress,
+        task_id: TaskID
+    ) -> None:
+        """Stream one (ranged) response into the partial file."""
+        if offset and partial.is_complete():
+            return
+
+        async with session.get(url, headers=partial.request_headers(offset), timeout=FILE_TIMEOUT) as response:
+            if response.status == 416 and partial.is_complete():
+                return
+
+            # 206 continues at offset; 200 means the server sent the whole file again
+            write_offset = partial.accept_response(response.status, response.headers, offset)
+            total_size = partial.expected_length or 0
+            downloaded_size = write_offset
+
+            async with aiofiles.open(partial.part_path, 'ab' if write_offset else 'wb') as file:
+                async for chunk in response.content.iter_chunked(chunk_size_for(partial.expected_length)):
+                    await file.write(chunk)
+                    partial.hash_chunk(downloaded_size, chunk)
+                    downloaded_size += len(chunk)
+
+                    # Update progress
+                    if total_size > 0:
+                        percentage = (downloaded_size / total_size) * 100
+                        progress.update(task_id, completed=percentage)
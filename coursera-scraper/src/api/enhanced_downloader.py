@@ -1,24 +1,58 @@
 """Enhanced video and subtitle downloader for Coursera course content."""
 
+import hashlib
 import os
-import json
-import re
+import signal
+import sqlite3
 import time
 import asyncio
 import aiohttp
 import aiofiles
-from typing import Dict, List, Optional, Tuple
+from contextlib import asynccontextmanager
+from itertools import islice
+from typing import Dict, List, Optional, Set, Tuple
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
-from rich.progress import Progress, TaskID, SpinnerColumn, TextColumn, BarColumn, DownloadColumn, TimeRemainingColumn
 
 from .auth import CourseraAuth
+from .download_scheduler import (
+    DEFAULT_LEASE_SECONDS, SCHEDULE_POLICIES, DownloadScheduler, LeasedScheduler, default_worker_id
+)
+from .http_session import API_TIMEOUT, FILE_TIMEOUT, ConnectionStats, create_download_session
+from .response_cache import ResponseCache
+from .hls_download import HLSTransfer
+from .lecture_media import COURSERA_BASE_URL, LectureMedia
+from .progress_display import PROGRESS_MODES, BatchedProgress, create_progress
+from .url_refresh import (
+    EXPIRED_STATUSES, REFRESH_BATCH_SIZE, MediaURLRefresher, URLExpiredError, is_expired
+)
+from .segmented_download import (
+    DEFAULT_SEGMENT_THRESHOLD, ResourceChangedError, SegmentedTransfer, probe_range_support
+)
+from ..core.course_manifest import FILE_COMPLETE, FILE_FAILED, FILE_PENDING, CourseManifest, walk_lesson_metadata
 from ..core.file_manager import FileManager
 from ..utils.exceptions import DownloadError
 from ..utils.logger import LoggerMixin
+from ..utils.partial_download import PartialDownload, chunk_size_for
+from ..utils.rate_limiter import ByteRateLimiter, RateControlFile, format_rate
 from ..utils.sanitizer import sanitize_sequential_video_name
 
+# Attempts per file; later attempts continue from the bytes already on disk
+DOWNLOAD_ATTEMPTS = 3
+
+# Video engine choices for items that have an HLS playlist
+HLS_MODES = ('auto', 'always', 'never')
+
+# Control file in the course directory whose rate (e.g. "2M") replaces the download limit while running
+RATE_CONTROL_FILENAME = '.rate_limit'
+
+# Minimum seconds between checks of files leased by other workers in a shared download
+LEASE_POLL_INTERVAL = 0.5
+
+# Files on disk smaller than this are treated as broken and downloaded again
+MIN_COMPLETE_SIZE = {'video': 1024, 'subtitle': 100, 'supplement': 100}
+
 
 class EnhancedVideoDownloader(LoggerMixin):
     """Enhanced video and subtitle downloader with progress tracking and resume capability."""
@@ -31,22 +65,98 @@ class EnhancedVideoDownloader(LoggerMixin):
         download_subtitles: bool = True,
         subtitle_language: str = 'en',
         download_supplements: bool = False,
+        segments: int = 1,
+        segment_threshold: int = DEFAULT_SEGMENT_THRESHOLD,
+        response_cache: Optional[ResponseCache] = None,
+        hls: str = 'auto',
+        rate_limit: Optional[float] = None,
+        rate_share: float = 1.0,
+        order: str = 'lesson',
+        progress: str = 'tty',
         logger=None
     ):
-        """Initialize the enhanced downloader."""
+        """
+        Initialize the enhanced downloader.
+
+        Files of at least ``segment_threshold`` bytes are fetched as ``segments``
+        parallel byte ranges when the server supports ranges. Extra segment
+        connections come out of the same ``max_concurrent`` budget as files.
+        Subtitle and supplement lookups go through ``response_cache`` when given,
+        sharing entries with CourseraClient's ``lecture_video`` and
+        ``supplement_content`` endpoints. Video URLs that have expired since the
+        scrape are looked up again through ``lecture_video`` just before use.
+        ``hls`` picks the engine for videos with an HLS playlist: ``auto`` uses it
+        when the resolution has no MP4 or the MP4 transfer fails, ``always``
+        prefers it, ``never`` only downloads MP4.
+        ``rate_limit`` caps the bytes per second of all transfers together (None
+        for no cap); it can be changed during a run through the course's
+        ``.rate_limit`` file. A worker that splits the limit with others passes
+        its ``rate_share`` (e.g. 1/N of N workers); it then applies that share of
+        both ``rate_limit`` and the rate in the control file.
+        ``order`` is the DownloadScheduler policy: ``lesson``, ``shortest`` or ``largest`` first.
+        ``progress`` is ``tty`` for progress bars, ``json`` for periodic snapshot lines
+        on stdout (other output then goes to stderr), or ``none``.
+        """
+        if hls not in HLS_MODES:
+            raise ValueError(f"hls must be one of {HLS_MODES}, got {hls!r}")
+        if order not in SCHEDULE_POLICIES:
+            raise ValueError(f"order must be one of {SCHEDULE_POLICIES}, got {order!r}")
+        if progress not in PROGRESS_MODES:
+            raise ValueError(f"progress must be one of {PROGRESS_MODES}, got {progress!r}")
+        if not 0 < rate_share <= 1:
+            raise ValueError(f"rate_share must be in (0, 1], got {rate_share!r}")
         self.auth = auth
         self.file_manager = file_manager
         self.max_concurrent = max_concurrent
         self.download_subtitles = download_subtitles
         self.subtitle_language = subtitle_language
         self.download_supplements = download_supplements
-        self.console = Console()
+        self.segments = max(1, segments)
+        self.segment_threshold = segment_threshold
+        self.hls = hls
+        self.order = order
+        self.progress_mode = progress
+        self.rate_share = rate_share
+        self.bandwidth = ByteRateLimiter(rate_limit * rate_share if rate_limit else None)
+        self.rate_control_file: Optional[Path] = None
+        self.response_cache = response_cache
+        self.api_base_url = COURSERA_BASE_URL
+        self.resume = False
+        self.console = Console(stderr=progress == 'json')
+
+        # One pooled session per run, shared by video, subtitle and supplement tasks
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.connection_stats = ConnectionStats()
+
+        # Connection slots for the current run (files and extra segments share them)
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        # Re-resolves expired video URLs during a run; queued media ride along in its batches
+        self.url_refresher: Optional[MediaURLRefresher] = None
+
+        # Media files of the current run not handed to a worker yet
+        self._scheduler: Optional[DownloadScheduler] = None
+
+        # (worker id, lease seconds) while sharing the course with other download workers
+        self._lease: Optional[Tuple[str, float]] = None
+
+        # Files this shared worker has claimed so far, whether they finished or failed
+        self._claimed: Set[Path] = set()
+
+        # One lecture media lookup per item, shared by its video and subtitle tasks
+        self._lecture_lookups: Dict[Tuple[str, str], Tuple[asyncio.Future, bool]] = {}
+
+        # Course manifest for the current run; finished files are recorded in it
+        self.manifest: Optional[CourseManifest] = None
+        self._completed: Dict[Path, int] = {}
+        self._adopted: List[Tuple] = []
 
         # Download statistics
         self.stats = {
             'videos': {'downloaded': 0, 'skipped': 0, 'failed': 0},
             'subtitles': {'downloaded': 0, 'skipped': 0, 'failed': 0},
             'supplements': {'downloaded': 0, 'skipped': 0, 'failed': 0},
+            'files': {'downloaded': 0, 'skipped': 0, 'failed': 0},
             'total_size': 0
         }
 
@@ -61,20 +171,19 @@ class EnhancedVideoDownloader(LoggerMixin):
         """Download all videos, subtitles, and supplements in a course at specified resolution."""
         try:
             self.logger.info(f"Starting video, subtitle, and supplement download for course: {course_path}")
+            self.resume = resume
+            self.rate_control_file = course_path / RATE_CONTROL_FILENAME
+            self.manifest = CourseManifest(course_path)
+            self._completed = self.manifest.completed_files()
 
-            # Discover all video files to download
-            media_files = self._discover_media_files(course_path, target_resolution)
+            found, media_files = self._pending_media_files(course_path, target_resolution)
 
-            if not media_files:
+            if not found:
                 self.console.print(f"[yellow]No {target_resolution} videos found to download[/yellow]")
                 return {'videos': self.stats['videos'], 'subtitles': self.stats['subtitles'], 'supplements': self.stats['supplements']}
 
-            self.console.print(f"[blue]Found {len(media_files)} media files to download[/blue]")
-
-            # Filter out already downloaded files if not resuming
-            if not resume:
-                media_files = self._filter_existing_media_files(media_files)
-                self.console.print(f"[blue]Will download {len(media_files)} new files[/blue]")
+            self.console.print(f"[blue]Found {found} media files to download[/blue]")
+            self.console.print(f"[blue]Will download {len(media_files)} new files[/blue]")
 
             if not media_files:
                 self.console.print("[yellow]All media files already downloaded[/yellow]")
@@ -87,48 +196,245 @@ class EnhancedVideoDownloader(LoggerMixin):
             self.logger.error(f"Failed to download course media: {e}")
             raise DownloadError(f"Download failed: {e}")
 
-    def _sort_lesson_directories(self, lesson_dirs: List[Path]) -> List[Path]:
-        """Sort lesson directories by module order and then by lesson order."""
-        def extract_order_numbers(lesson_path: Path):
-            """Extract module and lesson order numbers from path."""
-            module_order = 0
-            lesson_order = 0
+        finally:
+            if self.manifest:
+                self.manifest.close()
+                self.manifest = None
+
+    def download_courses(
+        self,
+        course_paths: List[Path],
+        target_resolution: str = '720p',
+        resume: bool = False,
+        rate_control_file: Optional[Path] = None
+    ) -> Dict:
+        """
+        Download several courses in one run, sharing its workers, connections and bandwidth limit.
+
+        Media from all courses go into one scheduler queue, so a worker that
+        finishes a course's last file moves on to the next course instead of
+        waiting for the slowest transfer. Each course keeps its own manifest.
+        ``rate_control_file`` replaces the per-course ``.rate_limit`` file.
+        Returns the engine totals plus a ``courses`` entry per course path with
+        the files queued, downloaded and failed in this run, the bytes
+        downloaded, and the course's complete files in total.
+        """
+        self.resume = resume
+        self.rate_control_file = rate_control_file
+        queued: List[Tuple[CourseManifest, List[Dict]]] = []
+
+        try:
+            for course_path in course_paths:
+                self.manifest = CourseManifest(course_path)
+                queued.append((self.manifest, []))
+                self._completed.update(self.manifest.completed_files())
+                _, media_files = self._pending_media_files(course_path, target_resolution)
+                for media in media_files:
+                    media['manifest'] = self.manifest
+                queued[-1][1].extend(media_files)
+            self.manifest = None
+
+            all_media = [media for _, media_files in queued for media in media_files]
+            self.console.print(f"[blue]Will download {len(all_media)} new files from {len(course_paths)} courses[/blue]")
+            result = asyncio.run(self._download_media_files_async(all_media)) if all_media else {
+                'videos': self.stats['videos'], 'subtitles': self.stats['subtitles'], 'supplements': self.stats['supplements']
+            }
+
+            result['courses'] = {}
+            for manifest, media_files in queued:
+                downloaded = [media for media in media_files if media.get('downloaded')]
+                files = manifest.summary()['files']
+                result['courses'][str(manifest.course_path)] = {
+                    'queued': len(media_files),
+                    'downloaded': len(downloaded),
+                    'failed': len(media_files) - len(downloaded),
+                    'bytes': sum(self._completed.get(media['local_path'], 0) for media in downloaded),
+                    'complete': sum(counts.get(FILE_COMPLETE, 0) for counts in files.values())
+                }
+            return result
+
+        except Exception as e:
+            self.logger.error(f"Failed to download courses: {e}")
+            raise DownloadError(f"Batch download failed: {e}")
+
+        finally:
+            self.manifest = None
+            for manifest, _ in queued:
+                manifest.close()
+
+    def download_course_shared(
+        self,
+        course_path: Path,
+        target_resolution: str = '720p',
+        resume: bool = False,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ) -> Dict:
+        """
+        Download a course as one of several workers sharing its manifest.
+
+        Workers may run in other processes or on other hosts that see the same
+        course directory. Each file is leased in the manifest before it is
+        fetched and the leases are renewed while the run lasts, so every file is
+        downloaded once. Files leased by other workers are waited for: when a
+        worker stops renewing (it crashed or lost the filesystem) its files are
+        taken over after ``lease_seconds``. Returns this worker's statistics.
+        """
+        worker_id = worker_id or default_worker_id()
+        try:
+            self.logger.info(f"Starting shared download of {course_path} as worker {worker_id}")
+            self.resume = resume
+            self.rate_control_file = course_path / RATE_CONTROL_FILENAME
+            self.manifest = CourseManifest(course_path)
+            self._completed = self.manifest.completed_files()
+
+            media_files = self._filter_existing_media_files(self._discover_media_files(course_path, target_resolution))
+            self._record_adopted_files()
+            self.manifest.enqueue_files((media['local_path'], media['type'], media.get('lesson_id')) for media in media_files)
+            self.console.print(f"[blue]Worker {worker_id}: {len(media_files)} files left to share[/blue]")
+
+            self._lease = (worker_id, lease_seconds)
+            self._claimed = set()
+            result = {'videos': self.stats['videos'], 'subtitles': self.stats['subtitles'], 'supplements': self.stats['supplements']}
+            while media_files:
+                # Still pending: files nobody holds, and files leased by other workers. A file this
+                # worker already tried stays pending only if its result could not be recorded; it is
+                # not claimed again, or the loop would fetch it over and over.
+                leases = self.manifest.pending_leases()
+                now = time.time()
+                media_files = [media for media in media_files
+                               if media['local_path'] in leases and media['local_path'] not in self._claimed]
+                claimable = [media for media in media_files if (leases[media['local_path']] or 0) < now]
+
+                if claimable:
+                    result = asyncio.run(self._download_media_files_async(claimable))
+                    self.manifest.release_leases(worker_id)
+                elif media_files:
+                    # Wait for the other workers to finish them, or for a lease to expire if its worker is gone
+                    first_expiry = min(leases[media['local_path']] for media in media_files)
+                    time.sleep(min(max(first_expiry - now, LEASE_POLL_INTERVAL), lease_seconds / 3))
+            return result
+
+        except Exception as e:
+            self.logger.error(f"Failed to download course media as worker {worker_id}: {e}")
+            raise DownloadError(f"Shared download failed: {e}")
+
+        finally:
+            self._lease = None
+            if self.manifest:
+                self.manifest.close()
+                self.manifest = None
+
+    def download_media(
+        self,
+        media_files: List[Dict],
+        course_path: Optional[Path] = None,
+        resume: bool = True
+    ) -> Dict:
+        """
+        Download media entries that were built by the caller rather than discovered.
+
+        Each entry is marked ``downloaded`` when it finishes, and its ``url`` is
+        updated if the engine had to re-resolve it. With a course_path, finished
+        files are recorded in the course manifest and the course's ``.rate_limit``
+        file is followed.
+        """
+        try:
+            self.resume = resume
+            if course_path:
+                self.rate_control_file = course_path / RATE_CONTROL_FILENAME
+                self.manifest = CourseManifest(course_path)
+            return asyncio.run(self._download_media_files_async(media_files))
 
-            # Get module order from parent directory
-            module_parent = lesson_path.parent.name
-            module_match = re.search(r'module-(\d+)', module_parent)
-            if module_match:
-                module_order = int(module_match.group(1))
+        except Exception as e:
+            self.logger.error(f"Failed to download media: {e}")
+            raise DownloadError(f"Download failed: {e}")
 
-            # Get lesson order from directory name
-            lesson_name = lesson_path.name
-            lesson_match = re.search(r'lesson-(\d+)', lesson_name)
-            if lesson_match:
-                lesson_order = int(lesson_match.group(1))
+        finally:
+            if self.manifest:
+                self.manifest.close()
+                self.manifest = None
+
+    def _pending_media_files(self, course_path: Path, target_resolution: str) -> Tuple[int, List[Dict]]:
+        """
+        Discover the course's media files and record the ones still to download as pending.
+
+        Completed files are skipped; interrupted ones are continued from their
+        .part file when resuming. Returns the number of files found and the
+        files to download.
+        """
+        media_files = self._discover_media_files(course_path, target_resolution)
+        found = len(media_files)
+        media_files = self._filter_existing_media_files(media_files)
+        self._record_adopted_files()
+
+        if media_files:
+            self.manifest.record_files(
+                (media['local_path'], media['type'], FILE_PENDING, media.get('lesson_id'), None) for media in media_files
+            )
+        return found, media_files
 
-            return (module_order, lesson_order)
+    def _completed_size(self, local_path: Path, media_type: str, lesson_id: Optional[str]) -> Optional[int]:
+        """
+        Size of a finished file, or None if it still has to be downloaded.
 
-        return sorted(lesson_dirs, key=extract_order_numbers)
+        Answered from the manifest; only files it does not know are checked on
+        disk, and those found there are recorded so the next run skips the stat.
+        """
+        if local_path in self._completed:
+            return self._completed[local_path]
+
+        try:
+            size = local_path.stat().st_size
+        except FileNotFoundError:
+            return None
+
+        if size >= MIN_COMPLETE_SIZE.get(media_type, 0):
+            self._completed[local_path] = size
+            self._adopted.append((local_path, media_type, FILE_COMPLETE, lesson_id, size))
+        return size
+
+    def _record_adopted_files(self) -> None:
+        """Write files found complete on disk but missing from the manifest."""
+        if self.manifest and self._adopted:
+            self.manifest.record_files(self._adopted)
+        self._adopted = []
+
+    def _record_result(self, media: Dict, status: str) -> None:
+        """Record a finished or failed download in its course's manifest."""
+        manifest = media.get('manifest') or self.manifest
+        if not manifest:
+            return
+
+        size = None
+        if status == FILE_COMPLETE:
+            size = media['local_path'].stat().st_size
+            self._completed[media['local_path']] = size
+
+        try:
+            manifest.record_file(
+                media['local_path'], media['type'], status, media.get('lesson_id'), size,
+                content_length=media.get('content_length'), sha256=media.get('sha256')
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to record {media['filename']} in course manifest: {e}")
 
     def _discover_media_files(self, course_path: Path, target_resolution: str) -> List[Dict]:
-        """Discover all video and subtitle files to download from lesson metadata."""
+        """Discover all video and subtitle files to download from the course manifest (or lesson metadata files)."""
         media_files = []
 
-        # Get all lesson directories and sort them by module and lesson order
-        lesson_dirs = [d for d in course_path.rglob("lesson-*") if d.is_dir()]
-        sorted_lesson_dirs = self._sort_lesson_directories(lesson_dirs)
+        # Lessons in module and lesson order; courses scraped before the manifest existed fall back to a tree walk
+        lessons = self.manifest.lessons() if self.manifest else []
+        if not lessons:
+            lessons = walk_lesson_metadata(course_path)
 
         video_counter = 1  # Global sequential counter for all videos
 
-        for lesson_dir in sorted_lesson_dirs:
-            metadata_file = lesson_dir / "lesson_metadata.json"
-            if not metadata_file.exists():
-                continue
+        for lesson_metadata in lessons:
+            lesson_dir = lesson_metadata['path']
+            lesson_id = lesson_metadata.get('id')
 
             try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    lesson_metadata = json.load(f)
-
                 lesson_name = lesson_metadata.get('name', 'Unknown Lesson')
 
                 if 'assets' in lesson_metadata:
@@ -191,14 +497,27 @@ class EnhancedVideoDownloader(LoggerMixin):
                             video_path = lesson_dir / video_filename
                             subtitle_path = lesson_dir / subtitle_filename
 
+                            # Lecture media saved at scrape time already holds the subtitle URLs and HLS playlist
+                            subtitle_url = hls_url = None
+                            if asset_metadata.get('lecture_media'):
+                                lecture_media = LectureMedia.from_dict(asset_metadata['lecture_media'])
+                                subtitle_url = lecture_media.subtitle_url(self.subtitle_language)
+                                if self.hls != 'never':
+                                    hls_url = lecture_media.hls_playlist
+
                             # Add video file if URL exists or if it's already downloaded locally
                             video_url = asset.get('url')  # May be None for already downloaded videos
-                            video_exists = video_path.exists() and video_path.stat().st_size > 1024
+                            if asset_metadata.get('format') == 'hls':
+                                # The asset's URL is its HLS playlist; there is no MP4 at this resolution
+                                video_url, hls_url = None, (video_url if self.hls != 'never' else None)
+                            video_size = self._completed_size(video_path, 'video', lesson_id)
+                            video_exists = video_size is not None and video_size > 1024
 
-                            if not video_exists and video_url:  # Need to download
+                            if not video_exists and (video_url or hls_url):  # Need to download
                                 media_files.append({
                                     'type': 'video',
                                     'lesson_path': lesson_dir,
+                                    'lesson_id': lesson_id,
                                     'lesson_name': lesson_name,
                                     'filename': video_filename,
                                     'original_filename': asset_name,
@@ -206,16 +525,19 @@ class EnhancedVideoDownloader(LoggerMixin):
                                     'local_path': video_path,
                                     'item_id': item_id,
                                     'course_id': course_id,
+                                    'resolution': target_resolution,
+                                    'hls_url': hls_url,
                                     'asset_info': asset,
                                     'sequence_number': video_counter
                                 })
 
-                            # Add subtitle file if enabled and we have course_id + item_id
-                            if (self.download_subtitles and course_id and item_id and
-                                not subtitle_path.exists()):
+                            # Add subtitle file if enabled and we have its URL or course_id + item_id to look it up
+                            if (self.download_subtitles and (subtitle_url or (course_id and item_id)) and
+                                self._completed_size(subtitle_path, 'subtitle', lesson_id) is None):
                                 media_files.append({
                                     'type': 'subtitle',
                                     'lesson_path': lesson_dir,
+                                    'lesson_id': lesson_id,
                                     'lesson_name': lesson_name,
                                     'filename': subtitle_filename,
                                     'local_path': subtitle_path,
@@ -223,7 +545,7 @@ class EnhancedVideoDownloader(LoggerMixin):
                                     'course_id': course_id,
                                     'language': self.subtitle_language,
                                     'sequence_number': video_counter,
-                                    'subtitle_url': None  # To be fetched from API
+                                    'subtitle_url': subtitle_url  # None: fetched from the API
                                 })
 
                             video_counter += 1
@@ -234,7 +556,7 @@ class EnhancedVideoDownloader(LoggerMixin):
                     media_files.extend(supplement_items)
 
             except Exception as e:
-                self.logger.warning(f"Failed to read lesson metadata from {metadata_file}: {e}")
+                self.logger.warning(f"Failed to read lesson metadata for {lesson_dir}: {e}")
 
         return media_files
 
@@ -276,6 +598,7 @@ class EnhancedVideoDownloader(LoggerMixin):
                     supplement_files.append({
                         'type': 'supplement',
                         'lesson_path': lesson_dir,
+                        'lesson_id': lesson_metadata.get('id'),
                         'lesson_name': lesson_name,
                         'filename': supplement_filename,
                         'original_name': item_name,
@@ -286,10 +609,10 @@ class EnhancedVideoDownloader(LoggerMixin):
                         'supplement_content': None  # To be fetched from API
                     })
                     
-                    if supplement_path.exists():
-                        self.logger.debug(f"Found existing supplement: {lesson_name} - {supplement_filename}")
+                    if self._completed_size(supplement_path, 'supplement', lesson_metadata.get('id')) is not None:
+                        self.logger.debug("Found existing supplement: %s - %s", lesson_name, supplement_filename)
                     else:
-                        self.logger.debug(f"Found supplement to download: {lesson_name} - {supplement_filename}")
+                        self.logger.debug("Found supplement to download: %s - %s", lesson_name, supplement_filename)
                     
                     supplement_counter += 1
         
@@ -302,17 +625,13 @@ class EnhancedVideoDownloader(LoggerMixin):
         """Filter out files that already exist."""
         new_files = []
         for media in media_files:
-            if not media['local_path'].exists():
+            file_size = self._completed_size(media['local_path'], media['type'], media.get('lesson_id'))
+            if file_size is None:
                 new_files.append(media)
             else:
                 # Check file size to ensure it's not a partial download
-                file_size = media['local_path'].stat().st_size
-                if media['type'] == 'video' and file_size < 1024:
-                    new_files.append(media)  # Re-download small video files
-                elif media['type'] == 'subtitle' and file_size < 100:
-                    new_files.append(media)  # Re-download small subtitle files
-                elif media['type'] == 'supplement' and file_size < 100:
-                    new_files.append(media)  # Re-download small supplement files
+                if file_size < MIN_COMPLETE_SIZE.get(media['type'], 0):
+                    new_files.append(media)  # Re-download small video, subtitle and supplement files
                 else:
                     if media['type'] == 'video':
                         self.stats['videos']['skipped'] += 1
@@ -324,182 +643,295 @@ class EnhancedVideoDownloader(LoggerMixin):
         return new_files
 
     async def _fetch_subtitle_url(self, course_id: str, item_id: str, language: str = 'en') -> Optional[str]:
-        """Fetch subtitle URL from Coursera API."""
+        """Fetch subtitle URL from the item's lecture media."""
         try:
-            # Construct API URL
-            api_url = f"https://www.coursera.org/api/onDemandLectureVideos.v1/{course_id}~{item_id}"
-            params = {
-                'includes': 'video',
-                'fields': 'onDemandVideos.v1(sources,subtitles,subtitlesVtt,subtitlesTxt,subtitlesAssetTags,dubbedSources,dubbedSubtitlesVtt,audioDescriptionVideoSources),disableSkippingForward,startMs,endMs'
-            }
-
-            headers = self.auth.get_headers(include_csrf=False)
-            cookies = self.auth.get_cookies()
-
-            timeout = aiohttp.ClientTimeout(total=30)
-
-            async with aiohttp.ClientSession(
-                headers=headers,
-                cookies=cookies,
-                timeout=timeout
-            ) as session:
-                async with session.get(api_url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-
-                        # Extract subtitle URL from response
-                        if ('linked' in data and
-                            'onDemandVideos.v1' in data['linked']):
-
-                            videos = data['linked']['onDemandVideos.v1']
-                            for video in videos:
-                                if 'subtitlesVtt' in video:
-                                    subtitles_vtt = video['subtitlesVtt']
-
-                                    if language in subtitles_vtt:
-                                        subtitle_url = subtitles_vtt[language]
-
-                                        # Convert relative URL to full URL
-                                        if subtitle_url.startswith('/api/'):
-                                            subtitle_url = f"https://www.coursera.org{subtitle_url}"
-
-                                        return subtitle_url
+            lecture_media = await self._lecture_media(course_id, item_id)
+            if lecture_media:
+                return lecture_media.subtitle_url(language)
 
         except Exception as e:
             self.logger.warning(f"Failed to fetch subtitle URL for {course_id}~{item_id}: {e}")
 
         return None
 
+    async def _lecture_media(self, course_id: str, item_id: str, stale_url: Optional[str] = None) -> Optional[LectureMedia]:
+        """
+        Video sources, subtitles and dubbed tracks for an item from one lecture video response.
+
+        Subtitle lookups and video URL refreshes for the same item share one
+        request per run, and the response cache across runs. With ``stale_url``
+        (an expired video URL) the cached response is skipped, and an earlier
+        lookup is reused only if it came from the API and does not list that URL.
+        """
+        key = (course_id, item_id)
+        lookup, from_api = self._lecture_lookups.get(key, (None, False))
+        if lookup is not None and lookup.done() and (lookup.cancelled() or lookup.exception()):
+            lookup = None
+        if lookup is not None and stale_url:
+            stale = lookup.done() and lookup.result() is not None and lookup.result().has_video_url(stale_url)
+            if not from_api or stale:
+                lookup = None
+
+        if lookup is None:
+            use_cache = stale_url is None
+            lookup = asyncio.ensure_future(self._fetch_lecture_media(course_id, item_id, use_cache=use_cache))
+            self._lecture_lookups[key] = (lookup, not use_cache or self.response_cache is None)
+        if lookup.done():
+            return lookup.result()
+        return await asyncio.shield(lookup)
+
+    async def _fetch_lecture_media(self, course_id: str, item_id: str, use_cache: bool = True) -> Optional[LectureMedia]:
+        """Fetch and parse an item's onDemandLectureVideos.v1 response."""
+        api_url = f"{self.api_base_url}/api/onDemandLectureVideos.v1/{course_id}~{item_id}"
+        params = {
+            'includes': 'video',
+            'fields': 'onDemandVideos.v1(sources,subtitles,subtitlesVtt,subtitlesTxt,subtitlesAssetTags,dubbedSources,dubbedSubtitlesVtt,audioDescriptionVideoSources),disableSkippingForward,startMs,endMs'
+        }
+        data = await self._get_api_json(
+            'lecture_video', {'course_id': course_id, 'lecture_id': item_id}, api_url, params, use_cache=use_cache
+        )
+        return LectureMedia.from_response(data)
+
     async def _fetch_supplement_content(self, course_id: str, item_id: str) -> Optional[str]:
         """Fetch supplement HTML content from Coursera API."""
         try:
             # Construct API URL
-            api_url = f"https://www.coursera.org/api/onDemandSupplements.v1/{course_id}~{item_id}"
+            api_url = f"{self.api_base_url}/api/onDemandSupplements.v1/{course_id}~{item_id}"
             params = {
                 'includes': 'asset',
                 'fields': 'openCourseAssets.v1(typeName),openCourseAssets.v1(definition),minimumDurationToComplete'
             }
 
-            headers = self.auth.get_headers(include_csrf=False)
-            cookies = self.auth.get_cookies()
-
-            timeout = aiohttp.ClientTimeout(total=30)
-
-            async with aiohttp.ClientSession(
-                headers=headers,
-                cookies=cookies,
-                timeout=timeout
-            ) as session:
-                async with session.get(api_url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-
-                        # Extract HTML content from response
-                        if ('linked' in data and
-                            'openCourseAssets.v1' in data['linked'] and
-                            len(data['linked']['openCourseAssets.v1']) > 0):
-
-                            asset = data['linked']['openCourseAssets.v1'][0]
-                            definition = asset.get('definition', {})
-                            
-                            # Try to get renderableHtml from renderableHtmlWithMetadata
-                            renderable_html_metadata = definition.get('renderableHtmlWithMetadata', {})
-                            if 'renderableHtml' in renderable_html_metadata:
-                                return renderable_html_metadata['renderableHtml']
-                            
-                            # Fallback: try direct renderableHtml field
-                            if 'renderableHtml' in definition:
-                                return definition['renderableHtml']
+            data = await self._get_api_json(
+                'supplement_content', {'course_id': course_id, 'item_id': item_id}, api_url, params
+            )
+            if data:
+                # Extract HTML content from response
+                if ('linked' in data and
+                    'openCourseAssets.v1' in data['linked'] and
+                    len(data['linked']['openCourseAssets.v1']) > 0):
+
+                    asset = data['linked']['openCourseAssets.v1'][0]
+                    definition = asset.get('definition', {})
+
+                    # Try to get renderableHtml from renderableHtmlWithMetadata
+                    renderable_html_metadata = definition.get('renderableHtmlWithMetadata', {})
+                    if 'renderableHtml' in renderable_html_metadata:
+                        return renderable_html_metadata['renderableHtml']
+
+                    # Fallback: try direct renderableHtml field
+                    if 'renderableHtml' in definition:
+                        return definition['renderableHtml']
 
         except Exception as e:
             self.logger.warning(f"Failed to fetch supplement content for {course_id}~{item_id}: {e}")
 
         return None
 
+    async def _get_api_json(
+        self,
+        endpoint: str,
+        cache_params: Dict[str, str],
+        api_url: str,
+        query: Dict[str, str],
+        use_cache: bool = True
+    ) -> Optional[Dict]:
+        """
+        GET a JSON API response, served from the response cache when fresh; None unless HTTP 200.
+
+        With ``use_cache`` False the cache is not read, but the new response still replaces its entry.
+        """
+        if self.response_cache and use_cache:
+            cached = self.response_cache.get(endpoint, cache_params)
+            if cached is not None:
+                return cached
+
+        async with self._session_scope() as session:
+            async with session.get(api_url, params=query, timeout=API_TIMEOUT) as response:
+                if response.status != 200:
+                    self.logger.debug("%s lookup returned HTTP %s: %s", endpoint, response.status, api_url)
+                    return None
+                data = await response.json()
+
+        if self.response_cache:
+            self.response_cache.put(endpoint, cache_params, data)
+        return data
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create the pooled session for a run, sized to the concurrency limit."""
+        return create_download_session(
+            self.auth,
+            # Each task holds at most one connection; leave room for API calls to the other host
+            limit=self.max_concurrent * 2,
+            limit_per_host=self.max_concurrent,
+            stats=self.connection_stats
+        )
+
+    @asynccontextmanager
+    async def _session_scope(self):
+        """Yield the run's shared session, or a short-lived one when called outside a run."""
+        if self.session is not None and not self.session.closed:
+            yield self.session
+            return
+
+        async with self._create_session() as session:
+            yield session
+
+    @asynccontextmanager
+    async def _rate_control(self):
+        """Follow the rate control file during a run; SIGHUP re-reads it at once."""
+        if self.rate_control_file is None:
+            yield
+            return
+
+        control = RateControlFile(self.bandwidth, self.rate_control_file, share=self.rate_share)
+        control.check()
+        watcher = asyncio.create_task(control.watch())
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGHUP, control.check)
+            handles_signal = True
+        except (AttributeError, NotImplementedError, RuntimeError, ValueError):
+            # No SIGHUP on Windows, and signal handlers only work in the main thread
+            handles_signal = False
+
+        try:
+            yield
+        finally:
+            watcher.cancel()
+            if handles_signal:
+                loop.remove_signal_handler(signal.SIGHUP)
+            self.bandwidth.set_rate(control.default_rate)
+
     async def _download_media_files_async(self, media_files: List[Dict]) -> Dict:
         """Download media files asynchronously with progress tracking."""
-        # Create download progress display
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            DownloadColumn(),
-            TimeRemainingColumn(),
-            console=self.console,
-            transient=False
-        ) as progress:
+        self._lecture_lookups = {}
+        self.url_refresher = MediaURLRefresher(self._lecture_media)
+
+        async with self._create_session() as session, self._rate_control():
+            self.session = session
+            try:
+                await self._run_download_tasks(media_files)
+            finally:
+                self.session = None
+
+        if self.bandwidth.rate or self.bandwidth.waited:
+            self.logger.info(f"Bandwidth limit {format_rate(self.bandwidth.rate)}: streams waited {self.bandwidth.waited:.1f}s in total")
+
+        refresh_stats = self.url_refresher.stats
+        if refresh_stats['lookups']:
+            self.logger.info(f"Video URL refresh: {refresh_stats['refreshed']} refreshed, {refresh_stats['failed']} failed in {refresh_stats['lookups']} lookups")
+            self.console.print(f"[blue]Expired video URLs refreshed: {refresh_stats['refreshed']} ({refresh_stats['failed']} failed)[/blue]")
+
+        self.logger.info(f"Connection reuse: {self.connection_stats.summary()}")
+        self.console.print(f"[blue]Connections: {self.connection_stats.summary()}[/blue]")
+
+        return {
+            'videos': self.stats['videos'],
+            'subtitles': self.stats['subtitles'],
+            'supplements': self.stats['supplements'],
+            'files': self.stats['files'],
+            'total_size': self.stats['total_size'],
+            'connections': self.connection_stats.as_dict()
+        }
+
+    async def _run_download_tasks(self, media_files: List[Dict]) -> None:
+        """Download media files with ``max_concurrent`` workers drawing from the run's scheduler."""
+        # Transfers update counters; the display reads them on a timer
+        async with create_progress(self.progress_mode, self.console) as progress:
+            progress.details = self._progress_details
 
             # Create main progress task
             main_task = progress.add_task(
                 f"Downloading {len(media_files)} media files",
-                total=len(media_files)
+                total=len(media_files),
+                unit='files'
             )
 
-            # Create semaphore to limit concurrent downloads
+            # Create semaphore to limit concurrent downloads (and extra segment connections)
             semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._slots = semaphore
+            if self._lease:
+                self._scheduler = LeasedScheduler(media_files, self.order, self.manifest, *self._lease)
+            else:
+                self._scheduler = DownloadScheduler(media_files, self.order)
+            jobs = iter(self._scheduler)
 
-            # Create download tasks
-            download_tasks = []
-            for media in media_files:
-                task = asyncio.create_task(
-                    self._download_single_media_file(media, progress, main_task, semaphore)
-                )
-                download_tasks.append(task)
+            async def worker():
+                for media in jobs:
+                    await self._download_single_media_file(media, progress, main_task, semaphore)
 
-            # Wait for all downloads to complete
-            await asyncio.gather(*download_tasks, return_exceptions=True)
+            # A fixed pool of workers, not a task per file, so memory stays flat for large catalogs
+            workers = [asyncio.create_task(worker()) for _ in range(min(self.max_concurrent, len(media_files)))]
+            heartbeat = asyncio.create_task(self._renew_leases()) if self._lease else None
+            try:
+                await asyncio.gather(*workers, return_exceptions=True)
+            finally:
+                if heartbeat:
+                    heartbeat.cancel()
+                if self._lease:
+                    self._claimed |= self._scheduler.claimed
+                self._scheduler = None
 
             progress.update(main_task, description="Download completed")
 
+    async def _renew_leases(self) -> None:
+        """Keep this worker's leases on claimed files alive while the run lasts."""
+        worker_id, lease_seconds = self._lease
+        while True:
+            await asyncio.sleep(lease_seconds / 3)
+            try:
+                self.manifest.renew_leases(worker_id, lease_seconds)
+            except sqlite3.Error as e:
+                # A missed renewal only matters if the lease runs out before the next one
+                self.logger.warning(f"Failed to renew leases of worker {worker_id}: {e}")
+
+    def _progress_details(self) -> Dict:
+        """Outcome counts added to progress snapshots."""
+        kinds = ('videos', 'subtitles', 'supplements', 'files')
         return {
-            'videos': self.stats['videos'],
-            'subtitles': self.stats['subtitles'],
-            'supplements': self.stats['supplements']
+            'files_downloaded': sum(self.stats[kind]['downloaded'] for kind in kinds),
+            'files_failed': sum(self.stats[kind]['failed'] for kind in kinds)
         }
 
     async def _download_single_media_file(
         self,
         media: Dict,
-        progress: Progress,
-        main_task: TaskID,
+        progress: BatchedProgress,
+        main_task: int,
         semaphore: asyncio.Semaphore
     ):
-        """Download a single media file (video, subtitle, or supplement)."""
+        """
+        Download a single media file (video, subtitle, supplement, or any file with a direct URL).
+
+        Sets ``media['downloaded']`` on success so callers can map results back to their assets.
+        """
         async with semaphore:
-            file_task = progress.add_task(
-                f"  {media['type'].title()}: {media['lesson_name'][:40]}...",
-                total=100
-            )
+            file_task = progress.add_task(f"  {media['type'].title()}: {media['lesson_name'][:40]}...")
 
             try:
                 # Create lesson directory if it doesn't exist
                 media['local_path'].parent.mkdir(parents=True, exist_ok=True)
 
                 if media['type'] == 'video':
-                    # Download video file
-                    download_url = media['url']
-                    await self._download_file(
-                        url=download_url,
-                        local_path=media['local_path'],
-                        progress=progress,
-                        task_id=file_task
-                    )
+                    integrity = await self._download_video(media, progress, file_task)
                     self.stats['videos']['downloaded'] += 1
                     
                 elif media['type'] == 'subtitle':
-                    # Fetch subtitle URL from API and download
-                    download_url = await self._fetch_subtitle_url(
+                    # Subtitle URL from the scraped lecture media, else from the item's (shared) API lookup
+                    download_url = media.get('subtitle_url') or await self._fetch_subtitle_url(
                         media['course_id'],
                         media['item_id'],
                         media['language']
                     )
                     if not download_url:
-                        self.logger.warning(f"Could not fetch subtitle URL for {media['filename']}")
+                        self.logger.warning("Could not fetch subtitle URL for %s", media['filename'])
                         self.stats['subtitles']['failed'] += 1
+                        self._record_result(media, FILE_FAILED)
                         progress.update(file_task, description=f"  FAILED: No subtitle URL")
                         return
                     
-                    await self._download_file(
+                    integrity = await self._download_file(
                         url=download_url,
                         local_path=media['local_path'],
                         progress=progress,
@@ -514,23 +946,37 @@ class EnhancedVideoDownloader(LoggerMixin):
                         media['item_id']
                     )
                     if not html_content:
-                        self.logger.warning(f"Could not fetch supplement content for {media['filename']}")
+                        self.logger.warning("Could not fetch supplement content for %s", media['filename'])
                         self.stats['supplements']['failed'] += 1
+                        self._record_result(media, FILE_FAILED)
                         progress.update(file_task, description=f"  FAILED: No supplement content")
                         return
                     
                     # Save HTML content to file
-                    await self._save_html_content(
+                    integrity = await self._save_html_content(
                         html_content=html_content,
                         local_path=media['local_path'],
                         progress=progress,
                         task_id=file_task
                     )
                     self.stats['supplements']['downloaded'] += 1
-                    
+
+                elif media['type'] == 'file':
+                    # Any other asset with a direct URL (readings, audio, ...) from the scrape path
+                    integrity = await self._download_file(
+                        url=media['url'],
+                        local_path=media['local_path'],
+                        progress=progress,
+                        task_id=file_task
+                    )
+                    self.stats['files']['downloaded'] += 1
+
                 else:
                     raise ValueError(f"Unknown media type: {media['type']}")
 
+                media['downloaded'] = True
+                media['content_length'], media['sha256'] = integrity
+                self._record_result(media, FILE_COMPLETE)
                 progress.update(file_task, description=f"  SUCCESS: {media['type'].title()}")
 
             except Exception as e:
@@ -540,90 +986,279 @@ class EnhancedVideoDownloader(LoggerMixin):
                     self.stats['subtitles']['failed'] += 1
                 elif media['type'] == 'supplement':
                     self.stats['supplements']['failed'] += 1
+                elif media['type'] == 'file':
+                    self.stats['files']['failed'] += 1
 
                 self.logger.error(f"Failed to download {media['filename']}: {e}")
+                self._record_result(media, FILE_FAILED)
                 progress.update(file_task, description=f"  FAILED: {media['type'].title()}")
 
             finally:
                 progress.advance(main_task)
                 progress.remove_task(file_task)
 
-    async def _download_file(
-        self,
-        url: str,
-        local_path: Path,
-        progress: Progress,
-        task_id: TaskID
-    ):
-        """Download a file from URL with progress tracking."""
-        headers = self.auth.get_headers(include_csrf=False)
-        cookies = self.auth.get_cookies()
-
-        timeout = aiohttp.ClientTimeout(total=30 * 60)  # 30 minute timeout
+    async def _download_video(self, media: Dict, progress: BatchedProgress, task_id: int) -> Tuple[Optional[int], str]:
+        """
+        Download a video as progressive MP4 or from its HLS playlist, following the ``hls`` mode.
 
-        async with aiohttp.ClientSession(
-            headers=headers,
-            cookies=cookies,
-            timeout=timeout
-        ) as session:
-
-            async with session.get(url) as response:
-                if response.status != 200:
-                    raise DownloadError(f"HTTP {response.status}: {url}")
+        Returns the content length and SHA-256 like _download_file.
+        """
+        has_hls = bool(media.get('hls_url')) and self.hls != 'never'
+        if not has_hls or (self.hls == 'auto' and media.get('url')):
+            try:
+                return await self._download_mp4(media, progress, task_id)
+            except (aiohttp.ClientError, asyncio.TimeoutError, DownloadError) as e:
+                if not has_hls:
+                    raise
+                self.logger.warning("MP4 download failed for %s (%s); switching to HLS", media['filename'], e)
+
+        return await self._download_hls(media, progress, task_id)
+
+    async def _download_mp4(self, media: Dict, progress: BatchedProgress, task_id: int) -> Tuple[Optional[int], str]:
+        """Download a progressive MP4, re-resolving its URL if the signature has (or is about to) expire."""
+        if not media.get('url'):
+            raise DownloadError(f"No MP4 or HLS source for {media['filename']}")
+        if is_expired(media['url']):
+            await self._refresh_video_url(media)
+        try:
+            return await self._download_file(
+                url=media['url'],
+                local_path=media['local_path'],
+                progress=progress,
+                task_id=task_id
+            )
+        except URLExpiredError as e:
+            if not await self._refresh_video_url(media):
+                raise
+            self.logger.info("%s; retrying %s with a refreshed URL", e, media['filename'])
+            return await self._download_file(
+                url=media['url'],
+                local_path=media['local_path'],
+                progress=progress,
+                task_id=task_id
+            )
 
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded_size = 0
+    async def _download_hls(self, media: Dict, progress: BatchedProgress, task_id: int) -> Tuple[Optional[int], str]:
+        """
+        Download a video from its HLS playlist, segments in parallel.
+
+        Segments of an interrupted transfer are kept and reused. There is no
+        single Content-Length, so only the SHA-256 is returned for verification.
+        """
+        def on_progress(received: int, total_size: int):
+            progress.update(task_id, completed=received, total=total_size)
+
+        async with self._session_scope() as session:
+            for attempt in (1, 2):
+                transfer = HLSTransfer(
+                    session, media['hls_url'], media['local_path'], media.get('resolution'),
+                    on_progress=on_progress, limiter=self.bandwidth
+                )
+                try:
+                    size, digest = await transfer.run()
+                    break
+                except URLExpiredError as e:
+                    if attempt == 2 or not await self._refresh_hls_url(media):
+                        raise
+                    self.logger.info("%s; retrying %s with a refreshed playlist", e, media['filename'])
+
+        self.logger.info(
+            "HLS %s: %d segments fetched, %d resumed, %d retries",
+            media['filename'], transfer.stats['fetched'], transfer.stats['resumed'], transfer.stats['retries']
+        )
+        self.stats['total_size'] += size
+        return None, digest
+
+    async def _refresh_hls_url(self, media: Dict) -> bool:
+        """Look up a fresh HLS playlist URL for media; True if it changed."""
+        if not (media.get('course_id') and media.get('item_id')):
+            return False
+        lecture_media = await self._lecture_media(media['course_id'], media['item_id'], stale_url=media['hls_url'])
+        if not lecture_media or not lecture_media.hls_playlist or lecture_media.hls_playlist == media['hls_url']:
+            return False
+        media['hls_url'] = lecture_media.hls_playlist
+        return True
+
+    async def _refresh_video_url(self, media: Dict) -> bool:
+        """
+        Look up a fresh URL for media, together with the next queued videos that have not started.
+
+        Their URLs were signed at the same time, so refreshing them in the same batch
+        spares each one a rejected transfer. New URLs are written back to the manifest.
+        Returns True if media's URL changed.
+        """
+        if not self.url_refresher or not self.url_refresher.can_refresh(media):
+            return False
+
+        pending = self._scheduler.pending() if self._scheduler else iter(())
+        upcoming = list(islice((
+            queued for queued in pending
+            if queued['type'] == 'video' and queued.get('url') and not queued.get('url_refreshed')
+        ), REFRESH_BATCH_SIZE - 1))
+        old_url = media['url']
+        changed = await self.url_refresher.refresh_batch([media] + upcoming)
+
+        # A batch run can refresh videos of several courses at once; each goes to its own manifest
+        by_manifest: Dict[int, Tuple[CourseManifest, List[Tuple[Dict, str]]]] = {}
+        for refreshed, previous in changed:
+            manifest = refreshed.get('manifest') or self.manifest
+            if manifest:
+                by_manifest.setdefault(id(manifest), (manifest, []))[1].append((refreshed, previous))
+
+        for manifest, urls in by_manifest.values():
+            try:
+                manifest.update_asset_urls(
+                    (refreshed.get('lesson_id'), previous, refreshed['url']) for refreshed, previous in urls
+                )
+            except Exception as e:
+                self.logger.warning(f"Failed to record refreshed URLs in course manifest: {e}")
 
-                # Create temporary file
-                temp_path = local_path.with_suffix('.tmp')
+        return media['url'] != old_url
 
+    async def _download_file(
+        self,
+        url: str,
+        local_path: Path,
+        progress: BatchedProgress,
+        task_id: int
+    ) -> Tuple[Optional[int], str]:
+        """
+        Download a file from URL with progress tracking, continuing partial downloads with Range requests.
+
+        Returns the server's content length and the file's SHA-256 for the course manifest.
+        """
+        partial = PartialDownload(local_path)
+
+        async with self._session_scope() as session:
+            if self.segments > 1 and await self._download_segmented(session, url, partial, progress, task_id):
+                # Segments arrive out of order, so the finished file is hashed from disk
+                await asyncio.to_thread(partial.finish_hash)
+                self.stats['total_size'] += partial.commit()
+                return partial.expected_length, partial.sha256
+
+            offset = partial.prepare(url, resume=self.resume)
+            if offset:
+                self.logger.info("Resuming %s from byte %d", local_path.name, offset)
+
+            for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
                 try:
-                    async with aiofiles.open(temp_path, 'wb') as file:
-                        async for chunk in response.content.iter_chunked(8192):
-                            await file.write(chunk)
-                            downloaded_size += len(chunk)
-
-                            # Update progress
-                            if total_size > 0:
-                                percentage = (downloaded_size / total_size) * 100
-                                progress.update(task_id, completed=percentage)
+                    await self._fetch_into_partial(session, url, partial, offset, progress, task_id)
+                    partial.verify()
+                    break
+                except URLExpiredError:
+                    # Retrying the same URL cannot help; the caller refreshes it
+                    raise
+                except (aiohttp.ClientError, asyncio.TimeoutError, DownloadError) as e:
+                    if attempt == DOWNLOAD_ATTEMPTS:
+                        raise
+                    # Keep the partial file: the next attempt asks only for the missing bytes
+                    offset = partial.downloaded_size
+                    self.logger.warning("Download attempt %d failed for %s: %s. Retrying from byte %d...", attempt, local_path.name, e, offset)
+                    await asyncio.sleep(2 ** attempt)
+
+        # Hashed while streaming; only a resume from an earlier run reads the file again
+        await asyncio.to_thread(partial.finish_hash)
+
+        # Move the verified partial file to its final location
+        self.stats['total_size'] += partial.commit()
+        return partial.expected_length, partial.sha256
+
+    async def _download_segmented(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        partial: PartialDownload,
+        progress: BatchedProgress,
+        task_id: int
+    ) -> bool:
+        """Download url as parallel byte ranges; returns False when it should be streamed instead."""
+        def on_progress(received: int, total_size: int):
+            progress.update(task_id, completed=received, total=total_size)
+
+        transfer = SegmentedTransfer(
+            session, url, partial, self.segments, slots=self._slots, on_progress=on_progress, limiter=self.bandwidth
+        )
+
+        if transfer.resume_existing(self.resume):
+            self.logger.info("Resuming %s segments at %d of %s bytes", partial.local_path.name, transfer.received, partial.expected_length)
+        else:
+            try:
+                total_size = await probe_range_support(session, url, partial)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.debug("Range probe failed for %s: %s", partial.local_path.name, e)
+                return False
+            if total_size is None or total_size < self.segment_threshold:
+                return False
+            transfer.start_new(total_size)
 
-                    # Move temp file to final location
-                    temp_path.replace(local_path)
+        try:
+            await transfer.run()
+        except ResourceChangedError as e:
+            self.logger.warning("%s; downloading %s as a single stream", e, partial.local_path.name)
+            partial.discard()
+            return False
 
-                    # Update total downloaded size
-                    self.stats['total_size'] += downloaded_size
+        return True
 
-                except Exception as e:
-                    # Clean up temp file on error
-                    if temp_path.exists():
-                        temp_path.unlink()
-                    raise e
+    async def _fetch_into_partial(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        partial: PartialDownload,
+        offset: int,
+        progress: BatchedProgress,
+        task_id: int
+    ) -> None:
+        """Stream one (ranged) response into the partial file."""
+        if offset and partial.is_complete():
+            return
+
+        async with session.get(url, headers=partial.request_headers(offset), timeout=FILE_TIMEOUT) as response:
+            if response.status == 416 and partial.is_complete():
+                return
+            if response.status in EXPIRED_STATUSES:
+                raise URLExpiredError(f"HTTP {response.status} for {partial.local_path.name}: media URL expired")
+
+            # 206 continues at offset; 200 means the server sent the whole file again
+            write_offset = partial.accept_response(response.status, response.headers, offset)
+            total_size = partial.expected_length
+            downloaded_size = write_offset
+
+            async with aiofiles.open(partial.part_path, 'ab' if write_offset else 'wb') as file:
+                async for chunk in response.content.iter_chunked(chunk_size_for(total_size)):
+                    await self.bandwidth.consume(len(chunk))
+                    await file.write(chunk)
+                    partial.hash_chunk(downloaded_size, chunk)
+                    downloaded_size += len(chunk)
+
+                    # Only counters change here; the display is redrawn on a timer
+                    progress.update(task_id, completed=downloaded_size, total=total_size)
 
     async def _save_html_content(
         self,
         html_content: str,
         local_path: Path,
-        progress: Progress,
-        task_id: TaskID
-    ):
-        """Save HTML content to a file."""
+        progress: BatchedProgress,
+        task_id: int
+    ) -> Tuple[Optional[int], str]:
+        """Save HTML content to a file; returns its size and SHA-256 for the course manifest."""
         try:
             # Create temporary file
             temp_path = local_path.with_suffix('.tmp')
+            data = html_content.encode('utf-8')
             
             # Write HTML content
-            async with aiofiles.open(temp_path, 'w', encoding='utf-8') as file:
-                await file.write(html_content)
+            async with aiofiles.open(temp_path, 'wb') as file:
+                await file.write(data)
             
             # Move temp file to final location
             temp_path.replace(local_path)
             
-            # Update progress to 100%
-            progress.update(task_id, completed=100)
+            progress.update(task_id, completed=len(data), total=len(data))
             
             # Update total downloaded size
-            self.stats['total_size'] += len(html_content.encode('utf-8'))
+            self.stats['total_size'] += len(data)
+            return len(data), hashlib.sha256(data).hexdigest()
             
         except Exception as e:
             # Clean up temp file on error
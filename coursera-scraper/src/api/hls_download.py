@@ -0,0 +1,338 @@
+"""HLS (HTTP Live Streaming) download: playlist parsing, concurrent segments and joining."""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import aiofiles
+import aiohttp
+
+from .http_session import API_TIMEOUT, FILE_TIMEOUT
+from .url_refresh import EXPIRED_STATUSES, URLExpiredError
+from ..utils.exceptions import DownloadError
+from ..utils.logger import LoggerMixin
+from ..utils.partial_download import MAX_CHUNK_SIZE
+from ..utils.rate_limiter import ByteRateLimiter
+
+# Segments in flight per file; segments are a few seconds each, so latency rather than bandwidth limits one stream
+HLS_SEGMENT_CONCURRENCY = 6
+
+# Attempts per segment, with exponential backoff between them
+HLS_SEGMENT_ATTEMPTS = 4
+
+# Finished segments wait in <file>.hls/ until they are joined, which is what makes them resumable
+SEGMENT_DIR_SUFFIX = '.hls'
+STATE_FILENAME = 'playlist.json'
+
+_ATTRIBUTE = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+
+
+@dataclass
+class HLSVariant:
+    """One rendition listed in a master playlist."""
+    url: str
+    bandwidth: int = 0
+    height: Optional[int] = None
+
+
+@dataclass
+class HLSMediaPlaylist:
+    """Segments of one rendition, plus the fMP4 initialization section if any."""
+    segments: List[str]
+    init_url: Optional[str] = None
+
+    @property
+    def fragmented_mp4(self) -> bool:
+        return self.init_url is not None
+
+
+def parse_attributes(value: str) -> Dict[str, str]:
+    """Parse an attribute list such as ``BANDWIDTH=800000,RESOLUTION=1280x720``."""
+    return {key: raw.strip('"') for key, raw in _ATTRIBUTE.findall(value)}
+
+
+def _playlist_lines(text: str):
+    """Yield (tag, None) for every tag line and (last tag, uri) for every URI line."""
+    last_tag = ''
+    for line in (line.strip() for line in text.splitlines()):
+        if line.startswith('#'):
+            last_tag = line
+            yield line, None
+        elif line:
+            yield last_tag, line
+
+
+def is_master_playlist(text: str) -> bool:
+    return '#EXT-X-STREAM-INF' in text
+
+
+def parse_master_playlist(text: str, base_url: str) -> List[HLSVariant]:
+    """Renditions of a master playlist with absolute URLs."""
+    variants = []
+    for tag, uri in _playlist_lines(text):
+        if tag.startswith('#EXT-X-STREAM-INF') and uri:
+            attributes = parse_attributes(tag.split(':', 1)[1])
+            resolution = attributes.get('RESOLUTION', '')
+            height = int(resolution.split('x')[1]) if 'x' in resolution else None
+            variants.append(HLSVariant(urljoin(base_url, uri), int(attributes.get('BANDWIDTH', 0) or 0), height))
+    return variants
+
+
+def parse_media_playlist(text: str, base_url: str) -> HLSMediaPlaylist:
+    """
+    Segment URLs of a media playlist, in order.
+
+    Raises:
+        DownloadError: For live (unterminated), encrypted or byte-range playlists
+    """
+    if '#EXT-X-ENDLIST' not in text:
+        raise DownloadError("HLS playlist is not a finished (VOD) playlist")
+
+    segments = []
+    init_url = None
+    for tag, uri in _playlist_lines(text):
+        if uri:
+            segments.append(urljoin(base_url, uri))
+        elif tag.startswith('#EXT-X-KEY'):
+            method = parse_attributes(tag.split(':', 1)[1]).get('METHOD', 'NONE')
+            if method != 'NONE':
+                raise DownloadError(f"Encrypted HLS ({method}) is not supported")
+        elif tag.startswith('#EXT-X-BYTERANGE'):
+            raise DownloadError("Byte-range HLS segments are not supported")
+        elif tag.startswith('#EXT-X-MAP'):
+            init_url = urljoin(base_url, parse_attributes(tag.split(':', 1)[1])['URI'])
+
+    if not segments:
+        raise DownloadError("HLS playlist has no segments")
+    return HLSMediaPlaylist(segments, init_url)
+
+
+def select_variant(variants: List[HLSVariant], resolution: Optional[str]) -> HLSVariant:
+    """
+    The best rendition at or below resolution (e.g. '720p'), else the smallest one above it.
+
+    Without a resolution, or when no rendition states its height, the highest bandwidth wins.
+    """
+    target = int(resolution[:-1]) if resolution and resolution[:-1].isdigit() else None
+    rank = lambda variant: (variant.height or 0, variant.bandwidth)
+    if target is None or all(variant.height is None for variant in variants):
+        return max(variants, key=rank)
+
+    fitting = [variant for variant in variants if variant.height is not None and variant.height <= target]
+    if fitting:
+        return max(fitting, key=rank)
+    return min(variants, key=rank)
+
+
+def ffmpeg_path() -> Optional[str]:
+    """ffmpeg on PATH, used to remux MPEG-TS into MP4 when available."""
+    return shutil.which('ffmpeg')
+
+
+def _resource_key(url: str) -> str:
+    """Scheme, host and path; playlist signatures in the query string rotate."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+class HLSTransfer(LoggerMixin):
+    """
+    Download one HLS rendition into a single file.
+
+    Segments are fetched concurrently, each into its own file under
+    ``<file>.hls/``, so an interrupted transfer continues with the segments it
+    does not have yet. Once all are present they are joined: fMP4 segments
+    are concatenated behind their init section, MPEG-TS segments are remuxed
+    to MP4 by ffmpeg when it is installed and otherwise concatenated as-is.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        playlist_url: str,
+        local_path: Path,
+        resolution: Optional[str] = None,
+        concurrency: int = HLS_SEGMENT_CONCURRENCY,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        limiter: Optional[ByteRateLimiter] = None
+    ):
+        self.session = session
+        self.playlist_url = playlist_url
+        self.local_path = Path(local_path)
+        self.resolution = resolution
+        self.concurrency = max(1, concurrency)
+        self.on_progress = on_progress
+        self.limiter = limiter
+        self.segment_dir = self.local_path.with_name(self.local_path.name + SEGMENT_DIR_SUFFIX)
+        self.stats = {'segments': 0, 'fetched': 0, 'resumed': 0, 'retries': 0, 'remuxed': False}
+        self.received = 0
+
+    async def run(self) -> Tuple[int, str]:
+        """
+        Download and join every segment; returns the final file's size and SHA-256.
+
+        Raises:
+            URLExpiredError: If the CDN rejects the playlist or a segment URL
+            DownloadError: If the playlist is unusable or a segment keeps failing
+        """
+        media_url, playlist = await self._load_playlist()
+        urls = ([playlist.init_url] if playlist.init_url else []) + playlist.segments
+        self.stats['segments'] = len(playlist.segments)
+
+        self._prepare_segment_dir(media_url, len(urls))
+        missing = [index for index in range(len(urls)) if not self._segment_path(index).exists()]
+        self.stats['resumed'] = len(urls) - len(missing)
+        self.received = sum(
+            self._segment_path(index).stat().st_size for index in set(range(len(urls))) - set(missing)
+        )
+        done = self.stats['resumed']
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for index in missing:
+            queue.put_nowait(index)
+
+        async def worker():
+            nonlocal done
+            while not queue.empty():
+                index = queue.get_nowait()
+                path = self._segment_path(index)
+                await self._fetch_segment(urls[index], path)
+                done += 1
+                self.received += path.stat().st_size
+                if self.on_progress:
+                    # Bytes so far and the total they extrapolate to; segment sizes are not known up front
+                    self.on_progress(self.received, self.received * len(urls) // done)
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, len(missing)))]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+
+        size, digest = await asyncio.to_thread(self._join, len(urls), playlist.fragmented_mp4)
+        shutil.rmtree(self.segment_dir, ignore_errors=True)
+        return size, digest
+
+    async def _get_text(self, url: str) -> str:
+        async with self.session.get(url, timeout=API_TIMEOUT) as response:
+            if response.status in EXPIRED_STATUSES:
+                raise URLExpiredError(f"HTTP {response.status} for HLS playlist: media URL expired")
+            if response.status != 200:
+                raise DownloadError(f"HTTP {response.status} for HLS playlist {url}")
+            return await response.text()
+
+    async def _load_playlist(self) -> Tuple[str, HLSMediaPlaylist]:
+        """Follow a master playlist to the chosen rendition and parse its media playlist."""
+        text = await self._get_text(self.playlist_url)
+        media_url = self.playlist_url
+        if is_master_playlist(text):
+            variants = parse_master_playlist(text, self.playlist_url)
+            if not variants:
+                raise DownloadError("HLS master playlist lists no renditions")
+            variant = select_variant(variants, self.resolution)
+            self.logger.debug("HLS rendition for %s: %sp at %s bps", self.local_path.name, variant.height, variant.bandwidth)
+            media_url = variant.url
+            text = await self._get_text(media_url)
+        return media_url, parse_media_playlist(text, media_url)
+
+    def _segment_path(self, index: int) -> Path:
+        return self.segment_dir / f"{index:05d}.seg"
+
+    def _prepare_segment_dir(self, media_url: str, count: int) -> None:
+        """Keep segments from an earlier run only if they belong to the same rendition."""
+        state = {'playlist': _resource_key(media_url), 'segments': count}
+        state_path = self.segment_dir / STATE_FILENAME
+        try:
+            previous = json.loads(state_path.read_text())
+        except (FileNotFoundError, ValueError):
+            previous = None
+
+        if previous != state:
+            shutil.rmtree(self.segment_dir, ignore_errors=True)
+            self.segment_dir.mkdir(parents=True, exist_ok=True)
+            state_path.write_text(json.dumps(state))
+
+    async def _fetch_segment(self, url: str, path: Path) -> None:
+        """Fetch one segment with retries; it only appears under its final name once complete."""
+        tmp_path = path.with_suffix('.tmp')
+        for attempt in range(1, HLS_SEGMENT_ATTEMPTS + 1):
+            try:
+                async with self.session.get(url, timeout=FILE_TIMEOUT) as response:
+                    if response.status in EXPIRED_STATUSES:
+                        raise URLExpiredError(f"HTTP {response.status} for HLS segment: media URL expired")
+                    if response.status != 200:
+                        raise DownloadError(f"HTTP {response.status} for HLS segment {path.name}")
+                    async with aiofiles.open(tmp_path, 'wb') as file:
+                        async for chunk in response.content.iter_chunked(MAX_CHUNK_SIZE):
+                            if self.limiter:
+                                await self.limiter.consume(len(chunk))
+                            await file.write(chunk)
+                os.replace(tmp_path, path)
+                self.stats['fetched'] += 1
+                return
+            except URLExpiredError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError, DownloadError) as e:
+                if attempt == HLS_SEGMENT_ATTEMPTS:
+                    raise DownloadError(f"HLS segment {path.name} failed after {attempt} attempts: {e}")
+                self.stats['retries'] += 1
+                self.logger.warning("HLS segment %s attempt %d failed: %s. Retrying...", path.name, attempt, e)
+                await asyncio.sleep(0.5 * 2 ** attempt)
+
+    def _join(self, count: int, fragmented_mp4: bool) -> Tuple[int, str]:
+        """Join segments into the target file (remuxing MPEG-TS when ffmpeg exists); returns size and SHA-256."""
+        joined = self.segment_dir / 'joined.part'
+        hasher = hashlib.sha256()
+        size = 0
+        with open(joined, 'wb') as out:
+            for index in range(count):
+                with open(self._segment_path(index), 'rb') as segment:
+                    for block in iter(lambda: segment.read(MAX_CHUNK_SIZE), b''):
+                        out.write(block)
+                        hasher.update(block)
+                        size += len(block)
+
+        if not fragmented_mp4 and self.local_path.suffix == '.mp4':
+            remuxed = self._remux(joined)
+            if remuxed:
+                joined = remuxed
+                size = remuxed.stat().st_size
+                hasher = hashlib.sha256()
+                with open(remuxed, 'rb') as f:
+                    for block in iter(lambda: f.read(MAX_CHUNK_SIZE), b''):
+                        hasher.update(block)
+
+        os.replace(joined, self.local_path)
+        return size, hasher.hexdigest()
+
+    def _remux(self, joined: Path) -> Optional[Path]:
+        """Remux joined MPEG-TS into MP4 with ffmpeg; None (keep the TS data) if ffmpeg is missing or fails."""
+        ffmpeg = ffmpeg_path()
+        if not ffmpeg:
+            self.logger.warning(f"ffmpeg not found; {self.local_path.name} is saved as MPEG-TS data")
+            return None
+
+        remuxed = self.segment_dir / 'remuxed.part'
+        try:
+            subprocess.run(
+                [ffmpeg, '-loglevel', 'error', '-y', '-i', str(joined), '-c', 'copy',
+                 '-bsf:a', 'aac_adtstoasc', '-f', 'mp4', str(remuxed)],
+                check=True, capture_output=True
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            self.logger.warning(f"ffmpeg remux failed for {self.local_path.name}, keeping MPEG-TS data: {e}")
+            return None
+
+        self.stats['remuxed'] = True
+        return remuxed
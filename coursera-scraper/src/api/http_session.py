@@ -0,0 +1,108 @@
+"""Shared aiohttp session factory and connection reuse statistics for the downloaders."""
+
+from typing import Dict, Optional
+
+import aiohttp
+
+from .auth import CourseraAuth
+
+# Per-request timeouts; the session itself has none so one session serves both kinds of request
+API_TIMEOUT = aiohttp.ClientTimeout(total=30)
+FILE_TIMEOUT = aiohttp.ClientTimeout(total=30 * 60, sock_connect=30, sock_read=120)
+
+DNS_CACHE_TTL = 300  # seconds
+KEEPALIVE_TIMEOUT = 30  # seconds an idle connection stays in the pool
+
+
+class ConnectionStats:
+    """Counts new vs. reused pooled connections through aiohttp tracing."""
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Build a TraceConfig that feeds these counters."""
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            self.requests += 1
+
+        async def on_connection_create_end(session, context, params):
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self.connections_reused += 1
+
+        async def on_dns_cache_hit(session, context, params):
+            self.dns_cache_hits += 1
+
+        async def on_dns_cache_miss(session, context, params):
+            self.dns_cache_misses += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of connection acquisitions served from the pool."""
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Export counters for run results."""
+        return {
+            'requests': self.requests,
+            'connections_created': self.connections_created,
+            'connections_reused': self.connections_reused,
+            'reuse_ratio': round(self.reuse_ratio, 3),
+            'dns_cache_hits': self.dns_cache_hits,
+            'dns_cache_misses': self.dns_cache_misses
+        }
+
+    def summary(self) -> str:
+        """One-line human readable summary."""
+        return (f"{self.requests} requests over {self.connections_created} new connections, "
+                f"{self.connections_reused} reused ({self.reuse_ratio:.0%}), "
+                f"DNS cache {self.dns_cache_hits} hits / {self.dns_cache_misses} misses")
+
+
+def create_download_session(
+    auth: CourseraAuth,
+    limit: int,
+    limit_per_host: int,
+    stats: Optional[ConnectionStats] = None
+) -> aiohttp.ClientSession:
+    """
+    Create the single session a download run shares across all its tasks.
+
+    Args:
+        auth: Authentication providing default headers and cookies
+        limit: Maximum simultaneous connections overall
+        limit_per_host: Maximum simultaneous connections per host (CDN, API)
+        stats: Optional counters to attach through request tracing
+
+    Returns:
+        A ClientSession with a pooled, DNS-caching TCPConnector
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=auth.get_headers(include_csrf=False),
+        cookies=auth.get_cookies(),
+        timeout=aiohttp.ClientTimeout(total=None),
+        trace_configs=[stats.trace_config()] if stats else None
+    )
@@ -0,0 +1,93 @@
+"""Per-item media URLs parsed from one onDemandLectureVideos.v1 response."""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional
+
+# Relative subtitle proxy URLs in lecture video responses are served from here
+COURSERA_BASE_URL = "https://www.coursera.org"
+
+# Response fields holding subtitle URLs by language, per subtitle format
+SUBTITLE_FIELDS = {'vtt': 'subtitlesVtt', 'txt': 'subtitlesTxt', 'srt': 'subtitles'}
+
+# Source keys holding video URLs, per container format
+VIDEO_URL_KEYS = {'mp4': 'mp4VideoUrl', 'webm': 'webMVideoUrl'}
+
+
+def _absolute(url: str) -> str:
+    return f"{COURSERA_BASE_URL}{url}" if url.startswith('/') else url
+
+
+def _videos_by_resolution(sources: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """{resolution: {format: url}} from a ``sources`` object."""
+    videos = {}
+    for resolution, source in (sources.get('byResolution') or {}).items():
+        urls = {fmt: source[key] for fmt, key in VIDEO_URL_KEYS.items() if source.get(key)}
+        if urls:
+            videos[resolution] = urls
+    return videos
+
+
+@dataclass
+class LectureMedia:
+    """
+    Every media URL for one lecture item: video sources by resolution,
+    subtitles per format and language, and dubbed tracks.
+
+    Built once from an item's lecture video response and kept in the video
+    asset's metadata, so downloads resolve videos and subtitles without
+    asking the API again.
+    """
+    videos: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    subtitles: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    dubbed_videos: Dict[str, Dict[str, Dict[str, str]]] = field(default_factory=dict)
+    dubbed_subtitles: Dict[str, str] = field(default_factory=dict)
+    hls_playlist: Optional[str] = None
+
+    @classmethod
+    def from_response(cls, data: Optional[Dict[str, Any]]) -> Optional['LectureMedia']:
+        """Parse a lecture video response; None if it has no video entry."""
+        videos = (data or {}).get('linked', {}).get('onDemandVideos.v1') or []
+        if not videos:
+            return None
+
+        video = videos[0]
+        sources = video.get('sources') or {}
+        playlists = sources.get('playlists') or {}
+        return cls(
+            videos=_videos_by_resolution(sources),
+            subtitles={
+                fmt: {language: _absolute(url) for language, url in (video.get(key) or {}).items()}
+                for fmt, key in SUBTITLE_FIELDS.items() if video.get(key)
+            },
+            dubbed_videos={
+                language: _videos_by_resolution(dubbed)
+                for language, dubbed in (video.get('dubbedSources') or {}).items()
+            },
+            dubbed_subtitles={
+                language: _absolute(url) for language, url in (video.get('dubbedSubtitlesVtt') or {}).items()
+            },
+            hls_playlist=playlists.get('hls')
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LectureMedia':
+        """Create from the dictionary stored in asset metadata."""
+        known_fields = {f.name for f in cls.__dataclass_fields__.values()}
+        return cls(**{k: v for k, v in data.items() if k in known_fields})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dictionary for asset metadata."""
+        return asdict(self)
+
+    def video_url(self, resolution: str, fmt: str = 'mp4', language: Optional[str] = None) -> Optional[str]:
+        """URL of the video at resolution, or of its dub in language."""
+        videos = self.dubbed_videos.get(language, {}) if language else self.videos
+        return videos.get(resolution, {}).get(fmt)
+
+    def has_video_url(self, url: str) -> bool:
+        """True if url is one of this item's (original language) video sources or its HLS playlist."""
+        return url == self.hls_playlist or any(url in urls.values() for urls in self.videos.values())
+
+    def subtitle_url(self, language: str, fmt: str = 'vtt') -> Optional[str]:
+        """Absolute URL of the subtitles in language and format."""
+        return self.subtitles.get(fmt, {}).get(language)
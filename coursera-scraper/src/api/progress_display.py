@@ -0,0 +1,178 @@
+"""Download progress recorded per transfer and shown on a timer: rich bars or JSON snapshots."""
+
+import asyncio
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, Optional, TextIO
+
+from rich.console import Console
+from rich.progress import (
+    BarColumn, DownloadColumn, Progress, SpinnerColumn, TextColumn, TimeRemainingColumn, TransferSpeedColumn
+)
+
+# Display modes: rich bars on a terminal, JSON lines for job runners, or nothing
+PROGRESS_MODES = ('tty', 'json', 'none')
+
+# Seconds between terminal redraws; transfers only update counters in between
+PROGRESS_REFRESH_INTERVAL = 0.5
+
+# Seconds between JSON snapshots
+JSON_SNAPSHOT_INTERVAL = 2.0
+
+
+class BatchedProgress:
+    """
+    Progress recorder with the rich ``Progress`` task API (add_task, update, advance, remove_task).
+
+    ``update`` only stores numbers, so calling it for every chunk of every
+    stream costs a dict write. The display is refreshed every ``interval``
+    seconds from whatever the counters hold. Tasks added with
+    ``unit='files'`` count files; all others count bytes.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._tasks: Dict[int, Dict[str, Any]] = {}
+        self._next_id = 0
+        self._finished_bytes = 0
+        self._started = time.monotonic()
+        self._timer: Optional[asyncio.Task] = None
+        # Extra fields for snapshots, e.g. the engine's failure counts
+        self.details: Optional[Callable[[], Dict[str, Any]]] = None
+
+    def add_task(self, description: str, total: Optional[float] = None, **fields) -> int:
+        task_id = self._next_id
+        self._next_id += 1
+        self._tasks[task_id] = {'description': description, 'total': total, 'completed': 0,
+                                'unit': fields.get('unit', 'bytes')}
+        return task_id
+
+    def update(self, task_id: int, completed: Optional[float] = None, total: Optional[float] = None,
+               description: Optional[str] = None, **_) -> None:
+        task = self._tasks.get(task_id)
+        if task is None:
+            return
+        if completed is not None:
+            task['completed'] = completed
+        if total is not None:
+            task['total'] = total
+        if description is not None:
+            task['description'] = description
+
+    def advance(self, task_id: int, advance: float = 1) -> None:
+        task = self._tasks.get(task_id)
+        if task is not None:
+            task['completed'] += advance
+
+    def remove_task(self, task_id: int) -> None:
+        task = self._tasks.pop(task_id, None)
+        if task is not None and task['unit'] == 'bytes':
+            self._finished_bytes += task['completed']
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Aggregate counters across all transfers."""
+        files = [task for task in self._tasks.values() if task['unit'] == 'files']
+        transfers = [task for task in self._tasks.values() if task['unit'] == 'bytes']
+        elapsed = time.monotonic() - self._started
+        received = self._finished_bytes + sum(task['completed'] for task in transfers)
+        snapshot = {
+            'elapsed': round(elapsed, 1),
+            'files_done': int(sum(task['completed'] for task in files)),
+            'files_total': int(sum(task['total'] or 0 for task in files)),
+            'active': len(transfers),
+            'bytes': int(received),
+            'bytes_per_sec': int(received / elapsed) if elapsed > 0 else 0
+        }
+        if self.details:
+            snapshot.update(self.details())
+        return snapshot
+
+    def flush(self) -> None:
+        """Show the current counters."""
+
+    async def _refresh(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.flush()
+
+    async def __aenter__(self) -> 'BatchedProgress':
+        self._timer = asyncio.create_task(self._refresh())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._timer.cancel()
+        self.flush()
+
+
+class TerminalProgress(BatchedProgress):
+    """Rich progress bars redrawn every ``PROGRESS_REFRESH_INTERVAL`` seconds instead of on every chunk."""
+
+    def __init__(self, console: Console, interval: float = PROGRESS_REFRESH_INTERVAL):
+        super().__init__(interval)
+        self.progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            DownloadColumn(),
+            TransferSpeedColumn(),
+            TimeRemainingColumn(),
+            console=console,
+            transient=False,
+            auto_refresh=False
+        )
+        self._rich_ids: Dict[int, Any] = {}
+
+    def add_task(self, description: str, total: Optional[float] = None, **fields) -> int:
+        task_id = super().add_task(description, total, **fields)
+        self._rich_ids[task_id] = self.progress.add_task(description, total=total)
+        return task_id
+
+    def remove_task(self, task_id: int) -> None:
+        super().remove_task(task_id)
+        rich_id = self._rich_ids.pop(task_id, None)
+        if rich_id is not None:
+            self.progress.remove_task(rich_id)
+
+    def flush(self) -> None:
+        for task_id, task in self._tasks.items():
+            self.progress.update(self._rich_ids[task_id], completed=task['completed'], total=task['total'],
+                                 description=task['description'])
+        self.progress.refresh()
+
+    async def __aenter__(self) -> 'TerminalProgress':
+        self.progress.start()
+        return await super().__aenter__()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await super().__aexit__(*exc_info)
+        self.progress.stop()
+
+
+class JSONProgress(BatchedProgress):
+    """One JSON object per line with aggregate counters, for job runners instead of a TTY."""
+
+    def __init__(self, stream: Optional[TextIO] = None, interval: float = JSON_SNAPSHOT_INTERVAL):
+        super().__init__(interval)
+        self.stream = stream or sys.stdout
+        self._done = False
+
+    def flush(self) -> None:
+        snapshot = {'event': 'progress', **self.snapshot(), 'done': self._done}
+        self.stream.write(json.dumps(snapshot) + "\n")
+        self.stream.flush()
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._done = True
+        await super().__aexit__(*exc_info)
+
+
+def create_progress(mode: str, console: Console) -> BatchedProgress:
+    """The progress recorder for a display mode."""
+    if mode == 'tty':
+        return TerminalProgress(console)
+    if mode == 'json':
+        return JSONProgress()
+    if mode == 'none':
+        return BatchedProgress(PROGRESS_REFRESH_INTERVAL)
+    raise ValueError(f"progress must be one of {PROGRESS_MODES}, got {mode!r}")
@@ -0,0 +1,129 @@
+"""Disk-backed cache of JSON API responses with per-endpoint TTLs."""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from ..utils.logger import LoggerMixin
+
+# Cache entries live under the output directory
+RESPONSE_CACHE_DIR = ".http_cache"
+
+# Eviction trims the cache to this fraction of its limit so it does not run on every store
+EVICTION_TARGET = 0.9
+
+
+class ResponseCache(LoggerMixin):
+    """
+    Cache decoded JSON responses on disk, keyed by endpoint name and URL parameters.
+
+    Keys use the endpoint's parameters rather than the full URL. Callers that
+    build the same request with different field lists or query order share
+    one entry. Endpoints without a positive TTL are never cached. With
+    ``refresh`` set, reads always miss but fresh responses are still stored.
+    Once the cache outgrows ``max_size_bytes``, the least recently used
+    entries are evicted.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        ttls: Dict[str, int],
+        max_size_bytes: int = 100 * 1024 * 1024,
+        refresh: bool = False
+    ):
+        """Initialize the cache and measure what is already on disk."""
+        self.cache_dir = Path(cache_dir)
+        self.ttls = ttls
+        self.max_size_bytes = max_size_bytes
+        self.refresh = refresh
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self._size = sum(path.stat().st_size for path in self._entries())
+
+    @classmethod
+    def from_api_config_data(
+        cls,
+        cache_dir: Union[str, Path],
+        api_config_data: Dict[str, Any],
+        max_size_mb: int = 100,
+        refresh: bool = False
+    ) -> 'ResponseCache':
+        """Create a cache using the ``cache_ttl`` of each endpoint in api_endpoints.json."""
+        ttls = {name: endpoint.get('cache_ttl', 0) for name, endpoint in api_config_data.get('endpoints', {}).items()}
+        return cls(cache_dir, ttls, max_size_bytes=max_size_mb * 1024 * 1024, refresh=refresh)
+
+    def get(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached response, or None on a miss."""
+        if self.refresh or self.ttls.get(endpoint, 0) <= 0:
+            return None
+
+        path = self._path(endpoint, params)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.stats['misses'] += 1
+            return None
+
+        if time.time() - entry.get('stored_at', 0) > self.ttls[endpoint]:
+            self._remove(path)
+            self.stats['misses'] += 1
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        os.utime(path)
+        self.stats['hits'] += 1
+        self.logger.debug("Response cache hit: %s %s", endpoint, params)
+        return entry['data']
+
+    def put(self, endpoint: str, params: Dict[str, Any], data: Dict[str, Any]) -> None:
+        """Store a successful response if the endpoint is cacheable."""
+        if self.ttls.get(endpoint, 0) <= 0:
+            return
+
+        path = self._path(endpoint, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        previous_size = path.stat().st_size if path.exists() else 0
+
+        temp_path = path.with_name(path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'endpoint': endpoint, 'params': params, 'stored_at': time.time(), 'data': data}, f)
+        os.replace(temp_path, path)
+
+        self._size += path.stat().st_size - previous_size
+        self.stats['stores'] += 1
+        if self._size > self.max_size_bytes:
+            self._evict()
+
+    def summary(self) -> str:
+        """One-line human readable summary."""
+        return (f"{self.stats['hits']} hits, {self.stats['misses']} misses, "
+                f"{self.stats['stores']} stored, {self.stats['evictions']} evicted")
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is below its target size."""
+        entries = sorted(self._entries(), key=lambda path: path.stat().st_mtime)
+        target = self.max_size_bytes * EVICTION_TARGET
+        for path in entries:
+            if self._size <= target:
+                break
+            self._remove(path)
+            self.stats['evictions'] += 1
+
+    def _remove(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        self._size -= size
+
+    def _entries(self):
+        return self.cache_dir.glob('*/*.json') if self.cache_dir.exists() else []
+
+    def _path(self, endpoint: str, params: Dict[str, Any]) -> Path:
+        key = hashlib.sha256(json.dumps([endpoint, params], sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        return self.cache_dir / key[:2] / f"{key}.json"
@@ -0,0 +1,232 @@
+"""Segmented (multi-connection) download of a single large file."""
+
+import asyncio
+from typing import Callable, List, Optional
+
+import aiofiles
+import aiohttp
+
+from .http_session import API_TIMEOUT, FILE_TIMEOUT
+from .url_refresh import EXPIRED_STATUSES, URLExpiredError
+from ..utils.exceptions import DownloadError
+from ..utils.logger import LoggerMixin
+from ..utils.partial_download import PartialDownload, chunk_size_for, parse_content_range
+from ..utils.rate_limiter import ByteRateLimiter
+
+# Files smaller than this are not worth splitting
+DEFAULT_SEGMENT_THRESHOLD = 16 * 1024 * 1024
+
+# Retries per segment; each retry continues from the segment's received bytes
+SEGMENT_ATTEMPTS = 3
+
+
+class ResourceChangedError(DownloadError):
+    """Raised when the server stops honouring ranges for the recorded representation."""
+    pass
+
+
+def plan_segments(total_size: int, count: int) -> List[List[int]]:
+    """Split [0, total_size) into count contiguous [start, end, received] ranges (end inclusive)."""
+    count = max(1, min(count, total_size))
+    base, extra = divmod(total_size, count)
+    segments = []
+    start = 0
+    for index in range(count):
+        length = base + (1 if index < extra else 0)
+        segments.append([start, start + length - 1, 0])
+        start += length
+    return segments
+
+
+async def probe_range_support(session: aiohttp.ClientSession, url: str, partial: PartialDownload) -> Optional[int]:
+    """
+    Ask for the first byte to learn the total size and whether ranges work.
+
+    Returns the total size when the server answers 206 with a known length
+    (validators are recorded on partial), otherwise None.
+    """
+    async with session.get(url, headers=partial.request_headers(0, end=0), timeout=API_TIMEOUT) as response:
+        await response.read()
+        if response.status != 206:
+            return None
+        content_range = parse_content_range(response.headers.get('Content-Range'))
+        if content_range is None or content_range[2] is None:
+            return None
+        partial.etag = response.headers.get('ETag')
+        partial.last_modified = response.headers.get('Last-Modified')
+        return content_range[2]
+
+
+class SegmentedTransfer(LoggerMixin):
+    """
+    Fetch one file as N byte ranges into a preallocated ``.part`` file.
+
+    Every segment writes at its own offset through its own file handle, so
+    segments never contend for a file position. Segment progress is kept in
+    the partial download's sidecar, so an interrupted transfer resumes each
+    range where it stopped.
+
+    The first worker runs on the connection slot its caller already holds;
+    the others take extra slots from ``slots`` when they are free, so the
+    download-wide ``max_concurrent`` stays the connection budget.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        partial: PartialDownload,
+        segment_count: int,
+        slots: Optional[asyncio.Semaphore] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        limiter: Optional[ByteRateLimiter] = None
+    ):
+        """Initialize the transfer for a partial download; ``limiter`` is the run's shared bandwidth cap."""
+        self.session = session
+        self.url = url
+        self.partial = partial
+        self.segment_count = segment_count
+        self.slots = slots
+        self.on_progress = on_progress
+        self.limiter = limiter
+        self._in_flight = 0
+        self._started_workers = set()
+
+    def resume_existing(self, resume: bool) -> bool:
+        """Continue a segmented partial from an earlier run if it matches this URL."""
+        if (resume and self.partial.part_path.exists() and self.partial.load()
+                and self.partial.segments and self.partial.same_resource(self.url)):
+            self.partial.url = self.url
+            return True
+        return False
+
+    def start_new(self, total_size: int) -> None:
+        """Preallocate the part file and record a fresh segment plan."""
+        etag, last_modified = self.partial.etag, self.partial.last_modified
+        self.partial.discard()
+        self.partial.url = self.url
+        self.partial.etag, self.partial.last_modified = etag, last_modified
+        self.partial.expected_length = total_size
+        self.partial.segments = plan_segments(total_size, self.segment_count)
+
+        with open(self.partial.part_path, 'wb') as f:
+            f.truncate(total_size)
+        self.partial.save()
+
+    @property
+    def received(self) -> int:
+        """Bytes confirmed on disk plus bytes written by segments still running."""
+        return sum(segment[2] for segment in self.partial.segments) + self._in_flight
+
+    async def run(self) -> None:
+        """
+        Download all unfinished segments and check that every byte arrived.
+
+        Raises:
+            ResourceChangedError: If the server no longer serves the recorded representation
+            URLExpiredError: If the CDN rejects the URL's signature
+            DownloadError: If a segment still fails after its retries
+        """
+        pending = [segment for segment in self.partial.segments if segment[0] + segment[2] <= segment[1]]
+        queue: asyncio.Queue = asyncio.Queue()
+        for segment in pending:
+            queue.put_nowait(segment)
+
+        extra_workers = [asyncio.create_task(self._extra_worker(queue))
+                         for _ in range(min(self.segment_count, len(pending)) - 1)]
+        try:
+            await self._worker(queue)
+            # Workers still waiting for a slot are not needed any more
+            for task in extra_workers:
+                if task not in self._started_workers:
+                    task.cancel()
+            results = await asyncio.gather(*extra_workers, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception) and not isinstance(result, asyncio.CancelledError):
+                    raise result
+        except BaseException:
+            for task in extra_workers:
+                task.cancel()
+            await asyncio.gather(*extra_workers, return_exceptions=True)
+            raise
+        finally:
+            self.partial.save()
+
+        missing = [segment for segment in self.partial.segments if segment[0] + segment[2] != segment[1] + 1]
+        if missing:
+            raise DownloadError(f"{len(missing)} segments incomplete for {self.partial.local_path.name}")
+
+    async def _extra_worker(self, queue: asyncio.Queue) -> None:
+        """Worker that needs its own connection slot before it starts."""
+        task = asyncio.current_task()
+        if self.slots is None:
+            self._started_workers.add(task)
+            await self._worker(queue)
+            return
+
+        async with self.slots:
+            self._started_workers.add(task)
+            await self._worker(queue)
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        """Take segments off the queue until it is empty."""
+        while not queue.empty():
+            segment = queue.get_nowait()
+            await self._fetch_segment(segment)
+
+    async def _fetch_segment(self, segment: List[int]) -> None:
+        """Fetch one segment with retries, continuing from its received bytes."""
+        start, end = segment[0], segment[1]
+
+        for attempt in range(1, SEGMENT_ATTEMPTS + 1):
+            position = start + segment[2]
+            if position > end:
+                return
+
+            written = 0
+            try:
+                async with self.session.get(
+                    self.url,
+                    headers=self.partial.request_headers(position, end=end),
+                    timeout=FILE_TIMEOUT
+                ) as response:
+                    if response.status in EXPIRED_STATUSES:
+                        raise URLExpiredError(f"HTTP {response.status} for bytes {position}-{end}: media URL expired")
+                    if response.status == 200:
+                        raise ResourceChangedError(f"Server sent the whole file for a range request: {self.url}")
+                    if response.status != 206:
+                        raise DownloadError(f"HTTP {response.status} for bytes {position}-{end}")
+
+                    content_range = parse_content_range(response.headers.get('Content-Range'))
+                    if (content_range is None or content_range[0] != position or content_range[1] != end
+                            or content_range[2] != self.partial.expected_length):
+                        raise ResourceChangedError(
+                            f"Unexpected Content-Range {response.headers.get('Content-Range')!r} for bytes {position}-{end}"
+                        )
+
+                    async with aiofiles.open(self.partial.part_path, 'r+b') as file:
+                        await file.seek(position)
+                        async for chunk in response.content.iter_chunked(chunk_size_for(end - start + 1)):
+                            if self.limiter:
+                                await self.limiter.consume(len(chunk))
+                            await file.write(chunk)
+                            written += len(chunk)
+                            self._in_flight += len(chunk)
+                            if self.on_progress:
+                                self.on_progress(self.received, self.partial.expected_length)
+
+            except (ResourceChangedError, URLExpiredError):
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError, DownloadError) as e:
+                if attempt == SEGMENT_ATTEMPTS:
+                    raise DownloadError(f"Segment {start}-{end} failed after {attempt} attempts: {e}")
+                self.logger.warning("Segment %d-%d attempt %d failed: %s. Retrying from byte %d...", start, end, attempt, e, start + segment[2] + written)
+            finally:
+                # Only bytes from a closed (flushed) handle are recorded in the sidecar
+                self._in_flight -= written
+                segment[2] += written
+                self.partial.save()
+
+            if start + segment[2] > end:
+                return
+            await asyncio.sleep(2 ** attempt)
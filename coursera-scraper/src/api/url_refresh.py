@@ -0,0 +1,120 @@
+"""Detect expired signed media URLs and re-resolve them from the lecture video API."""
+
+import asyncio
+import re
+import time
+from calendar import timegm
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .lecture_media import LectureMedia
+from ..utils.exceptions import DownloadError
+from ..utils.logger import LoggerMixin
+
+# Statuses CDNs answer with once a signed URL has expired or been revoked
+EXPIRED_STATUSES = (403, 410)
+
+# Refresh URLs that expire within this many seconds, so a long transfer does not outlive its signature
+EXPIRY_MARGIN = 300
+
+# Items re-resolved together; URLs scraped in one run expire together, so the next queued items ride along
+REFRESH_BATCH_SIZE = 16
+
+# Concurrent lecture video lookups within one batch
+REFRESH_CONCURRENCY = 4
+
+# Akamai-style tokens carry the expiry inside one parameter: exp=...~acl=...~hmac=...
+_TOKEN_EXPIRY = re.compile(r'(?:^|~)exp=(\d+)')
+
+
+class URLExpiredError(DownloadError):
+    """Raised when the CDN rejects a media URL whose signature has expired."""
+    pass
+
+
+def url_expiry(url: str) -> Optional[float]:
+    """
+    Unix time at which a signed URL stops working, or None if it carries no expiry.
+
+    Understands CloudFront (``Expires``), S3 presigned (``X-Amz-Date`` plus
+    ``X-Amz-Expires``) and Akamai token (``hdnts``/``__token__``) signatures.
+    """
+    query = {key.lower(): values[0] for key, values in parse_qs(urlsplit(url).query).items()}
+
+    try:
+        if 'expires' in query:
+            return float(query['expires'])
+        if 'x-amz-date' in query and 'x-amz-expires' in query:
+            signed_at = timegm(time.strptime(query['x-amz-date'], '%Y%m%dT%H%M%SZ'))
+            return float(signed_at + int(query['x-amz-expires']))
+    except ValueError:
+        return None
+
+    for key in ('hdnts', '__token__'):
+        match = _TOKEN_EXPIRY.search(query.get(key, ''))
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def is_expired(url: Optional[str], margin: float = EXPIRY_MARGIN) -> bool:
+    """True if url's signature has expired or will within margin seconds."""
+    expiry = url_expiry(url) if url else None
+    return expiry is not None and expiry - margin <= time.time()
+
+
+class MediaURLRefresher(LoggerMixin):
+    """
+    Re-resolve video URLs through onDemandLectureVideos.v1 when they expire.
+
+    ``fetch(course_id, item_id, stale_url)`` must return the item's media from
+    a lecture video response that no longer holds stale_url, i.e. not the
+    cached one; it is also where lookups for the same item are shared. A batch
+    is resolved with bounded concurrency. Create one per event loop (download run).
+    """
+
+    def __init__(self, fetch: Callable[[str, str, str], Awaitable[Optional[LectureMedia]]], concurrency: int = REFRESH_CONCURRENCY):
+        self._fetch = fetch
+        self._concurrency = concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.stats = {'lookups': 0, 'refreshed': 0, 'failed': 0}
+
+    @staticmethod
+    def can_refresh(media: Dict) -> bool:
+        """True if media has the item, course and resolution needed to look its URL up again."""
+        return bool(media.get('course_id') and media.get('item_id') and media.get('resolution'))
+
+    async def refresh_batch(self, media_files: List[Dict]) -> List[Tuple[Dict, str]]:
+        """
+        Resolve fresh URLs for media_files together, updating ``media['url']`` in place.
+
+        Returns (media, old_url) for every entry whose URL changed.
+        """
+        targets = [media for media in media_files if self.can_refresh(media)]
+        urls = await asyncio.gather(*(self._lookup(media) for media in targets))
+
+        changed = []
+        for media, url in zip(targets, urls):
+            media['url_refreshed'] = True
+            if url and url != media.get('url'):
+                changed.append((media, media.get('url')))
+                media['url'] = url
+                self.stats['refreshed'] += 1
+            elif not url:
+                self.stats['failed'] += 1
+        return changed
+
+    async def _lookup(self, media: Dict) -> Optional[str]:
+        """Fetch one item's lecture media and pick the video URL for its resolution."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+
+        async with self._semaphore:
+            self.stats['lookups'] += 1
+            try:
+                lecture_media = await self._fetch(media['course_id'], media['item_id'], media.get('url'))
+            except Exception as e:
+                self.logger.warning("Failed to refresh video URL for %s~%s: %s", media['course_id'], media['item_id'], e)
+                return None
+
+        return lecture_media.video_url(media['resolution']) if lecture_media else None
@@ -0,0 +1 @@
+"""Local Coursera stand-in and benchmarks for the scrape and download engines."""
@@ -0,0 +1,247 @@
+"""Local aiohttp stand-in for the Coursera course materials, lecture video, subtitle and MP4 endpoints."""
+
+import asyncio
+import multiprocessing
+import random
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+# Bytes written per media response chunk; bandwidth shaping sleeps between chunks
+MEDIA_CHUNK_SIZE = 64 * 1024
+
+# Seconds to wait for the server to report its port
+STARTUP_TIMEOUT = 10
+
+# Cue text of every subtitle; long enough to count as a complete file
+SUBTITLE_TEXT = (
+    "WEBVTT\n\n"
+    "00:00.000 --> 00:05.000\nLocal benchmark subtitle for {item_id}.\n\n"
+    "00:05.000 --> 00:10.000\nServed by the fake Coursera server, not the real CDN.\n"
+)
+
+
+@dataclass
+class FakeCourseSpec:
+    """Shape of the generated course."""
+    modules: int = 2
+    lessons_per_module: int = 4
+    videos_per_lesson: int = 2
+    video_size: int = 4 * 1024 * 1024
+    course_id: str = "benchcourse"
+    course_slug: str = "benchmark-course"
+
+    @property
+    def video_count(self) -> int:
+        return self.modules * self.lessons_per_module * self.videos_per_lesson
+
+
+@dataclass
+class NetworkProfile:
+    """How the stand-in behaves on the wire."""
+    latency: float = 0.0               # Seconds before every response starts
+    bandwidth: Optional[int] = None    # Bytes per second per media response; None for unlimited
+    error_rate: float = 0.0            # Fraction of requests answered with 503
+    ranges: bool = True                # Answer Range requests with 206
+    seed: int = 0                      # Seed for error injection, so runs are repeatable
+
+
+class FakeCourseraServer:
+    """
+    Serves one generated course the way Coursera's API and CDN do.
+
+    ``/api/onDemandCourseMaterials.v2/`` returns the modules, lessons and
+    lecture items; ``/api/onDemandLectureVideos.v1/{course}~{item}`` returns
+    a 720p MP4 and an English VTT subtitle URL on this server. Every video has
+    the same deterministic body. Counters are kept in ``stats`` and served as
+    JSON from ``/_stats``, which is how a benchmark reads them from a server
+    running in another process.
+    """
+
+    def __init__(self, spec: FakeCourseSpec, profile: Optional[NetworkProfile] = None):
+        self.spec = spec
+        self.profile = profile or NetworkProfile()
+        self.video = bytes(range(256)) * (spec.video_size // 256) + bytes(spec.video_size % 256)
+        self.etag = f'"bench-{spec.video_size}"'
+        self.base_url: Optional[str] = None
+        self.stats = {'requests': 0, 'api_requests': 0, 'media_requests': 0, 'range_requests': 0,
+                      'errors_injected': 0, 'bytes_served': 0}
+        self._random = random.Random(self.profile.seed)
+        self._ready = threading.Event()
+
+    def item_ids(self) -> List[List[List[str]]]:
+        """Item ids per module and lesson; fixed width, because the scraper matches them by substring."""
+        ids, index = [], 0
+        for _ in range(self.spec.modules):
+            lessons = []
+            for _ in range(self.spec.lessons_per_module):
+                lessons.append([f"it{index + video:06d}" for video in range(self.spec.videos_per_lesson)])
+                index += self.spec.videos_per_lesson
+            ids.append(lessons)
+        return ids
+
+    def course_materials(self) -> Dict[str, Any]:
+        """The onDemandCourseMaterials.v2 response for the course."""
+        modules, lessons, items = [], [], []
+        for m, module_items in enumerate(self.item_ids(), start=1):
+            module_id = f"mod{m}"
+            lesson_ids = []
+            for l, lesson_items in enumerate(module_items, start=1):
+                lesson_id = f"{module_id}les{l}"
+                lesson_ids.append(lesson_id)
+                lessons.append({'id': lesson_id, 'name': f"Lesson {m}.{l}", 'slug': f"lesson-{m}-{l}",
+                                'moduleId': module_id, 'itemIds': lesson_items, 'elementIds': []})
+                for v, item_id in enumerate(lesson_items, start=1):
+                    items.append({
+                        'id': item_id, 'name': f"Lecture {m}.{l}.{v}", 'slug': f"lecture-{item_id}",
+                        'timeCommitment': 300000, 'lessonId': lesson_id, 'moduleId': module_id,
+                        'contentSummary': {'typeName': 'lecture', 'definition': {'duration': 300000}}
+                    })
+            modules.append({'id': module_id, 'name': f"Benchmark Module {m}", 'slug': f"module-{m}",
+                            'lessonIds': lesson_ids})
+
+        return {
+            'elements': [{'id': self.spec.course_id, 'moduleIds': [module['id'] for module in modules]}],
+            'linked': {
+                'onDemandCourseMaterialModules.v1': modules,
+                'onDemandCourseMaterialLessons.v1': lessons,
+                'onDemandCourseMaterialItems.v2': items
+            }
+        }
+
+    def lecture_video(self, item_id: str) -> Dict[str, Any]:
+        """The onDemandLectureVideos.v1 response for an item."""
+        return {
+            'elements': [{'id': f"{self.spec.course_id}~{item_id}", 'courseId': self.spec.course_id, 'itemId': item_id}],
+            'linked': {'onDemandVideos.v1': [{
+                'sources': {'byResolution': {'720p': {'mp4VideoUrl': f"{self.base_url}/media/{item_id}.mp4"}}},
+                'subtitlesVtt': {'en': f"{self.base_url}/subtitles/{item_id}.en.vtt"}
+            }]}
+        }
+
+    async def _begin(self, request: web.Request, api: bool) -> Optional[web.Response]:
+        """Count the request, wait out the latency, and maybe answer it with an injected error."""
+        self.stats['requests'] += 1
+        self.stats['api_requests' if api else 'media_requests'] += 1
+        if self.profile.latency:
+            await asyncio.sleep(self.profile.latency)
+        if self.profile.error_rate and self._random.random() < self.profile.error_rate:
+            self.stats['errors_injected'] += 1
+            return web.Response(status=503, text="injected error")
+        return None
+
+    async def _materials(self, request: web.Request) -> web.StreamResponse:
+        return await self._begin(request, api=True) or web.json_response(self.course_materials())
+
+    async def _lecture(self, request: web.Request) -> web.StreamResponse:
+        course_id, _, item_id = request.match_info['ids'].partition('~')
+        error = await self._begin(request, api=True)
+        if error:
+            return error
+        if course_id != self.spec.course_id:
+            return web.json_response({'errorCode': 'Not Found'}, status=404)
+        return web.json_response(self.lecture_video(item_id))
+
+    async def _subtitle(self, request: web.Request) -> web.StreamResponse:
+        error = await self._begin(request, api=False)
+        if error:
+            return error
+        text = SUBTITLE_TEXT.format(item_id=request.match_info['name'])
+        self.stats['bytes_served'] += len(text)
+        return web.Response(text=text, content_type='text/vtt')
+
+    async def _media(self, request: web.Request) -> web.StreamResponse:
+        error = await self._begin(request, api=False)
+        if error:
+            return error
+
+        size = len(self.video)
+        start, end, status = 0, size - 1, 200
+        range_header = request.headers.get('Range')
+        if_range = request.headers.get('If-Range')
+        if self.profile.ranges and range_header and (not if_range or if_range == self.etag):
+            self.stats['range_requests'] += 1
+            first, _, last = range_header.split('=', 1)[1].partition('-')
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            if start >= size:
+                return web.Response(status=416, headers={'Content-Range': f'bytes */{size}'})
+            status = 206
+
+        headers = {'ETag': self.etag, 'Accept-Ranges': 'bytes' if self.profile.ranges else 'none',
+                   'Content-Type': 'video/mp4'}
+        if status == 206:
+            headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response = web.StreamResponse(status=status, headers=headers)
+        response.content_length = end + 1 - start
+        await response.prepare(request)
+
+        body = memoryview(self.video)[start:end + 1]
+        for offset in range(0, len(body), MEDIA_CHUNK_SIZE):
+            chunk = body[offset:offset + MEDIA_CHUNK_SIZE]
+            await response.write(chunk)
+            self.stats['bytes_served'] += len(chunk)
+            if self.profile.bandwidth:
+                await asyncio.sleep(len(chunk) / self.profile.bandwidth)
+        await response.write_eof()
+        return response
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats)
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/api/onDemandCourseMaterials.v2/', self._materials)
+        app.router.add_get('/api/onDemandLectureVideos.v1/{ids}', self._lecture)
+        app.router.add_get('/subtitles/{name}', self._subtitle)
+        app.router.add_get('/media/{name}', self._media)
+        app.router.add_get('/_stats', self._stats)
+        return app
+
+    def run(self, on_ready=None) -> None:
+        """Serve on a free local port until the process or thread ends."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        runner = web.AppRunner(self.app())
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        loop.run_until_complete(site.start())
+        self.base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        self._ready.set()
+        if on_ready:
+            on_ready(self.base_url)
+        loop.run_forever()
+
+    def start(self) -> str:
+        """Serve from a daemon thread of this process and return the base URL."""
+        threading.Thread(target=self.run, daemon=True).start()
+        if not self._ready.wait(STARTUP_TIMEOUT):
+            raise RuntimeError("Fake Coursera server did not start")
+        return self.base_url
+
+
+def _serve(spec: FakeCourseSpec, profile: NetworkProfile, urls: multiprocessing.Queue) -> None:
+    FakeCourseraServer(spec, profile).run(on_ready=urls.put)
+
+
+def start_server_process(spec: FakeCourseSpec, profile: NetworkProfile) -> Tuple[multiprocessing.Process, str]:
+    """
+    Serve from a separate process, so its CPU time and memory stay out of a benchmark's numbers.
+
+    Returns the process (terminate it when done) and the base URL.
+    """
+    urls = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(spec, profile, urls), daemon=True)
+    process.start()
+    try:
+        return process, urls.get(timeout=STARTUP_TIMEOUT)
+    except Exception:
+        process.terminate()
+        raise RuntimeError("Fake Coursera server did not start")
+
+
+def describe(spec: FakeCourseSpec, profile: NetworkProfile) -> Dict[str, Any]:
+    """Settings of a benchmark run, for reports."""
+    return {**asdict(spec), **asdict(profile)}
@@ -0,0 +1,202 @@
+"""Run the scrape or download engine against the local Coursera stand-in and measure it."""
+
+import contextlib
+import json
+import os
+import multiprocessing
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..api.auth import CourseraAuth
+from ..api.coursera_client import CourseraClient
+from ..api.enhanced_downloader import EnhancedVideoDownloader
+from ..api.lecture_media import LectureMedia
+from ..config.settings import ConfigManager
+from ..core.course_models import ContentAsset, Course, Lesson, Module
+from ..core.file_manager import FileManager
+from .fake_coursera import FakeCourseraServer, FakeCourseSpec, NetworkProfile, describe, start_server_process
+
+try:
+    import resource
+except ImportError:  # Windows has no getrusage; peak RSS is then not reported
+    resource = None
+
+ENGINES = ('scrape', 'download')
+
+# Engines run in a fresh interpreter, so CPU time and peak RSS are theirs alone
+MP_CONTEXT = multiprocessing.get_context('spawn')
+
+
+@dataclass
+class BenchResult:
+    """Throughput and resource use of one engine run."""
+    engine: str
+    files: int
+    bytes: int
+    failed: int
+    seconds: float
+    cpu_seconds: float
+    peak_rss: Optional[int]
+    server: Dict[str, Any] = field(default_factory=dict)
+    settings: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def files_per_sec(self) -> float:
+        return self.files / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_sec(self) -> float:
+        return self.bytes / 1024 / 1024 / self.seconds if self.seconds else 0.0
+
+    @property
+    def cpu_percent(self) -> float:
+        return 100 * self.cpu_seconds / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), 'files_per_sec': round(self.files_per_sec, 2),
+                'mb_per_sec': round(self.mb_per_sec, 2), 'cpu_percent': round(self.cpu_percent, 1)}
+
+
+def _peak_rss() -> Optional[int]:
+    """Largest resident set of this process so far, in bytes."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if peak > 1 << 32 or sys.platform == 'darwin' else peak * 1024
+
+
+def _auth() -> CourseraAuth:
+    return CourseraAuth(cauth_cookie="b" * 32, csrf_token="b" * 16)
+
+
+def _run_download(base_url: str, spec: FakeCourseSpec, output_dir: Path, options: Dict[str, Any]) -> Dict[str, int]:
+    """Lay out a scraped course pointing at the stand-in, then time EnhancedVideoDownloader on it."""
+    server = FakeCourseraServer(spec)
+    server.base_url = base_url
+    course = Course(id=spec.course_id, name="Benchmark Course", slug=spec.course_slug)
+    for m, module_items in enumerate(server.item_ids(), start=1):
+        module = Module(id=f"mod{m}", name=f"Benchmark Module {m}", order=m)
+        for l, lesson_items in enumerate(module_items, start=1):
+            lesson = Lesson(id=f"mod{m}les{l}", name=f"Lesson {m}.{l}", order=l)
+            for v, item_id in enumerate(lesson_items, start=1):
+                lecture_media = LectureMedia.from_response(server.lecture_video(item_id))
+                lesson.assets.append(ContentAsset(
+                    name=f"Lecture {m}.{l}.{v}_720p.mp4", url=lecture_media.video_url('720p'), file_type="video",
+                    metadata={'item_id': item_id, 'course_id': spec.course_id, 'resolution': '720p',
+                              'lecture_media': lecture_media.to_dict()}
+                ))
+            module.lessons.append(lesson)
+        course.modules.append(module)
+    file_manager = FileManager(output_dir)
+    file_manager.create_full_structure(course)
+
+    downloader = EnhancedVideoDownloader(
+        auth=_auth(), file_manager=file_manager, max_concurrent=options['max_concurrent'],
+        segments=options['segments'], segment_threshold=options['segment_threshold'], progress='none'
+    )
+    downloader.api_base_url = base_url
+
+    started = time.perf_counter(), time.process_time()
+    downloader.download_course_videos_and_subtitles(course.local_path, '720p')
+    seconds, cpu_seconds = time.perf_counter() - started[0], time.process_time() - started[1]
+
+    kinds = ('videos', 'subtitles')
+    return {
+        'files': sum(downloader.stats[kind]['downloaded'] for kind in kinds),
+        'failed': sum(downloader.stats[kind]['failed'] for kind in kinds),
+        'bytes': downloader.stats['total_size'],
+        'seconds': seconds,
+        'cpu_seconds': cpu_seconds
+    }
+
+
+def _run_scrape(base_url: str, spec: FakeCourseSpec, output_dir: Path, options: Dict[str, Any]) -> Dict[str, int]:
+    """Time CourseScraper.scrape_course against the stand-in: materials, lecture lookups and downloads."""
+    from ..core.scraper import CourseScraper
+
+    config = ConfigManager(options['config_dir'])
+    config.app_settings.default_output_dir = str(output_dir)
+    config.download_settings.download_files = True
+    config.download_settings.concurrent_downloads = options['max_concurrent']
+    client = CourseraClient.from_config_file(
+        config.config_dir / "api_endpoints.json",
+        _auth(),
+        timeout=config.app_settings.request_timeout,
+        max_retries=config.app_settings.retry_attempts,
+        backoff_factor=config.app_settings.retry_backoff_factor,
+        rate_limit_delay=1.0 / config.app_settings.requests_per_second,
+        rate_limit_burst=config.app_settings.request_burst
+    )
+    client.api_config.base_url = base_url
+    scraper = CourseScraper(client=client, file_manager=FileManager(output_dir), config=config)
+
+    started = time.perf_counter(), time.process_time()
+    course = scraper.scrape_course(spec.course_slug)
+    seconds, cpu_seconds = time.perf_counter() - started[0], time.process_time() - started[1]
+
+    assets = [asset for module in (course.modules if course else []) for lesson in module.lessons for asset in lesson.assets]
+    return {
+        'files': sum(1 for asset in assets if asset.downloaded),
+        'failed': len(scraper.current_progress.failed_downloads) if scraper.current_progress else 0,
+        'bytes': sum(asset.file_size or 0 for asset in assets if asset.downloaded),
+        'seconds': seconds,
+        'cpu_seconds': cpu_seconds
+    }
+
+
+def _measure(engine: str, base_url: str, spec: FakeCourseSpec, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one engine in this (fresh) process and return its counters, time and peak RSS."""
+    run = _run_scrape if engine == 'scrape' else _run_download
+    # The engines' console output would interleave with the benchmark's own report
+    with tempfile.TemporaryDirectory(prefix="coursera-bench-") as tmp, \
+            open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        result = run(base_url, spec, Path(tmp), options)
+    result['peak_rss'] = _peak_rss()
+    return result
+
+
+def _server_stats(base_url: str) -> Dict[str, Any]:
+    with urllib.request.urlopen(f"{base_url}/_stats", timeout=10) as response:
+        return json.loads(response.read())
+
+
+def run_benchmark(
+    engine: str,
+    spec: FakeCourseSpec,
+    profile: NetworkProfile,
+    max_concurrent: int = 3,
+    segments: int = 1,
+    segment_threshold: int = 16 * 1024 * 1024,
+    config_dir: str = "config"
+) -> BenchResult:
+    """
+    Benchmark one engine against a fresh stand-in server.
+
+    The server and the engine each run in their own process, so the reported
+    CPU time and peak RSS belong to the engine. Time covers the engine call
+    only, not laying out the course or starting processes.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+
+    options = {'max_concurrent': max_concurrent, 'segments': segments, 'segment_threshold': segment_threshold,
+               'config_dir': str(Path(config_dir).resolve())}
+    server, base_url = start_server_process(spec, profile)
+    try:
+        with ProcessPoolExecutor(max_workers=1, mp_context=MP_CONTEXT) as pool:
+            measured = pool.submit(_measure, engine, base_url, spec, options).result()
+        server_stats = _server_stats(base_url)
+    finally:
+        server.terminate()
+        server.join()
+
+    return BenchResult(engine=engine, server=server_stats,
+                       settings={**describe(spec, profile), 'max_concurrent': max_concurrent, 'segments': segments},
+                       **measured)
@@ -8,6 +8,7 @@ from dataclasses import dataclass, field
 
 from ..utils.exceptions import ConfigurationError
 from ..utils.logger import LoggerMixin
+from ..utils.rate_limiter import parse_rate
 
 
 @dataclass
@@ -22,6 +23,9 @@ class AppSettings:
     request_timeout: int = 30
     retry_attempts: int = 3
     retry_backoff_factor: float = 2.0
+    requests_per_second: float = 1.0  # Token bucket refill rate shared by all API requests
+    request_burst: int = 2  # Requests that may go out back to back before the rate applies
+    response_cache_max_mb: int = 100  # Disk budget for cached API responses (TTLs are per endpoint)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'AppSettings':
@@ -41,6 +45,7 @@ class DownloadSettings:
     create_metadata: bool = True
     save_urls: bool = True
     concurrent_downloads: int = 3
+    max_download_rate: str = ""  # Bytes/sec shared by all downloads, e.g. "5M"; empty for no limit
     skip_existing: bool = True
     create_progress_file: bool = True
 
@@ -165,6 +170,7 @@ class ConfigManager(LoggerMixin):
             'MAX_CONCURRENT_REQUESTS': 'max_concurrent_requests',
             'REQUEST_TIMEOUT': 'request_timeout',
             'RETRY_ATTEMPTS': 'retry_attempts',
+            'REQUESTS_PER_SECOND': 'requests_per_second',
         }
 
         for env_var, setting_name in env_overrides.items():
@@ -174,6 +180,8 @@ class ConfigManager(LoggerMixin):
                     # Convert to appropriate type
                     if setting_name in ['max_concurrent_requests', 'request_timeout', 'retry_attempts']:
                         value = int(env_value)
+                    elif setting_name == 'requests_per_second':
+                        value = float(env_value)
                     else:
                         value = env_value
 
@@ -198,6 +206,15 @@ class ConfigManager(LoggerMixin):
             if self.app_settings.retry_attempts < 0:
                 issues.append("retry_attempts must be >= 0")
 
+            if self.app_settings.requests_per_second <= 0:
+                issues.append("requests_per_second must be > 0")
+
+            if self.app_settings.request_burst < 1:
+                issues.append("request_burst must be >= 1")
+
+            if self.app_settings.response_cache_max_mb < 1:
+                issues.append("response_cache_max_mb must be >= 1")
+
             if self.app_settings.max_filename_length < 10:
                 issues.append("max_filename_length must be >= 10")
 
@@ -209,6 +226,11 @@ class ConfigManager(LoggerMixin):
             if self.download_settings.max_file_size_mb < 1:
                 issues.append("max_file_size_mb must be >= 1")
 
+            try:
+                parse_rate(self.download_settings.max_download_rate)
+            except ValueError as e:
+                issues.append(f"max_download_rate: {e}")
+
         # Validate API config
         if self._api_config_data:
             required_keys = ['base_url', 'endpoints']
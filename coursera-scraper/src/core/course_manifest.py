@@ -0,0 +1,408 @@
+"""SQLite manifest of a course's lessons, assets and downloaded files."""
+
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..utils.logger import LoggerMixin, get_logger
+from .course_models import Course
+
+# One file in the course directory, next to course_metadata.json
+MANIFEST_FILENAME = ".course_manifest.db"
+
+# Status of a row in the files table
+FILE_PENDING = 'pending'
+FILE_COMPLETE = 'complete'
+FILE_FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lessons (
+    lesson_id TEXT PRIMARY KEY,
+    module_order INTEGER NOT NULL,
+    lesson_order INTEGER NOT NULL,
+    module_path TEXT NOT NULL,
+    path TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lessons_by_order ON lessons (module_order, lesson_order);
+
+CREATE TABLE IF NOT EXISTS assets (
+    lesson_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    file_type TEXT NOT NULL,
+    url TEXT,
+    local_path TEXT,
+    file_size INTEGER,
+    downloaded INTEGER NOT NULL DEFAULT 0,
+    metadata TEXT NOT NULL,
+    PRIMARY KEY (lesson_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    media_type TEXT NOT NULL,
+    lesson_id TEXT,
+    status TEXT NOT NULL,
+    size INTEGER,
+    content_length INTEGER,
+    sha256 TEXT,
+    verified_at REAL,
+    updated_at REAL NOT NULL,
+    worker TEXT,
+    lease_expires REAL
+);
+CREATE INDEX IF NOT EXISTS files_by_status ON files (status, media_type);
+"""
+
+# Columns added to the files table after the first manifest version
+FILE_COLUMN_MIGRATIONS = {
+    'content_length': 'INTEGER',
+    'sha256': 'TEXT',
+    'verified_at': 'REAL',
+    'worker': 'TEXT',
+    'lease_expires': 'REAL'
+}
+
+
+class CourseManifest(LoggerMixin):
+    """
+    Index of everything known about a scraped course, in one SQLite file.
+
+    ``lessons`` and ``assets`` mirror the lesson metadata written by
+    FileManager.create_full_structure, including asset URLs, in course order.
+    ``files`` holds one row per target file with its media type, status, size,
+    the server's content length and a SHA-256 computed while writing, updated
+    by the downloaders as files finish. Discovery, resume and
+    the status command read these tables instead of walking the course tree.
+    Paths are stored relative to the course directory.
+
+    Several download workers, in separate processes or on hosts sharing the
+    course directory, can split the pending files: each claims a file with a
+    lease (``worker``, ``lease_expires``) before fetching it and renews its
+    leases while running. Files of a worker that stops renewing become
+    claimable again once the lease expires.
+    """
+
+    def __init__(self, course_path: Union[str, Path]):
+        """Open (creating if needed) the manifest of the course at course_path."""
+        self.course_path = Path(course_path)
+        self.path = self.course_path / MANIFEST_FILENAME
+        self.course_path.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        # Rows are small and rewritable from the course tree, so skip the per-commit fsync
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    @staticmethod
+    def exists(course_path: Union[str, Path]) -> bool:
+        """Check whether a course directory has a manifest."""
+        return (Path(course_path) / MANIFEST_FILENAME).exists()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> 'CourseManifest':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def write_structure(self, course: Course) -> None:
+        """Replace the lesson and asset index with the course's current structure."""
+        lesson_rows = []
+        asset_rows = []
+        file_rows = []
+        now = time.time()
+
+        for module in course.modules:
+            for lesson in module.lessons:
+                if not lesson.local_path:
+                    continue
+                lesson_rows.append((
+                    lesson.id,
+                    module.order,
+                    lesson.order,
+                    self._relative(module.local_path or lesson.local_path.parent),
+                    self._relative(lesson.local_path),
+                    json.dumps({
+                        "id": lesson.id,
+                        "name": lesson.name,
+                        "description": lesson.description,
+                        "order": lesson.order,
+                        "duration_minutes": lesson.duration_minutes,
+                        "total_assets": len(lesson.assets),
+                        "metadata": lesson.metadata
+                    }, ensure_ascii=False, default=str)
+                ))
+
+                for position, asset in enumerate(lesson.assets):
+                    local_path = self._relative(asset.local_path) if asset.local_path else None
+                    asset_rows.append((
+                        lesson.id, position, asset.name, asset.file_type, asset.url, local_path,
+                        asset.file_size, int(asset.downloaded),
+                        json.dumps(asset.metadata, ensure_ascii=False, default=str)
+                    ))
+                    if asset.downloaded and local_path:
+                        file_rows.append((local_path, asset.file_type, lesson.id, FILE_COMPLETE, asset.file_size, now))
+
+        with self._conn:
+            self._conn.execute("DELETE FROM lessons")
+            self._conn.execute("DELETE FROM assets")
+            self._conn.executemany("INSERT OR REPLACE INTO lessons VALUES (?, ?, ?, ?, ?, ?)", lesson_rows)
+            self._conn.executemany("INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", asset_rows)
+            # Files the downloader already recorded keep their size and hash
+            self._conn.executemany("""
+                INSERT OR IGNORE INTO files (path, media_type, lesson_id, status, size, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, file_rows)
+
+        self.logger.debug(f"Wrote manifest: {len(lesson_rows)} lessons, {len(asset_rows)} assets")
+
+    def lessons(self) -> List[Dict[str, Any]]:
+        """
+        Return every lesson in module/lesson order, shaped like lesson_metadata.json.
+
+        Each dict also has ``path`` (the lesson directory) and its ``assets``
+        include ``url`` when one was scraped. Empty if no structure was written.
+        """
+        assets_by_lesson: Dict[str, List[Dict[str, Any]]] = {}
+        for row in self._conn.execute("SELECT * FROM assets ORDER BY lesson_id, position"):
+            asset = {
+                "name": row["name"],
+                "file_type": row["file_type"],
+                "file_size": row["file_size"],
+                "downloaded": bool(row["downloaded"]),
+                "local_path": str(self.course_path / row["local_path"]) if row["local_path"] else None,
+                "metadata": json.loads(row["metadata"])
+            }
+            if row["url"]:
+                asset["url"] = row["url"]
+            assets_by_lesson.setdefault(row["lesson_id"], []).append(asset)
+
+        lessons = []
+        for row in self._conn.execute("SELECT * FROM lessons ORDER BY module_order, lesson_order"):
+            lesson = json.loads(row["data"])
+            lesson["path"] = self.course_path / row["path"]
+            lesson["assets"] = assets_by_lesson.get(row["lesson_id"], [])
+            lessons.append(lesson)
+        return lessons
+
+    def completed_files(self) -> Dict[Path, int]:
+        """Map each completed file's absolute path to its recorded size."""
+        return {
+            self.course_path / row["path"]: row["size"] or 0
+            for row in self._conn.execute("SELECT path, size FROM files WHERE status = ?", (FILE_COMPLETE,))
+        }
+
+    def files_to_verify(self) -> List[Dict[str, Any]]:
+        """Completed files with the size, content length and hash recorded when they were written."""
+        return [
+            {
+                'path': self.course_path / row["path"],
+                'media_type': row["media_type"],
+                'size': row["size"],
+                'content_length': row["content_length"],
+                'sha256': row["sha256"]
+            }
+            for row in self._conn.execute(
+                "SELECT path, media_type, size, content_length, sha256 FROM files WHERE status = ? ORDER BY path",
+                (FILE_COMPLETE,)
+            )
+        ]
+
+    def record_file(
+        self,
+        path: Path,
+        media_type: str,
+        status: str,
+        lesson_id: Optional[str] = None,
+        size: Optional[int] = None,
+        content_length: Optional[int] = None,
+        sha256: Optional[str] = None
+    ) -> None:
+        """Insert or update one file's status, with its integrity data once it is complete."""
+        now = time.time()
+        with self._conn:
+            self._upsert_files([(self._relative(path), media_type, lesson_id, status, size, content_length, sha256, now)])
+
+    def record_files(self, records: Iterable[Tuple[Path, str, str, Optional[str], Optional[int]]]) -> None:
+        """Insert or update many (path, media_type, status, lesson_id, size) records in one transaction."""
+        now = time.time()
+        rows = [(self._relative(path), media_type, lesson_id, status, size, None, None, now)
+                for path, media_type, status, lesson_id, size in records]
+        if rows:
+            with self._conn:
+                self._upsert_files(rows)
+
+    def enqueue_files(self, records: Iterable[Tuple[Path, str, Optional[str]]]) -> None:
+        """
+        Mark (path, media_type, lesson_id) files pending for shared workers.
+
+        Complete files and files claimed by a worker are left alone, so a worker
+        joining a running download does not undo the others' progress.
+        """
+        now = time.time()
+        rows = [(self._relative(path), media_type, lesson_id, FILE_PENDING, now) for path, media_type, lesson_id in records]
+        if rows:
+            with self._conn:
+                self._conn.executemany("""
+                    INSERT INTO files (path, media_type, lesson_id, status, updated_at) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(path) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at
+                    WHERE files.status = ?
+                """, [row + (FILE_FAILED,) for row in rows])
+
+    def claim_file(self, path: Path, worker: str, lease_seconds: float) -> bool:
+        """Lease a pending file to worker unless another worker holds a live lease on it."""
+        now = time.time()
+        with self._conn:
+            cursor = self._conn.execute("""
+                UPDATE files SET worker = ?, lease_expires = ?
+                WHERE path = ? AND status = ? AND (worker IS NULL OR worker = ? OR lease_expires < ?)
+            """, (worker, now + lease_seconds, self._relative(path), FILE_PENDING, worker, now))
+        return cursor.rowcount == 1
+
+    def renew_leases(self, worker: str, lease_seconds: float) -> int:
+        """Extend the leases worker holds on files it has not finished; returns how many."""
+        with self._conn:
+            cursor = self._conn.execute(
+                "UPDATE files SET lease_expires = ? WHERE worker = ? AND status = ?",
+                (time.time() + lease_seconds, worker, FILE_PENDING)
+            )
+        return cursor.rowcount
+
+    def release_leases(self, worker: str) -> None:
+        """Give up worker's leases on files it did not finish, so others need not wait for them to expire."""
+        with self._conn:
+            self._conn.execute(
+                "UPDATE files SET worker = NULL, lease_expires = NULL WHERE worker = ? AND status = ?",
+                (worker, FILE_PENDING)
+            )
+
+    def pending_leases(self) -> Dict[Path, Optional[float]]:
+        """Map each pending file's absolute path to its lease expiry, or None when nobody claimed it."""
+        return {
+            self.course_path / row["path"]: row["lease_expires"] if row["worker"] else None
+            for row in self._conn.execute("SELECT path, worker, lease_expires FROM files WHERE status = ?", (FILE_PENDING,))
+        }
+
+    def update_asset_urls(self, updates: Iterable[Tuple[Optional[str], str, str]]) -> None:
+        """Replace asset URLs given as (lesson_id, old_url, new_url), e.g. after re-signing expired ones."""
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE assets SET url = ? WHERE lesson_id = ? AND url = ?",
+                [(new_url, lesson_id, old_url) for lesson_id, old_url, new_url in updates]
+            )
+
+    def record_verified(self, results: Iterable[Tuple[Path, str]]) -> None:
+        """Stamp files that passed verification, storing the hash of files that had none."""
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE files SET verified_at = ?, sha256 = COALESCE(sha256, ?) WHERE path = ?",
+                [(now, sha256, self._relative(path)) for path, sha256 in results]
+            )
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts for the status command: modules, lessons, and files by type and status."""
+        lessons, modules = self._conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT module_path) FROM lessons"
+        ).fetchone()
+
+        files: Dict[str, Dict[str, int]] = {}
+        complete_bytes: Dict[str, int] = {}
+        for row in self._conn.execute(
+            "SELECT media_type, status, COUNT(*) AS count, COALESCE(SUM(size), 0) AS bytes FROM files GROUP BY media_type, status"
+        ):
+            files.setdefault(row["media_type"], {})[row["status"]] = row["count"]
+            if row["status"] == FILE_COMPLETE:
+                complete_bytes[row["media_type"]] = row["bytes"]
+
+        return {
+            'modules': modules,
+            'lessons': lessons,
+            'files': files,
+            'complete_bytes': complete_bytes
+        }
+
+    def module_breakdown(self) -> List[Tuple[str, int, int]]:
+        """(module directory name, lesson count, completed video count) in module order."""
+        rows = self._conn.execute("""
+            SELECT l.module_path AS module_path,
+                   COUNT(DISTINCT l.lesson_id) AS lessons,
+                   COUNT(f.path) AS videos
+            FROM lessons l
+            LEFT JOIN files f ON f.lesson_id = l.lesson_id AND f.media_type = 'video' AND f.status = ?
+            GROUP BY l.module_path
+            ORDER BY MIN(l.module_order)
+        """, (FILE_COMPLETE,))
+        return [(Path(row["module_path"]).name, row["lessons"], row["videos"]) for row in rows]
+
+    def _upsert_files(self, rows: List[Tuple]) -> None:
+        self._conn.executemany("""
+            INSERT INTO files (path, media_type, lesson_id, status, size, content_length, sha256, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                media_type = excluded.media_type,
+                lesson_id = COALESCE(excluded.lesson_id, files.lesson_id),
+                status = excluded.status,
+                size = excluded.size,
+                content_length = excluded.content_length,
+                sha256 = excluded.sha256,
+                verified_at = NULL,
+                updated_at = excluded.updated_at,
+                worker = NULL,
+                lease_expires = NULL
+        """, rows)
+
+    def _migrate(self) -> None:
+        """Add columns missing from manifests written by earlier versions."""
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(files)")}
+        with self._conn:
+            for column, column_type in FILE_COLUMN_MIGRATIONS.items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE files ADD COLUMN {column} {column_type}")
+
+    def _relative(self, path: Union[str, Path]) -> str:
+        """Store paths relative to the course directory so the course can be moved."""
+        path = Path(path)
+        try:
+            return path.relative_to(self.course_path).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+
+def walk_lesson_metadata(course_path: Path) -> List[Dict[str, Any]]:
+    """
+    Read every lesson_metadata.json by walking the course tree, in module/lesson order.
+
+    Fallback for courses scraped before the manifest existed; returns dicts
+    shaped like CourseManifest.lessons().
+    """
+    def order_numbers(lesson_path: Path):
+        module_match = re.search(r'module-(\d+)', lesson_path.parent.name)
+        lesson_match = re.search(r'lesson-(\d+)', lesson_path.name)
+        return (int(module_match.group(1)) if module_match else 0,
+                int(lesson_match.group(1)) if lesson_match else 0)
+
+    lessons = []
+    lesson_dirs = sorted((d for d in course_path.rglob("lesson-*") if d.is_dir()), key=order_numbers)
+    for lesson_dir in lesson_dirs:
+        metadata_file = lesson_dir / "lesson_metadata.json"
+        if not metadata_file.exists():
+            continue
+        try:
+            with open(metadata_file, 'r', encoding='utf-8') as f:
+                lesson = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            get_logger(__name__).warning(f"Failed to read lesson metadata from {metadata_file}: {e}")
+            continue
+        lesson["path"] = lesson_dir
+        lessons.append(lesson)
+    return lessons
@@ -1,8 +1,9 @@
 """Data models for Coursera course content."""
 
+import bisect
 from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, validator
 from pathlib import Path
 from enum import Enum
 
@@ -173,6 +174,7 @@ class APIEndpointConfig(BaseModel):
     method: str = "GET"
     response_mapping: Dict[str, str] = Field(default_factory=dict)
     headers: Dict[str, str] = Field(default_factory=dict)
+    cache_ttl: int = 0  # Seconds a response may be served from the response cache; 0 disables caching
 
     def get_mapped_value(self, response_data: Dict[str, Any], field_name: str) -> Any:
         """Extract a value from API response using the mapping."""
@@ -357,26 +359,80 @@ class ComprehensiveCourseData(BaseModel):
     content_atom_relations: Optional[List[Dict[str, Any]]] = None
     grade_policy: Optional[List[Dict[str, Any]]] = None
 
+    # Lookup indexes, built on first use (see _indexes)
+    _index: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    _index_fingerprint: Optional[tuple] = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in ('modules', 'lessons', 'items'):
+            self.invalidate_indexes()
+
+    def invalidate_indexes(self) -> None:
+        """Drop the lookup indexes; call after editing IDs of existing modules, lessons or items in place."""
+        self._index = None
+        self._index_fingerprint = None
+
+    def _indexes(self) -> Dict[str, Any]:
+        """
+        Return the lookup indexes, rebuilding them if the lists changed.
+
+        Assigning a list or appending to or removing from one is noticed by
+        the fingerprint; editing the IDs of existing entries needs an explicit
+        invalidate_indexes(). Positions are kept so lookups return entries in
+        list order, exactly like the scans they replace.
+        """
+        fingerprint = (id(self.modules), len(self.modules), id(self.lessons), len(self.lessons),
+                       id(self.items), len(self.items))
+        if self._index is not None and self._index_fingerprint == fingerprint:
+            return self._index
+
+        modules: Dict[str, CourseraModule] = {}
+        for module in self.modules:
+            modules.setdefault(module.id, module)
+
+        lesson_positions: Dict[str, List[int]] = {}
+        lessons_by_module: Dict[str, List[int]] = {}
+        for position, lesson in enumerate(self.lessons):
+            lesson_positions.setdefault(lesson.id, []).append(position)
+            if lesson.moduleId:
+                lessons_by_module.setdefault(lesson.moduleId, []).append(position)
+
+        item_positions: Dict[str, List[int]] = {}
+        items_by_lesson: Dict[str, List[int]] = {}
+        for position, item in enumerate(self.items):
+            item_positions.setdefault(item.id, []).append(position)
+            if item.lessonId:
+                items_by_lesson.setdefault(item.lessonId, []).append(position)
+
+        self._index = {
+            'modules': modules,
+            'lesson_positions': lesson_positions,
+            'lessons_by_module': lessons_by_module,
+            'item_positions': item_positions,
+            'items_by_lesson': items_by_lesson
+        }
+        self._index_fingerprint = fingerprint
+        return self._index
+
+    @staticmethod
+    def _positions_for_ids(positions: Dict[str, List[int]], ids: List[str]) -> List[int]:
+        """List positions of entries whose ID is in ids, in list order."""
+        return sorted(position for entry_id in set(ids) for position in positions.get(entry_id, ()))
+
     def get_module_by_id(self, module_id: str) -> Optional[CourseraModule]:
         """Get module by ID."""
-        for module in self.modules:
-            if module.id == module_id:
-                return module
-        return None
+        return self._indexes()['modules'].get(module_id)
 
     def get_lesson_by_id(self, lesson_id: str) -> Optional[CourseraLesson]:
         """Get lesson by ID."""
-        for lesson in self.lessons:
-            if lesson.id == lesson_id:
-                return lesson
-        return None
+        positions = self._indexes()['lesson_positions'].get(lesson_id)
+        return self.lessons[positions[0]] if positions else None
 
     def get_item_by_id(self, item_id: str) -> Optional[CourseraContentItem]:
         """Get item by ID."""
-        for item in self.items:
-            if item.id == item_id:
-                return item
-        return None
+        positions = self._indexes()['item_positions'].get(item_id)
+        return self.items[positions[0]] if positions else None
 
     def get_lessons_for_module(self, module_id: str) -> List[CourseraLesson]:
         """Get all lessons for a specific module."""
@@ -384,14 +440,15 @@ class ComprehensiveCourseData(BaseModel):
         if not module:
             return []
 
+        index = self._indexes()
+
         # First try to get lessons by lesson IDs in the module
-        lessons_by_ids = [lesson for lesson in self.lessons if lesson.id in module.lessonIds]
+        lessons_by_ids = [self.lessons[position]
+                          for position in self._positions_for_ids(index['lesson_positions'], module.lessonIds)]
 
         # If no lessons found by IDs, try to match by moduleId in lesson (fallback)
         if not lessons_by_ids:
-            lessons_by_module_ref = [lesson for lesson in self.lessons
-                                   if hasattr(lesson, 'moduleId') and lesson.moduleId == module_id]
-            return lessons_by_module_ref
+            return [self.lessons[position] for position in index['lessons_by_module'].get(module_id, [])]
 
         return lessons_by_ids
 
@@ -401,18 +458,21 @@ class ComprehensiveCourseData(BaseModel):
         if not lesson:
             return []
 
+        index = self._indexes()
+
         # Use itemIds if available (direct item references)
         if lesson.itemIds:
-            items_by_ids = [item for item in self.items if item.id in lesson.itemIds]
-            # Set lesson reference for items
-            for item in items_by_ids:
+            positions = self._positions_for_ids(index['item_positions'], lesson.itemIds)
+            # Set lesson reference for items, keeping the lessonId index in step
+            for position in positions:
+                item = self.items[position]
                 if not item.lessonId:
                     item.lessonId = lesson_id
-            return items_by_ids
+                    bisect.insort(index['items_by_lesson'].setdefault(lesson_id, []), position)
+            return [self.items[position] for position in positions]
 
         # Fallback to matching by lessonId in item
-        return [item for item in self.items
-                if hasattr(item, 'lessonId') and item.lessonId == lesson_id]
+        return [self.items[position] for position in index['items_by_lesson'].get(lesson_id, [])]
 
     @property
     def total_duration_minutes(self) -> float:
@@ -0,0 +1,70 @@
+"""Per-course cache of item IDs already probed during dynamic course discovery."""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Set, Union
+
+from ..utils.logger import LoggerMixin
+
+# Cache files live under the output directory, one JSON file per course ID
+DISCOVERY_CACHE_DIR = ".discovery_cache"
+
+
+class DiscoveryCache(LoggerMixin):
+    """
+    Remember which candidate item IDs a course's API accepted or rejected.
+
+    Course pages contain many ID-like strings that are not items. Rejected
+    IDs are skipped on later runs. Accepted IDs are still fetched, because
+    their responses carry signed URLs that expire.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], course_id: str):
+        """Initialize the cache for one course and load any earlier results."""
+        self.path = Path(cache_dir) / f"{course_id}.json"
+        self.course_id = course_id
+        self.valid: Dict[str, Set[str]] = {}
+        self.rejected: Dict[str, Set[str]] = {}
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Load earlier results; a missing or corrupt file means an empty cache."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+        self.valid = {endpoint: set(ids) for endpoint, ids in data.get('valid', {}).items()}
+        self.rejected = {endpoint: set(ids) for endpoint, ids in data.get('rejected', {}).items()}
+
+    def is_rejected(self, endpoint: str, item_id: str) -> bool:
+        """Check whether an earlier run found no content for this ID at this endpoint."""
+        return item_id in self.rejected.get(endpoint, set())
+
+    def record(self, endpoint: str, item_id: str, valid: bool) -> None:
+        """Record the outcome of probing an ID."""
+        accepted, refused = (self.valid, self.rejected) if valid else (self.rejected, self.valid)
+        accepted.setdefault(endpoint, set()).add(item_id)
+        refused.get(endpoint, set()).discard(item_id)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache atomically if anything changed."""
+        if not self._dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'course_id': self.course_id,
+            'valid': {endpoint: sorted(ids) for endpoint, ids in self.valid.items()},
+            'rejected': {endpoint: sorted(ids) for endpoint, ids in self.rejected.items()}
+        }
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, self.path)
+        self._dirty = False
+        self.logger.debug(f"Saved discovery cache: {self.path}")
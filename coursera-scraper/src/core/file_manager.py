@@ -9,9 +9,11 @@ from ..utils.sanitizer import (
     sanitize_course_name, sanitize_module_name,
     sanitize_lesson_name, create_safe_directory, ensure_unique_path
 )
-from ..utils.exceptions import FileSystemError, DirectoryCreationError, FileWriteError
+from ..utils.exceptions import FileSystemError, DirectoryCreationError, FileWriteError, DownloadError
 from ..utils.logger import LoggerMixin
+from ..utils.partial_download import PartialDownload, chunk_size_for
 from ..core.course_models import Course, Module, Lesson, ContentAsset
+from ..core.course_manifest import CourseManifest
 
 
 class FileManager(LoggerMixin):
@@ -253,6 +255,10 @@ class FileManager(LoggerMixin):
             if all_urls:
                 self.save_content_urls(all_urls, course_path)
 
+            # Index lessons, assets and finished files so downloads and status need no tree walk
+            with CourseManifest(course_path) as manifest:
+                manifest.write_structure(course)
+
             self.logger.info(f"Created complete structure for course '{course.name}' with {len(course.modules)} modules")
             return paths
 
@@ -319,8 +325,51 @@ class FileManager(LoggerMixin):
             self.logger.warning(f"Failed to load progress: {e}")
             return None
 
-    def download_asset(self, asset: ContentAsset, target_directory: Path, sequence_number: int = None) -> bool:
-        """Download a single content asset (video, PDF, document, etc.)."""
+    def get_asset_filename(self, asset: ContentAsset, sequence_number: int = None) -> str:
+        """Get the file name an asset is saved under (videos with a sequence number get sequential names)."""
+        from ..utils.sanitizer import sanitize_file_name, sanitize_sequential_video_name
+
+        # Determine the filename based on asset type and whether sequence number is provided
+        if asset.file_type == 'video' and sequence_number is not None:
+            # For video files with sequence number, use sequential naming
+            base_name = asset.name
+
+            # Remove resolution pattern if present (e.g., _720p.mp4)
+            resolution_patterns = ['_720p.mp4', '_480p.mp4', '_1080p.mp4', '_360p.mp4']
+            for pattern in resolution_patterns:
+                if base_name.endswith(pattern):
+                    base_name = base_name[:-len(pattern)]
+                    break
+
+            # Create sequential filename
+            return sanitize_sequential_video_name(sequence_number, base_name, '.mp4')
+
+        # For non-video files or videos without sequence number, use regular naming
+        safe_filename = sanitize_file_name(asset.name)
+
+        # Add file extension if not present based on asset type
+        # Special handling for video files to avoid .mp4.video extensions
+        if asset.file_type == 'video':
+            # For video files, ensure they end with .mp4 (not .video)
+            if not safe_filename.lower().endswith('.mp4'):
+                # Remove any existing extension and add .mp4
+                if '.' in safe_filename:
+                    safe_filename = safe_filename.rsplit('.', 1)[0]
+                safe_filename = f"{safe_filename}.mp4"
+        elif asset.file_type and not safe_filename.lower().endswith(f'.{asset.file_type}'):
+            safe_filename = f"{safe_filename}.{asset.file_type}"
+
+        return safe_filename
+
+    def download_asset(self, asset: ContentAsset, target_directory: Path, sequence_number: int = None,
+                       resume: bool = True) -> bool:
+        """
+        Download a single content asset (video, PDF, document, etc.).
+
+        Bytes are written to a ``.part`` file with a resume sidecar; an
+        interrupted transfer continues with a Range request on the next
+        attempt (or the next run when ``resume`` is set).
+        """
         if not asset.url:
             self.logger.warning(f"No URL provided for asset: {asset.name}")
             return False
@@ -328,41 +377,9 @@ class FileManager(LoggerMixin):
         try:
             import requests
             import time
-            from ..utils.sanitizer import sanitize_file_name, sanitize_sequential_video_name
 
             target_directory.mkdir(parents=True, exist_ok=True)
-
-            # Determine the filename based on asset type and whether sequence number is provided
-            if asset.file_type == 'video' and sequence_number is not None:
-                # For video files with sequence number, use sequential naming
-                base_name = asset.name
-
-                # Remove resolution pattern if present (e.g., _720p.mp4)
-                resolution_patterns = ['_720p.mp4', '_480p.mp4', '_1080p.mp4', '_360p.mp4']
-                for pattern in resolution_patterns:
-                    if base_name.endswith(pattern):
-                        base_name = base_name[:-len(pattern)]
-                        break
-
-                # Create sequential filename
-                safe_filename = sanitize_sequential_video_name(sequence_number, base_name, '.mp4')
-            else:
-                # For non-video files or videos without sequence number, use regular naming
-                safe_filename = sanitize_file_name(asset.name)
-
-                # Add file extension if not present based on asset type
-                # Special handling for video files to avoid .mp4.video extensions
-                if asset.file_type == 'video':
-                    # For video files, ensure they end with .mp4 (not .video)
-                    if not safe_filename.lower().endswith('.mp4'):
-                        # Remove any existing extension and add .mp4
-                        if '.' in safe_filename:
-                            safe_filename = safe_filename.rsplit('.', 1)[0]
-                        safe_filename = f"{safe_filename}.mp4"
-                elif asset.file_type and not safe_filename.lower().endswith(f'.{asset.file_type}'):
-                    safe_filename = f"{safe_filename}.{asset.file_type}"
-
-            file_path = target_directory / safe_filename
+            file_path = target_directory / self.get_asset_filename(asset, sequence_number)
 
             # Skip if file already exists
             if file_path.exists():
@@ -375,7 +392,6 @@ class FileManager(LoggerMixin):
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/145.0.0.0 Safari/537.36',
                 'Accept': '*/*',
-                'Accept-Encoding': 'gzip, deflate, br, zstd',
                 'Accept-Language': 'en',
                 'Connection': 'keep-alive',
                 'sec-ch-ua': '"Not:A-Brand";v="99", "Google Chrome";v="145", "Chromium";v="145"',
@@ -386,41 +402,30 @@ class FileManager(LoggerMixin):
                 'sec-fetch-site': 'same-origin'
             }
 
-            self.logger.info(f"Downloading: {asset.name} -> {file_path}")
+            partial = PartialDownload(file_path)
+            offset = partial.prepare(asset.url, resume=resume)
+            if offset:
+                self.logger.info(f"Resuming: {asset.name} -> {file_path} from byte {offset}")
+            else:
+                self.logger.info(f"Downloading: {asset.name} -> {file_path}")
 
-            # Make download request with timeout and retries
+            # Each retry continues from the bytes already written
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    response = requests.get(
-                        asset.url,
-                        headers=headers,
-                        stream=True,
-                        timeout=(10, 60),  # Connect timeout, read timeout
-                        allow_redirects=True
-                    )
-                    response.raise_for_status()
+                    self._fetch_into_partial(asset.url, partial, offset, headers)
+                    partial.verify()
                     break
-                except requests.exceptions.RequestException as e:
+                except (requests.exceptions.RequestException, DownloadError) as e:
                     if attempt < max_retries - 1:
-                        self.logger.warning(f"Download attempt {attempt + 1} failed for {asset.name}: {e}. Retrying...")
+                        offset = partial.downloaded_size
+                        self.logger.warning(f"Download attempt {attempt + 1} failed for {asset.name}: {e}. Retrying from byte {offset}...")
                         time.sleep(2 ** attempt)  # Exponential backoff
                         continue
                     else:
                         raise
 
-            # Get file size
-            total_size = int(response.headers.get('content-length', 0))
-
-            # Download in chunks with progress tracking
-            downloaded_size = 0
-            chunk_size = 8192
-
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
+            downloaded_size = partial.commit()
 
             # Update asset metadata
             asset.local_path = file_path
@@ -431,11 +436,34 @@ class FileManager(LoggerMixin):
             return True
 
         except Exception as e:
+            # The .part file and its sidecar are kept so the next run can resume
             self.logger.error(f"Failed to download {asset.name}: {e}")
-            # Clean up partial download
-            if 'file_path' in locals() and file_path.exists():
-                try:
-                    file_path.unlink()
-                except:
-                    pass
-            return False
\ No newline at end of file
+            return False
+
+    def _fetch_into_partial(self, url: str, partial: PartialDownload, offset: int, headers: Dict[str, str]) -> None:
+        """Stream one (ranged) response into the partial file."""
+        import requests
+
+        if offset and partial.is_complete():
+            return
+
+        request_headers = dict(headers)
+        request_headers.update(partial.request_headers(offset))
+
+        with requests.get(
+            url,
+            headers=request_headers,
+            stream=True,
+            timeout=(10, 60),  # Connect timeout, read timeout
+            allow_redirects=True
+        ) as response:
+            if response.status_code == 416 and partial.is_complete():
+                return
+
+            # 206 continues at offset; 200 means the server sent the whole file again
+            write_offset = partial.accept_response(response.status_code, response.headers, offset)
+
+            with open(partial.part_path, 'ab' if write_offset else 'wb') as f:
+                for chunk in response.iter_content(chunk_size=chunk_size_for(partial.expected_length)):
+                    if chunk:
+                        f.write(chunk)
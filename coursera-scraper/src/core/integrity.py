@@ -0,0 +1,68 @@
+"""Integrity checks for downloaded course files against the course manifest."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .course_manifest import FILE_PENDING, CourseManifest
+from ..utils.partial_download import hash_file
+
+INTEGRITY_OK = 'ok'
+INTEGRITY_MISSING = 'missing'
+INTEGRITY_TRUNCATED = 'truncated'
+INTEGRITY_SIZE_MISMATCH = 'size mismatch'
+INTEGRITY_CORRUPT = 'corrupt'
+
+# Records handed to each worker process at once; hashing dominates, so small batches balance well
+VERIFY_CHUNKSIZE = 4
+
+
+def check_file(record: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """
+    Check one manifest record against the file on disk; returns (status, sha256).
+
+    The size is compared with the server's content length (or the recorded
+    size when the response had none) before the file is hashed, so missing
+    and truncated files cost a single stat. Files recorded without a hash
+    (adopted from disk) pass on size and return their hash for backfilling.
+    """
+    try:
+        size = record['path'].stat().st_size
+    except FileNotFoundError:
+        return INTEGRITY_MISSING, None
+
+    expected = record['content_length'] if record['content_length'] is not None else record['size']
+    if expected is not None and size < expected:
+        return INTEGRITY_TRUNCATED, None
+    if expected is not None and size != expected:
+        return INTEGRITY_SIZE_MISMATCH, None
+
+    digest = hash_file(record['path'])
+    if record['sha256'] and digest != record['sha256']:
+        return INTEGRITY_CORRUPT, digest
+    return INTEGRITY_OK, digest
+
+
+def verify_files(records: List[Dict[str, Any]], workers: Optional[int] = None) -> List[Tuple[Dict[str, Any], str, Optional[str]]]:
+    """Check records on a process pool (one worker per CPU core by default); returns (record, status, sha256)."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(records) < 2:
+        results = map(check_file, records)
+        return [(record, status, digest) for record, (status, digest) in zip(records, results)]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(records))) as pool:
+        results = pool.map(check_file, records, chunksize=VERIFY_CHUNKSIZE)
+        return [(record, status, digest) for record, (status, digest) in zip(records, results)]
+
+
+def requeue_files(manifest: CourseManifest, records: Iterable[Dict[str, Any]]) -> int:
+    """Delete damaged files and mark them pending so the next download run fetches them again."""
+    rows = []
+    for record in records:
+        try:
+            record['path'].unlink()
+        except FileNotFoundError:
+            pass
+        rows.append((record['path'], record['media_type'], FILE_PENDING, None, None))
+    manifest.record_files(rows)
+    return len(rows)
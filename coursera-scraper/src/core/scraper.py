@@ -3,9 +3,9 @@
 import asyncio
 import time
 import re
-import requests
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
+from pathlib import Path
 from rich.console import Console
 from rich.progress import Progress, TaskID, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn
 
@@ -14,14 +14,19 @@ from .course_models import (
     ComprehensiveCourseData, CourseraModule, CourseraLesson,
     CourseraContentItem, ContentSummary, ComprehensiveCourseConverter
 )
+from .discovery_cache import DISCOVERY_CACHE_DIR, DiscoveryCache
 from .file_manager import FileManager
+from ..api.async_client import AsyncCourseraClient
+from ..api.enhanced_downloader import EnhancedVideoDownloader
 from ..api.coursera_client import CourseraClient, ResponseParser
+from ..api.lecture_media import LectureMedia
 from ..config.settings import ConfigManager
 from ..utils.exceptions import (
     CourseraScraperError, APIError, CourseNotFoundError,
-    FileSystemError, ValidationError
+    FileSystemError, ValidationError, InvalidResponseError
 )
 from ..utils.logger import LoggerMixin
+from ..utils.rate_limiter import parse_rate
 from ..utils.sanitizer import get_file_extension, sanitize_file_name
 
 
@@ -120,6 +125,15 @@ class ContentTypeMapper:
             return ContentType.SUPPLEMENT
 
 
+# Per-item endpoints used when the course materials response has no asset URLs
+LECTURE_VIDEO_ENDPOINT = "https://www.coursera.org/api/onDemandLectureVideos.v1/{course_id}~{item_id}?includes=video&fields=onDemandVideos.v1(sources%2Csubtitles%2CsubtitlesVtt%2CsubtitlesTxt%2CsubtitlesAssetTags%2CdubbedSources%2CdubbedSubtitlesVtt%2CaudioDescriptionVideoSources)%2CdisableSkippingForward%2CstartMs%2CendMs"
+READING_ENDPOINT = "https://www.coursera.org/api/onDemandLectureReadings.v1/{course_id}~{item_id}?includes=reading&fields=onDemandReadings.v1(url%2Ctitle%2Cdescription%2CreadingType)"
+ASSIGNMENT_ENDPOINTS = [
+    "https://www.coursera.org/api/onDemandLearnerAssignments.v1/{course_id}~{item_id}",
+    READING_ENDPOINT
+]
+
+
 class CourseScraper(LoggerMixin):
     """Main course scraping orchestrator."""
 
@@ -143,6 +157,12 @@ class CourseScraper(LoggerMixin):
         self.current_progress: Optional[ScrapingProgress] = None
         self.video_sequence_counter = 1  # Global counter for video sequential naming
 
+        # Item URLs resolved up front by the async engine, keyed by item ID
+        self.resolved_item_urls: Dict[str, List[Dict]] = {}
+
+        # (lesson, asset, media) entries queued during the walk for the async download engine
+        self.download_queue: List[Tuple[Lesson, ContentAsset, Dict]] = []
+
         self.logger.info("Course scraper initialized")
 
     def scrape_course(self, course_identifier: str) -> Optional[Course]:
@@ -175,12 +195,20 @@ class CourseScraper(LoggerMixin):
                 course_name=course.name
             )
 
-            # Reset video sequence counter for this course
+            # Reset video sequence counter and download queue for this course
             self.video_sequence_counter = 1
+            self.download_queue = []
 
             # Step 2: Create course directory structure
             course_paths = self.file_manager.create_course_directory(course)
 
+            # Resolve every item's asset URLs concurrently; the ordered walk below only reads the results
+            self.resolved_item_urls = {}
+            if self.config.download_settings.download_files:
+                lessons = [lesson for module in course.modules or [] for lesson in module.lessons or []]
+                with self.console.status("[blue]Resolving content URLs...[/blue]"):
+                    self.resolved_item_urls = asyncio.run(self._resolve_item_urls_async(lessons))
+
             # Step 3: Scrape modules with progress tracking
             with Progress(
                 SpinnerColumn(),
@@ -214,6 +242,10 @@ class CourseScraper(LoggerMixin):
 
                 progress.update(main_task, description="COMPLETE: Course scraping completed")
 
+            # Download everything queued during the walk with bounded concurrency
+            if self.download_queue:
+                self._download_queued_assets(course_paths)
+
             # Step 4: Create complete file structure
             self.file_manager.create_full_structure(course)
 
@@ -241,79 +273,47 @@ class CourseScraper(LoggerMixin):
     def _discover_course_dynamically(self, course_identifier: str) -> Optional[Dict]:
         """Dynamically discover course structure for any course name."""
         try:
-            self.console.print(f"[blue]Discovering course structure for: {course_identifier}[/blue]")
-
-            # Get authentication headers and cookies
-            headers = self.client.auth.get_headers(include_csrf=False)
-            # Convert to standard headers format for requests
-            request_headers = {
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'User-Agent': headers.get('User-Agent', ''),
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
-            cookies = self.client.auth.get_cookies()
-
-            # Try different possible course URL patterns
-            possible_urls = [
-                f"https://www.coursera.org/learn/{course_identifier}",
-                f"https://www.coursera.org/learn/{course_identifier}-intro",
-                f"https://www.coursera.org/learn/{course_identifier}-course",
-                f"https://www.coursera.org/learn/{course_identifier.replace('-', '_')}"
-            ]
-
-            course_id = None
-            found_course_url = None
-            html_content = None
-
-            # Try to find the course
-            for course_url in possible_urls:
-                try:
-                    self.console.print(f"  Trying: {course_url}")
-                    response = requests.get(course_url, headers=request_headers, cookies=cookies)
-
-                    if response.status_code == 200:
-                        self.console.print(f"  SUCCESS: Found course at {course_url}")
-                        found_course_url = course_url
-                        html_content = response.text
-
-                        # Extract course ID from HTML
-                        course_id_patterns = [
-                            r'course["\']:\s*["\']([\w~-]+)["\']',
-                            r'courseId["\']:\s*["\']([\w~-]+)["\']',
-                            r'"id":\s*"([\w~-]{20,})"',
-                        ]
-
-                        for pattern in course_id_patterns:
-                            matches = re.findall(pattern, html_content)
-                            for match in matches:
-                                if len(match) > 15:  # Course IDs are typically long
-                                    course_id = match
-                                    self.console.print(f"  Found course ID: {course_id}")
-                                    break
-                            if course_id:
-                                break
-
-                        if course_id:
-                            break
-                    elif response.status_code == 404:
-                        self.console.print(f"  Course not found at this URL")
-                    else:
-                        self.console.print(f"  HTTP {response.status_code}")
-
-                except Exception as e:
-                    self.console.print(f"  Error accessing {course_url}: {e}")
-                    continue
+            return asyncio.run(self._discover_course_dynamically_async(course_identifier))
+        except Exception as e:
+            self.logger.error(f"Failed to discover course dynamically: {e}")
+            return None
 
-            if not found_course_url or not course_id:
+    async def _discover_course_dynamically_async(self, course_identifier: str) -> Optional[Dict]:
+        """
+        Discover course structure by probing course pages and candidate item IDs concurrently.
+
+        All requests share one session, the client's token bucket and its
+        timeout; at most max_concurrent_requests are in flight.
+        """
+        self.console.print(f"[blue]Discovering course structure for: {course_identifier}[/blue]")
+
+        # Get authentication headers and cookies
+        headers = self.client.auth.get_headers(include_csrf=False)
+        # Convert to standard headers format for page requests
+        request_headers = {
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'User-Agent': headers.get('User-Agent', ''),
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate',  # No br: aiohttp only decodes it with the optional brotli package
+            'Upgrade-Insecure-Requests': '1'
+        }
+
+        # Try different possible course URL patterns
+        possible_urls = [
+            f"https://www.coursera.org/learn/{course_identifier}",
+            f"https://www.coursera.org/learn/{course_identifier}-intro",
+            f"https://www.coursera.org/learn/{course_identifier}-course",
+            f"https://www.coursera.org/learn/{course_identifier.replace('-', '_')}"
+        ]
+
+        max_concurrent = self.config.app_settings.max_concurrent_requests
+        async with AsyncCourseraClient(self.client, max_concurrent=max_concurrent) as api:
+            found = await self._find_course_page(api, possible_urls, request_headers)
+            if not found:
                 self.console.print(f"[red]Could not find course: {course_identifier}[/red]")
                 return None
 
-            if not html_content:
-                self.console.print("[red]No HTML content retrieved[/red]")
-                return None
+            found_course_url, html_content, course_id = found
 
             # Extract content IDs with smart filtering - prioritize video content
             self.console.print("[blue]Extracting content IDs with smart filtering...[/blue]")
@@ -345,143 +345,174 @@ class CourseScraper(LoggerMixin):
                     if 4 <= len(match) <= 8 and match.replace('_', '').isalnum():
                         other_content_ids.add(match)
 
-            total_content_ids = len(video_content_ids) + len(other_content_ids)
             self.console.print(f"  Found {len(video_content_ids)} video IDs, {len(other_content_ids)} other content IDs")
 
             # Test content efficiently - prioritize videos
             self.console.print("[blue]Testing content with smart prioritization...[/blue]")
-            api_headers = self.client.auth.get_headers(include_csrf=False)
-            api_cookies = self.client.auth.get_cookies()
+            cache = DiscoveryCache(self.file_manager.base_output_dir / DISCOVERY_CACHE_DIR, course_id)
 
             valid_content_items = []
             course_name = None
 
-            # Optimized API testing strategy
-            def test_video_content(content_ids: set) -> List[Dict]:
-                """Test video content IDs efficiently."""
-                video_results = []
-                video_url_template = "https://www.coursera.org/api/onDemandLectureVideos.v1/{course_id}~{item_id}?includes=video&fields=onDemandVideos.v1(sources%2Csubtitles%2CsubtitlesVtt%2CsubtitlesTxt%2CsubtitlesAssetTags%2CdubbedSources%2CdubbedSubtitlesVtt%2CaudioDescriptionVideoSources)%2CdisableSkippingForward%2CstartMs%2CendMs"
-
-                for i, item_id in enumerate(sorted(content_ids), 1):
-                    print(f"  [{i:3d}/{len(content_ids)}] Testing video {item_id}...", end=' ')
-
-                    try:
-                        test_url = video_url_template.format(course_id=course_id, item_id=item_id)
-                        response = requests.get(test_url, headers=api_headers, cookies=api_cookies)
-
-                        if response.status_code == 200:
-                            try:
-                                data = response.json()
-                                if self._is_valid_video_content(data):
-                                    video_results.append({
-                                        'item_id': item_id,
-                                        'content_type': ContentType.VIDEO,
-                                        'endpoint': 'video',
-                                        'data': data,
-                                        'url': test_url
-                                    })
-                                    print(f"SUCCESS! VIDEO")
-                                else:
-                                    print("No video data")
-                            except ValueError:  # JSON decode error
-                                print("Invalid JSON")
-                        elif response.status_code == 404:
-                            print("Not found")
-                        else:
-                            print(f"HTTP {response.status_code}")
-
-                    except Exception as e:
-                        print(f"Error: {e}")
-
-                return video_results
-
-            def test_other_content(content_ids: set) -> List[Dict]:
-                """Test other content types but limit scope."""
-                other_results = []
-
-                # Only test reading endpoint for other content (most likely to succeed)
-                reading_url_template = "https://www.coursera.org/api/onDemandLectureReadings.v1/{course_id}~{item_id}?includes=reading&fields=onDemandReadings.v1(url%2Ctitle%2Cdescription%2CreadingType)"
-
-                # Limit to first 10 to avoid excessive API calls
-                limited_ids = sorted(content_ids)[:10]
-                for i, item_id in enumerate(limited_ids, 1):
-                    print(f"  [R{i:2d}/{len(limited_ids)}] Testing reading {item_id}...", end=' ')
+            try:
+                # Test video content first (highest priority)
+                video_items = await self._validate_content_ids(
+                    api, cache, course_id, sorted(video_content_ids),
+                    ContentType.VIDEO, LECTURE_VIDEO_ENDPOINT, self._is_valid_video_content
+                )
+                valid_content_items.extend(video_items)
+
+                # Extract course name from first successful video response
+                if video_items and not course_name:
+                    course_name = self._extract_course_name(video_items[0]['data'], course_identifier)
+
+                # Test other content types if we found videos (indicates active course)
+                if video_items and other_content_ids:
+                    # Limit to first 10 to avoid excessive API calls
+                    other_items = await self._validate_content_ids(
+                        api, cache, course_id, sorted(other_content_ids)[:10],
+                        ContentType.READING, READING_ENDPOINT, self._is_valid_reading_content
+                    )
+                    valid_content_items.extend(other_items)
+            finally:
+                cache.save()
 
-                    try:
-                        test_url = reading_url_template.format(course_id=course_id, item_id=item_id)
-                        response = requests.get(test_url, headers=api_headers, cookies=api_cookies)
-
-                        if response.status_code == 200:
-                            try:
-                                data = response.json()
-                                if self._is_valid_reading_content(data):
-                                    other_results.append({
-                                        'item_id': item_id,
-                                        'content_type': ContentType.READING,
-                                        'endpoint': 'reading',
-                                        'data': data,
-                                        'url': test_url
-                                    })
-                                    print(f"SUCCESS! READING")
-                                else:
-                                    print("No reading data")
-                            except ValueError:
-                                print("Invalid JSON")
-                        elif response.status_code == 404:
-                            print("Not found")
-                        else:
-                            print(f"HTTP {response.status_code}")
+        if not valid_content_items:
+            self.console.print(f"[red]No valid content found for course: {course_identifier}[/red]")
+            return None
 
-                    except Exception as e:
-                        print(f"Error: {e}")
+        self.console.print(f"[green]Successfully discovered {len(valid_content_items)} content items[/green]")
 
-                return other_results
+        # Group content items by type for reporting
+        content_by_type = {}
+        for item in valid_content_items:
+            content_type = item['content_type']
+            if content_type not in content_by_type:
+                content_by_type[content_type] = []
+            content_by_type[content_type].append(item)
 
-            # Test video content first (highest priority)
-            video_items = test_video_content(video_content_ids)
-            valid_content_items.extend(video_items)
+        for content_type, items in content_by_type.items():
+            self.console.print(f"  - {len(items)} {content_type} items")
 
-            # Extract course name from first successful video response
-            if video_items and not course_name:
-                course_name = self._extract_course_name(video_items[0]['data'], course_identifier)
+        # Infer course name if not found
+        if not course_name:
+            course_name = course_identifier.replace('-', ' ').title()
 
-            # Test other content types if we found videos (indicates active course)
-            if video_items and other_content_ids:
-                other_items = test_other_content(other_content_ids)
-                valid_content_items.extend(other_items)
+        return {
+            'course_id': course_id,
+            'course_name': course_name,
+            'course_url': found_course_url,
+            'valid_content_items': valid_content_items,
+            'content_by_type': content_by_type
+        }
 
-            if not valid_content_items:
-                self.console.print(f"[red]No valid content found for course: {course_identifier}[/red]")
+    async def _find_course_page(
+        self,
+        api: AsyncCourseraClient,
+        possible_urls: List[str],
+        request_headers: Dict[str, str]
+    ) -> Optional[Tuple[str, str, str]]:
+        """
+        Fetch all candidate course pages at once and return (url, html, course_id) for the best hit.
+
+        Candidates are listed in priority order. Pages are fetched in parallel but
+        their results are taken in that order, so a lower-priority page that answers
+        first never wins over a higher-priority one; the remaining requests are
+        cancelled as soon as the highest-priority page still pending yields a course ID.
+        """
+        async def probe(course_url: str) -> Optional[Tuple[str, str, str]]:
+            try:
+                html_content = await api.get_text(course_url, headers=request_headers)
+            except CourseNotFoundError:
+                self.console.print(f"  Course not found at {course_url}")
+                return None
+            except CourseraScraperError as e:
+                self.console.print(f"  Error accessing {course_url}: {e}")
                 return None
 
-            self.console.print(f"[green]Successfully discovered {len(valid_content_items)} content items[/green]")
+            course_id = self._extract_course_id_from_page(html_content)
+            return (course_url, html_content, course_id) if course_id else None
 
-            # Group content items by type for reporting
-            content_by_type = {}
-            for item in valid_content_items:
-                content_type = item['content_type']
-                if content_type not in content_by_type:
-                    content_by_type[content_type] = []
-                content_by_type[content_type].append(item)
+        self.console.print(f"  Trying {len(possible_urls)} candidate URLs...")
+        tasks = [asyncio.create_task(probe(course_url)) for course_url in possible_urls]
+        try:
+            for task in tasks:
+                result = await task
+                if result:
+                    self.console.print(f"  SUCCESS: Found course at {result[0]}")
+                    self.console.print(f"  Found course ID: {result[2]}")
+                    return result
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _extract_course_id_from_page(self, html_content: str) -> Optional[str]:
+        """Extract the course ID from a course landing page."""
+        course_id_patterns = [
+            r'course["\']:\s*["\']([\w~-]+)["\']',
+            r'courseId["\']:\s*["\']([\w~-]+)["\']',
+            r'"id":\s*"([\w~-]{20,})"',
+        ]
+
+        for pattern in course_id_patterns:
+            for match in re.findall(pattern, html_content):
+                if len(match) > 15:  # Course IDs are typically long
+                    return match
+        return None
 
-            for content_type, items in content_by_type.items():
-                self.console.print(f"  - {len(items)} {content_type} items")
+    async def _validate_content_ids(
+        self,
+        api: AsyncCourseraClient,
+        cache: DiscoveryCache,
+        course_id: str,
+        item_ids: List[str],
+        content_type: str,
+        url_template: str,
+        is_valid
+    ) -> List[Dict]:
+        """
+        Probe candidate item IDs concurrently and keep those the API serves content for.
+
+        IDs an earlier run already rejected are skipped. Results keep the order
+        of item_ids. IDs that failed for transient reasons are not cached.
+        """
+        endpoint = 'video' if content_type == ContentType.VIDEO else 'reading'
+        to_probe = [item_id for item_id in item_ids if not cache.is_rejected(endpoint, item_id)]
+
+        async def probe(item_id: str) -> Optional[Dict]:
+            test_url = url_template.format(course_id=course_id, item_id=item_id)
+            try:
+                data = await api.get_json(test_url)
+            except (CourseNotFoundError, InvalidResponseError):
+                cache.record(endpoint, item_id, valid=False)
+                return None
+            except CourseraScraperError as e:
+                self.logger.debug(f"Could not test {endpoint} {item_id}: {e}")
+                return None
 
-            # Infer course name if not found
-            if not course_name:
-                course_name = course_identifier.replace('-', ' ').title()
+            if not is_valid(data):
+                cache.record(endpoint, item_id, valid=False)
+                return None
 
+            cache.record(endpoint, item_id, valid=True)
             return {
-                'course_id': course_id,
-                'course_name': course_name,
-                'course_url': found_course_url,
-                'valid_content_items': valid_content_items,
-                'content_by_type': content_by_type
+                'item_id': item_id,
+                'content_type': content_type,
+                'endpoint': endpoint,
+                'data': data,
+                'url': test_url
             }
 
-        except Exception as e:
-            self.logger.error(f"Failed to discover course dynamically: {e}")
-            return None
+        results = await asyncio.gather(*(probe(item_id) for item_id in to_probe))
+        items = [item for item in results if item]
+
+        self.console.print(
+            f"  {endpoint.title()} IDs: {len(items)} valid of {len(to_probe)} tested "
+            f"({len(item_ids) - len(to_probe)} skipped as known invalid)"
+        )
+        return items
 
     def _is_valid_video_content(self, data: Dict) -> bool:
         """Check if response contains valid video content."""
@@ -1021,6 +1052,7 @@ class CourseScraper(LoggerMixin):
                 return assets
 
             video_info = video_data['linked']['onDemandVideos.v1'][0]
+            lecture_media = LectureMedia.from_response(video_data)
 
             # Extract video URLs by resolution - ONLY 720p MP4 as requested
             if 'sources' in video_info and 'byResolution' in video_info['sources']:
@@ -1031,7 +1063,6 @@ class CourseScraper(LoggerMixin):
                         # Use actual video name if provided, otherwise fallback to item_id
                         if video_name:
                             # Sanitize the video name for filesystem
-                            from ..utils.sanitizer import sanitize_file_name
                             safe_name = sanitize_file_name(video_name)
                             filename = f"{safe_name}_720p.mp4"
                         else:
@@ -1047,7 +1078,9 @@ class CourseScraper(LoggerMixin):
                                 'item_id': item_id,
                                 'original_name': video_name,
                                 # Note: course_id will be added by the comprehensive API extraction
-                                'course_id': None  # Will be set later in comprehensive API processing
+                                'course_id': None,  # Will be set later in comprehensive API processing
+                                # Subtitle and dubbed track URLs from the same response, so downloads need no second lookup
+                                'lecture_media': lecture_media.to_dict() if lecture_media else None
                             }
                         ))
                         self.logger.info(f"Extracted 720p MP4 video: {filename}")
@@ -1056,6 +1089,24 @@ class CourseScraper(LoggerMixin):
                 else:
                     self.logger.warning(f"No 720p resolution available for item {item_id}")
 
+            # Without a 720p MP4 the video can still be assembled from its HLS playlist
+            if not assets and lecture_media and lecture_media.hls_playlist:
+                safe_name = sanitize_file_name(video_name) if video_name else f"video_{item_id}"
+                assets.append(ContentAsset(
+                    name=f"{safe_name}_720p.mp4",
+                    url=lecture_media.hls_playlist,
+                    file_type="video",
+                    metadata={
+                        'resolution': '720p',
+                        'format': 'hls',
+                        'item_id': item_id,
+                        'original_name': video_name,
+                        'course_id': None,
+                        'lecture_media': lecture_media.to_dict()
+                    }
+                ))
+                self.logger.info(f"Using HLS playlist for item {item_id}")
+
             # Extract audio URLs
             if 'sources' in video_info and 'audio' in video_info['sources']:
                 for i, audio_data in enumerate(video_info['sources']['audio']):
@@ -1118,7 +1169,7 @@ class CourseScraper(LoggerMixin):
 
             # Process lesson assets if download is enabled
             if self.config.download_settings.download_files and lesson.assets:
-                self._download_lesson_assets(lesson, progress)
+                self._queue_lesson_assets(lesson)
 
             # Update progress
             progress.advance(lesson_task)
@@ -1133,11 +1184,7 @@ class CourseScraper(LoggerMixin):
                 return
 
             item_ids = lesson.metadata['coursera_item_ids']
-            course_id = lesson.metadata.get('course_id')
-
-            if not course_id:
-                # Try to get course_id from course metadata
-                course_id = lesson.metadata.get('comprehensive_api_data', {}).get('course_id')
+            course_id = self._get_lesson_course_id(lesson)
 
             if not course_id:
                 self.logger.warning(f"No course ID found for lesson {lesson.id}")
@@ -1148,11 +1195,7 @@ class CourseScraper(LoggerMixin):
             for item_id in item_ids:
                 try:
                     # Find the asset for this item_id
-                    target_asset = None
-                    for asset in lesson.assets:
-                        if item_id in asset.name:
-                            target_asset = asset
-                            break
+                    target_asset = self._find_item_asset(lesson, item_id)
 
                     if not target_asset:
                         continue
@@ -1176,8 +1219,12 @@ class CourseScraper(LoggerMixin):
                     # Enhanced: Try to get URLs directly from comprehensive API data first
                     content_urls = self._extract_urls_from_comprehensive_data(item_id, content_type, target_asset.metadata)
 
-                    # If no URLs from comprehensive data, fallback to individual API calls
-                    if not content_urls:
+                    # Then use URLs the async engine already resolved for this item
+                    if not content_urls and item_id in self.resolved_item_urls:
+                        content_urls = self.resolved_item_urls[item_id]
+
+                    # If still nothing, fallback to individual API calls
+                    elif not content_urls:
                         # Try to get comprehensive data to extract video names
                         comprehensive_data = lesson.metadata.get('comprehensive_api_data', {})
                         content_urls = self._extract_urls_via_individual_api_calls(course_id, item_id, content_type, comprehensive_data)
@@ -1196,7 +1243,9 @@ class CourseScraper(LoggerMixin):
                                 'content_type': content_type,
                                 # Add course_id and item_id for enhanced downloader compatibility
                                 'course_id': course_id,
-                                'item_id': item_id
+                                'item_id': item_id,
+                                'format': url_data.get('format'),
+                                'lecture_media': url_data.get('lecture_media')
                             }
                         )
                         extracted_assets.append(asset)
@@ -1220,6 +1269,114 @@ class CourseScraper(LoggerMixin):
         except Exception as e:
             self.logger.error(f"Failed to extract assets from comprehensive API for lesson {lesson.id}: {e}")
 
+    def _get_lesson_course_id(self, lesson: Lesson) -> Optional[str]:
+        """Get the course ID recorded on a lesson."""
+        course_id = lesson.metadata.get('course_id')
+        if not course_id:
+            # Try to get course_id from course metadata
+            course_id = lesson.metadata.get('comprehensive_api_data', {}).get('course_id')
+        return course_id
+
+    def _find_item_asset(self, lesson: Lesson, item_id: str) -> Optional[ContentAsset]:
+        """Find the placeholder asset for a Coursera item in a lesson."""
+        for asset in lesson.assets:
+            if item_id in asset.name:
+                return asset
+        return None
+
+    def _plan_url_lookups(self, lesson: Lesson) -> List[Tuple[str, str, str, Dict]]:
+        """
+        List the items of a lesson whose URLs need an individual API call.
+
+        Applies the same filters as _extract_content_assets_from_comprehensive_api
+        and returns (course_id, item_id, content_type, comprehensive_data) tuples.
+        """
+        course_id = self._get_lesson_course_id(lesson)
+        if 'coursera_item_ids' not in lesson.metadata or not course_id:
+            return []
+
+        comprehensive_data = lesson.metadata.get('comprehensive_api_data', {})
+        lookups = []
+        for item_id in lesson.metadata['coursera_item_ids']:
+            target_asset = self._find_item_asset(lesson, item_id)
+            if not target_asset:
+                continue
+
+            content_type = target_asset.metadata.get('coursera_item', {}).get('content_type', 'unknown')
+            if ContentTypeMapper.should_skip(content_type) or not ContentTypeMapper.is_downloadable(content_type):
+                continue
+            if self._extract_urls_from_comprehensive_data(item_id, content_type, target_asset.metadata):
+                continue
+
+            lookups.append((course_id, item_id, content_type, comprehensive_data))
+        return lookups
+
+    async def _resolve_item_urls_async(self, lessons: List[Lesson]) -> Dict[str, List[Dict]]:
+        """
+        Resolve asset URLs for all items of the given lessons concurrently.
+
+        Requests run under the client's token bucket with at most
+        max_concurrent_requests in flight. Items whose lookup failed are left
+        out, so the ordered walk retries them with the synchronous client.
+        """
+        lookups = [lookup for lesson in lessons for lookup in self._plan_url_lookups(lesson)]
+        if not lookups:
+            return {}
+
+        started = time.time()
+        async with AsyncCourseraClient(self.client, max_concurrent=self.config.app_settings.max_concurrent_requests) as api:
+            results = await asyncio.gather(*(self._fetch_item_urls_async(api, *lookup) for lookup in lookups))
+
+        resolved = {lookup[1]: urls for lookup, urls in zip(lookups, results) if urls is not None}
+        self.logger.info(
+            f"Resolved URLs for {len(resolved)}/{len(lookups)} items in {time.time() - started:.1f}s"
+        )
+        return resolved
+
+    async def _fetch_item_urls_async(
+        self,
+        api: AsyncCourseraClient,
+        course_id: str,
+        item_id: str,
+        content_type: str,
+        comprehensive_data: Dict
+    ) -> Optional[List[Dict]]:
+        """Async counterpart of _extract_urls_via_individual_api_calls; returns None if the lookup failed."""
+        try:
+            if ContentTypeMapper.is_video(content_type):
+                video_name = comprehensive_data.get('items', {}).get(item_id, {}).get('name') if comprehensive_data else None
+                data = await api.get_lecture_video(course_id, item_id)
+                return self._assets_to_url_data(self._extract_video_content_assets(data, item_id, video_name), 'video_api')
+
+            elif ContentTypeMapper.is_reading(content_type):
+                data = await api.get_json(READING_ENDPOINT.format(course_id=course_id, item_id=item_id))
+                assets = self._extract_generic_content_assets(data, item_id, 'onDemandReadings.v1', 'reading')
+                return self._assets_to_url_data(assets, 'reading_api')
+
+            elif ContentTypeMapper.is_assignment(content_type):
+                for endpoint in ASSIGNMENT_ENDPOINTS:
+                    endpoint_url = endpoint.format(course_id=course_id, item_id=item_id)
+                    try:
+                        data = await api.get_json(endpoint_url)
+                    except CourseraScraperError as e:
+                        self.logger.debug(f"Assignment extraction failed for endpoint {endpoint_url}: {e}")
+                        continue
+
+                    for data_key in ['onDemandLearnerAssignments.v1', 'onDemandReadings.v1']:
+                        assets = self._extract_generic_content_assets(data, item_id, data_key, 'assignment')
+                        if assets:
+                            return self._assets_to_url_data(assets, 'assignment_api')
+
+            return []
+
+        except CourseNotFoundError:
+            # The item has no such content; asking again will not change that
+            return []
+
+        except Exception as e:
+            self.logger.warning(f"Failed to resolve URLs for {item_id}: {e}")
+            return None
+
     def _add_sequential_numbering_to_videos(self, lesson: Lesson) -> None:
         """Add sequential numbering to video assets based on lesson item order."""
         try:
@@ -1311,38 +1468,15 @@ class CourseScraper(LoggerMixin):
             # Extract assets based on type using individual API calls
             if ContentTypeMapper.is_video(content_type):
                 video_assets = self._extract_video_assets_by_item_id(course_id, item_id, video_name)
-                for asset in video_assets:
-                    if asset.url:
-                        urls.append({
-                            'name': asset.name,
-                            'url': asset.url,
-                            'file_type': asset.file_type,
-                            'source': 'video_api',
-                            'resolution': asset.metadata.get('resolution'),
-                            'quality': asset.metadata.get('quality')
-                        })
+                urls = self._assets_to_url_data(video_assets, 'video_api')
 
             elif ContentTypeMapper.is_reading(content_type):
                 reading_assets = self._extract_reading_assets_by_item_id(course_id, item_id)
-                for asset in reading_assets:
-                    if asset.url:
-                        urls.append({
-                            'name': asset.name,
-                            'url': asset.url,
-                            'file_type': asset.file_type,
-                            'source': 'reading_api'
-                        })
+                urls = self._assets_to_url_data(reading_assets, 'reading_api')
 
             elif ContentTypeMapper.is_assignment(content_type):
                 assignment_assets = self._extract_assignment_assets_by_item_id(course_id, item_id, content_type)
-                for asset in assignment_assets:
-                    if asset.url:
-                        urls.append({
-                            'name': asset.name,
-                            'url': asset.url,
-                            'file_type': asset.file_type,
-                            'source': 'assignment_api'
-                        })
+                urls = self._assets_to_url_data(assignment_assets, 'assignment_api')
 
             return urls
 
@@ -1350,14 +1484,24 @@ class CourseScraper(LoggerMixin):
             self.logger.warning(f"Failed to extract URLs via individual API calls for {item_id}: {e}")
             return []
 
+    def _assets_to_url_data(self, assets: List[ContentAsset], source: str) -> List[Dict]:
+        """Convert extracted assets into the URL records used to build lesson assets."""
+        return [{
+            'name': asset.name,
+            'url': asset.url,
+            'file_type': asset.file_type,
+            'source': source,
+            'resolution': asset.metadata.get('resolution'),
+            'quality': asset.metadata.get('quality'),
+            'format': asset.metadata.get('format'),
+            'lecture_media': asset.metadata.get('lecture_media')
+        } for asset in assets if asset.url]
+
     def _extract_assignment_assets_by_item_id(self, course_id: str, item_id: str, content_type: str) -> List[ContentAsset]:
         """Extract assignment assets (may have instructions, submissions, etc.)."""
         try:
             # For assignments, try different API endpoints
-            possible_endpoints = [
-                f"https://www.coursera.org/api/onDemandLearnerAssignments.v1/{course_id}~{item_id}",
-                f"https://www.coursera.org/api/onDemandLectureReadings.v1/{course_id}~{item_id}?includes=reading&fields=onDemandReadings.v1(url%2Ctitle%2Cdescription%2CreadingType)"
-            ]
+            possible_endpoints = [endpoint.format(course_id=course_id, item_id=item_id) for endpoint in ASSIGNMENT_ENDPOINTS]
 
             headers = self.client.auth.get_headers(include_csrf=False)
             cookies = self.client.auth.get_cookies()
@@ -1397,7 +1541,7 @@ class CourseScraper(LoggerMixin):
         """Extract reading/supplement assets using individual API calls."""
         try:
             # Try the reading API endpoint
-            reading_url = f"https://www.coursera.org/api/onDemandLectureReadings.v1/{course_id}~{item_id}?includes=reading&fields=onDemandReadings.v1(url%2Ctitle%2Cdescription%2CreadingType)"
+            reading_url = READING_ENDPOINT.format(course_id=course_id, item_id=item_id)
 
             headers = self.client.auth.get_headers(include_csrf=False)
             cookies = self.client.auth.get_cookies()
@@ -1412,8 +1556,8 @@ class CourseScraper(LoggerMixin):
             self.logger.warning(f"Failed to extract reading for {item_id}: {e}")
         return []
 
-    def _download_lesson_assets(self, lesson: Lesson, progress: Progress) -> None:
-        """Download assets for a lesson, extracting URLs if needed."""
+    def _queue_lesson_assets(self, lesson: Lesson) -> None:
+        """Extract URLs for a lesson if needed and queue its assets for download."""
         try:
             # First, try to extract actual content URLs if we have comprehensive API data
             if 'coursera_item_ids' in lesson.metadata:
@@ -1430,48 +1574,66 @@ class CourseScraper(LoggerMixin):
                 self.logger.info(f"No downloadable assets found for lesson: {lesson.name}")
                 return
 
-            # Create download progress for this lesson
-            download_task = progress.add_task(
-                f"    Downloading {lesson.name}",
-                total=len(downloadable_assets)
-            )
-
             for asset in downloadable_assets:
-                try:
-                    progress.update(download_task, description=f"    Downloading: {asset.name}")
-
-                    # Check if this is a video asset and pass sequence number
-                    if asset.file_type == 'video':
-                        success = self.file_manager.download_asset(
-                            asset,
-                            lesson.local_path,
-                            sequence_number=self.video_sequence_counter
-                        )
-
-                        if success:
-                            self.logger.info(f"Downloaded video {self.video_sequence_counter}: {asset.name}")
-                            self.video_sequence_counter += 1
-                    else:
-                        # For non-video assets, use regular download
-                        success = self.file_manager.download_asset(asset, lesson.local_path)
-
-                    if success:
-                        asset.downloaded = True
-                        self.current_progress.downloaded_assets += 1
-                    else:
-                        self.current_progress.failed_downloads.append(f"{lesson.name}/{asset.name}")
-
-                    progress.advance(download_task)
-
-                    # Add small delay to avoid overwhelming the server
-                    time.sleep(0.1)
-
-                except Exception as e:
-                    self.logger.error(f"Failed to download asset {asset.name}: {e}")
-                    self.current_progress.failed_downloads.append(f"{lesson.name}/{asset.name}")
-                    progress.advance(download_task)
+                # Videos are numbered in course order as they are queued, so names do not depend on completion order
+                sequence_number = None
+                if asset.file_type == 'video':
+                    sequence_number = self.video_sequence_counter
+                    self.video_sequence_counter += 1
+
+                file_path = lesson.local_path / self.file_manager.get_asset_filename(asset, sequence_number)
+                if file_path.exists():
+                    self.logger.info(f"File already exists: {file_path}")
+                    asset.local_path = file_path
+                    asset.downloaded = True
+                    self.current_progress.downloaded_assets += 1
+                    continue
 
-            progress.remove_task(download_task)
+                hls_url = asset.url if asset.metadata.get('format') == 'hls' else (
+                    (asset.metadata.get('lecture_media') or {}).get('hls_playlist')
+                )
+                self.download_queue.append((lesson, asset, {
+                    'type': 'video' if asset.file_type == 'video' else 'file',
+                    'lesson_id': lesson.id,
+                    'lesson_name': lesson.name,
+                    'filename': file_path.name,
+                    'url': None if asset.metadata.get('format') == 'hls' else asset.url,
+                    'hls_url': hls_url,
+                    'local_path': file_path,
+                    # Lets the engine re-resolve the video URL if it expires before its turn
+                    'item_id': asset.metadata.get('item_id'),
+                    'course_id': asset.metadata.get('course_id') or lesson.metadata.get('course_id'),
+                    'resolution': asset.metadata.get('resolution')
+                }))
 
         except Exception as e:
-            self.logger.error(f"Failed to download lesson assets for {lesson.name}: {e}")
+            self.logger.error(f"Failed to queue lesson assets for {lesson.name}: {e}")
+
+    def _download_queued_assets(self, course_path: Optional[Path] = None) -> None:
+        """
+        Download all queued assets through the async download engine.
+
+        At most ``concurrent_downloads`` files are in flight; interrupted
+        files are continued from their ``.part`` files as before. With a
+        course_path, each finished file is recorded in the course manifest.
+        """
+        downloader = EnhancedVideoDownloader(
+            auth=self.client.auth,
+            file_manager=self.file_manager,
+            max_concurrent=self.config.download_settings.concurrent_downloads,
+            rate_limit=parse_rate(self.config.download_settings.max_download_rate)
+        )
+        downloader.download_media([media for _, _, media in self.download_queue], course_path, resume=True)
+
+        for lesson, asset, media in self.download_queue:
+            # Keep URLs the engine re-resolved after they expired
+            asset.url = media['url'] or media.get('hls_url')
+            if media.get('downloaded'):
+                asset.local_path = media['local_path']
+                asset.file_size = media['local_path'].stat().st_size
+                asset.downloaded = True
+                self.current_progress.downloaded_assets += 1
+            else:
+                self.current_progress.failed_downloads.append(f"{lesson.name}/{asset.name}")
+
+        self.download_queue = []
@@ -1,6 +1,11 @@
 """Main CLI entry point for the Coursera scraper."""
 
+import json
+import logging
 import sys
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
 import click
 from rich.console import Console
 from rich.panel import Panel
@@ -10,19 +15,127 @@ from rich.table import Table
 from .config.settings import ConfigManager
 from .api.auth import CourseraAuth
 from .api.coursera_client import CourseraClient
+from .api.download_scheduler import DEFAULT_LEASE_SECONDS
+from .api.response_cache import RESPONSE_CACHE_DIR, ResponseCache
+from .core.course_manifest import FILE_COMPLETE, FILE_FAILED, FILE_PENDING, CourseManifest
 from .core.file_manager import FileManager
+from .core.integrity import INTEGRITY_OK, requeue_files, verify_files
 from .utils.exceptions import (
     CourseraScraperError, AuthenticationError, ConfigurationError
 )
-from .utils.logger import setup_logger
+from .utils.logger import get_handlers, setup_logger, stop_logging
+from .utils.rate_limiter import parse_rate
 
 # Create console for rich output
 console = Console()
 
+
+def _create_response_cache(config: ConfigManager, refresh: bool) -> ResponseCache:
+    """Create the API response cache in the output directory using per-endpoint TTLs."""
+    return ResponseCache.from_api_config_data(
+        config.get_output_dir() / RESPONSE_CACHE_DIR,
+        config.get_api_config_data(),
+        max_size_mb=config.app_settings.response_cache_max_mb,
+        refresh=refresh
+    )
+
+
+def _send_output_to_stderr(logger: logging.Logger) -> None:
+    """Move console and log output off stdout, which then carries only JSON progress snapshots."""
+    console.file = sys.stderr
+    for handler in get_handlers(logger):
+        if isinstance(handler, logging.StreamHandler) and handler.stream is sys.stdout:
+            handler.setStream(sys.stderr)
+
+
+def _shared_download_worker(course_path: Path, target_resolution: str, resume: bool, lease_seconds: float,
+                            output_dir: Optional[str], refresh: bool, options: Dict[str, Any]) -> Dict[str, Any]:
+    """One worker process of `download --workers`, with its own auth, session and engine."""
+    from .api.enhanced_downloader import EnhancedVideoDownloader
+
+    config = ConfigManager()
+    if output_dir:
+        config.app_settings.default_output_dir = output_dir
+    downloader = EnhancedVideoDownloader(
+        auth=CourseraAuth(),
+        file_manager=FileManager(config.get_output_dir()),
+        response_cache=_create_response_cache(config, refresh),
+        logger=setup_logger(),
+        **options
+    )
+    try:
+        return downloader.download_course_shared(course_path, target_resolution, resume, lease_seconds=lease_seconds)
+    finally:
+        # Pool processes exit without running atexit, so write out queued log records now
+        stop_logging()
+
+
+def _sum_download_stats(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Add up the downloaded, skipped and failed counts and connections of several workers."""
+    total: Dict[str, Any] = {}
+    for result in results:
+        for kind in ('videos', 'subtitles', 'supplements'):
+            counts = total.setdefault(kind, {'downloaded': 0, 'skipped': 0, 'failed': 0})
+            for key, value in result.get(kind, {}).items():
+                counts[key] = counts.get(key, 0) + value
+        if result.get('connections'):
+            connections = total.setdefault('connections', {'requests': 0, 'connections_created': 0, 'connections_reused': 0})
+            for key in connections:
+                connections[key] += result['connections'][key]
+    return total
+
+
+def _read_course_list(path: Path) -> List[str]:
+    """Course names from a batch file, one per line; blank lines and # comments are skipped."""
+    names = []
+    for line in path.read_text(encoding='utf-8').splitlines():
+        name = line.split('#', 1)[0].strip()
+        if name:
+            names.append(name)
+    return names
+
+
+def _course_counts(course_path: Path) -> Dict[str, Any]:
+    """
+    Module, lesson and video counts for the status command.
+
+    Read from the course manifest when there is one; courses scraped before
+    the manifest existed are counted by walking the directory tree.
+    """
+    if CourseManifest.exists(course_path):
+        with CourseManifest(course_path) as manifest:
+            summary = manifest.summary()
+            breakdown = manifest.module_breakdown()
+        videos = summary['files'].get('video', {})
+        return {
+            'modules': summary['modules'],
+            'lessons': summary['lessons'],
+            'videos': videos.get(FILE_COMPLETE, 0),
+            'size_mb': summary['complete_bytes'].get('video', 0) / 1024 / 1024,
+            'pending': sum(counts.get(FILE_PENDING, 0) for counts in summary['files'].values()),
+            'failed': sum(counts.get(FILE_FAILED, 0) for counts in summary['files'].values()),
+            'breakdown': breakdown
+        }
+
+    counts = {'modules': 0, 'lessons': 0, 'videos': 0, 'size_mb': 0.0, 'breakdown': []}
+    for module_path in sorted(course_path.glob("module-*")):
+        if module_path.is_dir():
+            lesson_dirs = [d for d in module_path.glob("lesson-*") if d.is_dir()]
+            video_files = [vf for ld in lesson_dirs for vf in list(ld.glob("*.mp4")) + list(ld.glob("*.webm"))]
+            counts['modules'] += 1
+            counts['lessons'] += len(lesson_dirs)
+            counts['videos'] += len(video_files)
+            counts['size_mb'] += sum(vf.stat().st_size for vf in video_files) / 1024 / 1024
+            counts['breakdown'].append((module_path.name, len(lesson_dirs), len(video_files)))
+    return counts
+
+
 @click.group()
 @click.version_option(version="1.0.0")
+@click.option('--log-json', type=click.Path(dir_okay=False, path_type=Path), envvar='LOG_JSON',
+              help='Also write logs as JSON Lines to this file, for log ingestion (env: LOG_JSON)')
 @click.pass_context
-def cli(ctx):
+def cli(ctx, log_json):
     """
     Coursera Course Scraper - Organize course content into structured folders.
     """
@@ -30,7 +143,7 @@ def cli(ctx):
 
     # Setup basic logging
     try:
-        logger = setup_logger()
+        logger = setup_logger(json_log=log_json)
         ctx.obj['logger'] = logger
     except Exception as e:
         console.print(f"[red]Failed to setup logging: {e}[/red]")
@@ -43,8 +156,9 @@ def cli(ctx):
 @click.option('--config-dir', '-c', default='config', help='Configuration directory')
 @click.option('--dry-run', is_flag=True, help='Show what would be done without actually doing it')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
+@click.option('--refresh', is_flag=True, help='Ignore cached API responses and fetch fresh course metadata')
 @click.pass_context
-def scrape(ctx, course_name, output_dir, config_dir, dry_run, verbose):
+def scrape(ctx, course_name, output_dir, config_dir, dry_run, verbose, refresh):
     """
     Scrape any Coursera course and organize content into folders.
 
@@ -87,7 +201,13 @@ def scrape(ctx, course_name, output_dir, config_dir, dry_run, verbose):
         console.print("[blue]Initializing API client...[/blue]")
         client = CourseraClient.from_config_file(
             config.config_dir / "api_endpoints.json",
-            auth
+            auth,
+            timeout=config.app_settings.request_timeout,
+            max_retries=config.app_settings.retry_attempts,
+            backoff_factor=config.app_settings.retry_backoff_factor,
+            rate_limit_delay=1.0 / config.app_settings.requests_per_second,
+            rate_limit_burst=config.app_settings.request_burst,
+            response_cache=_create_response_cache(config, refresh)
         )
 
         # Test connection
@@ -115,6 +235,7 @@ def scrape(ctx, course_name, output_dir, config_dir, dry_run, verbose):
             if result:
                 console.print(f"\n[green]SUCCESS: Successfully scraped course: {course_name}[/green]")
                 console.print(f"[blue]Content saved to: {result.local_path}[/blue]")
+                console.print(f"[blue]API response cache: {client.response_cache.summary()}[/blue]")
             else:
                 console.print(f"[red]Failed to scrape course: {course_name}[/red]")
                 sys.exit(1)
@@ -147,22 +268,51 @@ def scrape(ctx, course_name, output_dir, config_dir, dry_run, verbose):
 @click.option('--output-dir', '-o', default=None, help='Output directory for course content')
 @click.option('--resolution', '-r', default='720p', help='Video resolution to download (default: 720p)')
 @click.option('--max-concurrent', '-c', default=3, help='Maximum concurrent downloads (default: 3)')
-@click.option('--resume', is_flag=True, help='Resume incomplete downloads')
+@click.option('--resume', is_flag=True, help='Continue interrupted downloads from their .part files (HTTP Range)')
 @click.option('--subtitles/--no-subtitles', default=True, help='Download English subtitles (.vtt) (default: enabled)')
 @click.option('--subtitle-language', default='en', help='Subtitle language to download (default: en)')
 @click.option('--supplements/--no-supplements', default=False, help='Download supplement materials (.html) (default: disabled)')
+@click.option('--segments', default=1, type=click.IntRange(1, 16), help='Parallel byte-range connections per large file (default: 1)')
+@click.option('--segment-threshold-mb', default=16, type=click.IntRange(1), help='Only split files of at least this many MB (default: 16)')
+@click.option('--refresh', is_flag=True, help='Ignore cached API responses for subtitle and supplement lookups')
+@click.option('--hls', default='auto', type=click.Choice(['auto', 'always', 'never']),
+              help='Use HLS playlists for videos: when MP4 is missing or fails (auto), preferred (always), or never (default: auto)')
+@click.option('--limit-rate', default=None, help='Total download rate, e.g. 500K or 5M (default: max_download_rate setting, else unlimited)')
+@click.option('--order', default='lesson', type=click.Choice(['lesson', 'shortest', 'largest']),
+              help='Download in course order, smallest files first, or largest first (default: lesson)')
+@click.option('--progress', 'progress_mode', default='tty', type=click.Choice(['tty', 'json', 'none']),
+              help='Progress bars, JSON snapshot lines on stdout for job runners, or none (default: tty)')
+@click.option('--shared', is_flag=True, help='Split the course with download workers on other hosts sharing the output directory')
+@click.option('--workers', '-w', default=1, type=click.IntRange(1), help='Local worker processes splitting the course (implies --shared) (default: 1)')
+@click.option('--lease-seconds', default=DEFAULT_LEASE_SECONDS, type=click.FloatRange(5),
+              help=f'Seconds before files of a worker that stopped responding are taken over (default: {DEFAULT_LEASE_SECONDS:.0f})')
 @click.pass_context
-def download(ctx, course_name, output_dir, resolution, max_concurrent, resume, subtitles, subtitle_language, supplements):
+def download(ctx, course_name, output_dir, resolution, max_concurrent, resume, subtitles, subtitle_language, supplements,
+             segments, segment_threshold_mb, refresh, hls, limit_rate, order, progress_mode, shared, workers, lease_seconds):
     """
     Download actual video files, subtitles, and supplements for a scraped course.
 
     Downloads 720p videos by default along with English subtitles (.vtt).
     Optionally downloads supplement materials (reading materials, PDFs, etc.) as HTML files.
     Files are saved with sequential naming: 1_video_name.mp4, 1_video_name.vtt, 1_supplement_name.html
+    With --segments N, large videos are fetched over N parallel range requests that share
+    the --max-concurrent connection budget. Videos without an MP4 at the requested
+    resolution, or whose MP4 transfer fails, are assembled from their HLS segments.
+    --limit-rate caps all transfers together; write a new rate to the course's
+    .rate_limit file (and optionally send SIGHUP) to change it while downloading.
+    --progress json prints an aggregate snapshot line every two seconds instead of
+    progress bars; everything else is written to stderr.
+    With --shared, files are claimed through leases in the course manifest so
+    workers on several hosts can split the course; --workers N starts N such
+    workers on this host. Each worker applies --max-concurrent and its share of
+    --limit-rate and of the .rate_limit file, so both cap this host's workers
+    together. Workers on other hosts apply the .rate_limit rate to their own host.
 
     COURSE_NAME: The course that was already scraped
     """
     logger = ctx.obj['logger']
+    if progress_mode == 'json':
+        _send_output_to_stderr(logger)
 
     try:
         # Show startup banner
@@ -181,6 +331,12 @@ def download(ctx, course_name, output_dir, resolution, max_concurrent, resume, s
         if output_dir:
             config.app_settings.default_output_dir = output_dir
 
+        try:
+            rate_limit = parse_rate(limit_rate if limit_rate is not None else config.download_settings.max_download_rate)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            sys.exit(1)
+
         # Setup authentication
         console.print("[blue]Setting up authentication...[/blue]")
         auth = CourseraAuth()
@@ -210,22 +366,55 @@ def download(ctx, course_name, output_dir, resolution, max_concurrent, resume, s
         # Import and run downloader
         from .api.enhanced_downloader import EnhancedVideoDownloader
 
-        downloader = EnhancedVideoDownloader(
-            auth=auth,
-            file_manager=file_manager,
-            max_concurrent=max_concurrent,
-            download_subtitles=subtitles,
-            subtitle_language=subtitle_language,
-            download_supplements=supplements,
-            logger=logger
-        )
+        options = {
+            'max_concurrent': max_concurrent,
+            'download_subtitles': subtitles,
+            'subtitle_language': subtitle_language,
+            'download_supplements': supplements,
+            'segments': segments,
+            'segment_threshold': segment_threshold_mb * 1024 * 1024,
+            'hls': hls,
+            'rate_limit': rate_limit,
+            'rate_share': 1 / workers,
+            'order': order,
+            'progress': progress_mode
+        }
+
+        if workers > 1:
+            console.print(f"[blue]Starting {workers} download workers...[/blue]")
+            # Bars from several processes would overwrite each other
+            options['progress'] = 'none' if progress_mode == 'tty' else progress_mode
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_shared_download_worker, course_path, resolution, resume, lease_seconds,
+                                output_dir, refresh, options)
+                    for _ in range(workers)
+                ]
+                result = _sum_download_stats([future.result() for future in futures])
+            downloader = None
+        else:
+            downloader = EnhancedVideoDownloader(
+                auth=auth,
+                file_manager=file_manager,
+                response_cache=_create_response_cache(config, refresh),
+                logger=logger,
+                **options
+            )
 
-        # Start downloading
-        result = downloader.download_course_videos_and_subtitles(
-            course_path=course_path,
-            target_resolution=resolution,
-            resume=resume
-        )
+            # Start downloading
+            if shared:
+                result = downloader.download_course_shared(
+                    course_path=course_path,
+                    target_resolution=resolution,
+                    resume=resume,
+                    lease_seconds=lease_seconds
+                )
+            else:
+                result = downloader.download_course_videos_and_subtitles(
+                    course_path=course_path,
+                    target_resolution=resolution,
+                    resume=resume
+                )
 
         if result:
             video_stats = result.get('videos', {})
@@ -236,6 +425,12 @@ def download(ctx, course_name, output_dir, resolution, max_concurrent, resume, s
             console.print(f"[blue]Videos: {video_stats.get('downloaded', 0)} downloaded | {video_stats.get('skipped', 0)} skipped | {video_stats.get('failed', 0)} failed[/blue]")
             console.print(f"[blue]Subtitles: {subtitle_stats.get('downloaded', 0)} downloaded | {subtitle_stats.get('skipped', 0)} skipped | {subtitle_stats.get('failed', 0)} failed[/blue]")
             console.print(f"[blue]Supplements: {supplement_stats.get('downloaded', 0)} downloaded | {supplement_stats.get('skipped', 0)} skipped | {supplement_stats.get('failed', 0)} failed[/blue]")
+
+            connection_stats = result.get('connections')
+            if connection_stats:
+                console.print(f"[blue]Connections: {connection_stats['connections_created']} opened | {connection_stats['connections_reused']} reused | {connection_stats['requests']} requests[/blue]")
+            if downloader:
+                console.print(f"[blue]API response cache: {downloader.response_cache.summary()}[/blue]")
         else:
             console.print("[red]Download failed[/red]")
             sys.exit(1)
@@ -246,6 +441,274 @@ def download(ctx, course_name, output_dir, resolution, max_concurrent, resume, s
         sys.exit(1)
 
 
+@cli.command('download-batch')
+@click.argument('course_names', nargs=-1)
+@click.option('--courses-file', '-f', type=click.Path(exists=True, dir_okay=False, path_type=Path),
+              help='File listing one course name per line (blank lines and # comments are ignored)')
+@click.option('--output-dir', '-o', default=None, help='Output directory for course content')
+@click.option('--resolution', '-r', default='720p', help='Video resolution to download (default: 720p)')
+@click.option('--max-concurrent', '-c', default=6, help='Maximum concurrent downloads across all courses (default: 6)')
+@click.option('--resume', is_flag=True, help='Continue interrupted downloads from their .part files (HTTP Range)')
+@click.option('--subtitles/--no-subtitles', default=True, help='Download English subtitles (.vtt) (default: enabled)')
+@click.option('--subtitle-language', default='en', help='Subtitle language to download (default: en)')
+@click.option('--supplements/--no-supplements', default=False, help='Download supplement materials (.html) (default: disabled)')
+@click.option('--segments', default=1, type=click.IntRange(1, 16), help='Parallel byte-range connections per large file (default: 1)')
+@click.option('--segment-threshold-mb', default=16, type=click.IntRange(1), help='Only split files of at least this many MB (default: 16)')
+@click.option('--refresh', is_flag=True, help='Ignore cached API responses for subtitle and supplement lookups')
+@click.option('--hls', default='auto', type=click.Choice(['auto', 'always', 'never']),
+              help='Use HLS playlists for videos: when MP4 is missing or fails (auto), preferred (always), or never (default: auto)')
+@click.option('--limit-rate', default=None, help='Total download rate of the batch, e.g. 500K or 5M (default: max_download_rate setting, else unlimited)')
+@click.option('--order', default='lesson', type=click.Choice(['lesson', 'shortest', 'largest']),
+              help='Download in course order, smallest files first, or largest first (default: lesson)')
+@click.option('--progress', 'progress_mode', default='tty', type=click.Choice(['tty', 'json', 'none']),
+              help='Progress bars, JSON snapshot lines on stdout for job runners, or none (default: tty)')
+@click.option('--report', 'report_path', type=click.Path(dir_okay=False, path_type=Path),
+              help='Also write the per-course report to this JSON file')
+@click.pass_context
+def download_batch(ctx, course_names, courses_file, output_dir, resolution, max_concurrent, resume, subtitles,
+                   subtitle_language, supplements, segments, segment_threshold_mb, refresh, hls, limit_rate, order,
+                   progress_mode, report_path):
+    """
+    Download several scraped courses in one run.
+
+    Media from all courses share one worker pool, connection pool and
+    --limit-rate budget, so the run is limited by the link rather than by the
+    slowest file of each course. Courses come from the arguments and from
+    --courses-file; courses that have not been scraped are reported and skipped.
+    Write a rate to .rate_limit in the output directory to change the limit
+    while downloading. Ends with a table of results per course.
+
+    COURSE_NAMES: Courses that were already scraped
+    """
+    logger = ctx.obj['logger']
+    if progress_mode == 'json':
+        _send_output_to_stderr(logger)
+
+    names = list(course_names)
+    if courses_file:
+        names += _read_course_list(courses_file)
+    # Keep the first mention of each course
+    names = list(dict.fromkeys(names))
+    if not names:
+        console.print("[red]No courses given. Pass course names or --courses-file.[/red]")
+        sys.exit(1)
+
+    try:
+        console.print(Panel.fit(
+            Text("Coursera Batch Downloader", style="bold green"),
+            subtitle=f"Downloading {len(names)} courses at {resolution}..."
+        ))
+
+        config = ConfigManager()
+        if output_dir:
+            config.app_settings.default_output_dir = output_dir
+
+        try:
+            rate_limit = parse_rate(limit_rate if limit_rate is not None else config.download_settings.max_download_rate)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            sys.exit(1)
+
+        auth = CourseraAuth()
+        if not auth.is_authenticated():
+            console.print("[red]Authentication failed. Please check your API token.[/red]")
+            sys.exit(1)
+
+        file_manager = FileManager(config.get_output_dir())
+
+        course_paths = {}
+        for name in names:
+            course_path = file_manager.get_existing_course_path(name)
+            if course_path and (course_path / "course_metadata.json").exists():
+                course_paths[name] = course_path
+            else:
+                console.print(f"[yellow]Skipping {name}: not scraped yet (run 'scrape' first)[/yellow]")
+        if not course_paths:
+            console.print("[red]None of the courses have been scraped[/red]")
+            sys.exit(1)
+
+        from .api.enhanced_downloader import RATE_CONTROL_FILENAME, EnhancedVideoDownloader
+
+        downloader = EnhancedVideoDownloader(
+            auth=auth,
+            file_manager=file_manager,
+            max_concurrent=max_concurrent,
+            download_subtitles=subtitles,
+            subtitle_language=subtitle_language,
+            download_supplements=supplements,
+            segments=segments,
+            segment_threshold=segment_threshold_mb * 1024 * 1024,
+            response_cache=_create_response_cache(config, refresh),
+            hls=hls,
+            rate_limit=rate_limit,
+            order=order,
+            progress=progress_mode,
+            logger=logger
+        )
+
+        result = downloader.download_courses(
+            list(course_paths.values()),
+            target_resolution=resolution,
+            resume=resume,
+            rate_control_file=config.get_output_dir() / RATE_CONTROL_FILENAME
+        )
+
+        table = Table(title="Batch Download")
+        for column in ("Course", "Queued", "Downloaded", "Failed", "MB", "Complete"):
+            table.add_column(column, justify="left" if column == "Course" else "right")
+        report = {}
+        for name in names:
+            if name not in course_paths:
+                report[name] = {'status': 'not scraped'}
+                table.add_row(name, "-", "-", "-", "-", "[yellow]not scraped[/yellow]")
+                continue
+            counts = result['courses'][str(course_paths[name])]
+            report[name] = {'status': 'failed' if counts['failed'] else 'ok', 'path': str(course_paths[name]), **counts}
+            failed = f"[red]{counts['failed']}[/red]" if counts['failed'] else "0"
+            table.add_row(name, str(counts['queued']), str(counts['downloaded']), failed,
+                          f"{counts['bytes'] / 1024 / 1024:.1f}", str(counts['complete']))
+        console.print(table)
+
+        totals = {key: sum(counts.get(key, 0) for counts in report.values()) for key in ('queued', 'downloaded', 'failed', 'bytes')}
+        console.print(f"[blue]Total: {totals['downloaded']} of {totals['queued']} downloaded | {totals['failed']} failed | {totals['bytes'] / 1024 / 1024:.1f} MB[/blue]")
+        connection_stats = result.get('connections')
+        if connection_stats:
+            console.print(f"[blue]Connections: {connection_stats['connections_created']} opened | {connection_stats['connections_reused']} reused | {connection_stats['requests']} requests[/blue]")
+
+        if report_path:
+            report_path.write_text(json.dumps({'courses': report, 'totals': totals}, indent=2))
+            console.print(f"[green]Report written to {report_path}[/green]")
+
+    except Exception as e:
+        console.print(f"[red]Batch Download Error: {e}[/red]")
+        logger.exception("Batch download error occurred")
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('course_name')
+@click.option('--output-dir', '-o', default=None, help='Output directory for course content')
+@click.option('--workers', '-w', default=None, type=click.IntRange(1), help='Processes hashing files (default: one per CPU core)')
+@click.option('--requeue', is_flag=True, help='Delete damaged files and mark them pending for the next download run')
+def verify(course_name, output_dir, workers, requeue):
+    """
+    Verify downloaded files against the sizes and checksums in the course manifest.
+
+    Files are re-hashed in parallel across CPU cores. Missing, truncated and
+    corrupt files are listed; with --requeue they are removed and marked
+    pending so the next 'download' run fetches them again.
+
+    COURSE_NAME: The course that was already downloaded
+    """
+    try:
+        config = ConfigManager()
+        if output_dir:
+            config.app_settings.default_output_dir = output_dir
+
+        course_path = FileManager(config.get_output_dir()).get_existing_course_path(course_name)
+        if not course_path:
+            console.print(f"[red]Course not found: {course_name}[/red]")
+            sys.exit(1)
+        if not CourseManifest.exists(course_path):
+            console.print("[red]Course manifest not found. Run 'scrape' and 'download' first.[/red]")
+            sys.exit(1)
+
+        with CourseManifest(course_path) as manifest:
+            records = manifest.files_to_verify()
+            console.print(f"[blue]Verifying {len(records)} files...[/blue]")
+            results = verify_files(records, workers)
+
+            # Adopted files had no hash yet; passing ones get it now
+            manifest.record_verified((record['path'], digest) for record, status, digest in results if status == INTEGRITY_OK)
+            problems = [(record, status) for record, status, _ in results if status != INTEGRITY_OK]
+
+            if not problems:
+                console.print(f"[green]SUCCESS: All {len(results)} files verified[/green]")
+                return
+
+            table = Table(title="Damaged Files")
+            table.add_column("File", style="cyan")
+            table.add_column("Type")
+            table.add_column("Problem", style="red")
+            for record, status in problems:
+                table.add_row(str(record['path'].relative_to(course_path)), record['media_type'], status)
+            console.print(table)
+
+            if requeue:
+                requeued = requeue_files(manifest, [record for record, _ in problems])
+                console.print(f"[yellow]Requeued {requeued} files; run 'download' to fetch them again[/yellow]")
+            else:
+                console.print(f"[yellow]{len(problems)} of {len(results)} files failed verification; use --requeue to fetch them again[/yellow]")
+                sys.exit(1)
+
+    except Exception as e:
+        console.print(f"[red]Verification Error: {e}[/red]")
+        sys.exit(1)
+
+
+@cli.command()
+@click.option('--engine', '-e', default='both', type=click.Choice(['scrape', 'download', 'both']),
+              help='scrape: materials, lecture lookups and downloads; download: the download engine on a scraped course (default: both)')
+@click.option('--modules', default=2, type=click.IntRange(1), help='Modules in the generated course (default: 2)')
+@click.option('--lessons', default=4, type=click.IntRange(1), help='Lessons per module (default: 4)')
+@click.option('--videos-per-lesson', default=2, type=click.IntRange(1), help='Lecture videos per lesson (default: 2)')
+@click.option('--video-mb', default=4.0, type=click.FloatRange(0.01), help='Size of every video in MB (default: 4)')
+@click.option('--latency-ms', default=0.0, type=click.FloatRange(0), help='Delay before every response starts (default: 0)')
+@click.option('--bandwidth', default=None, help='Bytes per second per media response, e.g. 2M (default: unlimited)')
+@click.option('--error-rate', default=0.0, type=click.FloatRange(0, 1), help='Fraction of requests answered with HTTP 503 (default: 0)')
+@click.option('--no-ranges', is_flag=True, help='Serve media without Range support')
+@click.option('--max-concurrent', '-c', default=3, type=click.IntRange(1), help='Maximum concurrent downloads (default: 3)')
+@click.option('--segments', default=1, type=click.IntRange(1, 16), help='Parallel byte-range connections per large file (default: 1)')
+@click.option('--segment-threshold-mb', default=16, type=click.IntRange(1), help='Only split files of at least this many MB (default: 16)')
+@click.option('--json', 'json_path', type=click.Path(dir_okay=False, path_type=Path), help='Also write the results as JSON to this file')
+@click.option('--config-dir', default='config', help='Configuration directory for the scrape engine (default: config)')
+def bench(engine, modules, lessons, videos_per_lesson, video_mb, latency_ms, bandwidth, error_rate, no_ranges,
+          max_concurrent, segments, segment_threshold_mb, json_path, config_dir):
+    """
+    Benchmark the scrape and download engines against a local Coursera stand-in.
+
+    A generated course is served from a local aiohttp server with the given
+    latency, bandwidth, error rate and Range support; no Coursera account or
+    network access is used. Reports files/s, MB/s, CPU% and peak RSS.
+    """
+    from .benchmark.fake_coursera import FakeCourseSpec, NetworkProfile
+    from .benchmark.runner import ENGINES, run_benchmark
+
+    try:
+        spec = FakeCourseSpec(modules=modules, lessons_per_module=lessons, videos_per_lesson=videos_per_lesson,
+                              video_size=int(video_mb * 1024 * 1024))
+        profile = NetworkProfile(latency=latency_ms / 1000, bandwidth=parse_rate(bandwidth), error_rate=error_rate,
+                                 ranges=not no_ranges)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+
+    try:
+        results = []
+        for name in ENGINES if engine == 'both' else (engine,):
+            console.print(f"[blue]Benchmarking {name} engine: {spec.video_count} videos of {video_mb:g} MB...[/blue]")
+            results.append(run_benchmark(name, spec, profile, max_concurrent=max_concurrent, segments=segments,
+                                         segment_threshold=segment_threshold_mb * 1024 * 1024, config_dir=config_dir))
+
+        table = Table(title="Benchmark")
+        for column in ("Engine", "Files", "Failed", "Seconds", "Files/s", "MB/s", "CPU %", "Peak RSS MB", "Requests"):
+            table.add_column(column, justify="left" if column == "Engine" else "right")
+        for result in results:
+            failed = f"[red]{result.failed}[/red]" if result.failed else "0"
+            peak_rss = f"{result.peak_rss / 1024 / 1024:.0f}" if result.peak_rss else "-"
+            table.add_row(result.engine, str(result.files), failed, f"{result.seconds:.2f}", f"{result.files_per_sec:.1f}",
+                          f"{result.mb_per_sec:.1f}", f"{result.cpu_percent:.0f}", peak_rss, str(result.server['requests']))
+        console.print(table)
+
+        if json_path:
+            json_path.write_text(json.dumps([result.as_dict() for result in results], indent=2))
+            console.print(f"[green]Results written to {json_path}[/green]")
+
+    except Exception as e:
+        console.print(f"[red]Benchmark Error: {e}[/red]")
+        sys.exit(1)
+
+
 @cli.command()
 @click.option('--config-dir', '-c', default='config', help='Configuration directory')
 def config(config_dir):
@@ -276,6 +739,7 @@ def config(config_dir):
             table.add_row("File Types", ", ".join(download.file_types))
             table.add_row("Max File Size", f"{download.max_file_size_mb}MB")
             table.add_row("Concurrent Downloads", str(download.concurrent_downloads))
+            table.add_row("Max Download Rate", download.max_download_rate or "unlimited")
             table.add_row("Skip Existing", str(download.skip_existing))
 
         console.print(table)
@@ -354,34 +818,22 @@ def status(course_dir):
             console.print(f"\n[bold cyan]Course: {course_dir}[/bold cyan]")
             console.print(f"[blue]Location: {course_path}[/blue]\n")
 
-            # Count modules and lessons
-            module_count = 0
-            total_lessons = 0
-            total_videos = 0
-            total_size_mb = 0
-
-            for module_path in sorted(course_path.glob("module-*")):
-                if module_path.is_dir():
-                    module_count += 1
-                    lesson_dirs = [d for d in module_path.glob("lesson-*") if d.is_dir()]
-                    total_lessons += len(lesson_dirs)
-
-                    # Count videos in this module
-                    for lesson_dir in lesson_dirs:
-                        video_files = list(lesson_dir.glob("*.mp4")) + list(lesson_dir.glob("*.webm"))
-                        total_videos += len(video_files)
-                        for vf in video_files:
-                            total_size_mb += vf.stat().st_size / 1024 / 1024
+            # Count modules, lessons and videos
+            counts = _course_counts(course_path)
+            total_size_mb = counts['size_mb']
 
             # Create detailed table
             table = Table(title=f"Course Details: {course_dir}")
             table.add_column("Metric", style="cyan")
             table.add_column("Value", style="magenta", justify="right")
 
-            table.add_row("Total Modules", str(module_count))
-            table.add_row("Total Lessons", str(total_lessons))
-            table.add_row("Total Videos", str(total_videos))
+            table.add_row("Total Modules", str(counts['modules']))
+            table.add_row("Total Lessons", str(counts['lessons']))
+            table.add_row("Total Videos", str(counts['videos']))
             table.add_row("Total Size", f"{total_size_mb:.1f} MB ({total_size_mb/1024:.2f} GB)")
+            if 'pending' in counts:
+                table.add_row("Pending Downloads", str(counts['pending']))
+                table.add_row("Failed Downloads", str(counts['failed']))
 
             # Check progress
             progress_path = file_manager.get_progress_file_path(course_path)
@@ -402,11 +854,8 @@ def status(course_dir):
 
             # Show module breakdown
             console.print("\n[bold cyan]Module Breakdown:[/bold cyan]")
-            for module_path in sorted(course_path.glob("module-*")):
-                if module_path.is_dir():
-                    lesson_dirs = [d for d in module_path.glob("lesson-*") if d.is_dir()]
-                    videos_in_module = sum(len(list(ld.glob("*.mp4"))) for ld in lesson_dirs)
-                    console.print(f"  [blue]{module_path.name}[/blue]: {len(lesson_dirs)} lessons, {videos_in_module} videos")
+            for module_name, lesson_count, videos_in_module in counts['breakdown']:
+                console.print(f"  [blue]{module_name}[/blue]: {lesson_count} lessons, {videos_in_module} videos")
 
         else:
             # Show all courses
@@ -423,9 +872,7 @@ def status(course_dir):
                     course_count += 1
 
                     # Count modules and lessons
-                    module_count = len([p for p in course_path.glob("module-*") if p.is_dir()])
-                    lesson_count = len(list(course_path.rglob("lesson-*")))
-                    video_count = len(list(course_path.glob("**/*.mp4")))
+                    counts = _course_counts(course_path)
 
                     # Check for progress file
                     progress_path = file_manager.get_progress_file_path(course_path)
@@ -441,9 +888,9 @@ def status(course_dir):
 
                     table.add_row(
                         course_path.name,
-                        str(module_count),
-                        str(lesson_count),
-                        str(video_count),
+                        str(counts['modules']),
+                        str(counts['lessons']),
+                        str(counts['videos']),
                         status
                     )
 
@@ -1,20 +1,93 @@
 """Logging configuration and utilities."""
 
+import atexit
+import json
 import logging
 import logging.handlers
+import os
+import queue
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Union
 import sys
 
+# Logger that setup_logger configures; LoggerMixin loggers are its children
+APP_LOGGER = "coursera_scraper"
+
+# LogRecord attributes that are not ``extra`` fields
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'taskName'}
+
+# Writer threads of configured loggers, by logger name
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line, for log ingestion."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'function': record.funcName,
+            'line': record.lineno,
+            'thread': record.threadName,
+            'process': record.process
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        # Fields passed with extra={...}
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records as they are, leaving message formatting to the writer thread.
+
+    QueueHandler formats the message before queueing so records can be pickled;
+    the queue here never leaves the process, so that work is moved off the
+    calling thread (usually the download event loop). Arguments of %-style log
+    calls are formatted later and should not be mutated after the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _ConsoleFilter(logging.Filter):
+    """Lets component (LoggerMixin) records reach the console only from WARNING up."""
+
+    def __init__(self, name: str):
+        super().__init__()
+        self.app_name = name
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.name == self.app_name or record.levelno >= logging.WARNING
+
 
 def setup_logger(
-    name: str = "coursera_scraper",
+    name: str = APP_LOGGER,
     log_level: str = "INFO",
     log_dir: str = "logs",
     max_bytes: int = 10 * 1024 * 1024,  # 10MB
-    backup_count: int = 3
+    backup_count: int = 3,
+    json_log: Optional[Union[str, Path]] = None
 ) -> logging.Logger:
-    """Set up structured logging with file rotation."""
+    """
+    Set up structured logging with file rotation.
+
+    The logger gets a single QueueHandler; the rotating file, console and
+    optional JSON Lines (``json_log``) handlers run on a background writer
+    thread, so logging from async code never blocks on file I/O. The thread
+    is stopped and the queue drained at exit, or by stop_logging().
+    """
 
     # Create logs directory if it doesn't exist
     log_path = Path(log_dir)
@@ -50,17 +123,69 @@ def setup_logger(
         '%(levelname)s: %(message)s'
     )
     console_handler.setFormatter(console_formatter)
-
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    console_handler.addFilter(_ConsoleFilter(name))
+
+    handlers: List[logging.Handler] = [file_handler, console_handler]
+
+    # Structured sink for log ingestion
+    if json_log:
+        json_path = Path(json_log)
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        json_handler = logging.FileHandler(json_path)
+        json_handler.setLevel(logging.DEBUG)
+        json_handler.setFormatter(JsonFormatter())
+        handlers.append(json_handler)
+
+    # Handlers run on the listener's thread
+    records = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    if not _listeners:
+        atexit.register(stop_logging)
+    _listeners[name] = listener
+    logger.addHandler(_DeferredQueueHandler(records))
 
     return logger
 
 
+def stop_logging(name: Optional[str] = None) -> None:
+    """Write out queued records and stop the writer thread of one configured logger, or of all."""
+    for logger_name in [name] if name else list(_listeners):
+        listener = _listeners.pop(logger_name, None)
+        if listener:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+            logging.getLogger(logger_name).handlers = [
+                handler for handler in logging.getLogger(logger_name).handlers
+                if not isinstance(handler, _DeferredQueueHandler)
+            ]
+
+
+def _restart_after_fork() -> None:
+    """Give a forked child its own writer threads; the parent's do not exist in it."""
+    for name, listener in list(_listeners.items()):
+        records = queue.SimpleQueue()
+        for handler in logging.getLogger(name).handlers:
+            if isinstance(handler, _DeferredQueueHandler):
+                handler.queue = records
+        _listeners[name] = logging.handlers.QueueListener(records, *listener.handlers, respect_handler_level=True)
+        _listeners[name].start()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def get_handlers(logger: logging.Logger) -> List[logging.Handler]:
+    """Handlers that write a logger's records, including those behind its queue."""
+    listener = _listeners.get(logger.name)
+    return list(listener.handlers) if listener else list(logger.handlers)
+
+
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """Get a logger instance."""
-    logger_name = name if name else "coursera_scraper"
+    logger_name = name if name else APP_LOGGER
     return logging.getLogger(logger_name)
 
 
@@ -69,25 +194,25 @@ class LoggerMixin:
 
     @property
     def logger(self) -> logging.Logger:
-        """Get logger for this class."""
-        return get_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        """Get logger for this class, a child of the application logger."""
+        return get_logger(f"{APP_LOGGER}.{self.__class__.__module__}.{self.__class__.__name__}")
 
 
 # Progress logging utilities
 def log_api_request(logger: logging.Logger, method: str, url: str, status_code: Optional[int] = None):
     """Log API request details."""
     if status_code:
-        logger.info(f"{method} {url} -> {status_code}")
+        logger.info("%s %s -> %s", method, url, status_code)
     else:
-        logger.info(f"{method} {url}")
+        logger.info("%s %s", method, url)
 
 
 def log_download_progress(logger: logging.Logger, filename: str, progress: float, total_size: int):
     """Log download progress."""
-    logger.debug(f"Downloading {filename}: {progress:.1f}% ({total_size} bytes)")
+    logger.debug("Downloading %s: %.1f%% (%d bytes)", filename, progress, total_size)
 
 
 def log_scraping_progress(logger: logging.Logger, course_name: str, modules_done: int, total_modules: int):
     """Log course scraping progress."""
     progress = (modules_done / total_modules) * 100 if total_modules > 0 else 0
-    logger.info(f"Course '{course_name}': {modules_done}/{total_modules} modules ({progress:.1f}%)")
\ No newline at end of file
+    logger.info("Course '%s': %d/%d modules (%.1f%%)", course_name, modules_done, total_modules, progress)
@@ -0,0 +1,269 @@
+"""Resumable partial downloads tracked with a JSON sidecar file."""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from .exceptions import DownloadError
+
+# Bytes in flight live in "<name>.part", resume state in "<name>.part.json"
+PART_SUFFIX = ".part"
+SIDECAR_SUFFIX = ".part.json"
+
+# Response read sizes: small files stay responsive, large ones avoid per-chunk overhead.
+# A read returns what is buffered up to this size, so fast streams get the larger chunks.
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+
+_CONTENT_RANGE_PATTERN = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)', re.IGNORECASE)
+
+
+def parse_content_range(value: Optional[str]) -> Optional[Tuple[int, int, Optional[int]]]:
+    """Parse a Content-Range header into (first_byte, last_byte, total_length or None)."""
+    if not value:
+        return None
+    match = _CONTENT_RANGE_PATTERN.match(value.strip())
+    if not match:
+        return None
+    total = None if match.group(3) == '*' else int(match.group(3))
+    return int(match.group(1)), int(match.group(2)), total
+
+
+def chunk_size_for(expected_length: Optional[int]) -> int:
+    """Pick a read size of about 1/64 of the body, clamped and rounded down to a power of two."""
+    if not expected_length:
+        return MIN_CHUNK_SIZE
+    size = max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, expected_length // 64))
+    return 1 << (size.bit_length() - 1)
+
+
+def hash_file(path: Union[str, Path]) -> str:
+    """SHA-256 of a file on disk, read in MAX_CHUNK_SIZE blocks."""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(MAX_CHUNK_SIZE), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def _resource_key(url: Optional[str]) -> Optional[str]:
+    """Identify a resource by scheme, host and path; CDN signatures in the query string rotate."""
+    if not url:
+        return None
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+class PartialDownload:
+    """
+    State of one resumable download.
+
+    The sidecar records the source URL, the expected length and the server's
+    validator (ETag or Last-Modified). A later run sends ``Range`` together
+    with ``If-Range`` so the server either continues the same representation
+    (206) or sends the whole, changed file (200).
+    """
+
+    def __init__(self, local_path: Union[str, Path]):
+        """Initialize partial download state for a target file."""
+        self.local_path = Path(local_path)
+        self.part_path = self.local_path.with_name(self.local_path.name + PART_SUFFIX)
+        self.sidecar_path = self.local_path.with_name(self.local_path.name + SIDECAR_SUFFIX)
+        self.url: Optional[str] = None
+        self.expected_length: Optional[int] = None
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        # [start, end, received] per byte range for segmented downloads; None for a contiguous file
+        self.segments: Optional[List[List[int]]] = None
+        # SHA-256 of the finished file, set by finish_hash()
+        self.sha256: Optional[str] = None
+        self._hasher = None
+        self._hashed = 0
+
+    @property
+    def downloaded_size(self) -> int:
+        """Number of bytes already on disk in the partial file."""
+        try:
+            return self.part_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def is_complete(self) -> bool:
+        """Check whether the partial file already holds every expected byte."""
+        return self.expected_length is not None and self.downloaded_size == self.expected_length
+
+    def load(self) -> bool:
+        """Load the sidecar; returns False when there is no usable state."""
+        try:
+            with open(self.sidecar_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        self.url = data.get('url')
+        self.expected_length = data.get('expected_length')
+        self.etag = data.get('etag')
+        self.last_modified = data.get('last_modified')
+        self.segments = data.get('segments')
+        return True
+
+    def save(self) -> None:
+        """Persist the sidecar next to the partial file."""
+        data = {
+            'url': self.url,
+            'expected_length': self.expected_length,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'segments': self.segments
+        }
+        temp_path = self.sidecar_path.with_name(self.sidecar_path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, self.sidecar_path)
+
+    def prepare(self, url: str, resume: bool = True) -> int:
+        """
+        Decide where the next request starts.
+
+        Returns the byte offset to request from. Partial data is kept only when
+        resuming and the sidecar describes the same resource; otherwise it is
+        discarded and the download starts from zero. A preallocated segmented
+        file is never continued as a contiguous stream.
+        """
+        if (resume and self.part_path.exists() and self.load()
+                and not self.segments and self.same_resource(url)):
+            self.url = url
+            return self.downloaded_size
+
+        self.discard()
+        self.url = url
+        return 0
+
+    def same_resource(self, url: str) -> bool:
+        """Check whether url names the resource recorded in the sidecar."""
+        return _resource_key(self.url) == _resource_key(url)
+
+    def if_range_value(self) -> Optional[str]:
+        """Validator to send in If-Range (weak ETags are not allowed there)."""
+        if self.etag and not self.etag.startswith('W/'):
+            return self.etag
+        return self.last_modified
+
+    def request_headers(self, offset: int, end: Optional[int] = None) -> Dict[str, str]:
+        """Build request headers for a (ranged) request from offset up to an optional inclusive end."""
+        # Ranges must address the stored bytes, so never let the server re-encode the body
+        headers = {'Accept-Encoding': 'identity'}
+        if offset > 0 or end is not None:
+            headers['Range'] = f"bytes={offset}-{'' if end is None else end}"
+            if_range = self.if_range_value()
+            if if_range:
+                headers['If-Range'] = if_range
+        return headers
+
+    def accept_response(self, status: int, headers: Mapping[str, str], offset: int) -> int:
+        """
+        Validate a response against the requested offset.
+
+        Returns the offset at which the response body must be written: the
+        requested offset for a matching 206, or 0 when the server sent the full
+        file (Range ignored or the validator no longer matched).
+
+        Raises:
+            DownloadError: On error statuses or a range that does not line up
+        """
+        if status == 206:
+            content_range = parse_content_range(headers.get('Content-Range'))
+            if content_range is None or content_range[0] != offset:
+                self.discard()
+                raise DownloadError(f"Unexpected Content-Range {headers.get('Content-Range')!r} for offset {offset}")
+            if content_range[2] is not None:
+                self.expected_length = content_range[2]
+            self._update_validators(headers)
+            self.save()
+            return offset
+
+        if status == 200:
+            content_length = headers.get('Content-Length')
+            encoded = headers.get('Content-Encoding', 'identity').lower() != 'identity'
+            self.expected_length = int(content_length) if content_length and not encoded else None
+            self.segments = None
+            self.etag = None
+            self.last_modified = None
+            self._update_validators(headers)
+            self.save()
+            return 0
+
+        if status == 416:
+            # Our offset is past the end of the current representation - start over
+            self.discard()
+            raise DownloadError(f"Requested range not satisfiable at offset {offset}")
+
+        raise DownloadError(f"HTTP {status}: {self.url}")
+
+    def verify(self) -> None:
+        """Check that the partial file has the expected length."""
+        if not self.part_path.exists():
+            raise DownloadError(f"Partial file missing: {self.part_path}")
+        if self.expected_length is not None and self.downloaded_size != self.expected_length:
+            raise DownloadError(
+                f"Incomplete download: {self.downloaded_size} of {self.expected_length} bytes for {self.local_path.name}"
+            )
+
+    def hash_chunk(self, position: int, chunk: bytes) -> None:
+        """
+        Feed bytes just written at position into the running SHA-256.
+
+        A stream starting at 0 starts a new hash. Bytes that do not continue
+        the hashed prefix (a resume from an earlier run) stop the running hash,
+        and finish_hash() falls back to reading the file.
+        """
+        if position == 0:
+            self._hasher = hashlib.sha256()
+            self._hashed = 0
+        if self._hasher is None or position != self._hashed:
+            self._hasher = None
+            return
+        self._hasher.update(chunk)
+        self._hashed += len(chunk)
+
+    def finish_hash(self) -> str:
+        """
+        Return the SHA-256 of the partial file, setting ``sha256``.
+
+        Uses the running hash when it covers every byte on disk. Otherwise
+        (segmented or resumed transfers) the file is read once, so call this
+        off the event loop.
+        """
+        if self._hasher is not None and self._hashed == self.downloaded_size:
+            self.sha256 = self._hasher.hexdigest()
+        else:
+            self.sha256 = hash_file(self.part_path)
+        return self.sha256
+
+    def commit(self) -> int:
+        """Verify and move the finished partial file into place; returns its size."""
+        self.verify()
+        size = self.downloaded_size
+        os.replace(self.part_path, self.local_path)
+        self.sidecar_path.unlink(missing_ok=True)
+        return size
+
+    def discard(self) -> None:
+        """Remove the partial file and its sidecar."""
+        self.part_path.unlink(missing_ok=True)
+        self.sidecar_path.unlink(missing_ok=True)
+        self.expected_length = None
+        self.segments = None
+        self.etag = None
+        self.last_modified = None
+        self._hasher = None
+        self._hashed = 0
+
+    def _update_validators(self, headers: Mapping[str, str]) -> None:
+        """Remember the server's validators for the next If-Range."""
+        self.etag = headers.get('ETag') or self.etag
+        self.last_modified = headers.get('Last-Modified') or self.last_modified
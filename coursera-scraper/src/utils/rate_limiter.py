@@ -0,0 +1,196 @@
+"""Token bucket limiters: API requests per second and download bytes per second."""
+
+import asyncio
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from .logger import LoggerMixin
+
+# Bytes a download stream takes per reservation; streams queue for every grant, so they share the rate evenly
+GRANT_SIZE = 64 * 1024
+
+# Bytes that may arrive back to back after a pause, in seconds at the configured rate
+BURST_SECONDS = 0.5
+
+# How often a rate control file is checked for changes, in seconds
+CONTROL_POLL_INTERVAL = 2.0
+
+_RATE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([kmg]?)i?b?\s*(?:/s)?\s*$', re.IGNORECASE)
+_RATE_UNITS = {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+
+
+def parse_rate(text: Optional[str]) -> Optional[int]:
+    """
+    Bytes per second from a rate such as ``500K``, ``2M`` or ``1.5MB/s``; None for no limit.
+
+    Empty, ``0``, ``off`` and ``unlimited`` mean no limit.
+
+    Raises:
+        ValueError: If text is not a rate
+    """
+    if text is None or text.strip().lower() in ('', '0', 'off', 'none', 'unlimited'):
+        return None
+    match = _RATE.match(text)
+    if not match:
+        raise ValueError(f"Invalid rate: {text!r} (expected e.g. 500K, 2M or 1.5MB/s)")
+    rate = int(float(match.group(1)) * _RATE_UNITS[match.group(2).lower()])
+    return rate or None
+
+
+def format_rate(rate: Optional[float]) -> str:
+    """Human readable bytes per second."""
+    if not rate:
+        return "unlimited"
+    for unit, size in (('GB', 1024 ** 3), ('MB', 1024 ** 2), ('KB', 1024)):
+        if rate >= size:
+            return f"{rate / size:.1f} {unit}/s"
+    return f"{rate:.0f} B/s"
+
+
+class TokenBucket:
+    """
+    Allow ``rate`` requests per second on average with bursts of up to ``capacity``.
+
+    Callers reserve a token up front, so concurrent waiters are served in
+    arrival order instead of all waking at once when the bucket refills.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        """Initialize a full bucket."""
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token; returns how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire_blocking(self) -> float:
+        """Wait (blocking the thread) until a request may be sent; returns the time waited."""
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    async def acquire(self) -> float:
+        """Wait until a request may be sent; returns the time waited."""
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class ByteRateLimiter:
+    """
+    Share ``rate`` bytes per second between every concurrent download stream.
+
+    Streams reserve what they read in grants of at most ``GRANT_SIZE`` and
+    queue again for the next one, so the rate is split evenly between the
+    active streams (a subtitle is not starved by a multi-GB video reading
+    megabyte chunks). ``rate`` may be changed while downloads run; None means
+    unlimited, which costs nothing per chunk.
+    """
+
+    def __init__(self, rate: Optional[float] = None):
+        """Initialize a full bucket."""
+        self.rate = None
+        self.waited = 0.0
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        self.set_rate(rate)
+
+    @property
+    def capacity(self) -> float:
+        return max(GRANT_SIZE, self.rate * BURST_SECONDS) if self.rate else 0.0
+
+    def set_rate(self, rate: Optional[float]) -> None:
+        """Change the limit; reservations already made keep their delay."""
+        rate = rate if rate and rate > 0 else None
+        if rate == self.rate:
+            return
+        self.rate = rate
+        # Start the new rate with a full bucket rather than debt run up at the old one
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _reserve(self, nbytes: int) -> float:
+        """Take nbytes; returns how long the caller must wait before using them."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= nbytes
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def consume(self, nbytes: int) -> float:
+        """Wait until nbytes more may be read; returns the time waited."""
+        waited = 0.0
+        while nbytes > 0 and self.rate:
+            grant = min(nbytes, GRANT_SIZE)
+            delay = self._reserve(grant)
+            # Even without a delay, let other streams reserve before the next grant
+            await asyncio.sleep(delay)
+            waited += delay
+            nbytes -= grant
+        self.waited += waited
+        return waited
+
+
+class RateControlFile(LoggerMixin):
+    """
+    Apply the rate written in a control file (e.g. ``2M``) to a running limiter.
+
+    The file is checked every ``CONTROL_POLL_INTERVAL`` seconds, or right away
+    when ``check`` is called (the downloader does so on SIGHUP). Removing the
+    file restores the rate the limiter started with. When several workers
+    read the same file, each applies ``share`` of the rate written in it, so
+    the file still caps their transfers together.
+    """
+
+    def __init__(self, limiter: ByteRateLimiter, path: Path, share: float = 1.0):
+        self.limiter = limiter
+        self.path = Path(path)
+        self.share = share
+        self.default_rate = limiter.rate
+        self._mtime: Optional[float] = None
+
+    def check(self) -> None:
+        """Re-read the control file if it changed since the last check."""
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+
+        rate = self.default_rate
+        if mtime is not None:
+            try:
+                rate = parse_rate(self.path.read_text())
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Ignoring rate control file {self.path}: {e}")
+                return
+            if rate:
+                rate *= self.share
+
+        if rate != self.limiter.rate:
+            self.limiter.set_rate(rate)
+            self.logger.info(f"Download rate limit set to {format_rate(rate)}")
+
+    async def watch(self, interval: float = CONTROL_POLL_INTERVAL) -> None:
+        """Check the control file until cancelled."""
+        while True:
+            self.check()
+            await asyncio.sleep(interval)
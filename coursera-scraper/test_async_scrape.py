@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent item URL resolution in CourseScraper.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.auth import CourseraAuth
+from src.api.coursera_client import CourseraClient
+from src.config.settings import ConfigManager
+from src.core.course_models import APIConfig, APIEndpointConfig, ContentAsset, Lesson
+from src.core.file_manager import FileManager
+from src.core.scraper import CourseScraper
+from src.utils.rate_limiter import TokenBucket
+
+COURSE_ID = "course123"
+LATENCY = 0.2  # Seconds the fake API takes per request
+
+
+class FakeVideoAPI:
+    """Local stand-in for onDemandLectureVideos.v1 that tracks concurrency."""
+
+    def __init__(self, missing=()):
+        self.missing = set(missing)
+        self.requests = []
+        self.active = 0
+        self.peak_active = 0
+        self.port = None
+        self._ready = threading.Event()
+
+    async def handle(self, request):
+        lecture_id = request.match_info['ids'].split('~')[1]
+        self.requests.append(lecture_id)
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            await asyncio.sleep(LATENCY)
+        finally:
+            self.active -= 1
+
+        if lecture_id in self.missing:
+            return web.json_response({}, status=404)
+        return web.json_response({
+            'elements': [{'id': f'{COURSE_ID}~{lecture_id}'}],
+            'linked': {'onDemandVideos.v1': [{
+                'sources': {'byResolution': {'720p': {'mp4VideoUrl': f'https://cdn.example/{lecture_id}.mp4'}}}
+            }]}
+        })
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait(5)
+        return f"http://127.0.0.1:{self.port}"
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        app = web.Application()
+        app.router.add_get('/api/onDemandLectureVideos.v1/{ids}', self.handle)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        loop.run_forever()
+
+
+def _scraper(base_url, tmp, requests_per_second=100.0, burst=10):
+    auth = CourseraAuth(cauth_cookie="x" * 32, csrf_token="y" * 16)
+    api_config = APIConfig(base_url=base_url, endpoints={
+        'lecture_video': APIEndpointConfig(path='/api/onDemandLectureVideos.v1/{course_id}~{lecture_id}')
+    })
+    client = CourseraClient(auth, api_config, rate_limit_delay=1.0 / requests_per_second, rate_limit_burst=burst)
+    config = ConfigManager(Path(__file__).parent / "config")
+    config.app_settings.max_concurrent_requests = 4
+    return CourseScraper(client=client, file_manager=FileManager(Path(tmp)), config=config)
+
+
+def _lesson(index, item_ids):
+    lesson = Lesson(id=f"lesson{index}", name=f"Lesson {index}", order=index)
+    lesson.metadata['coursera_item_ids'] = item_ids
+    lesson.metadata['course_id'] = COURSE_ID
+    lesson.metadata['comprehensive_api_data'] = {
+        'course_id': COURSE_ID,
+        'items': {item_id: {'name': f'Video {item_id}'} for item_id in item_ids}
+    }
+    for item_id in item_ids:
+        lesson.assets.append(ContentAsset(
+            name=f"item_{item_id}", file_type="video",
+            metadata={'coursera_item': {'id': item_id, 'content_type': 'lecture'}}
+        ))
+    return lesson
+
+
+def test_token_bucket():
+    """Bursts pass immediately, then requests are spaced at the configured rate."""
+    bucket = TokenBucket(rate=20, capacity=2)
+    started = time.monotonic()
+    for _ in range(6):
+        bucket.acquire_blocking()
+    elapsed = time.monotonic() - started
+    assert 0.18 <= elapsed < 0.5, elapsed
+
+    async def acquire_many():
+        await asyncio.gather(*(bucket.acquire() for _ in range(4)))
+
+    started = time.monotonic()
+    asyncio.run(acquire_many())
+    assert time.monotonic() - started >= 0.15
+    print("PASS: token bucket spaces requests")
+
+
+def test_concurrent_resolution_preserves_order():
+    """Items are fetched concurrently but assets keep lesson/item order."""
+    server = FakeVideoAPI()
+    base_url = server.start()
+    lessons = [_lesson(i, [f"v{i}{j}" for j in range(4)]) for i in range(3)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = _scraper(base_url, tmp)
+        started = time.monotonic()
+        scraper.resolved_item_urls = asyncio.run(scraper._resolve_item_urls_async(lessons))
+        elapsed = time.monotonic() - started
+
+        for lesson in lessons:
+            scraper._extract_content_assets_from_comprehensive_api(lesson)
+
+    assert len(server.requests) == 12
+    assert 1 < server.peak_active <= 4
+    assert elapsed < 12 * LATENCY / 2, elapsed
+    for i, lesson in enumerate(lessons):
+        names = [asset.name for asset in lesson.assets]
+        assert names == [f"{j + 1:03d}_Video_v{i}{j}_720p.mp4" for j in range(4)], names
+        assert lesson.assets[0].url == f"https://cdn.example/v{i}0.mp4"
+    print(f"PASS: 12 items resolved in {elapsed:.2f}s with ordering preserved")
+
+
+def test_rate_limit_is_shared():
+    """Concurrent requests never beat the token bucket."""
+    server = FakeVideoAPI()
+    base_url = server.start()
+    lessons = [_lesson(0, [f"r{j}" for j in range(6)])]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = _scraper(base_url, tmp, requests_per_second=10, burst=1)
+        started = time.monotonic()
+        asyncio.run(scraper._resolve_item_urls_async(lessons))
+        elapsed = time.monotonic() - started
+
+    # Six requests at 10/s with no burst need at least 0.5s of spacing
+    assert elapsed >= 0.5, elapsed
+    print("PASS: concurrent requests respect the shared rate limit")
+
+
+def test_missing_items_are_not_retried():
+    """A 404 resolves to no URLs instead of a sequential retry."""
+    server = FakeVideoAPI(missing={"gone"})
+    base_url = server.start()
+    lesson = _lesson(0, ["ok", "gone"])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = _scraper(base_url, tmp)
+        scraper.resolved_item_urls = asyncio.run(scraper._resolve_item_urls_async([lesson]))
+        scraper._extract_content_assets_from_comprehensive_api(lesson)
+
+    assert scraper.resolved_item_urls["gone"] == []
+    assert len(server.requests) == 2
+    assert [asset.name for asset in lesson.assets] == ["001_Video_ok_720p.mp4"]
+    print("PASS: missing items resolved once")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING CONCURRENT URL RESOLUTION")
+    print("=" * 60)
+    tests = [
+        test_token_bucket,
+        test_concurrent_resolution_preserves_order,
+        test_rate_limit_is_shared,
+        test_missing_items_are_not_retried,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared download bandwidth limit.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.auth import CourseraAuth
+from src.api.enhanced_downloader import RATE_CONTROL_FILENAME, EnhancedVideoDownloader
+from src.core.file_manager import FileManager
+from src.utils.rate_limiter import ByteRateLimiter, RateControlFile, parse_rate
+from test_resumable_download import BLOB
+from test_url_refresh import SignedCDN, _course
+
+MB = 1024 * 1024
+
+
+def test_rate_parsing():
+    """Rates are read with K/M/G suffixes; zero and 'unlimited' lift the limit."""
+    assert parse_rate("500K") == 500 * 1024
+    assert parse_rate("2M") == 2 * MB
+    assert parse_rate("1.5MB/s") == int(1.5 * MB)
+    assert parse_rate("4096") == 4096
+    assert parse_rate("") is None and parse_rate("0") is None and parse_rate("unlimited") is None
+    try:
+        parse_rate("fast")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("accepted an invalid rate")
+    print("PASS: rates parsed")
+
+
+def test_streams_share_the_rate():
+    """A small stream finishes quickly beside a stream reading large chunks, and the total rate holds."""
+    async def run():
+        limiter = ByteRateLimiter(MB)
+        finished = {}
+        start = time.monotonic()
+
+        async def video():
+            consumed = 0
+            while time.monotonic() - start < 1.5:
+                await limiter.consume(MB)
+                consumed += MB
+            finished['video_bytes'] = consumed
+
+        async def subtitle():
+            for _ in range(2):
+                await limiter.consume(64 * 1024)
+            finished['subtitle'] = time.monotonic() - start
+
+        await asyncio.gather(video(), subtitle())
+        finished['elapsed'] = time.monotonic() - start
+        return finished
+
+    result = asyncio.run(run())
+    # Served first-come-first-served, the subtitle would wait behind whole 1 MB video chunks
+    assert result['subtitle'] < 0.5, result
+    # At most the burst plus the rate over the run
+    assert result['video_bytes'] <= MB * (result['elapsed'] + 1), result
+    print("PASS: streams share the rate")
+
+
+def test_control_file_changes_rate():
+    """Writing the control file changes the limit; deleting it restores the configured one."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / RATE_CONTROL_FILENAME
+        limiter = ByteRateLimiter(MB)
+        control = RateControlFile(limiter, path)
+
+        def write(text, mtime):
+            path.write_text(text)
+            os.utime(path, (mtime, mtime))
+            control.check()
+
+        control.check()
+        assert limiter.rate == MB
+        write("2M\n", 1000)
+        assert limiter.rate == 2 * MB
+        write("not a rate", 2000)
+        assert limiter.rate == 2 * MB
+        write("0", 3000)
+        assert limiter.rate is None
+        path.unlink()
+        control.check()
+        assert limiter.rate == MB
+
+        # One of two workers takes half of the file's rate
+        shared = ByteRateLimiter(MB // 2)
+        share = RateControlFile(shared, path, share=0.5)
+        path.write_text("4M")
+        share.check()
+        assert shared.rate == 2 * MB
+        path.unlink()
+        share.check()
+        assert shared.rate == MB // 2
+    print("PASS: control file changes the rate")
+
+
+def _download(cdn, base_url, tmp, rate_limit, control=None):
+    course = _course(cdn, lessons=2)
+    file_manager = FileManager(Path(tmp))
+    file_manager.create_full_structure(course)
+    if control is not None:
+        (course.local_path / RATE_CONTROL_FILENAME).write_text(control)
+
+    auth = CourseraAuth(cauth_cookie="x" * 32, csrf_token="y" * 16)
+    downloader = EnhancedVideoDownloader(auth=auth, file_manager=file_manager, max_concurrent=2,
+                                         download_subtitles=False, rate_limit=rate_limit)
+    downloader.api_base_url = base_url
+    start = time.monotonic()
+    downloader.download_course_videos_and_subtitles(course.local_path, '720p')
+    assert downloader.stats['videos']['downloaded'] == 2, downloader.stats
+    assert (course.modules[0].lessons[1].local_path / "2_Talk_2.mp4").read_bytes() == BLOB
+    return downloader, time.monotonic() - start
+
+
+def test_download_follows_control_file():
+    """The engine applies its limit to transfers and lets the course's control file replace it."""
+    cdn = SignedCDN()
+    base_url = cdn.start()
+
+    # 2 MB at 1 MB/s, less the half-second burst
+    with tempfile.TemporaryDirectory() as tmp:
+        downloader, elapsed = _download(cdn, base_url, tmp, MB)
+        assert elapsed >= 1.2, elapsed
+        assert downloader.bandwidth.waited > 0
+
+    # The control file lifts a limit that would otherwise take 8 seconds
+    with tempfile.TemporaryDirectory() as tmp:
+        downloader, elapsed = _download(cdn, base_url, tmp, 256 * 1024, control="0")
+        assert elapsed < 4, elapsed
+        assert downloader.bandwidth.rate == 256 * 1024
+    print("PASS: download follows the rate control file")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING DOWNLOAD BANDWIDTH LIMIT")
+    print("=" * 60)
+    tests = [
+        test_rate_parsing,
+        test_streams_share_the_rate,
+        test_control_file_changes_rate,
+        test_download_follows_control_file,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test script for the local Coursera stand-in and the benchmark runner.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import json
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.lecture_media import LectureMedia
+from src.benchmark.fake_coursera import FakeCourseraServer, FakeCourseSpec, NetworkProfile
+from src.benchmark.runner import run_benchmark
+
+SPEC = FakeCourseSpec(modules=1, lessons_per_module=2, videos_per_lesson=2, video_size=300 * 1024)
+
+
+def _get(url, headers=None):
+    with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {}), timeout=10) as response:
+        return response.status, response.headers, response.read()
+
+
+def test_course_endpoints():
+    """Course materials list every lecture item, and each lecture resolves to media on the stand-in."""
+    server = FakeCourseraServer(SPEC)
+    base_url = server.start()
+
+    _, _, body = _get(f"{base_url}/api/onDemandCourseMaterials.v2/?q=slug&slug={SPEC.course_slug}")
+    materials = json.loads(body)
+    items = materials['linked']['onDemandCourseMaterialItems.v2']
+    assert [item['id'] for item in items] == ["it000000", "it000001", "it000002", "it000003"], items
+    assert materials['linked']['onDemandCourseMaterialLessons.v1'][1]['itemIds'] == ["it000002", "it000003"]
+
+    _, _, body = _get(f"{base_url}/api/onDemandLectureVideos.v1/{SPEC.course_id}~it000002")
+    media = LectureMedia.from_response(json.loads(body))
+    assert media.video_url('720p') == f"{base_url}/media/it000002.mp4"
+    _, _, video = _get(media.video_url('720p'))
+    assert video == server.video and len(video) == SPEC.video_size
+    _, _, subtitle = _get(media.subtitle_url('en'))
+    assert subtitle.startswith(b"WEBVTT") and b"it000002" in subtitle
+    print("PASS: course endpoints")
+
+
+def test_range_requests():
+    """Ranges are answered with 206 unless disabled, and If-Range with a stale ETag gets the whole file."""
+    server = FakeCourseraServer(SPEC)
+    base_url = server.start()
+    url = f"{base_url}/media/it000000.mp4"
+
+    status, headers, body = _get(url, {'Range': 'bytes=1000-'})
+    assert status == 206 and body == server.video[1000:]
+    assert headers['Content-Range'] == f"bytes 1000-{SPEC.video_size - 1}/{SPEC.video_size}"
+    status, _, body = _get(url, {'Range': 'bytes=0-99', 'If-Range': headers['ETag']})
+    assert status == 206 and body == server.video[:100]
+    status, _, body = _get(url, {'Range': 'bytes=0-99', 'If-Range': '"stale"'})
+    assert status == 200 and len(body) == SPEC.video_size
+    assert server.stats['range_requests'] == 2, server.stats
+
+    no_ranges = FakeCourseraServer(SPEC, NetworkProfile(ranges=False))
+    status, headers, body = _get(f"{no_ranges.start()}/media/it000000.mp4", {'Range': 'bytes=1000-'})
+    assert status == 200 and headers['Accept-Ranges'] == 'none' and len(body) == SPEC.video_size
+    print("PASS: range requests")
+
+
+def test_error_injection():
+    """The error rate answers that share of requests with 503, the same ones for the same seed."""
+    def failures(seed):
+        base_url = FakeCourseraServer(SPEC, NetworkProfile(error_rate=0.5, seed=seed)).start()
+        failed = []
+        for index in range(20):
+            try:
+                _get(f"{base_url}/subtitles/it000000.en.vtt")
+            except urllib.error.HTTPError as e:
+                assert e.code == 503
+                failed.append(index)
+        return failed
+
+    first = failures(seed=7)
+    assert 3 <= len(first) <= 17, first
+    assert failures(seed=7) == first
+    print("PASS: error injection")
+
+
+def test_download_benchmark():
+    """The download engine fetches every video and subtitle from the stand-in despite injected errors."""
+    result = run_benchmark('download', SPEC, NetworkProfile(error_rate=0.1, seed=3), max_concurrent=2)
+    assert result.files == 2 * SPEC.video_count and result.failed == 0, result
+    assert result.bytes >= SPEC.video_count * SPEC.video_size
+    assert result.server['media_requests'] >= result.files, result.server
+    assert result.seconds > 0 and result.files_per_sec > 0 and result.mb_per_sec > 0
+    assert result.cpu_seconds >= 0
+    if sys.platform != 'win32':
+        assert result.peak_rss > 1024 * 1024, result.peak_rss
+    report = result.as_dict()
+    assert report['engine'] == 'download' and report['settings']['error_rate'] == 0.1
+    print("PASS: download benchmark")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING BENCHMARK")
+    print("=" * 60)
+    tests = [
+        test_course_endpoints,
+        test_range_requests,
+        test_error_injection,
+        test_download_benchmark,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test script for indexed lookups in ComprehensiveCourseData.
+Includes a benchmark converting a synthetic 10,000-item course.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.core.course_models import (
+    ComprehensiveCourseConverter, ComprehensiveCourseData, ContentSummary,
+    CourseraContentItem, CourseraLesson, CourseraModule
+)
+
+# Converting the 10k-item course took ~3s with linear scans; indexed it is well under a second
+BENCHMARK_LIMIT_SECONDS = 1.5
+
+
+def _item(item_id, lesson_id=None):
+    return CourseraContentItem(
+        id=item_id, name=item_id, slug=item_id, lessonId=lesson_id,
+        contentSummary=ContentSummary(typeName='lecture', definition={'duration': 60000})
+    )
+
+
+def _synthetic_course(module_count=50, lessons_per_module=20, items_per_lesson=10):
+    modules, lessons, items = [], [], []
+    for m in range(module_count):
+        lesson_ids = []
+        for l in range(lessons_per_module):
+            lesson_id = f"l{m}_{l}"
+            item_ids = [f"i{m}_{l}_{i}" for i in range(items_per_lesson)]
+            lesson_ids.append(lesson_id)
+            lessons.append(CourseraLesson(id=lesson_id, name=lesson_id, slug=lesson_id, itemIds=item_ids))
+            items.extend(_item(item_id) for item_id in item_ids)
+        modules.append(CourseraModule(id=f"m{m}", name=f"Module {m}", slug=f"m{m}", lessonIds=lesson_ids))
+    return ComprehensiveCourseData(
+        course_id="course", module_ids=[module.id for module in modules],
+        modules=modules, lessons=lessons, items=items
+    )
+
+
+def test_lookups_follow_list_order():
+    """Lookups return entries in list order, like the scans they replace, including the fallbacks."""
+    data = ComprehensiveCourseData(
+        course_id="course",
+        modules=[
+            CourseraModule(id="m1", name="M1", slug="m1", lessonIds=["b", "a", "missing"]),
+            CourseraModule(id="m2", name="M2", slug="m2"),
+        ],
+        lessons=[
+            CourseraLesson(id="a", name="A", slug="a", itemIds=["x2", "x1"]),
+            CourseraLesson(id="b", name="B", slug="b"),
+            CourseraLesson(id="c", name="C", slug="c", moduleId="m2"),
+        ],
+        items=[_item("x1"), _item("x2"), _item("y1", lesson_id="b"), _item("z1")],
+    )
+
+    assert data.get_module_by_id("m2").name == "M2"
+    assert data.get_lesson_by_id("c").name == "C"
+    assert data.get_item_by_id("z1").id == "z1"
+    assert data.get_item_by_id("nope") is None
+    assert [lesson.id for lesson in data.get_lessons_for_module("m1")] == ["a", "b"]
+    assert [lesson.id for lesson in data.get_lessons_for_module("m2")] == ["c"]
+    assert [item.id for item in data.get_items_for_lesson("a")] == ["x1", "x2"]
+    assert [item.id for item in data.get_items_for_lesson("b")] == ["y1"]
+    assert data.get_items_for_lesson("nope") == []
+    print("PASS: indexed lookups match list order")
+
+
+def test_items_get_lesson_reference():
+    """Items reached through itemIds get their lessonId, and the lessonId index follows."""
+    data = ComprehensiveCourseData(
+        course_id="course",
+        lessons=[CourseraLesson(id="a", name="A", slug="a", itemIds=["x1", "x2"])],
+        items=[_item("x1"), _item("x2")],
+    )
+    data.get_items_for_lesson("a")
+    assert [item.lessonId for item in data.items] == ["a", "a"]
+
+    # Without itemIds the lesson falls back to the items that now point at it
+    data.lessons[0].itemIds = []
+    assert [item.id for item in data.get_items_for_lesson("a")] == ["x1", "x2"]
+    print("PASS: lesson references kept in the index")
+
+
+def test_mutation_invalidates_indexes():
+    """Appending, reassigning and explicit invalidation all refresh the indexes."""
+    data = ComprehensiveCourseData(course_id="course", items=[_item("x1")])
+    assert data.get_item_by_id("x2") is None
+
+    data.items.append(_item("x2"))
+    assert data.get_item_by_id("x2") is not None
+
+    data.items = [_item("y1")]
+    assert data.get_item_by_id("x1") is None
+    assert data.get_item_by_id("y1") is not None
+
+    data.items[0].id = "y2"
+    data.invalidate_indexes()
+    assert data.get_item_by_id("y2") is not None
+    print("PASS: indexes follow mutations")
+
+
+def test_convert_10k_item_course():
+    """Converting a synthetic 10,000-item course stays linear."""
+    data = _synthetic_course()
+
+    started = time.perf_counter()
+    course = ComprehensiveCourseConverter.to_course(data, "Synthetic Course", "synthetic-course")
+    elapsed = time.perf_counter() - started
+
+    assert len(course.modules) == 50
+    assert course.total_lessons == 1000
+    assert course.total_assets == 10000
+    assert course.modules[3].lessons[4].assets[5].metadata['coursera_item']['id'] == "i3_4_5"
+    assert elapsed < BENCHMARK_LIMIT_SECONDS, elapsed
+    print(f"PASS: converted 10,000 items in {elapsed:.2f}s")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING COURSE DATA INDEXES")
+    print("=" * 60)
+    tests = [
+        test_lookups_follow_list_order,
+        test_items_get_lesson_reference,
+        test_mutation_invalidates_indexes,
+        test_convert_10k_item_course,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
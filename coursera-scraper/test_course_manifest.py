@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite course manifest used by discovery, resume and status.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.auth import CourseraAuth
+from src.api.enhanced_downloader import EnhancedVideoDownloader
+from src.core.course_manifest import FILE_COMPLETE, FILE_PENDING, CourseManifest, walk_lesson_metadata
+from src.core.course_models import ContentAsset, Course, Lesson, Module
+from src.core.file_manager import FileManager
+from src.main import _course_counts
+from test_resumable_download import BLOB, RangeServer
+
+
+def _course(url, modules=2, lessons=2):
+    course = Course(id="c1", name="Manifest Course", slug="manifest-course")
+    for m in range(1, modules + 1):
+        module = Module(id=f"m{m}", name=f"Module {m}", order=m)
+        for l in range(1, lessons + 1):
+            lesson = Lesson(id=f"m{m}l{l}", name=f"Lesson {l}", order=l)
+            lesson.assets.append(ContentAsset(name=f"Talk {m}{l}_720p.mp4", url=f"{url}&v={m}{l}", file_type="video"))
+            lesson.assets.append(ContentAsset(name=f"Talk {m}{l}_360p.mp4", url=f"{url}&v={m}{l}s", file_type="video"))
+            module.lessons.append(lesson)
+        course.modules.append(module)
+    return course
+
+
+def _downloader(file_manager):
+    auth = CourseraAuth(cauth_cookie="x" * 32, csrf_token="y" * 16)
+    return EnhancedVideoDownloader(auth=auth, file_manager=file_manager, max_concurrent=3, download_subtitles=False)
+
+
+def test_structure_round_trip():
+    """create_full_structure writes every lesson and asset URL in course order."""
+    with tempfile.TemporaryDirectory() as tmp:
+        course = _course("http://cdn.example/v.mp4?x=1", modules=3)
+        FileManager(Path(tmp)).create_full_structure(course)
+
+        with CourseManifest(course.local_path) as manifest:
+            lessons = manifest.lessons()
+
+        assert [lesson['id'] for lesson in lessons] == ["m1l1", "m1l2", "m2l1", "m2l2", "m3l1", "m3l2"]
+        assert lessons[0]['path'] == course.modules[0].lessons[0].local_path
+        assert lessons[0]['assets'][0]['url'] == "http://cdn.example/v.mp4?x=1&v=11"
+        # The tree-walk fallback sees the same lessons in the same order
+        assert [lesson['id'] for lesson in walk_lesson_metadata(course.local_path)] == [lesson['id'] for lesson in lessons]
+    print("PASS: manifest mirrors the course structure")
+
+
+def test_download_uses_and_updates_manifest():
+    """Downloads are discovered from the manifest, recorded there, and skipped on the next run."""
+    server = RangeServer()
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_manager = FileManager(Path(tmp))
+        course = _course(url)
+        file_manager.create_full_structure(course)
+
+        # Discovery must not depend on the per-lesson JSON files any more
+        for lesson_file in course.local_path.rglob("lesson_metadata.json"):
+            lesson_file.unlink()
+
+        result = _downloader(file_manager).download_course_videos_and_subtitles(course.local_path, '720p')
+        assert result['videos']['downloaded'] == 4, result
+        first_lesson = course.modules[0].lessons[0].local_path
+        assert (first_lesson / "1_Talk_11.mp4").read_bytes() == BLOB
+
+        with CourseManifest(course.local_path) as manifest:
+            completed = manifest.completed_files()
+            summary = manifest.summary()
+        assert completed[first_lesson / "1_Talk_11.mp4"] == len(BLOB)
+        assert summary['files']['video'] == {FILE_COMPLETE: 4}
+
+        requests_before = len(server.requests)
+        rerun = _downloader(file_manager)
+        rerun.download_course_videos_and_subtitles(course.local_path, '720p')
+        assert len(server.requests) == requests_before
+        assert rerun.stats['videos']['downloaded'] == 0
+
+        counts = _course_counts(course.local_path)
+        assert (counts['modules'], counts['lessons'], counts['videos']) == (2, 4, 4), counts
+        assert [name for name, _, _ in counts['breakdown']] == ["module-01-module-1", "module-02-module-2"], counts
+        assert [videos for _, _, videos in counts['breakdown']] == [2, 2]
+    print("PASS: downloads discovered from and recorded in the manifest")
+
+
+def test_existing_files_are_adopted():
+    """Finished files from before the manifest existed are recorded instead of downloaded again."""
+    server = RangeServer()
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_manager = FileManager(Path(tmp))
+        course = _course(url, modules=1, lessons=1)
+        file_manager.create_full_structure(course)
+        existing = course.modules[0].lessons[0].local_path / "1_Talk_11.mp4"
+        existing.write_bytes(BLOB)
+
+        _downloader(file_manager).download_course_videos_and_subtitles(course.local_path, '720p')
+
+        assert server.requests == []
+        with CourseManifest(course.local_path) as manifest:
+            assert manifest.completed_files() == {existing: len(BLOB)}
+    print("PASS: existing files adopted into the manifest")
+
+
+def test_failed_downloads_stay_visible():
+    """Failed files are recorded and reported by the status counts."""
+    with tempfile.TemporaryDirectory() as tmp:
+        file_manager = FileManager(Path(tmp))
+        course = _course("http://127.0.0.1:9/video.mp4?x=1", modules=1, lessons=1)
+        file_manager.create_full_structure(course)
+
+        downloader = _downloader(file_manager)
+        downloader.download_course_videos_and_subtitles(course.local_path, '720p')
+        assert downloader.stats['videos']['failed'] == 1
+
+        counts = _course_counts(course.local_path)
+        assert counts['failed'] == 1 and counts['videos'] == 0, counts
+
+        with CourseManifest(course.local_path) as manifest:
+            manifest.record_file(course.local_path / "x.mp4", 'video', FILE_PENDING)
+            assert manifest.summary()['files']['video'] == {'failed': 1, FILE_PENDING: 1}
+    print("PASS: failed downloads recorded")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING COURSE MANIFEST")
+    print("=" * 60)
+    tests = [
+        test_structure_round_trip,
+        test_download_uses_and_updates_manifest,
+        test_existing_files_are_adopted,
+        test_failed_downloads_stay_visible,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for downloading several courses in one batch run.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.auth import CourseraAuth
+from src.api.lecture_media import LectureMedia
+from src.core.course_manifest import FILE_COMPLETE, CourseManifest
+from src.core.file_manager import FileManager
+from src.main import _read_course_list
+from test_download_scheduler import CountingDownloader, OrderedAPI
+from test_lecture_media import _response
+from test_resumable_download import BLOB
+from test_url_refresh import _course
+
+
+def _courses(api, base_url, tmp, lessons):
+    """Scraped courses named Batch A, Batch B, ... with the given lesson counts."""
+    paths = []
+    for index, count in enumerate(lessons):
+        course = _course(api, lessons=count)
+        course.name = f"Batch {chr(ord('A') + index)}"
+        for lesson in course.modules[0].lessons:
+            asset = lesson.assets[0]
+            asset.metadata['lecture_media'] = LectureMedia.from_response(_response(asset.metadata['item_id'], base_url)).to_dict()
+        FileManager(Path(tmp)).create_full_structure(course)
+        paths.append(course.local_path)
+    return paths
+
+
+def _downloader(tmp, base_url, order='lesson', max_concurrent=2):
+    auth = CourseraAuth(cauth_cookie="x" * 32, csrf_token="y" * 16)
+    downloader = CountingDownloader(auth=auth, file_manager=FileManager(Path(tmp)), max_concurrent=max_concurrent,
+                                    order=order, progress='none')
+    downloader.api_base_url = base_url
+    return downloader
+
+
+def test_course_list_file():
+    """Batch files list one course per line; comments and blank lines are skipped."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "courses.txt"
+        path.write_text("# specialization\nmachine-learning\n\n  deep-learning  # part 2\n")
+        assert _read_course_list(path) == ["machine-learning", "deep-learning"]
+    print("PASS: course list file parsed")
+
+
+def test_batch_shares_one_queue():
+    """Files of all courses go through one scheduler queue and worker pool, with a report per course."""
+    api = OrderedAPI()
+    base_url = api.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _courses(api, base_url, tmp, lessons=[2, 3])
+        downloader = _downloader(tmp, base_url, order='shortest')
+        result = downloader.download_courses(paths, '720p')
+
+        # Shortest first across the batch: every course's subtitles before any video
+        kinds = [kind for kind, _ in api.sequence]
+        assert kinds == ['subtitle'] * 5 + ['video'] * 5, api.sequence
+        # Two workers, the run itself and nothing per course
+        assert downloader.peak_tasks <= 4, downloader.peak_tasks
+        assert result['connections']['requests'] >= 10
+
+        first, second = (result['courses'][str(path)] for path in paths)
+        assert first == {'queued': 4, 'downloaded': 4, 'failed': 0, 'bytes': first['bytes'], 'complete': 4}, first
+        assert second['downloaded'] == second['complete'] == 6 and second['failed'] == 0, second
+        assert second['bytes'] > 3 * len(BLOB) and first['bytes'] > 2 * len(BLOB)
+
+        # Each course records its own files
+        for path, videos in zip(paths, (2, 3)):
+            with CourseManifest(path) as manifest:
+                files = manifest.summary()['files']
+            assert files['video'] == {FILE_COMPLETE: videos}, files
+            assert files['subtitle'] == {FILE_COMPLETE: videos}, files
+    print("PASS: batch shares one queue")
+
+
+def test_batch_rerun_skips_finished_courses():
+    """A second batch run finds every file complete and downloads nothing."""
+    api = OrderedAPI()
+    base_url = api.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _courses(api, base_url, tmp, lessons=[1, 2])
+        _downloader(tmp, base_url).download_courses(paths, '720p')
+        requests = len(api.sequence)
+
+        result = _downloader(tmp, base_url).download_courses(paths, '720p')
+        assert len(api.sequence) == requests
+        assert [counts['complete'] for counts in result['courses'].values()] == [2, 4], result['courses']
+        assert all(counts['queued'] == counts['downloaded'] == 0 for counts in result['courses'].values())
+    print("PASS: batch rerun skips finished courses")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING BATCH DOWNLOAD")
+    print("=" * 60)
+    tests = [
+        test_course_list_file,
+        test_batch_shares_one_queue,
+        test_batch_rerun_skips_finished_courses,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
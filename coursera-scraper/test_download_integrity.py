@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test script for download checksums and the verify command.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import hashlib
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+from click.testing import CliRunner
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.core.course_manifest import FILE_COMPLETE, FILE_PENDING, CourseManifest
+from src.core.file_manager import FileManager
+from src.core.integrity import (
+    INTEGRITY_CORRUPT, INTEGRITY_MISSING, INTEGRITY_OK, INTEGRITY_TRUNCATED, requeue_files, verify_files
+)
+from src.main import cli
+from src.utils.partial_download import PartialDownload
+from test_course_manifest import _course, _downloader
+from test_resumable_download import BLOB, RangeServer
+
+BLOB_SHA256 = hashlib.sha256(BLOB).hexdigest()
+
+
+def _downloaded_course(tmp, server, modules=1, lessons=3):
+    file_manager = FileManager(Path(tmp))
+    course = _course(server.start(), modules=modules, lessons=lessons)
+    file_manager.create_full_structure(course)
+    _downloader(file_manager).download_course_videos_and_subtitles(course.local_path, '720p')
+    return file_manager, course
+
+
+def test_streaming_hash_and_fallback():
+    """Contiguous writes are hashed in memory; a gap falls back to reading the file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        partial = PartialDownload(Path(tmp) / "video.mp4")
+        partial.part_path.write_bytes(BLOB)
+        partial.hash_chunk(0, BLOB[:1000])
+        partial.hash_chunk(1000, BLOB[1000:])
+        # The file on disk is not read when the running hash covers it
+        partial.part_path.write_bytes(b"x" * len(BLOB))
+        assert partial.finish_hash() == BLOB_SHA256
+
+        resumed = PartialDownload(Path(tmp) / "resumed.mp4")
+        resumed.part_path.write_bytes(BLOB)
+        resumed.hash_chunk(5000, BLOB[5000:])
+        assert resumed.finish_hash() == BLOB_SHA256
+    print("PASS: streaming hash with file fallback")
+
+
+def test_downloads_record_size_and_hash():
+    """Finished downloads store content length and SHA-256, also across a dropped connection."""
+    server = RangeServer(drop_after=300000)
+    with tempfile.TemporaryDirectory() as tmp:
+        _, course = _downloaded_course(tmp, server)
+        with CourseManifest(course.local_path) as manifest:
+            records = manifest.files_to_verify()
+
+    assert len(records) == 3, records
+    for record in records:
+        assert record['size'] == record['content_length'] == len(BLOB), record
+        assert record['sha256'] == BLOB_SHA256, record
+    print("PASS: size, content length and hash recorded")
+
+
+def test_verify_finds_and_requeues_damage():
+    """Corrupt, truncated and missing files are flagged, requeued and fetched again."""
+    server = RangeServer()
+    with tempfile.TemporaryDirectory() as tmp:
+        file_manager, course = _downloaded_course(tmp, server)
+        lessons = [lesson.local_path for lesson in course.modules[0].lessons]
+        corrupt, truncated, missing = (lessons[0] / "1_Talk_11.mp4", lessons[1] / "2_Talk_12.mp4",
+                                       lessons[2] / "3_Talk_13.mp4")
+        corrupt.write_bytes(b"\xff" + BLOB[1:])
+        truncated.write_bytes(BLOB[:1000])
+        missing.unlink()
+
+        with CourseManifest(course.local_path) as manifest:
+            results = verify_files(manifest.files_to_verify(), workers=2)
+            statuses = {record['path']: status for record, status, _ in results}
+            assert statuses == {corrupt: INTEGRITY_CORRUPT, truncated: INTEGRITY_TRUNCATED, missing: INTEGRITY_MISSING}, statuses
+
+            assert requeue_files(manifest, [record for record, status, _ in results if status != INTEGRITY_OK]) == 3
+            assert manifest.summary()['files']['video'] == {FILE_PENDING: 3}
+        assert not corrupt.exists()
+
+        rerun = _downloader(file_manager)
+        rerun.download_course_videos_and_subtitles(course.local_path, '720p')
+        assert rerun.stats['videos']['downloaded'] == 3, rerun.stats
+
+        with CourseManifest(course.local_path) as manifest:
+            assert {status for _, status, _ in verify_files(manifest.files_to_verify(), workers=2)} == {INTEGRITY_OK}
+    print("PASS: damaged files flagged and requeued")
+
+
+def test_verify_command_backfills_adopted_hashes():
+    """The verify command hashes files adopted without one and exits non-zero on damage."""
+    server = RangeServer()
+    with tempfile.TemporaryDirectory() as tmp:
+        file_manager = FileManager(Path(tmp))
+        course = _course(server.start(), modules=1, lessons=2)
+        file_manager.create_full_structure(course)
+        lessons = [lesson.local_path for lesson in course.modules[0].lessons]
+        (lessons[0] / "1_Talk_11.mp4").write_bytes(BLOB)
+        (lessons[1] / "2_Talk_12.mp4").write_bytes(BLOB)
+        _downloader(file_manager).download_course_videos_and_subtitles(course.local_path, '720p')
+        assert server.requests == []
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ['verify', course.name, '--output-dir', tmp, '--workers', '1'])
+        assert result.exit_code == 0, result.output
+        with CourseManifest(course.local_path) as manifest:
+            assert {record['sha256'] for record in manifest.files_to_verify()} == {BLOB_SHA256}
+
+        (lessons[1] / "2_Talk_12.mp4").write_bytes(b"\xff" + BLOB[1:])
+        result = runner.invoke(cli, ['verify', course.name, '--output-dir', tmp])
+        assert result.exit_code == 1, result.output
+        assert 'corrupt' in result.output, result.output
+    print("PASS: verify command backfills hashes and reports damage")
+
+
+def test_old_manifest_is_migrated():
+    """Manifests written before the integrity columns existed gain them on open."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / ".course_manifest.db")
+        conn.execute("""CREATE TABLE files (path TEXT PRIMARY KEY, media_type TEXT NOT NULL, lesson_id TEXT,
+                        status TEXT NOT NULL, size INTEGER, updated_at REAL NOT NULL)""")
+        conn.execute("INSERT INTO files VALUES ('a.mp4', 'video', NULL, 'complete', 10, 0)")
+        conn.commit()
+        conn.close()
+
+        with CourseManifest(Path(tmp)) as manifest:
+            records = manifest.files_to_verify()
+            manifest.record_file(Path(tmp) / "b.mp4", 'video', FILE_COMPLETE, size=3, content_length=3, sha256="abc")
+            assert manifest.summary()['files']['video'] == {FILE_COMPLETE: 2}
+        assert records[0]['sha256'] is None and records[0]['size'] == 10
+    print("PASS: old manifest migrated")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING DOWNLOAD INTEGRITY")
+    print("=" * 60)
+    tests = [
+        test_streaming_hash_and_fallback,
+        test_downloads_record_size_and_hash,
+        test_verify_finds_and_requeues_damage,
+        test_verify_command_backfills_adopted_hashes,
+        test_old_manifest_is_migrated,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
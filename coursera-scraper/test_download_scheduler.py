@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script for the download scheduler policies and worker pool.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.auth import CourseraAuth
+from src.api.download_scheduler import DownloadScheduler
+from src.api.enhanced_downloader import EnhancedVideoDownloader
+from src.api.lecture_media import LectureMedia
+from src.core.file_manager import FileManager
+from test_lecture_media import LectureAPI, _response
+from test_url_refresh import _course
+
+
+class OrderedAPI(LectureAPI):
+    """LectureAPI that records the order in which videos and subtitles are requested."""
+
+    def __init__(self):
+        super().__init__()
+        self.sequence = []
+
+    async def media(self, request):
+        self.sequence.append(('video', request.match_info['name']))
+        return await super().media(request)
+
+    async def subtitles(self, request):
+        self.sequence.append(('subtitle', request.match_info['name']))
+        return await super().subtitles(request)
+
+
+class CountingDownloader(EnhancedVideoDownloader):
+    """Records how many asyncio tasks exist whenever a file starts."""
+
+    peak_tasks = 0
+
+    async def _download_single_media_file(self, *args):
+        self.peak_tasks = max(self.peak_tasks, len(asyncio.all_tasks()))
+        return await super()._download_single_media_file(*args)
+
+
+def _media(name, media_type, size=None):
+    return {'filename': name, 'type': media_type, 'asset_info': {'file_size': size} if size else {}}
+
+
+def _download(api, base_url, tmp, lessons, order, max_concurrent=1, progress='tty'):
+    course = _course(api, lessons=lessons)
+    for lesson in course.modules[0].lessons:
+        asset = lesson.assets[0]
+        asset.metadata['lecture_media'] = LectureMedia.from_response(_response(asset.metadata['item_id'], base_url)).to_dict()
+    FileManager(Path(tmp)).create_full_structure(course)
+
+    auth = CourseraAuth(cauth_cookie="x" * 32, csrf_token="y" * 16)
+    downloader = CountingDownloader(auth=auth, file_manager=FileManager(Path(tmp)), max_concurrent=max_concurrent, order=order,
+                                    progress=progress)
+    downloader.api_base_url = base_url
+    downloader.download_course_videos_and_subtitles(course.local_path, '720p')
+    return downloader
+
+
+def test_policy_order():
+    """Each policy orders by expected size, keeping lesson order between equal sizes."""
+    media = [
+        _media("1.mp4", 'video'), _media("1.vtt", 'subtitle'),
+        _media("2.mp4", 'video', size=5000), _media("2.vtt", 'subtitle'),
+        _media("3.html", 'supplement'), _media("3.mp4", 'video', size=900 * 1024 * 1024),
+    ]
+    names = lambda policy: [item['filename'] for item in DownloadScheduler(media, policy)]
+
+    assert names('lesson') == ["1.mp4", "1.vtt", "2.mp4", "2.vtt", "3.html", "3.mp4"]
+    assert names('shortest') == ["2.mp4", "1.vtt", "2.vtt", "3.html", "1.mp4", "3.mp4"]
+    assert names('largest') == ["3.mp4", "1.mp4", "1.vtt", "2.vtt", "3.html", "2.mp4"]
+
+    scheduler = DownloadScheduler(media, 'shortest')
+    jobs = iter(scheduler)
+    next(jobs), next(jobs)
+    assert [item['filename'] for item in scheduler.pending()] == ["2.vtt", "3.html", "1.mp4", "3.mp4"]
+    assert len(scheduler) == 4
+
+    try:
+        DownloadScheduler(media, 'random')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("accepted an unknown policy")
+    print("PASS: scheduler policies order media")
+
+
+def test_shortest_first_download():
+    """With shortest-first, every subtitle is fetched before the first video."""
+    api = OrderedAPI()
+    base_url = api.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        downloader = _download(api, base_url, tmp, lessons=3, order='shortest')
+
+        assert downloader.stats['videos']['downloaded'] == 3, downloader.stats
+        assert downloader.stats['subtitles']['downloaded'] == 3, downloader.stats
+        kinds = [kind for kind, _ in api.sequence]
+        assert kinds == ['subtitle'] * 3 + ['video'] * 3, api.sequence
+        assert [name for _, name in api.sequence[3:]] == ["i1.mp4", "i2.mp4", "i3.mp4"]
+    print("PASS: shortest-first download order")
+
+
+def test_worker_pool_is_bounded():
+    """A large run keeps a fixed pool of workers rather than a task per file."""
+    api = OrderedAPI()
+    base_url = api.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        downloader = _download(api, base_url, tmp, lessons=25, order='lesson', max_concurrent=2)
+
+        assert downloader.stats['videos']['downloaded'] == 25, downloader.stats
+        assert downloader.stats['subtitles']['downloaded'] == 25, downloader.stats
+        # Two workers, the run itself and the rate control watcher
+        assert downloader.peak_tasks <= 5, downloader.peak_tasks
+        # Lesson order: each lesson's video and subtitle start before the next lesson's
+        videos = [name for kind, name in api.sequence if kind == 'video']
+        assert videos[:3] == ["i1.mp4", "i2.mp4", "i3.mp4"], videos
+    print("PASS: bounded worker pool")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING DOWNLOAD SCHEDULER")
+    print("=" * 60)
+    tests = [
+        test_policy_order,
+        test_shortest_first_download,
+        test_worker_pool_is_bounded,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Test script for downloading videos from HLS playlists.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api import hls_download
+from src.api.hls_download import (
+    HLSTransfer, HLSVariant, parse_master_playlist, parse_media_playlist, select_variant
+)
+from src.api.lecture_media import LectureMedia
+from src.api.url_refresh import URLExpiredError
+from src.utils.exceptions import DownloadError
+from src.core.file_manager import FileManager
+from test_lecture_media import _downloader
+from test_url_refresh import COURSE_ID, SignedCDN, _course
+
+SEGMENT_COUNT = 12
+SEGMENTS = [bytes([index]) * 40000 for index in range(SEGMENT_COUNT)]
+INIT_SECTION = b"ftypisom" + b"\0" * 1000
+
+MASTER = """#EXTM3U
+#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360
+360/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=2500000,RESOLUTION=1280x720
+720/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=5000000,RESOLUTION=1920x1080
+1080/index.m3u8
+"""
+
+
+def _media_playlist(extension, init=False):
+    lines = ["#EXTM3U", "#EXT-X-VERSION:7", "#EXT-X-TARGETDURATION:6", "#EXT-X-PLAYLIST-TYPE:VOD"]
+    if init:
+        lines.append('#EXT-X-MAP:URI="init.mp4"')
+    for index in range(SEGMENT_COUNT):
+        lines += ["#EXTINF:6.0,", f"seg{index}.{extension}?token=abc"]
+    lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
+
+
+class HLSServer(SignedCDN):
+    """SignedCDN that also serves HLS playlists and segments, with failures on request."""
+
+    def __init__(self, fmp4=False):
+        super().__init__()
+        self.fmp4 = fmp4
+        self.segment_requests = []
+        self.fail_once = set()      # Segment indices answered with HTTP 500 the first time
+        self.expire_once = set()    # Segment indices answered with HTTP 403 the first time
+        self.mp4_status = None      # Status for every progressive MP4 request, if set
+        self.active = 0
+        self.peak_active = 0
+
+    async def master(self, request):
+        return web.Response(text=MASTER)
+
+    async def rendition(self, request):
+        extension = 'm4s' if self.fmp4 else 'ts'
+        return web.Response(text=_media_playlist(extension, init=self.fmp4))
+
+    async def segment(self, request):
+        name = request.match_info['name']
+        if name == 'init.mp4':
+            return web.Response(body=INIT_SECTION)
+
+        index = int(name[3:].split('.')[0])
+        self.segment_requests.append((request.match_info['rendition'], index))
+        if index in self.expire_once:
+            self.expire_once.discard(index)
+            return web.Response(status=403)
+        if index in self.fail_once:
+            self.fail_once.discard(index)
+            return web.Response(status=500)
+
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            # Give concurrent requests a chance to overlap
+            await asyncio.sleep(0.05)
+            return web.Response(body=SEGMENTS[index])
+        finally:
+            self.active -= 1
+
+    async def media(self, request):
+        if self.mp4_status:
+            return web.Response(status=self.mp4_status)
+        return await super().media(request)
+
+    async def lecture_video(self, request):
+        item_id = request.match_info['ids'].split('~')[1]
+        self.lookups.append(item_id)
+        return web.json_response(_lecture_response(item_id, f"http://127.0.0.1:{self.port}"))
+
+    def add_routes(self, app):
+        super().add_routes(app)
+        app.router.add_get('/hls/{item}/master.m3u8', self.master)
+        app.router.add_get('/hls/{item}/{rendition}/index.m3u8', self.rendition)
+        app.router.add_get('/hls/{item}/{rendition}/{name}', self.segment)
+
+
+def _lecture_response(item_id, base_url, mp4=True):
+    by_resolution = {'720p': {'mp4VideoUrl': f"{base_url}/cdn/{item_id}.mp4?Expires=9999999999&Signature=fresh"}} if mp4 else {}
+    return {
+        'elements': [{'id': f'{COURSE_ID}~{item_id}'}],
+        'linked': {'onDemandVideos.v1': [{
+            'sources': {'byResolution': by_resolution, 'playlists': {'hls': f"{base_url}/hls/{item_id}/master.m3u8"}}
+        }]}
+    }
+
+
+def _transfer(server, base_url, local_path, **kwargs):
+    async def run():
+        async with aiohttp.ClientSession() as session:
+            transfer = HLSTransfer(session, f"{base_url}/hls/i1/master.m3u8", local_path, '720p', **kwargs)
+            try:
+                return transfer, await transfer.run()
+            except (DownloadError, URLExpiredError) as e:
+                return transfer, e
+    return asyncio.run(run())
+
+
+def test_playlist_parsing():
+    """Master playlists resolve to the best rendition at or below the requested resolution."""
+    variants = parse_master_playlist(MASTER, "https://cdn.example/hls/i1/master.m3u8?sig=1")
+    assert [variant.height for variant in variants] == [360, 720, 1080]
+    assert variants[1].url == "https://cdn.example/hls/i1/720/index.m3u8"
+    assert select_variant(variants, '720p').height == 720
+    assert select_variant(variants, '540p').height == 360
+    assert select_variant(variants, '240p').height == 360
+    assert select_variant(variants, None).height == 1080
+    assert select_variant([HLSVariant("a", 100), HLSVariant("b", 900)], '720p').url == "b"
+
+    playlist = parse_media_playlist(_media_playlist('m4s', init=True), "https://cdn.example/hls/i1/720/index.m3u8")
+    assert playlist.fragmented_mp4 and playlist.init_url == "https://cdn.example/hls/i1/720/init.mp4"
+    assert playlist.segments[0] == "https://cdn.example/hls/i1/720/seg0.m4s?token=abc"
+    assert len(playlist.segments) == SEGMENT_COUNT
+
+    for broken in ("#EXTM3U\n#EXTINF:6.0,\nseg0.ts\n",
+                   "#EXTM3U\n#EXT-X-KEY:METHOD=AES-128,URI=\"k\"\n#EXTINF:6.0,\nseg0.ts\n#EXT-X-ENDLIST\n",
+                   "#EXTM3U\n#EXT-X-BYTERANGE:100@0\n#EXTINF:6.0,\nall.ts\n#EXT-X-ENDLIST\n"):
+        try:
+            parse_media_playlist(broken, "https://cdn.example/x.m3u8")
+        except DownloadError:
+            continue
+        raise AssertionError(f"accepted unsupported playlist: {broken!r}")
+    print("PASS: playlists parsed and rendition selected")
+
+
+def test_segments_fetched_concurrently_with_retry():
+    """fMP4 segments download in parallel, a failed one is retried, and the join is byte-exact."""
+    server = HLSServer(fmp4=True)
+    base_url = server.start()
+    server.fail_once = {4}
+    with tempfile.TemporaryDirectory() as tmp:
+        local_path = Path(tmp) / "video.mp4"
+        transfer, result = _transfer(server, base_url, local_path)
+
+        assert not isinstance(result, Exception), result
+        expected = INIT_SECTION + b"".join(SEGMENTS)
+        assert local_path.read_bytes() == expected
+        assert result[0] == len(expected)
+        assert transfer.stats['retries'] == 1 and transfer.stats['fetched'] == SEGMENT_COUNT + 1
+        assert server.peak_active > 1
+        assert all(rendition == '720' for rendition, _ in server.segment_requests)
+        assert not transfer.segment_dir.exists()
+    print("PASS: segments fetched concurrently with retry")
+
+
+def test_segments_resumed():
+    """An interrupted transfer keeps its finished segments and fetches only the missing ones."""
+    server = HLSServer()
+    base_url = server.start()
+    server.expire_once = {SEGMENT_COUNT - 1}
+    original_ffmpeg_path = hls_download.ffmpeg_path
+    hls_download.ffmpeg_path = lambda: None
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            local_path = Path(tmp) / "video.mp4"
+            transfer, result = _transfer(server, base_url, local_path, concurrency=2)
+            assert isinstance(result, URLExpiredError), result
+            kept = {int(path.stem) for path in transfer.segment_dir.glob("*.seg")}
+            assert kept and len(kept) < SEGMENT_COUNT
+
+            server.segment_requests = []
+            transfer, result = _transfer(server, base_url, local_path, concurrency=2)
+            assert not isinstance(result, Exception), result
+            assert sorted(index for _, index in server.segment_requests) == sorted(set(range(SEGMENT_COUNT)) - kept)
+            assert transfer.stats['resumed'] == len(kept)
+
+            # Without ffmpeg the MPEG-TS segments are joined as they are
+            assert not transfer.stats['remuxed']
+            assert local_path.read_bytes() == b"".join(SEGMENTS)
+    finally:
+        hls_download.ffmpeg_path = original_ffmpeg_path
+    print("PASS: HLS segments resumed")
+
+
+def test_downloader_uses_hls():
+    """The engine falls back to HLS when the MP4 fails, and uses it when there is no MP4 at all."""
+    server = HLSServer(fmp4=True)
+    base_url = server.start()
+    server.mp4_status = 500
+    with tempfile.TemporaryDirectory() as tmp:
+        course = _course(server, lessons=2)
+        first, second = (lesson.assets[0] for lesson in course.modules[0].lessons)
+        first.metadata['lecture_media'] = LectureMedia.from_response(_lecture_response("i1", base_url)).to_dict()
+        second.metadata['lecture_media'] = LectureMedia.from_response(_lecture_response("i2", base_url, mp4=False)).to_dict()
+        second.url = f"{base_url}/hls/i2/master.m3u8"
+        second.metadata['format'] = 'hls'
+        FileManager(Path(tmp)).create_full_structure(course)
+
+        downloader = _downloader(tmp, base_url)
+        downloader.download_subtitles = False
+        downloader.download_course_videos_and_subtitles(course.local_path, '720p')
+
+        assert downloader.stats['videos']['downloaded'] == 2, downloader.stats
+        expected = INIT_SECTION + b"".join(SEGMENTS)
+        for index, lesson in enumerate(course.modules[0].lessons, start=1):
+            assert (lesson.local_path / f"{index}_Talk_{index}.mp4").read_bytes() == expected
+        assert server.lookups == []
+    print("PASS: downloader falls back to HLS")
+
+
+def test_scraper_extracts_hls_only_video():
+    """A lecture without a 720p MP4 still gets a video asset from the scrape path, pointing at its playlist."""
+    from test_scrape_downloads import _scraper
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = _scraper(tmp, concurrent_downloads=1)
+        assets = scraper._extract_video_content_assets(
+            _lecture_response("i2", "https://cdn.example", mp4=False), item_id="i2", video_name="Intro: HLS/only"
+        )
+    videos = [asset for asset in assets if asset.file_type == "video"]
+    assert len(videos) == 1, assets
+    assert videos[0].url == "https://cdn.example/hls/i2/master.m3u8"
+    assert videos[0].metadata['format'] == 'hls' and videos[0].name.endswith("_720p.mp4")
+    print("PASS: scraper extracts HLS-only video")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING HLS DOWNLOADS")
+    print("=" * 60)
+    tests = [
+        test_playlist_parsing,
+        test_segments_fetched_concurrently_with_retry,
+        test_segments_resumed,
+        test_downloader_uses_hls,
+        test_scraper_extracts_hls_only_video,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
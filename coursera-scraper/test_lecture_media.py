@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test script for resolving videos and subtitles from one lecture video response per item.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+from aiohttp import web
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.auth import CourseraAuth
+from src.api.enhanced_downloader import EnhancedVideoDownloader
+from src.api.lecture_media import LectureMedia
+from src.core.file_manager import FileManager
+from test_url_refresh import COURSE_ID, SignedCDN, _course
+
+SUBTITLES = b"WEBVTT\n\n00:00.000 --> 00:02.000\nHello from the local subtitle server, long enough to count.\n"
+
+
+def _response(item_id, base_url, expires_in=3600):
+    return {
+        'elements': [{'id': f'{COURSE_ID}~{item_id}'}],
+        'linked': {'onDemandVideos.v1': [{
+            'sources': {
+                'byResolution': {
+                    '720p': {'mp4VideoUrl': f"{base_url}/cdn/{item_id}.mp4?Expires=9999999999&Signature=fresh",
+                             'webMVideoUrl': f"{base_url}/cdn/{item_id}.webm"},
+                    '360p': {'mp4VideoUrl': f"{base_url}/cdn/{item_id}_360.mp4"}
+                },
+                'playlists': {'hls': f"{base_url}/hls/{item_id}.m3u8"}
+            },
+            'subtitlesVtt': {'en': f"{base_url}/subs/{item_id}.en.vtt", 'fr': f"/api/subtitleAssetProxy.v1/{item_id}?fileExtension=vtt"},
+            'subtitlesTxt': {'en': f"{base_url}/subs/{item_id}.en.txt"},
+            'dubbedSources': {'es': {'byResolution': {'720p': {'mp4VideoUrl': f"{base_url}/cdn/{item_id}.es.mp4"}}}},
+            'dubbedSubtitlesVtt': {'es': f"{base_url}/subs/{item_id}.es.vtt"}
+        }]}
+    }
+
+
+class LectureAPI(SignedCDN):
+    """SignedCDN whose lecture video responses carry subtitles, dubs and playlists."""
+
+    def __init__(self):
+        super().__init__()
+        self.subtitles_served = []
+
+    async def lecture_video(self, request):
+        item_id = request.match_info['ids'].split('~')[1]
+        self.lookups.append(item_id)
+        return web.json_response(_response(item_id, f"http://127.0.0.1:{self.port}"))
+
+    async def subtitles(self, request):
+        self.subtitles_served.append(request.match_info['name'])
+        return web.Response(body=SUBTITLES)
+
+    def add_routes(self, app):
+        super().add_routes(app)
+        app.router.add_get('/subs/{name}', self.subtitles)
+
+
+def _downloader(tmp, base_url):
+    auth = CourseraAuth(cauth_cookie="x" * 32, csrf_token="y" * 16)
+    downloader = EnhancedVideoDownloader(auth=auth, file_manager=FileManager(Path(tmp)), max_concurrent=2)
+    downloader.api_base_url = base_url
+    return downloader
+
+
+def test_parse_every_media_url():
+    """Video sources, subtitle formats, dubbed tracks and the HLS playlist come from one response."""
+    media = LectureMedia.from_response(_response("i1", "http://cdn"))
+
+    assert media.video_url('720p') == "http://cdn/cdn/i1.mp4?Expires=9999999999&Signature=fresh"
+    assert media.video_url('720p', 'webm') == "http://cdn/cdn/i1.webm"
+    assert media.video_url('360p') == "http://cdn/cdn/i1_360.mp4"
+    assert media.video_url('1080p') is None
+    assert media.video_url('720p', language='es') == "http://cdn/cdn/i1.es.mp4"
+    assert media.subtitle_url('en') == "http://cdn/subs/i1.en.vtt"
+    assert media.subtitle_url('fr') == "https://www.coursera.org/api/subtitleAssetProxy.v1/i1?fileExtension=vtt"
+    assert media.subtitle_url('en', 'txt') == "http://cdn/subs/i1.en.txt"
+    assert media.subtitle_url('de') is None
+    assert media.dubbed_subtitles == {'es': "http://cdn/subs/i1.es.vtt"}
+    assert media.hls_playlist == "http://cdn/hls/i1.m3u8"
+
+    assert LectureMedia.from_dict(media.to_dict()) == media
+    assert LectureMedia.from_response({'elements': []}) is None
+    print("PASS: lecture media parsed from one response")
+
+
+def test_scraped_media_needs_no_lookup():
+    """Subtitles listed in the scraped lecture media are downloaded without any API request."""
+    api = LectureAPI()
+    base_url = api.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        course = _course(api, lessons=3)
+        for lesson in course.modules[0].lessons:
+            asset = lesson.assets[0]
+            asset.metadata['lecture_media'] = LectureMedia.from_response(
+                _response(asset.metadata['item_id'], base_url)).to_dict()
+        FileManager(Path(tmp)).create_full_structure(course)
+
+        downloader = _downloader(tmp, base_url)
+        downloader.download_course_videos_and_subtitles(course.local_path, '720p')
+
+        assert downloader.stats['videos']['downloaded'] == 3, downloader.stats
+        assert downloader.stats['subtitles']['downloaded'] == 3, downloader.stats
+        assert api.lookups == []
+        assert (course.modules[0].lessons[0].local_path / "1_Talk_1.vtt").read_bytes() == SUBTITLES
+    print("PASS: scraped lecture media used without API requests")
+
+
+def test_one_lookup_per_item():
+    """Without scraped media, each item costs one lookup, shared with its video URL refresh."""
+    api = LectureAPI()
+    base_url = api.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        course = _course(api, lessons=3, expires_in=-60)
+        FileManager(Path(tmp)).create_full_structure(course)
+
+        downloader = _downloader(tmp, base_url)
+        downloader.download_course_videos_and_subtitles(course.local_path, '720p')
+
+        assert downloader.stats['videos']['downloaded'] == 3, downloader.stats
+        assert downloader.stats['subtitles']['downloaded'] == 3, downloader.stats
+        assert sorted(api.lookups) == ["i1", "i2", "i3"], api.lookups
+        assert sorted(api.subtitles_served) == ["i1.en.vtt", "i2.en.vtt", "i3.en.vtt"]
+    print("PASS: one lecture video lookup per item")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING LECTURE MEDIA RESOLUTION")
+    print("=" * 60)
+    tests = [
+        test_parse_every_media_url,
+        test_scraped_media_needs_no_lookup,
+        test_one_lookup_per_item,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
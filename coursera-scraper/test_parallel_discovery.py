@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Test script for parallel dynamic course discovery.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.async_client import AsyncCourseraClient
+from src.api.auth import CourseraAuth
+from src.api.coursera_client import CourseraClient
+from src.config.settings import ConfigManager
+from src.core.course_models import APIConfig
+from src.core.discovery_cache import DISCOVERY_CACHE_DIR, DiscoveryCache
+from src.core.file_manager import FileManager
+from src.core.scraper import ContentType, CourseScraper
+
+COURSE_ID = "AbCdEfGhIjKlMnOpQrStUv"
+VALID_VIDEOS = {"vid001", "vid002", "vid003"}
+
+
+class FakeCoursera:
+    """Local stand-in for course pages and the lecture video API."""
+
+    def __init__(self):
+        self.video_requests = []
+        self.active = 0
+        self.peak_active = 0
+        self.port = None
+        self._ready = threading.Event()
+
+    async def page(self, request):
+        slug = request.match_info['slug']
+        if slug == 'missing':
+            return web.Response(status=404)
+        # The slow candidate would hold up discovery if probing were sequential
+        await asyncio.sleep({'slow': 3, 'late': 0.5}.get(slug, 0.05))
+        return web.Response(text=f'<script>window.App = {{"courseId": "{COURSE_ID}"}}</script>',
+                            content_type='text/html')
+
+    async def video(self, request):
+        item_id = request.match_info['ids'].split('~')[1]
+        self.video_requests.append(item_id)
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            self.active -= 1
+        if item_id not in VALID_VIDEOS:
+            return web.json_response({}, status=404)
+        return web.json_response({'linked': {'onDemandVideos.v1': [{'sources': {}}]}})
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait(5)
+        return f"http://127.0.0.1:{self.port}"
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        app = web.Application()
+        app.router.add_get('/learn/{slug}', self.page)
+        app.router.add_get('/api/videos/{ids}', self.video)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        loop.run_forever()
+
+
+def _scraper(tmp):
+    auth = CourseraAuth(cauth_cookie="x" * 32, csrf_token="y" * 16)
+    client = CourseraClient(auth, APIConfig(base_url="http://127.0.0.1", endpoints={}),
+                            rate_limit_delay=0.01, rate_limit_burst=10)
+    config = ConfigManager(Path(__file__).parent / "config")
+    config.app_settings.max_concurrent_requests = 4
+    return CourseScraper(client=client, file_manager=FileManager(Path(tmp)), config=config)
+
+
+def test_highest_priority_course_page_wins():
+    """Candidate pages are fetched together; the highest-priority hit wins and the slow ones are cancelled."""
+    server = FakeCoursera()
+    base_url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = _scraper(tmp)
+        # 'fast' answers first, but 'late' comes earlier in the priority order
+        urls = [f"{base_url}/learn/missing", f"{base_url}/learn/late", f"{base_url}/learn/fast",
+                f"{base_url}/learn/slow"]
+
+        async def run():
+            async with AsyncCourseraClient(scraper.client, max_concurrent=4) as api:
+                return await scraper._find_course_page(api, urls, {})
+
+        started = time.monotonic()
+        found = asyncio.run(run())
+        elapsed = time.monotonic() - started
+
+    assert found is not None
+    assert found[0].endswith('/learn/late'), found[0]
+    assert found[2] == COURSE_ID
+    assert elapsed < 1.5, elapsed
+    print(f"PASS: highest-priority course page found in {elapsed:.2f}s, slow candidate cancelled")
+
+
+def test_ids_validated_concurrently_and_cached():
+    """IDs are probed concurrently, in order, and rejected IDs are skipped on rerun."""
+    server = FakeCoursera()
+    base_url = server.start()
+    candidates = sorted(VALID_VIDEOS | {f"junk{i:02d}" for i in range(12)})
+    template = base_url + "/api/videos/{course_id}~{item_id}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = _scraper(tmp)
+        cache_dir = Path(tmp) / DISCOVERY_CACHE_DIR
+
+        async def run():
+            cache = DiscoveryCache(cache_dir, COURSE_ID)
+            async with AsyncCourseraClient(scraper.client, max_concurrent=4) as api:
+                items = await scraper._validate_content_ids(
+                    api, cache, COURSE_ID, candidates, ContentType.VIDEO, template, scraper._is_valid_video_content
+                )
+            cache.save()
+            return items
+
+        started = time.monotonic()
+        items = asyncio.run(run())
+        elapsed = time.monotonic() - started
+
+        assert [item['item_id'] for item in items] == sorted(VALID_VIDEOS)
+        assert all(item['content_type'] == ContentType.VIDEO for item in items)
+        assert len(server.video_requests) == 15
+        assert 1 < server.peak_active <= 4
+        assert elapsed < 15 * 0.1 / 2, elapsed
+
+        cache = DiscoveryCache(cache_dir, COURSE_ID)
+        assert cache.valid['video'] == VALID_VIDEOS
+        assert len(cache.rejected['video']) == 12
+
+        # A rerun only asks for the IDs that were valid last time
+        server.video_requests.clear()
+        items = asyncio.run(run())
+        assert [item['item_id'] for item in items] == sorted(VALID_VIDEOS)
+        assert sorted(server.video_requests) == sorted(VALID_VIDEOS)
+
+    print(f"PASS: 15 IDs validated in {elapsed:.2f}s, rerun skipped 12 cached rejects")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING PARALLEL COURSE DISCOVERY")
+    print("=" * 60)
+    tests = [
+        test_highest_priority_course_page_wins,
+        test_ids_validated_concurrently_and_cached,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
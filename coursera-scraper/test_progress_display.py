@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for batched download progress and JSON progress snapshots.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from rich.console import Console
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.progress_display import JSONProgress, TerminalProgress
+from src.utils.partial_download import MAX_CHUNK_SIZE, MIN_CHUNK_SIZE, chunk_size_for
+from test_download_scheduler import OrderedAPI, _download
+from test_resumable_download import BLOB
+
+
+def test_adaptive_chunk_sizes():
+    """Read sizes scale with the body between 256 KB and 4 MB."""
+    assert MIN_CHUNK_SIZE == 256 * 1024 and MAX_CHUNK_SIZE == 4 * 1024 * 1024
+    assert chunk_size_for(50_000) == MIN_CHUNK_SIZE
+    assert chunk_size_for(64 * 1024 * 1024) == 1024 * 1024
+    assert chunk_size_for(2 * 1024 ** 3) == MAX_CHUNK_SIZE
+    print("PASS: adaptive chunk sizes")
+
+
+def test_updates_are_batched():
+    """Per-chunk updates only change counters; the display sees them when flushed."""
+    async def run():
+        stream = io.StringIO()
+        terminal = TerminalProgress(Console(file=io.StringIO()), interval=60)
+        async with JSONProgress(stream, interval=60) as progress, terminal:
+            files = progress.add_task("files", total=2, unit='files')
+            first, second = progress.add_task("a"), progress.add_task("b")
+            bar = terminal.add_task("a")
+            for offset in range(0, 1000 * 4096, 4096):
+                progress.update(first, completed=offset + 4096, total=1000 * 4096)
+                terminal.update(bar, completed=offset + 4096, total=1000 * 4096)
+            progress.update(second, completed=500, total=1000)
+
+            # Thousands of updates, nothing drawn or written yet
+            assert stream.getvalue() == ""
+            rich_task = terminal.progress.tasks[0]
+            assert rich_task.completed == 0
+            terminal.flush()
+            assert rich_task.completed == 1000 * 4096
+
+            progress.remove_task(first)
+            progress.advance(files)
+            snapshot = progress.snapshot()
+            assert snapshot['bytes'] == 1000 * 4096 + 500, snapshot
+            assert snapshot['active'] == 1 and snapshot['files_done'] == 1 and snapshot['files_total'] == 2
+        return stream.getvalue().splitlines()
+
+    lines = asyncio.run(run())
+    assert len(lines) == 1 and json.loads(lines[0])['done'] is True, lines
+    print("PASS: progress updates batched")
+
+
+def test_json_progress_download():
+    """A headless run prints aggregate JSON snapshots on stdout, ending with a final one."""
+    api = OrderedAPI()
+    base_url = api.start()
+    stdout = io.StringIO()
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(stdout):
+        downloader = _download(api, base_url, tmp, lessons=3, order='lesson', progress='json')
+
+    assert downloader.stats['videos']['downloaded'] == 3, downloader.stats
+    snapshots = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert snapshots and all(snapshot['event'] == 'progress' for snapshot in snapshots), stdout.getvalue()[:500]
+    final = snapshots[-1]
+    assert final['done'] is True
+    assert final['files_done'] == final['files_total'] == 6, final
+    assert final['files_downloaded'] == 6 and final['files_failed'] == 0, final
+    assert final['bytes'] >= 3 * len(BLOB), final
+    print("PASS: JSON progress snapshots")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING PROGRESS REPORTING")
+    print("=" * 60)
+    tests = [
+        test_adaptive_chunk_sizes,
+        test_updates_are_batched,
+        test_json_progress_download,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test script for queued logging: background writer thread, deferred formatting and the JSON sink.
+No Coursera credentials needed.
+"""
+
+import contextlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.utils.logger import APP_LOGGER, LoggerMixin, get_handlers, setup_logger, stop_logging
+
+
+class Recorder:
+    """Log argument that remembers which thread turned it into text."""
+
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread())
+        return "recorded"
+
+
+def test_formatting_on_writer_thread():
+    """Records are formatted and written by the listener thread, and debug below the level is never formatted."""
+    with tempfile.TemporaryDirectory() as tmp:
+        logger = setup_logger("queued_test", log_level="INFO", log_dir=tmp)
+        # Handlers on the root logger (pytest's capture) would format on the calling thread
+        logger.propagate = False
+        try:
+            # The logger itself only queues; the writer thread owns the file and console handlers
+            assert len(logger.handlers) == 1 and len(get_handlers(logger)) == 2
+            skipped, logged = Recorder(), Recorder()
+            logger.debug("Hot path detail %s", skipped)
+            logger.info("Downloaded %s", logged)
+        finally:
+            stop_logging("queued_test")
+
+        assert skipped.threads == []
+        assert logged.threads and all(thread is not threading.main_thread() for thread in logged.threads), logged.threads
+        assert "Downloaded recorded" in (Path(tmp) / "queued_test.log").read_text()
+        assert logger.handlers == []
+    print("PASS: formatting on writer thread")
+
+
+def test_json_sink():
+    """The JSON sink writes one object per record, with extra fields and exceptions."""
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "sink" / "scraper.jsonl"
+        logger = setup_logger("json_test", log_level="DEBUG", log_dir=tmp, json_log=json_path)
+        try:
+            logger.debug("Fetched %d segments", 12, extra={'course': "ml", 'bytes': 4096})
+            try:
+                raise ValueError("broken")
+            except ValueError:
+                logger.exception("Download failed")
+        finally:
+            stop_logging("json_test")
+
+        entries = [json.loads(line) for line in json_path.read_text().splitlines()]
+        assert len(entries) == 2, entries
+        assert entries[0]['message'] == "Fetched 12 segments" and entries[0]['level'] == 'DEBUG'
+        assert entries[0]['course'] == "ml" and entries[0]['bytes'] == 4096 and entries[0]['logger'] == "json_test"
+        assert entries[1]['level'] == 'ERROR' and "ValueError: broken" in entries[1]['exception']
+    print("PASS: JSON sink")
+
+
+def test_component_loggers():
+    """LoggerMixin classes log under the app logger; only their warnings reach the console."""
+    class Component(LoggerMixin):
+        pass
+
+    assert Component().logger.name == f"{APP_LOGGER}.{__name__}.Component"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        console = io.StringIO()
+        with contextlib.redirect_stdout(console):
+            logger = setup_logger("component_test", log_level="INFO", log_dir=tmp)
+        child = logger.getChild("src.api.Component")
+        try:
+            logger.info("Course scraped")
+            child.info("Connection reuse: 3 requests")
+            child.warning("Segment retry")
+        finally:
+            stop_logging("component_test")
+
+        assert console.getvalue() == "INFO: Course scraped\nWARNING: Segment retry\n", console.getvalue()
+        log_text = (Path(tmp) / "component_test.log").read_text()
+        assert "Connection reuse: 3 requests" in log_text and "Segment retry" in log_text
+    print("PASS: component loggers")
+
+
+def _log_in_worker(name):
+    """Log from a pool process; module level so worker processes can run it."""
+    try:
+        logging.getLogger(name).info("Worker %d done", os.getpid())
+    finally:
+        stop_logging()
+    return os.getpid()
+
+
+def test_forked_workers_log():
+    """Forked download workers get their own writer thread and write out their records before exiting."""
+    if not hasattr(os, 'register_at_fork'):
+        print("SKIP: forked workers log (no fork on this platform)")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_logger("fork_test", log_dir=tmp)
+        try:
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('fork')) as pool:
+                pid = pool.submit(_log_in_worker, "fork_test").result()
+        finally:
+            stop_logging("fork_test")
+        assert f"Worker {pid} done" in (Path(tmp) / "fork_test.log").read_text()
+    print("PASS: forked workers log")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING QUEUED LOGGING")
+    print("=" * 60)
+    tests = [
+        test_formatting_on_writer_thread,
+        test_json_sink,
+        test_component_loggers,
+        test_forked_workers_log,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Test script for the disk-backed API response cache.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.auth import CourseraAuth
+from src.api.async_client import AsyncCourseraClient
+from src.api.coursera_client import CourseraClient
+from src.api.enhanced_downloader import EnhancedVideoDownloader
+from src.api.response_cache import ResponseCache
+from src.core.course_models import APIConfig, APIEndpointConfig
+from src.core.file_manager import FileManager
+
+COURSE_ID = "course123"
+
+
+class FakeVideoAPI:
+    """Local stand-in for onDemandLectureVideos.v1 that counts requests."""
+
+    def __init__(self):
+        self.requests = []
+        self.port = None
+        self._ready = threading.Event()
+
+    async def handle(self, request):
+        lecture_id = request.match_info['ids'].split('~')[1]
+        self.requests.append(lecture_id)
+        return web.json_response({
+            'elements': [{'id': f'{COURSE_ID}~{lecture_id}'}],
+            'linked': {'onDemandVideos.v1': [{
+                'sources': {'byResolution': {'720p': {'mp4VideoUrl': f'https://cdn.example/{lecture_id}.mp4'}}},
+                'subtitlesVtt': {'en': f'/api/subtitleAssetProxy.v1/{lecture_id}?format=vtt'}
+            }]}
+        })
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait(5)
+        return f"http://127.0.0.1:{self.port}"
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        app = web.Application()
+        app.router.add_get('/api/onDemandLectureVideos.v1/{ids}', self.handle)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        loop.run_forever()
+
+
+def _auth():
+    return CourseraAuth(cauth_cookie="x" * 32, csrf_token="y" * 16)
+
+
+def _client(base_url, cache):
+    api_config = APIConfig(base_url=base_url, endpoints={
+        'lecture_video': APIEndpointConfig(path='/api/onDemandLectureVideos.v1/{course_id}~{lecture_id}', cache_ttl=3600)
+    })
+    return CourseraClient(_auth(), api_config, rate_limit_delay=0.01, rate_limit_burst=10, response_cache=cache)
+
+
+def test_ttl_expiry_and_uncached_endpoints():
+    """Entries expire after their endpoint's TTL; endpoints without a TTL are never stored."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(tmp, {'course_info': 1, 'lecture_video': 0})
+        cache.put('course_info', {'slug': 'a'}, {'elements': [1]})
+        cache.put('lecture_video', {'lecture_id': 'x'}, {'elements': [2]})
+
+        assert cache.get('course_info', {'slug': 'a'}) == {'elements': [1]}
+        assert cache.get('course_info', {'slug': 'b'}) is None
+        assert cache.get('lecture_video', {'lecture_id': 'x'}) is None
+        assert cache.stats['stores'] == 1
+
+        time.sleep(1.1)
+        assert cache.get('course_info', {'slug': 'a'}) is None
+        assert not list(Path(tmp).glob('*/*.json'))
+    print("PASS: entries expire by endpoint TTL")
+
+
+def test_refresh_bypasses_reads():
+    """With refresh set, reads miss but new responses still replace old entries."""
+    with tempfile.TemporaryDirectory() as tmp:
+        ResponseCache(tmp, {'course_info': 3600}).put('course_info', {'slug': 'a'}, {'v': 1})
+
+        refreshing = ResponseCache(tmp, {'course_info': 3600}, refresh=True)
+        assert refreshing.get('course_info', {'slug': 'a'}) is None
+        refreshing.put('course_info', {'slug': 'a'}, {'v': 2})
+
+        assert ResponseCache(tmp, {'course_info': 3600}).get('course_info', {'slug': 'a'}) == {'v': 2}
+    print("PASS: --refresh ignores cached responses")
+
+
+def test_lru_eviction():
+    """Least recently used entries go first once the size limit is exceeded."""
+    payload = {'blob': 'z' * 1000}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(tmp, {'course_info': 3600}, max_size_bytes=5000)
+        for index in range(4):
+            cache.put('course_info', {'slug': index}, payload)
+
+        # Age every entry, then use entry 0 so it is the most recently used
+        for path in Path(tmp).glob('*/*.json'):
+            os.utime(path, (time.time() - 60, time.time() - 60))
+        assert cache.get('course_info', {'slug': 0}) == payload
+
+        cache.put('course_info', {'slug': 4}, payload)
+        cache.put('course_info', {'slug': 5}, payload)
+
+        assert cache.stats['evictions'] >= 2
+        assert cache._size <= 5000
+        assert cache.get('course_info', {'slug': 0}) == payload
+        assert cache.get('course_info', {'slug': 1}) is None
+        assert cache.get('course_info', {'slug': 5}) == payload
+
+        # A new instance measures the same size from disk
+        assert ResponseCache(tmp, {'course_info': 3600})._size == cache._size
+    print(f"PASS: LRU eviction kept the cache at {cache._size} bytes")
+
+
+def test_client_rerun_skips_network():
+    """A second run over the same items is served entirely from disk."""
+    server = FakeVideoAPI()
+    base_url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client = _client(base_url, ResponseCache(tmp, {'lecture_video': 3600}))
+        first = client.get_lecture_video(COURSE_ID, 'a1')
+
+        async def fetch_async():
+            async with AsyncCourseraClient(client) as api:
+                return await asyncio.gather(
+                    api.get_lecture_video(COURSE_ID, 'a1'),
+                    api.get_lecture_video(COURSE_ID, 'a2')
+                )
+
+        async_results = asyncio.run(fetch_async())
+        assert async_results[0] == first
+        assert server.requests == ['a1', 'a2']
+
+        # Next run: fresh client and cache object over the same directory
+        rerun = _client(base_url, ResponseCache(tmp, {'lecture_video': 3600}))
+        assert rerun.get_lecture_video(COURSE_ID, 'a2') == async_results[1]
+        assert server.requests == ['a1', 'a2']
+
+        # test_connection must always ask the server
+        rerun.get('lecture_video', use_cache=False, course_id=COURSE_ID, lecture_id='a2')
+        assert server.requests == ['a1', 'a2', 'a2']
+    print("PASS: rerun served from cache without network requests")
+
+
+def test_downloader_shares_lecture_video_entry():
+    """The downloader's subtitle lookup reuses the client's lecture_video response."""
+    server = FakeVideoAPI()
+    base_url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(Path(tmp) / 'cache', {'lecture_video': 3600})
+        _client(base_url, cache).get_lecture_video(COURSE_ID, 's1')
+
+        downloader = EnhancedVideoDownloader(
+            auth=_auth(),
+            file_manager=FileManager(Path(tmp)),
+            response_cache=cache
+        )
+        subtitle_url = asyncio.run(downloader._fetch_subtitle_url(COURSE_ID, 's1', 'en'))
+
+    assert subtitle_url == 'https://www.coursera.org/api/subtitleAssetProxy.v1/s1?format=vtt', subtitle_url
+    assert server.requests == ['s1']
+    print("PASS: downloader reused the cached lecture_video response")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING API RESPONSE CACHE")
+    print("=" * 60)
+    tests = [
+        test_ttl_expiry_and_uncached_endpoints,
+        test_refresh_bypasses_reads,
+        test_lru_eviction,
+        test_client_rerun_skips_network,
+        test_downloader_shares_lecture_video_entry,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
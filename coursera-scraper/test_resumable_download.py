@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Test script for resumable (HTTP Range) downloads.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import asyncio
+import hashlib
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from aiohttp import web
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.auth import CourseraAuth
+from src.api.enhanced_downloader import EnhancedVideoDownloader
+from src.core.course_models import ContentAsset
+from src.core.file_manager import FileManager
+from src.utils.partial_download import PartialDownload
+
+BLOB = bytes(range(256)) * 4096  # 1 MiB
+ETAG = '"' + hashlib.md5(BLOB).hexdigest() + '"'
+
+
+class RangeServer:
+    """Local server serving BLOB with optional Range support and connection drops."""
+
+    def __init__(self, support_ranges=True, drop_after=None, etag=ETAG):
+        self.support_ranges = support_ranges
+        self.drop_after = drop_after  # Drop the first response after this many bytes
+        self.etag = etag
+        self.requests = []
+        self.active = 0
+        self.peak_active = 0  # Most responses in flight at once
+        self.loop = None
+        self.port = None
+        self._ready = threading.Event()
+
+    async def handle(self, request):
+        self.requests.append(dict(request.headers))
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            return await self._respond(request)
+        finally:
+            self.active -= 1
+
+    async def _respond(self, request):
+        start, end = 0, len(BLOB) - 1
+        status = 200
+        range_header = request.headers.get('Range')
+        if_range = request.headers.get('If-Range')
+
+        if self.support_ranges and range_header and (not if_range or if_range == self.etag):
+            first, _, last = range_header.split('=')[1].partition('-')
+            start = int(first)
+            if last:
+                end = min(int(last), len(BLOB) - 1)
+            if start >= len(BLOB):
+                return web.Response(status=416, headers={'Content-Range': f'bytes */{len(BLOB)}'})
+            status = 206
+
+        body = BLOB[start:end + 1]
+        headers = {'ETag': self.etag, 'Accept-Ranges': 'bytes' if self.support_ranges else 'none'}
+        if status == 206:
+            headers['Content-Range'] = f'bytes {start}-{end}/{len(BLOB)}'
+        # Give concurrent requests a chance to overlap
+        await asyncio.sleep(0.05)
+
+        response = web.StreamResponse(status=status, headers=headers)
+        response.content_length = len(body)
+        await response.prepare(request)
+
+        if self.drop_after is not None:
+            cut, self.drop_after = self.drop_after, None
+            await response.write(body[:cut])
+            # Let the client consume what was sent before the connection dies
+            await asyncio.sleep(0.3)
+            request.transport.close()
+            return response
+
+        await response.write(body)
+        await response.write_eof()
+        return response
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait(5)
+        return f"http://127.0.0.1:{self.port}/video/index.mp4?hmac=abc"
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        app = web.Application()
+        app.router.add_get('/video/index.mp4', self.handle)
+        runner = web.AppRunner(app)
+        self.loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        self.loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self.loop.run_forever()
+
+
+def _asset(url):
+    return ContentAsset(name="lecture.mp4", url=url, file_type="video")
+
+
+def test_sync_resume_after_dropped_connection():
+    """A dropped connection is continued with a Range request, not restarted."""
+    server = RangeServer(drop_after=300_000)
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = FileManager(Path(tmp) / "courses")
+        assert manager.download_asset(_asset(url), Path(tmp) / "lesson")
+
+        target = Path(tmp) / "lesson" / "lecture.mp4"
+        assert target.read_bytes() == BLOB
+        assert not PartialDownload(target).sidecar_path.exists()
+
+    assert len(server.requests) == 2
+    assert server.requests[1].get('Range', '').startswith('bytes=')
+    assert server.requests[1].get('Range') != 'bytes=0-'
+    assert server.requests[1].get('If-Range') == ETAG
+    print("PASS: sync download resumed after dropped connection")
+
+
+def test_sync_resume_from_previous_run():
+    """A .part file plus sidecar from an earlier run is continued."""
+    server = RangeServer()
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "lesson" / "lecture.mp4"
+        target.parent.mkdir(parents=True)
+        partial = PartialDownload(target)
+        partial.part_path.write_bytes(BLOB[:500_000])
+        partial.url = url.replace("abc", "expired-signature")
+        partial.expected_length = len(BLOB)
+        partial.etag = ETAG
+        partial.save()
+
+        manager = FileManager(Path(tmp) / "courses")
+        assert manager.download_asset(_asset(url), target.parent)
+        assert target.read_bytes() == BLOB
+
+    assert server.requests[0].get('Range') == 'bytes=500000-'
+    print("PASS: sync download resumed from previous run")
+
+
+def test_sync_server_ignores_range():
+    """Servers without Range support send 200 and the file is rewritten from zero."""
+    server = RangeServer(support_ranges=False, drop_after=200_000)
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = FileManager(Path(tmp) / "courses")
+        assert manager.download_asset(_asset(url), Path(tmp) / "lesson")
+        assert (Path(tmp) / "lesson" / "lecture.mp4").read_bytes() == BLOB
+
+    print("PASS: full re-download when server ignores Range")
+
+
+def test_changed_validator_restarts():
+    """If-Range with a stale ETag makes the server send the full (new) file."""
+    server = RangeServer(etag='"new-version"')
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "lecture.mp4"
+        partial = PartialDownload(target)
+        partial.part_path.write_bytes(b"x" * 1000)
+        partial.url = url
+        partial.expected_length = len(BLOB)
+        partial.etag = '"old-version"'
+        partial.save()
+
+        manager = FileManager(Path(tmp) / "courses")
+        assert manager.download_asset(_asset(url), Path(tmp))
+        assert target.read_bytes() == BLOB
+
+    print("PASS: stale validator restarts the download")
+
+
+def test_async_resume():
+    """EnhancedVideoDownloader resumes partial files when resume is enabled."""
+    server = RangeServer(drop_after=400_000)
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        auth = CourseraAuth(cauth_cookie="x" * 32, csrf_token="y" * 16)
+        downloader = EnhancedVideoDownloader(auth=auth, file_manager=FileManager(Path(tmp) / "courses"))
+        downloader.resume = True
+        target = Path(tmp) / "lecture.mp4"
+
+        from rich.progress import Progress
+        with Progress(disable=True) as progress:
+            task = progress.add_task("test", total=100)
+            asyncio.run(downloader._download_file(url, target, progress, task))
+
+        assert target.read_bytes() == BLOB
+        assert downloader.stats['total_size'] == len(BLOB)
+
+    assert len(server.requests) == 2
+    assert server.requests[1].get('Range') == 'bytes=400000-'
+    print("PASS: async download resumed after dropped connection")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING RESUMABLE DOWNLOADS")
+    print("=" * 60)
+    tests = [
+        test_sync_resume_after_dropped_connection,
+        test_sync_resume_from_previous_run,
+        test_sync_server_ignores_range,
+        test_changed_validator_restarts,
+        test_async_resume,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
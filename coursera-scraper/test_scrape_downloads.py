@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent asset downloads in the scrape path.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.auth import CourseraAuth
+from src.api.coursera_client import CourseraClient
+from src.config.settings import ConfigManager
+from src.core.course_manifest import CourseManifest
+from src.core.course_models import APIConfig, ContentAsset, Lesson, ScrapingProgress
+from src.core.file_manager import FileManager
+from src.core.scraper import CourseScraper
+from src.utils.partial_download import MAX_CHUNK_SIZE, MIN_CHUNK_SIZE, chunk_size_for
+from test_resumable_download import BLOB, RangeServer
+
+
+def _scraper(tmp, concurrent_downloads):
+    auth = CourseraAuth(cauth_cookie="x" * 32, csrf_token="y" * 16)
+    client = CourseraClient(auth, APIConfig(base_url="http://127.0.0.1", endpoints={}))
+    config = ConfigManager(Path(__file__).parent / "config")
+    config.download_settings.concurrent_downloads = concurrent_downloads
+    scraper = CourseScraper(client=client, file_manager=FileManager(Path(tmp)), config=config)
+    scraper.current_progress = ScrapingProgress(course_id="c1", course_name="Course")
+    return scraper
+
+
+def _lesson(tmp, index, url, videos, readings=0):
+    lesson = Lesson(id=f"lesson{index}", name=f"Lesson {index}", order=index)
+    lesson.local_path = Path(tmp) / f"lesson{index}"
+    lesson.local_path.mkdir(parents=True)
+    for j in range(videos):
+        lesson.assets.append(ContentAsset(name=f"Talk {index}{j}_720p.mp4", url=f"{url}&v={index}{j}", file_type="video"))
+    for j in range(readings):
+        lesson.assets.append(ContentAsset(name=f"notes_{index}{j}.pdf", url=f"{url}&r={index}{j}", file_type="pdf"))
+    return lesson
+
+
+def test_chunk_size_for():
+    """Read sizes grow with the body and stay within bounds."""
+    assert chunk_size_for(None) == MIN_CHUNK_SIZE
+    assert chunk_size_for(10_000) == MIN_CHUNK_SIZE
+    assert chunk_size_for(16 * 1024 * 1024) == 256 * 1024
+    assert chunk_size_for(10 * 1024 ** 3) == MAX_CHUNK_SIZE
+    print("PASS: adaptive chunk sizes")
+
+
+def test_scrape_downloads_run_concurrently():
+    """Queued assets download in parallel, bounded by concurrent_downloads, with course-order names."""
+    server = RangeServer()
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = _scraper(tmp, concurrent_downloads=3)
+        lessons = [_lesson(tmp, 1, url, videos=2, readings=1), _lesson(tmp, 2, url, videos=3)]
+        for lesson in lessons:
+            scraper._queue_lesson_assets(lesson)
+
+        assert len(scraper.download_queue) == 6
+        scraper._download_queued_assets()
+
+        assert sorted(p.name for p in lessons[0].local_path.iterdir()) == ["1_Talk_10.mp4", "2_Talk_11.mp4", "notes_10.pdf"]
+        assert sorted(p.name for p in lessons[1].local_path.iterdir()) == ["3_Talk_20.mp4", "4_Talk_21.mp4", "5_Talk_22.mp4"]
+        assert all(asset.downloaded and asset.file_size == len(BLOB) for lesson in lessons for asset in lesson.assets)
+        assert all(asset.local_path.read_bytes() == BLOB for lesson in lessons for asset in lesson.assets)
+        assert scraper.current_progress.downloaded_assets == 6
+        assert scraper.current_progress.failed_downloads == []
+
+    assert 1 < server.peak_active <= 3
+    print("PASS: scrape assets downloaded concurrently in course order")
+
+
+def test_existing_files_are_skipped():
+    """Files already on disk are not requested again but keep their sequence number."""
+    server = RangeServer()
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = _scraper(tmp, concurrent_downloads=2)
+        lesson = _lesson(tmp, 1, url, videos=2)
+        (lesson.local_path / "1_Talk_10.mp4").write_bytes(b"done")
+
+        scraper._queue_lesson_assets(lesson)
+        scraper._download_queued_assets()
+
+        assert (lesson.local_path / "1_Talk_10.mp4").read_bytes() == b"done"
+        assert (lesson.local_path / "2_Talk_11.mp4").read_bytes() == BLOB
+        assert scraper.current_progress.downloaded_assets == 2
+
+    assert len(server.requests) == 1
+    print("PASS: existing files skipped")
+
+
+def test_course_manifest_records_downloads():
+    """With a course path, finished files are recorded in the course manifest, which is closed afterwards."""
+    server = RangeServer()
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = _scraper(tmp, concurrent_downloads=2)
+        lesson = _lesson(tmp, 1, url, videos=2)
+        scraper._queue_lesson_assets(lesson)
+        scraper._download_queued_assets(Path(tmp))
+
+        assert scraper.current_progress.downloaded_assets == 2
+        with CourseManifest(tmp) as manifest:
+            assert manifest.completed_files() == {
+                lesson.local_path / "1_Talk_10.mp4": len(BLOB), lesson.local_path / "2_Talk_11.mp4": len(BLOB)
+            }
+    print("PASS: course manifest records scrape downloads")
+
+
+def test_failed_downloads_are_recorded():
+    """Assets whose download fails are reported in the scraping progress."""
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = _scraper(tmp, concurrent_downloads=2)
+        lesson = _lesson(tmp, 1, "http://127.0.0.1:9/video.mp4?x=1", videos=1)
+        scraper._queue_lesson_assets(lesson)
+        scraper._download_queued_assets()
+
+        assert scraper.current_progress.failed_downloads == ["Lesson 1/Talk 10_720p.mp4"]
+        assert not lesson.assets[0].downloaded
+    print("PASS: failed downloads recorded")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING SCRAPE PATH DOWNLOADS")
+    print("=" * 60)
+    tests = [
+        test_chunk_size_for,
+        test_scrape_downloads_run_concurrently,
+        test_existing_files_are_skipped,
+        test_course_manifest_records_downloads,
+        test_failed_downloads_are_recorded,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
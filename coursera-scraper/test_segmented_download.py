@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script for segmented (multi-connection) downloads.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.auth import CourseraAuth
+from src.api.enhanced_downloader import EnhancedVideoDownloader
+from src.api.segmented_download import plan_segments
+from src.core.file_manager import FileManager
+from src.utils.partial_download import PartialDownload
+from test_resumable_download import BLOB, ETAG, RangeServer
+
+
+def _downloader(tmp, **kwargs):
+    auth = CourseraAuth(cauth_cookie="x" * 32, csrf_token="y" * 16)
+    return EnhancedVideoDownloader(auth=auth, file_manager=FileManager(Path(tmp) / "courses"), **kwargs)
+
+
+def _media(url, directory, count):
+    return [{
+        'type': 'video',
+        'lesson_name': f'Lesson {i}',
+        'filename': f'{i}_lecture.mp4',
+        'url': url,
+        'local_path': directory / f'{i}_lecture.mp4',
+    } for i in range(1, count + 1)]
+
+
+def _ranges(server):
+    return [headers.get('Range') for headers in server.requests]
+
+
+def test_plan_segments():
+    """Segments cover every byte exactly once."""
+    segments = plan_segments(10, 3)
+    assert segments == [[0, 3, 0], [4, 6, 0], [7, 9, 0]]
+    assert plan_segments(2, 8) == [[0, 0, 0], [1, 1, 0]]
+    print("PASS: segment plan covers the file")
+
+
+def test_segmented_download():
+    """A large file is fetched as parallel ranges and reassembled byte for byte."""
+    server = RangeServer()
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        downloader = _downloader(tmp, max_concurrent=4, segments=4, segment_threshold=100_000)
+        result = asyncio.run(downloader._download_media_files_async(_media(url, Path(tmp), 1)))
+
+        target = Path(tmp) / '1_lecture.mp4'
+        assert result['videos']['downloaded'] == 1
+        assert target.read_bytes() == BLOB
+        assert not PartialDownload(target).sidecar_path.exists()
+
+    ranges = _ranges(server)
+    assert ranges[0] == 'bytes=0-0'
+    assert sorted(ranges[1:]) == sorted(f'bytes={s}-{e}' for s, e, _ in plan_segments(len(BLOB), 4))
+    assert server.peak_active > 1
+    print("PASS: file downloaded as parallel segments")
+
+
+def test_segments_share_connection_budget():
+    """Files and their extra segments never exceed max_concurrent connections."""
+    server = RangeServer()
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        downloader = _downloader(tmp, max_concurrent=2, segments=4, segment_threshold=100_000)
+        result = asyncio.run(downloader._download_media_files_async(_media(url, Path(tmp), 3)))
+
+        assert result['videos']['downloaded'] == 3
+        assert all((Path(tmp) / f'{i}_lecture.mp4').read_bytes() == BLOB for i in range(1, 4))
+
+    assert server.peak_active <= 2
+    print("PASS: segments stay within max_concurrent")
+
+
+def test_small_file_streams():
+    """Files below the threshold use one plain request after the probe."""
+    server = RangeServer()
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        downloader = _downloader(tmp, segments=4)
+        result = asyncio.run(downloader._download_media_files_async(_media(url, Path(tmp), 1)))
+        assert result['videos']['downloaded'] == 1
+        assert (Path(tmp) / '1_lecture.mp4').read_bytes() == BLOB
+
+    assert _ranges(server) == ['bytes=0-0', None]
+    print("PASS: small file downloaded as a single stream")
+
+
+def test_server_without_ranges():
+    """Servers that ignore Range fall back to a single stream."""
+    server = RangeServer(support_ranges=False)
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        downloader = _downloader(tmp, segments=4, segment_threshold=100_000)
+        result = asyncio.run(downloader._download_media_files_async(_media(url, Path(tmp), 1)))
+        assert result['videos']['downloaded'] == 1
+        assert (Path(tmp) / '1_lecture.mp4').read_bytes() == BLOB
+
+    assert len(server.requests) == 2
+    print("PASS: server without Range support falls back to one stream")
+
+
+def test_resume_segmented_partial():
+    """Only the missing bytes of each segment are requested on resume."""
+    server = RangeServer()
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / '1_lecture.mp4'
+        segments = plan_segments(len(BLOB), 2)
+        partial = PartialDownload(target)
+        data = bytearray(len(BLOB))
+        data[:1000] = BLOB[:1000]
+        start = segments[1][0]
+        data[start:start + 2000] = BLOB[start:start + 2000]
+        partial.part_path.write_bytes(bytes(data))
+        segments[0][2], segments[1][2] = 1000, 2000
+        partial.url = url
+        partial.expected_length = len(BLOB)
+        partial.etag = ETAG
+        partial.segments = segments
+        partial.save()
+
+        downloader = _downloader(tmp, segments=2, segment_threshold=100_000)
+        downloader.resume = True
+        result = asyncio.run(downloader._download_media_files_async(_media(url, Path(tmp), 1)))
+        assert result['videos']['downloaded'] == 1
+        assert target.read_bytes() == BLOB
+
+    assert sorted(_ranges(server)) == sorted([f'bytes=1000-{segments[0][1]}', f'bytes={start + 2000}-{len(BLOB) - 1}'])
+    assert all(headers.get('If-Range') == ETAG for headers in server.requests)
+    print("PASS: segmented partial resumed per segment")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING SEGMENTED DOWNLOADS")
+    print("=" * 60)
+    tests = [
+        test_plan_segments,
+        test_segmented_download,
+        test_segments_share_connection_budget,
+        test_small_file_streams,
+        test_server_without_ranges,
+        test_resume_segmented_partial,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Test script for download workers sharing one course manifest through leases.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import asyncio
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.auth import CourseraAuth
+from src.api.enhanced_downloader import RATE_CONTROL_FILENAME, EnhancedVideoDownloader
+from src.api.lecture_media import LectureMedia
+from src.core.course_manifest import FILE_COMPLETE, FILE_FAILED, FILE_PENDING, CourseManifest
+from src.core.file_manager import FileManager
+from test_download_scheduler import OrderedAPI
+from test_lecture_media import _response
+from test_resumable_download import BLOB
+
+MB = 1024 * 1024
+from test_url_refresh import _course
+
+
+class SlowAPI(OrderedAPI):
+    """Takes a moment per video, so workers started together overlap."""
+
+    async def media(self, request):
+        await asyncio.sleep(0.15)
+        return await super().media(request)
+
+
+def _scraped_course(api, base_url, tmp, lessons):
+    course = _course(api, lessons=lessons)
+    for lesson in course.modules[0].lessons:
+        asset = lesson.assets[0]
+        asset.metadata['lecture_media'] = LectureMedia.from_response(_response(asset.metadata['item_id'], base_url)).to_dict()
+    FileManager(Path(tmp)).create_full_structure(course)
+    return course
+
+
+def _worker(tmp, base_url, course_path, worker_id, lease_seconds=30.0):
+    """One download worker; module level so worker processes can run it."""
+    auth = CourseraAuth(cauth_cookie="x" * 32, csrf_token="y" * 16)
+    downloader = EnhancedVideoDownloader(auth=auth, file_manager=FileManager(Path(tmp)), max_concurrent=1,
+                                         progress='none')
+    downloader.api_base_url = base_url
+    return downloader.download_course_shared(course_path, '720p', worker_id=worker_id, lease_seconds=lease_seconds)
+
+
+def test_file_leases():
+    """A live lease keeps other workers off a file until it finishes or expires."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "module-1" / "lesson-1" / "1_Talk.mp4"
+        with CourseManifest(tmp) as manifest:
+            manifest.enqueue_files([(path, 'video', 'l1')])
+            assert manifest.claim_file(path, "a", lease_seconds=30)
+            assert not manifest.claim_file(path, "b", lease_seconds=30)
+            assert manifest.claim_file(path, "a", lease_seconds=30)
+            assert manifest.renew_leases("a", 30) == 1
+
+            # Joining workers do not reset a claimed file
+            manifest.enqueue_files([(path, 'video', 'l1')])
+            assert not manifest.claim_file(path, "b", lease_seconds=30)
+
+            # An expired lease can be taken over
+            assert manifest.claim_file(path, "a", lease_seconds=-1)
+            assert manifest.claim_file(path, "b", lease_seconds=30)
+
+            # Finishing clears the lease; complete files are never handed out again
+            manifest.record_file(path, 'video', FILE_COMPLETE, 'l1', 10)
+            assert manifest.pending_leases() == {}
+            manifest.enqueue_files([(path, 'video', 'l1')])
+            assert not manifest.claim_file(path, "c", lease_seconds=30)
+
+            # Failed files are queued again by the next worker that joins
+            manifest.record_file(path, 'video', FILE_FAILED, 'l1')
+            manifest.enqueue_files([(path, 'video', 'l1')])
+            assert manifest.pending_leases() == {path: None}
+            manifest.claim_file(path, "c", lease_seconds=30)
+            manifest.release_leases("c")
+            assert manifest.pending_leases() == {path: None}
+    print("PASS: file leases")
+
+
+def test_worker_processes_split_course():
+    """Two worker processes download each file of the course exactly once between them."""
+    api = SlowAPI()
+    base_url = api.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        course = _scraped_course(api, base_url, tmp, lessons=8)
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(_worker, tmp, base_url, course.local_path, f"worker-{index}") for index in range(2)]
+            results = [future.result() for future in futures]
+
+        videos = [result['videos']['downloaded'] for result in results]
+        assert sum(videos) == 8 and min(videos) > 0, videos
+        requested = [name for kind, name in api.sequence if kind == 'video']
+        assert sorted(requested) == sorted(f"i{index}.mp4" for index in range(1, 9)), requested
+
+        with CourseManifest(course.local_path) as manifest:
+            files = manifest.summary()['files']
+        assert files['video'] == {FILE_COMPLETE: 8} and files['subtitle'] == {FILE_COMPLETE: 8}, files
+        assert (course.modules[0].lessons[7].local_path / "8_Talk_8.mp4").read_bytes() == BLOB
+    print("PASS: worker processes split the course")
+
+
+def test_crashed_worker_taken_over():
+    """Files leased by a worker that stopped renewing are downloaded once the lease expires."""
+    api = OrderedAPI()
+    base_url = api.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        course = _scraped_course(api, base_url, tmp, lessons=2)
+        video_path = course.modules[0].lessons[0].local_path / "1_Talk_1.mp4"
+        with CourseManifest(course.local_path) as manifest:
+            manifest.enqueue_files([(video_path, 'video', 'l1')])
+            assert manifest.claim_file(video_path, "crashed", lease_seconds=1)
+
+        start = time.monotonic()
+        result = _worker(tmp, base_url, course.local_path, "survivor")
+        elapsed = time.monotonic() - start
+
+        # Lesson 2 right away, lesson 1 after the crashed worker's lease ran out
+        assert result['videos']['downloaded'] == 2, result
+        assert video_path.read_bytes() == BLOB
+        assert elapsed >= 0.5, elapsed
+        with CourseManifest(course.local_path) as manifest:
+            assert manifest.summary()['files']['video'] == {FILE_COMPLETE: 2}
+            assert manifest.pending_leases() == {}
+    print("PASS: crashed worker taken over")
+
+
+def test_unrecorded_results_not_refetched():
+    """A worker whose results cannot be written to the manifest still finishes, fetching each file once."""
+    api = OrderedAPI()
+    base_url = api.start()
+    record_file = CourseManifest.record_file
+
+    def failing_record_file(manifest, path, media_type, status, *args, **kwargs):
+        if status != FILE_PENDING:
+            raise sqlite3.OperationalError("database is locked")
+        return record_file(manifest, path, media_type, status, *args, **kwargs)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        course = _scraped_course(api, base_url, tmp, lessons=2)
+        results = []
+        CourseManifest.record_file = failing_record_file
+        try:
+            # A thread, so a worker that keeps re-claiming its files cannot hang the test run
+            worker = threading.Thread(target=lambda: results.append(_worker(tmp, base_url, course.local_path, "solo")),
+                                      daemon=True)
+            worker.start()
+            worker.join(20)
+        finally:
+            CourseManifest.record_file = record_file
+
+        assert not worker.is_alive(), "worker kept re-claiming files it had already downloaded"
+        assert results and results[0]['videos']['downloaded'] == 2, results
+        requested = [name for kind, name in api.sequence if kind == 'video']
+        assert sorted(requested) == ["i1.mp4", "i2.mp4"], requested
+    print("PASS: unrecorded results not refetched")
+
+
+def test_workers_split_control_file_rate():
+    """Workers reading one .rate_limit file apply their share of it, so together they stay under it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        auth = CourseraAuth(cauth_cookie="x" * 32, csrf_token="y" * 16)
+        control_file = Path(tmp) / RATE_CONTROL_FILENAME
+        workers = [EnhancedVideoDownloader(auth=auth, file_manager=FileManager(Path(tmp)), rate_limit=4 * MB,
+                                           rate_share=0.5, progress='none') for _ in range(2)]
+        assert sum(worker.bandwidth.rate for worker in workers) == 4 * MB
+
+        async def applied_rate(worker):
+            worker.rate_control_file = control_file
+            async with worker._rate_control():
+                return worker.bandwidth.rate
+
+        control_file.write_text("2M\n")
+        rates = [asyncio.run(applied_rate(worker)) for worker in workers]
+        assert rates == [MB, MB], rates
+        # The configured share is back once the run ends
+        assert [worker.bandwidth.rate for worker in workers] == [2 * MB, 2 * MB]
+    print("PASS: workers split the control file rate")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING SHARED DOWNLOAD WORKERS")
+    print("=" * 60)
+    tests = [
+        test_file_leases,
+        test_worker_processes_split_course,
+        test_crashed_worker_taken_over,
+        test_unrecorded_results_not_refetched,
+        test_workers_split_control_file_rate,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
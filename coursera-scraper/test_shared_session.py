@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared download session.
+Checks that one pooled connection set serves a whole download run.
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.auth import CourseraAuth
+from src.api.enhanced_downloader import EnhancedVideoDownloader
+from src.core.file_manager import FileManager
+from test_resumable_download import BLOB, RangeServer
+
+
+def _media(url, directory, count):
+    return [{
+        'type': 'video',
+        'lesson_name': f'Lesson {i}',
+        'filename': f'{i}_lecture.mp4',
+        'url': url,
+        'local_path': directory / f'{i}_lecture.mp4',
+    } for i in range(1, count + 1)]
+
+
+def test_connections_are_reused():
+    """Ten files over max_concurrent=2 must not open ten connections."""
+    server = RangeServer()
+    url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        auth = CourseraAuth(cauth_cookie="x" * 32, csrf_token="y" * 16)
+        downloader = EnhancedVideoDownloader(auth=auth, file_manager=FileManager(Path(tmp) / "courses"),
+                                             max_concurrent=2)
+        result = asyncio.run(downloader._download_media_files_async(_media(url, Path(tmp), 10)))
+
+        assert result['videos']['downloaded'] == 10
+        assert all((Path(tmp) / f'{i}_lecture.mp4').read_bytes() == BLOB for i in range(1, 11))
+
+    connections = result['connections']
+    print(f"  {downloader.connection_stats.summary()}")
+    assert connections['requests'] == 10
+    assert connections['connections_created'] <= 2
+    assert connections['connections_reused'] >= 8
+    assert downloader.session is None
+    print("PASS: connections reused across downloads")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING SHARED DOWNLOAD SESSION")
+    print("=" * 60)
+    try:
+        test_connections_are_reused()
+    except AssertionError as e:
+        print(f"FAIL: {e}")
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
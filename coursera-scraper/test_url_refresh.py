@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Test script for re-resolving expired video URLs during downloads.
+Runs against a local aiohttp server, no Coursera credentials needed.
+"""
+
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.api.auth import CourseraAuth
+from src.api.enhanced_downloader import EnhancedVideoDownloader
+from src.api.url_refresh import is_expired, url_expiry
+from src.core.course_manifest import CourseManifest
+from src.core.course_models import ContentAsset, Course, Lesson, Module
+from src.core.file_manager import FileManager
+from test_resumable_download import BLOB
+
+COURSE_ID = "course123"
+
+
+class SignedCDN:
+    """Local CDN that rejects stale signatures, plus the lecture video API that re-signs them."""
+
+    def __init__(self):
+        self.rejected = []
+        self.served = []
+        self.lookups = []
+        self.port = None
+        self._ready = threading.Event()
+
+    def signed_url(self, item_id, signature="fresh", expires_in=3600):
+        return f"http://127.0.0.1:{self.port}/cdn/{item_id}.mp4?Expires={int(time.time() + expires_in)}&Signature={signature}"
+
+    async def media(self, request):
+        name = request.match_info['name']
+        if request.query.get('Signature') != 'fresh' or int(request.query['Expires']) < time.time():
+            self.rejected.append(name)
+            return web.Response(status=403, text="Request has expired")
+        self.served.append(name)
+        return web.Response(body=BLOB)
+
+    async def lecture_video(self, request):
+        item_id = request.match_info['ids'].split('~')[1]
+        self.lookups.append(item_id)
+        return web.json_response({
+            'elements': [{'id': f'{COURSE_ID}~{item_id}'}],
+            'linked': {'onDemandVideos.v1': [{
+                'sources': {'byResolution': {'720p': {'mp4VideoUrl': self.signed_url(item_id)}}}
+            }]}
+        })
+
+    def add_routes(self, app):
+        app.router.add_get('/cdn/{name}', self.media)
+        app.router.add_get('/api/onDemandLectureVideos.v1/{ids}', self.lecture_video)
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait(5)
+        return f"http://127.0.0.1:{self.port}"
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        app = web.Application()
+        self.add_routes(app)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        loop.run_forever()
+
+
+def _course(cdn, lessons, **signing):
+    course = Course(id=COURSE_ID, name="Refresh Course", slug="refresh-course")
+    module = Module(id="m1", name="Module 1", order=1)
+    for index in range(1, lessons + 1):
+        lesson = Lesson(id=f"l{index}", name=f"Lesson {index}", order=index)
+        lesson.assets.append(ContentAsset(
+            name=f"Talk {index}_720p.mp4", url=cdn.signed_url(f"i{index}", **signing), file_type="video",
+            metadata={'item_id': f"i{index}", 'course_id': COURSE_ID, 'resolution': '720p'}
+        ))
+        module.lessons.append(lesson)
+    course.modules.append(module)
+    return course
+
+
+def _download(tmp, cdn, base_url, course, max_concurrent=1):
+    file_manager = FileManager(Path(tmp))
+    file_manager.create_full_structure(course)
+    auth = CourseraAuth(cauth_cookie="x" * 32, csrf_token="y" * 16)
+    downloader = EnhancedVideoDownloader(auth=auth, file_manager=file_manager, max_concurrent=max_concurrent,
+                                         download_subtitles=False)
+    downloader.api_base_url = base_url
+    downloader.download_course_videos_and_subtitles(course.local_path, '720p')
+    return downloader
+
+
+def test_signature_expiry_parsing():
+    """Expiry is read from CloudFront, S3 presigned and Akamai token URLs."""
+    assert url_expiry("https://cdn.example/v.mp4?Expires=1700000000&Signature=abc&Key-Pair-Id=K") == 1700000000
+    assert url_expiry("https://s3.example/v.mp4?X-Amz-Date=20240101T000000Z&X-Amz-Expires=3600") == 1704070800
+    assert url_expiry("https://akamai.example/v.mp4?hdnts=st=1~exp=1700000500~acl=/*~hmac=ff") == 1700000500
+    assert url_expiry("https://cdn.example/v.mp4?x=1") is None
+    assert is_expired("https://cdn.example/v.mp4?Expires=1")
+    assert not is_expired(f"https://cdn.example/v.mp4?Expires={int(time.time()) + 3600}")
+    assert not is_expired("https://cdn.example/v.mp4")
+    print("PASS: signature expiry parsed")
+
+
+def test_expired_signatures_refreshed_before_transfer():
+    """URLs whose timestamp has passed are re-resolved up front, without a rejected request."""
+    cdn = SignedCDN()
+    base_url = cdn.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        course = _course(cdn, lessons=3, expires_in=-60)
+        downloader = _download(tmp, cdn, base_url, course)
+
+        assert downloader.stats['videos']['downloaded'] == 3, downloader.stats
+        assert cdn.rejected == []
+        assert sorted(cdn.lookups) == ["i1", "i2", "i3"]
+        # Later videos rode along with the first refresh instead of each asking separately
+        assert downloader.url_refresher.stats['lookups'] == 3
+        assert (course.modules[0].lessons[2].local_path / "3_Talk_3.mp4").read_bytes() == BLOB
+    print("PASS: expired signatures refreshed before transfer")
+
+
+def test_rejected_url_refreshes_queued_batch():
+    """A 403 re-resolves that item and the videos queued behind it, so only one transfer is wasted."""
+    cdn = SignedCDN()
+    base_url = cdn.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        course = _course(cdn, lessons=5, signature="revoked")
+        downloader = _download(tmp, cdn, base_url, course)
+
+        assert downloader.stats['videos']['downloaded'] == 5, downloader.stats
+        assert cdn.rejected == ["i1.mp4"], cdn.rejected
+        assert sorted(cdn.lookups) == ["i1", "i2", "i3", "i4", "i5"]
+
+        # The refreshed URLs replace the stale ones for the next run
+        with CourseManifest(course.local_path) as manifest:
+            urls = [lesson['assets'][0]['url'] for lesson in manifest.lessons()]
+        assert all('Signature=fresh' in url for url in urls), urls
+    print("PASS: rejected URL refreshed with its queued batch")
+
+
+def test_unrefreshable_media_fails():
+    """Media without item metadata fail on 403 instead of retrying a dead URL."""
+    cdn = SignedCDN()
+    base_url = cdn.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        course = _course(cdn, lessons=1, signature="revoked")
+        course.modules[0].lessons[0].assets[0].metadata = {}
+        downloader = _download(tmp, cdn, base_url, course)
+
+        assert downloader.stats['videos']['failed'] == 1, downloader.stats
+        assert cdn.rejected == ["i1.mp4"] and cdn.lookups == []
+    print("PASS: unrefreshable media fail after one request")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING VIDEO URL REFRESH")
+    print("=" * 60)
+    tests = [
+        test_signature_expiry_parsing,
+        test_expired_signatures_refreshed_before_transfer,
+        test_rejected_url_refreshes_queued_batch,
+        test_unrefreshable_media_fails,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,57 @@
+"""
+Atomic File Writes for generated books
+Writes go to a temporary file in the target directory, are fsynced, then renamed
+over the destination so readers and crashes never leave a half-written file
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Union
+
+
+def _fsync_directory(directory: Path):
+    """Persist a rename by syncing its directory entry (not supported on Windows)"""
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path: Union[str, Path], content: str, encoding: str = "utf-8"):
+    """
+    Atomically replace a text file
+
+    Args:
+        path: Destination file path
+        content: Text to write
+        encoding: Text encoding
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        # Never leave temp files behind on failure
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+    _fsync_directory(path.parent)
+
+
+def atomic_write_json(path: Union[str, Path], data: Any, indent: int = 2):
+    """Atomically replace a JSON file"""
+    atomic_write_text(path, json.dumps(data, indent=indent))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark Jinja2 template environment startup and per-render cost
+
+Compares the old per-request Environment construction against the shared,
+bytecode-cached environment returned by get_template_environment().
+"""
+
+import tempfile
+import time
+from datetime import datetime
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from latex_generator import (LaTeXBookGenerator, create_template_environment, escape_latex,
+                             get_template_environment, slugify)
+from main import BookSection
+
+TEMPLATE_DIR = "templates/latex-book"
+TEMPLATES = ["main.tex.j2", "chapter.tex.j2", "preface.tex.j2", "section.tex.j2"]
+RENDERS = 500
+
+
+def load_all(env):
+    """Load every template once (what a request touching all templates pays)"""
+    return [env.get_template(name) for name in TEMPLATES]
+
+
+def time_ms(func, repeat: int = 1) -> float:
+    """Average wall time of func in milliseconds"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def render_section(env):
+    """Render a section file the way /generate-section-content does"""
+    section = BookSection(id="4771234193080320", title="Caching & Replication", slug="caching-and-replication")
+    return env.get_template("section.tex.j2").render(
+        section=section,
+        section_content="\\section{Body}\n" + "Lorem ipsum dolor sit amet. " * 200,
+        generation_timestamp=datetime.now().isoformat()
+    )
+
+
+def fresh_environment():
+    """Environment equivalent to the pre-cache generator: no bytecode cache, nothing shared"""
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=select_autoescape(['html', 'xml']),
+        block_start_string='{% ',
+        block_end_string=' %}',
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+    env.filters['escape_latex'] = escape_latex
+    env.filters['slugify'] = slugify
+    return env
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Startup: compile templates from source and populate the bytecode cache
+        cold = time_ms(lambda: load_all(create_template_environment(TEMPLATE_DIR, cache_dir)))
+
+        # Startup after a restart: new environment, templates loaded from bytecode
+        warm = time_ms(lambda: load_all(create_template_environment(TEMPLATE_DIR, cache_dir)), repeat=20)
+
+    # Old behaviour: a fresh environment (no bytecode cache) per request
+    per_request = time_ms(lambda: render_section(fresh_environment()), repeat=50)
+
+    # New behaviour: shared environment, templates already compiled
+    shared_env = get_template_environment(TEMPLATE_DIR)
+    render_section(shared_env)
+    shared = time_ms(lambda: render_section(LaTeXBookGenerator().env), repeat=RENDERS)
+
+    print("=== Jinja2 template benchmark ===")
+    print(f"Startup, compile from source:      {cold:8.2f} ms")
+    print(f"Startup, from bytecode cache:      {warm:8.2f} ms")
+    print(f"Render, new Environment each time: {per_request:8.3f} ms/section")
+    print(f"Render, shared Environment:        {shared:8.3f} ms/section")
+    print(f"Speedup per render:                {per_request / shared:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
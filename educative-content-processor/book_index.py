@@ -0,0 +1,214 @@
+"""
+Book Index for generated books
+Keeps small summary records so the /api/books listing and detail views do not
+have to parse every section_metadata.json or read every section .tex file
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from atomic_io import atomic_write_json
+
+# Library-wide index of per-book summary records (inside output_dir)
+INDEX_FILE_NAME = "book_index.json"
+
+# Per-book index of section status/size/mtime (inside <book>/sections/)
+SECTION_INDEX_FILE_NAME = "section_index.json"
+
+# Sections shorter than this are only the template skeleton, not generated content
+COMPLETED_MIN_LENGTH = 100
+
+_index_lock = threading.RLock()
+
+
+class BookIndex:
+    """Maintain the book summary index and per-book section indexes"""
+
+    def __init__(self, output_dir: str = "generated_books"):
+        self.output_dir = Path(output_dir)
+        self.index_file = self.output_dir / INDEX_FILE_NAME
+
+    def list_books(self) -> List[dict]:
+        """
+        Return summary records for every generated book
+
+        Books created or deleted outside the API are picked up by a single
+        directory scan; each new book is indexed once.
+        """
+        if not self.output_dir.exists():
+            return []
+
+        with _index_lock:
+            index = self._load_index()
+            books = index["books"]
+            changed = False
+
+            on_disk = {entry.name for entry in os.scandir(self.output_dir)
+                       if entry.is_dir() and not entry.name.startswith(".")}
+
+            for book_name in list(books):
+                if book_name not in on_disk:
+                    del books[book_name]
+                    changed = True
+
+            for book_name in sorted(on_disk - books.keys()):
+                record = self._build_book_record(book_name)
+                if record:
+                    books[book_name] = record
+                    changed = True
+
+            if changed:
+                self._save_index(index)
+
+            return list(books.values())
+
+    def get_book(self, book_name: str) -> Optional[dict]:
+        """Return the summary record for one book, indexing it on first use"""
+        with _index_lock:
+            record = self._load_index()["books"].get(book_name)
+            if record is None:
+                record = self.rebuild_book(book_name)
+            return record
+
+    def get_section_index(self, book_name: str) -> Dict[str, dict]:
+        """Return {section_file: {status, size, mtime}} for a book, building it on first use"""
+        section_index_file = self._section_index_file(book_name)
+
+        with _index_lock:
+            section_index = self._load_json(section_index_file, None)
+            if section_index is None:
+                self.rebuild_book(book_name)
+                section_index = self._load_json(section_index_file, {})
+            return section_index
+
+    def rebuild_book(self, book_name: str) -> Optional[dict]:
+        """
+        Re-index a book from section_metadata.json and the section files on disk
+
+        Called when the book structure is (re)generated; stats each section
+        file once instead of on every request.
+        """
+        with _index_lock:
+            record = self._build_book_record(book_name)
+            index = self._load_index()
+            if record:
+                index["books"][book_name] = record
+            else:
+                index["books"].pop(book_name, None)
+            self._save_index(index)
+            return record
+
+    def record_section(self, book_name: str, section_file: str, content_length: int):
+        """
+        Record a section file that was just written
+
+        Args:
+            book_name: Book directory name
+            section_file: Section path relative to the book directory
+            content_length: Length of the written content in characters
+        """
+        section_path = self.output_dir / book_name / section_file
+        stat = section_path.stat()
+
+        with _index_lock:
+            section_index = self.get_section_index(book_name)
+            section_index[Path(section_file).as_posix()] = {
+                "status": "completed" if content_length > COMPLETED_MIN_LENGTH else "pending",
+                "size": stat.st_size,
+                "mtime": stat.st_mtime
+            }
+            self._save_json(self._section_index_file(book_name), section_index)
+            self._update_completed_count(book_name, section_index)
+
+    def clear_sections(self, book_name: str, section_files: Iterable[str]):
+        """Mark sections as pending after their files were removed"""
+        with _index_lock:
+            section_index = self.get_section_index(book_name)
+            for section_file in section_files:
+                section_index[Path(section_file).as_posix()] = {"status": "pending", "size": 0, "mtime": None}
+            self._save_json(self._section_index_file(book_name), section_index)
+            self._update_completed_count(book_name, section_index)
+
+    def _build_book_record(self, book_name: str) -> Optional[dict]:
+        """Build a book summary record and its section index from disk"""
+        book_dir = self.output_dir / book_name
+        metadata_file = book_dir / "sections" / "section_metadata.json"
+        if not metadata_file.exists():
+            return None
+
+        try:
+            with open(metadata_file, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+        except json.JSONDecodeError:
+            return None
+
+        section_index = {}
+        for chapter in metadata.get("chapters", []):
+            for section in chapter.get("sections", []):
+                section_file = section.get("section_file")
+                if not section_file:
+                    continue
+                try:
+                    stat = (book_dir / section_file).stat()
+                except FileNotFoundError:
+                    section_index[Path(section_file).as_posix()] = {"status": "pending", "size": 0, "mtime": None}
+                    continue
+                section_index[Path(section_file).as_posix()] = {
+                    # Byte size is an upper bound on character length - good enough for the skeleton check
+                    "status": "completed" if stat.st_size > COMPLETED_MIN_LENGTH else "pending",
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime
+                }
+        self._save_json(self._section_index_file(book_name), section_index)
+
+        return {
+            "id": book_name,
+            "name": metadata.get("book_title", book_name),
+            "course_name": book_name.replace("_", "-"),
+            "created_at": datetime.fromtimestamp(book_dir.stat().st_ctime).isoformat(),
+            "chapter_count": len(metadata.get("chapters", [])),
+            "section_count": len(section_index),
+            "completed_sections": sum(1 for s in section_index.values() if s["status"] == "completed"),
+            "status": "created",
+            "book_path": str(book_dir)
+        }
+
+    def _update_completed_count(self, book_name: str, section_index: Dict[str, dict]):
+        """Refresh the completed-section counter in the book summary record"""
+        index = self._load_index()
+        record = index["books"].get(book_name)
+        if record is None:
+            return
+        record["section_count"] = len(section_index)
+        record["completed_sections"] = sum(1 for s in section_index.values() if s["status"] == "completed")
+        self._save_index(index)
+
+    def _section_index_file(self, book_name: str) -> Path:
+        return self.output_dir / book_name / "sections" / SECTION_INDEX_FILE_NAME
+
+    def _load_index(self) -> dict:
+        index = self._load_json(self.index_file, {})
+        index.setdefault("books", {})
+        return index
+
+    def _save_index(self, index: dict):
+        self._save_json(self.index_file, index)
+
+    @staticmethod
+    def _load_json(path: Path, default):
+        if not path.exists():
+            return default
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return default
+
+    @staticmethod
+    def _save_json(path: Path, data):
+        """Write JSON atomically so readers never see a half-written index"""
+        atomic_write_json(path, data)
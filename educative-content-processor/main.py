@@ -5,6 +5,7 @@ from pydantic import BaseModel
 from typing import List, Optional
 import uvicorn
 import httpx
+import asyncio
 import json
 import os
 import gzip
@@ -14,6 +15,10 @@ from datetime import datetime
 from dotenv import load_dotenv
 from pathlib import Path
 
+from atomic_io import atomic_write_json, atomic_write_text
+from book_index import BookIndex
+from section_journal import SectionJournal
+
 # Load environment variables
 load_dotenv()
 
@@ -141,12 +146,14 @@ class GenerateSectionContentRequest(BaseModel):
     token: Optional[str] = None
     cookie: Optional[str] = None
     use_env_credentials: bool = True
+    resume: bool = False  # Skip sections already generated by an earlier (possibly interrupted) run
 
 class SectionContentResponse(BaseModel):
     success: bool
     generated_sections: Optional[List[dict]] = None  # List of generated section details
     total_sections_generated: Optional[int] = None
     failed_sections: Optional[List[dict]] = None  # List of failed sections with errors
+    skipped_sections: Optional[List[dict]] = None  # Sections kept from a previous run (resume)
     chapter_info: Optional[dict] = None
     error_message: Optional[str] = None
     source: Optional[str] = None
@@ -163,6 +170,21 @@ class ClearChapterContentResponse(BaseModel):
     chapter_info: Optional[dict] = None
     error_message: Optional[str] = None
 
+# Models for PDF compilation
+class CompileBookRequest(BaseModel):
+    book_name: str  # Name of the generated book
+    full_book: bool = True  # Compile main.tex
+    chapter_numbers: Optional[List[int]] = None  # Chapters to compile as standalone previews
+    all_chapters: bool = False  # Compile every chapter as a preview
+
+class CompileBookResponse(BaseModel):
+    success: bool
+    status: str  # "compiled", "failed", "invalid_request", "toolchain_missing" or "not_found"
+    pdf_path: Optional[str] = None
+    runs: Optional[List[dict]] = None  # Per-document latexmk runs with timings
+    total_duration_seconds: Optional[float] = None
+    error_message: Optional[str] = None
+
 # New models for sanitized book content
 class BookSection(BaseModel):
     title: str
@@ -193,6 +215,9 @@ class SanitizedBookResponse(BaseModel):
 items_db = []
 next_id = 1
 
+# Summary index of generated books (listing/detail views read this instead of scanning files)
+book_index = BookIndex()
+
 def sanitize_educative_response(raw_data: dict, source: str) -> SanitizedBookResponse:
     """
     Sanitize and transform Educative API response into book-style format
@@ -342,37 +367,9 @@ async def health_check():
 # List generated books endpoint
 @app.get("/api/books")
 async def list_generated_books():
-    """List all generated books from the generated_books directory"""
+    """List all generated books from the book index"""
     try:
-        generated_books_dir = Path("generated_books")
-        if not generated_books_dir.exists():
-            return {"books": []}
-        
-        books = []
-        for book_dir in generated_books_dir.iterdir():
-            if book_dir.is_dir():
-                metadata_file = book_dir / "sections" / "section_metadata.json"
-                if metadata_file.exists():
-                    try:
-                        with open(metadata_file, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                        
-                        # Get creation time from directory
-                        creation_time = datetime.fromtimestamp(book_dir.stat().st_ctime)
-                        
-                        books.append({
-                            "id": book_dir.name,
-                            "name": metadata.get("book_title", book_dir.name),
-                            "course_name": book_dir.name.replace("_", "-"),
-                            "created_at": creation_time.isoformat(),
-                            "chapter_count": len(metadata.get("chapters", [])),
-                            "status": "created",
-                            "book_path": str(book_dir)
-                        })
-                    except json.JSONDecodeError:
-                        continue
-        
-        return {"books": books}
+        return {"books": book_index.list_books()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing books: {str(e)}")
 
@@ -392,32 +389,26 @@ async def get_book_details(book_id: str):
         with open(metadata_file, 'r', encoding='utf-8') as f:
             metadata = json.load(f)
         
-        # Check content status for each section
+        # Content status comes from the section index instead of reading every section file
+        section_index = book_index.get_section_index(book_id)
         for chapter in metadata.get("chapters", []):
             for section in chapter.get("sections", []):
-                section_file = book_dir / section["section_file"]
-                if section_file.exists():
-                    # Check if file has actual content (more than just basic structure)
-                    content = section_file.read_text(encoding='utf-8')
-                    if len(content) > 100:  # Basic check for actual content
-                        section["content_status"] = "completed"
-                    else:
-                        section["content_status"] = "pending"
-                else:
-                    section["content_status"] = "pending"
+                entry = section_index.get(Path(section["section_file"]).as_posix(), {})
+                section["content_status"] = entry.get("status", "pending")
         
-        # Get creation time
-        creation_time = datetime.fromtimestamp(book_dir.stat().st_ctime)
+        book_record = book_index.get_book(book_id) or {}
         
         return {
             "id": book_id,
             "name": metadata.get("book_title", book_id),
             "course_name": book_id.replace("_", "-"),
-            "created_at": creation_time.isoformat(),
+            "created_at": book_record.get("created_at"),
             "book_path": str(book_dir),
             "metadata": metadata,
             "chapters": metadata.get("chapters", [])
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting book details: {str(e)}")
 
@@ -700,6 +691,7 @@ async def generate_latex_book(request: GenerateLatexBookRequest):
         
         # Generate and save the LaTeX book
         book_path = latex_generator.generate_and_save_book(book_data, book_name, request.content_type)
+        book_index.rebuild_book(book_name)
         
         # Get list of generated files
         book_path_obj = Path(book_path)
@@ -748,7 +740,6 @@ async def generate_section_content(request: GenerateSectionContentRequest):
     try:
         from section_processor import SectionContentProcessor
         from latex_generator import LaTeXBookGenerator
-        import json
         
         # Validate that the book structure exists
         book_dir = Path("generated_books") / request.book_name
@@ -761,9 +752,9 @@ async def generate_section_content(request: GenerateSectionContentRequest):
                 error_message="Book structure not found. Please call /generate-latex-book first to generate the book structure."
             )
         
-        # Load section metadata
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
+        # Load section metadata, folding in progress journaled by an interrupted run
+        journal = SectionJournal(sections_dir)
+        metadata = journal.compact(metadata_file)
         
         # Get content type from metadata, fallback to request if not available
         metadata_content_type = metadata.get("content_type", request.content_type)
@@ -841,6 +832,7 @@ async def generate_section_content(request: GenerateSectionContentRequest):
         # Track generation results
         generated_sections = []
         failed_sections = []
+        skipped_sections = []
         
         print(f"INFO: Starting generation of {len(chapter_sections)} sections for chapter {request.chapter_number}")
         
@@ -861,6 +853,19 @@ async def generate_section_content(request: GenerateSectionContentRequest):
                 print(f"ERROR: Section {section_index + 1} has empty ID: {section_title}")
                 continue
             
+            # Resume: keep sections a previous run already wrote
+            section_file_name = section_info.get("section_file", "")
+            if (request.resume and section_info.get("content_status") == "generated"
+                    and section_file_name and (book_dir / section_file_name).exists()):
+                skipped_sections.append({
+                    "section_id": section_id,
+                    "section_title": section_title,
+                    "section_file_path": section_file_name,
+                    "generated_timestamp": section_info.get("generated_timestamp")
+                })
+                print(f"INFO: Skipping already generated section {section_index + 1}: {section_title}")
+                continue
+            
             try:
                 print(f"INFO: Processing section {section_index + 1}/{len(chapter_sections)}: {section_title} (ID: {section_id})")
                 
@@ -1065,14 +1070,21 @@ async def generate_section_content(request: GenerateSectionContentRequest):
                 
                 section_file_path = chapter_section_dir / section_filename
                 
-                # Write section content to file
-                with open(section_file_path, 'w', encoding='utf-8') as f:
-                    f.write(final_latex)
+                # Write section content atomically so a crash never leaves a partial file
+                atomic_write_text(section_file_path, final_latex)
+                book_index.record_section(request.book_name, str(section_file_path.relative_to(book_dir)), len(final_latex))
                 
-                # Update metadata to mark section as generated
+                # Update metadata to mark section as generated and journal it immediately
                 section_info["content_status"] = "generated"
                 section_info["generated_timestamp"] = datetime.now().isoformat()
                 section_info["component_types"] = component_types
+                journal.append(
+                    request.chapter_number,
+                    section_id,
+                    content_status=section_info["content_status"],
+                    generated_timestamp=section_info["generated_timestamp"],
+                    component_types=component_types
+                )
                 
                 # Add to successful generations
                 generated_sections.append({
@@ -1098,29 +1110,32 @@ async def generate_section_content(request: GenerateSectionContentRequest):
                 failed_sections.append(error_details)
                 print(f"ERROR: Failed to generate section {section_index + 1}: {section_title} - {str(section_error)}")
         
-        # Save updated metadata
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2)
+        # Fold this run's journal into section_metadata.json
+        journal.compact(metadata_file)
         
         # Determine overall success
         total_sections = len(chapter_sections)
         successful_count = len(generated_sections)
         failed_count = len(failed_sections)
+        skipped_count = len(skipped_sections)
         
-        overall_success = successful_count > 0  # Success if at least one section was generated
+        # Success if at least one section was generated, or everything was already done
+        overall_success = successful_count > 0 or (skipped_count > 0 and failed_count == 0)
         
         return SectionContentResponse(
             success=overall_success,
             generated_sections=generated_sections,
             total_sections_generated=successful_count,
             failed_sections=failed_sections if failed_sections else None,
+            skipped_sections=skipped_sections if skipped_sections else None,
             chapter_info={
                 "chapter_number": request.chapter_number,
                 "chapter_title": target_chapter.get("chapter_title", ""),
                 "chapter_slug": target_chapter.get("chapter_slug", ""),
                 "total_sections": total_sections,
                 "successful_sections": successful_count,
-                "failed_sections": failed_count
+                "failed_sections": failed_count,
+                "skipped_sections": skipped_count
             },
             source=f"chapter_{request.chapter_number}_batch_generation"
         )
@@ -1169,9 +1184,9 @@ async def clear_chapter_content(request: ClearChapterContentRequest):
                 error_message="Metadata not found"
             )
         
-        # Load metadata
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
+        # Load metadata, folding in any journaled progress first
+        journal = SectionJournal(metadata_file.parent)
+        metadata = journal.compact(metadata_file)
         
         # Find the target chapter
         chapters = metadata.get("chapters", [])
@@ -1246,8 +1261,12 @@ async def clear_chapter_content(request: ClearChapterContentRequest):
                         print(f"Warning: Could not delete alternative chapter files directory: {str(e)}")
         
         # Save updated metadata
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2)
+        atomic_write_json(metadata_file, metadata)
+        
+        book_index.clear_sections(
+            request.book_name,
+            [section["section_file"] for section in chapter_sections if section.get("section_file")]
+        )
         
         chapter_title = target_chapter.get("chapter_title", f"Chapter {request.chapter_number}")
         
@@ -1275,6 +1294,63 @@ async def clear_chapter_content(request: ClearChapterContentRequest):
             error_message=str(e)
         )
 
+@app.post("/compile", response_model=CompileBookResponse)
+async def compile_book(request: CompileBookRequest):
+    """
+    Compile a generated book to PDF with latexmk
+    
+    Builds run in a per-book sandbox under generated_books/.latex_build so
+    auxiliary files are reused between runs. Chapter previews are compiled
+    in parallel as standalone subfiles. Fails fast when no TeX toolchain
+    is installed.
+    """
+    try:
+        from latex_compiler import LaTeXBookCompiler, LaTeXToolchainError
+        
+        compiler = LaTeXBookCompiler()
+        result = await asyncio.to_thread(
+            compiler.compile_book,
+            request.book_name,
+            full_book=request.full_book,
+            chapter_numbers=request.chapter_numbers,
+            all_chapters=request.all_chapters
+        )
+        
+        failed_runs = [run["target"] for run in result["runs"] if not run["success"]]
+        return CompileBookResponse(
+            success=result["success"],
+            status="compiled" if result["success"] else "failed",
+            pdf_path=result["pdf_path"],
+            runs=result["runs"],
+            total_duration_seconds=result["total_duration_seconds"],
+            error_message=f"Compilation failed for: {', '.join(failed_runs)}" if failed_runs else None
+        )
+        
+    except ValueError as e:
+        return CompileBookResponse(
+            success=False,
+            status="invalid_request",
+            error_message=str(e)
+        )
+    except LaTeXToolchainError as e:
+        return CompileBookResponse(
+            success=False,
+            status="toolchain_missing",
+            error_message=str(e)
+        )
+    except FileNotFoundError as e:
+        return CompileBookResponse(
+            success=False,
+            status="not_found",
+            error_message=str(e)
+        )
+    except Exception as e:
+        return CompileBookResponse(
+            success=False,
+            status="failed",
+            error_message=f"Failed to compile book: {str(e)}"
+        )
+
 if __name__ == "__main__":
     host = os.getenv("API_HOST", "0.0.0.0")
     port = int(os.getenv("API_PORT", "8000"))
@@ -0,0 +1,106 @@
+"""
+Section Generation Journal
+Records each completed section as it is written so long chapter jobs can be
+resumed after a crash without regenerating finished sections
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List
+
+from atomic_io import atomic_write_json
+
+JOURNAL_FILE_NAME = "section_journal.jsonl"
+
+# Section fields a journal entry may update in section_metadata.json
+JOURNALED_FIELDS = ("content_status", "generated_timestamp", "component_types")
+
+
+class SectionJournal:
+    """Append-only journal of completed sections, folded into section_metadata.json"""
+
+    def __init__(self, sections_dir: Path):
+        self.sections_dir = Path(sections_dir)
+        self.path = self.sections_dir / JOURNAL_FILE_NAME
+
+    def append(self, chapter_number: int, section_id: str, **fields):
+        """
+        Durably record a completed section
+
+        Args:
+            chapter_number: Chapter number (1-based)
+            section_id: Section ID within the chapter
+            **fields: Section metadata fields to apply (see JOURNALED_FIELDS)
+        """
+        entry = {"chapter_number": chapter_number, "section_id": section_id}
+        entry.update({key: value for key, value in fields.items() if key in JOURNALED_FIELDS})
+
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        with open(self.path, "a+b") as f:
+            # Start on a fresh line if a previous write was torn by a crash
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def entries(self) -> List[dict]:
+        """Read journal entries, ignoring a torn last line from an interrupted write"""
+        if not self.path.exists():
+            return []
+
+        entries = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return entries
+
+    def replay(self, metadata: dict) -> int:
+        """
+        Apply journal entries to loaded section metadata
+
+        Returns:
+            Number of entries applied
+        """
+        chapters = {chapter.get("chapter_number"): chapter for chapter in metadata.get("chapters", [])}
+        applied = 0
+
+        for entry in self.entries():
+            chapter = chapters.get(entry.get("chapter_number"))
+            if not chapter:
+                continue
+            section = next((s for s in chapter.get("sections", []) if s.get("section_id") == entry.get("section_id")), None)
+            if not section:
+                continue
+            section.update({key: entry[key] for key in JOURNALED_FIELDS if key in entry})
+            applied += 1
+
+        return applied
+
+    def compact(self, metadata_file: Path) -> dict:
+        """
+        Fold the journal into section_metadata.json and truncate it
+
+        The metadata is re-read from disk so updates made by other requests are
+        kept. Returns the merged metadata.
+        """
+        with open(metadata_file, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+
+        if self.replay(metadata):
+            atomic_write_json(metadata_file, metadata)
+        self.clear()
+        return metadata
+
+    def clear(self):
+        """Remove the journal"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the book summary index: picking up books created or deleted on disk and
+keeping completed_sections in step with section writes and clears.
+Runs offline, no Educative credentials needed.
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from atomic_io import atomic_write_json
+from book_index import COMPLETED_MIN_LENGTH, INDEX_FILE_NAME, BookIndex
+
+SECTION_FILES = ["files/chapter_1_intro/section_s1.tex", "files/chapter_1_intro/section_s2.tex",
+                 "files/chapter_2_next/section_s3.tex"]
+
+
+def _create_book(output_dir: Path, book_name: str, generated=()):
+    """Lay out a book structure on disk; sections in ``generated`` get full-length content"""
+    book_dir = output_dir / book_name
+    chapters = {}
+    for section_file in SECTION_FILES:
+        chapter_number = int(section_file.split("/")[1].split("_")[1])
+        chapters.setdefault(chapter_number, []).append({"section_id": section_file[-6:-4], "section_file": section_file})
+        content = "x" * (COMPLETED_MIN_LENGTH + 1) if section_file in generated else "\\section{Skeleton}\n"
+        (book_dir / section_file).parent.mkdir(parents=True, exist_ok=True)
+        (book_dir / section_file).write_text(content)
+    atomic_write_json(book_dir / "sections" / "section_metadata.json", {
+        "book_title": book_name.replace("_", " ").title(),
+        "chapters": [{"chapter_number": number, "sections": sections} for number, sections in sorted(chapters.items())]
+    })
+    return book_dir
+
+
+def test_list_books_follows_disk():
+    """Books created or deleted outside the API are picked up and dropped by list_books"""
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        index = BookIndex(str(output_dir))
+        assert index.list_books() == []
+
+        _create_book(output_dir, "first_book", generated=SECTION_FILES[:1])
+        books = index.list_books()
+        assert [book["id"] for book in books] == ["first_book"]
+        assert books[0]["name"] == "First Book" and books[0]["chapter_count"] == 2
+        assert books[0]["section_count"] == 3 and books[0]["completed_sections"] == 1
+        assert (output_dir / INDEX_FILE_NAME).exists()
+
+        _create_book(output_dir, "second_book")
+        (output_dir / "not_a_book").mkdir()  # No section_metadata.json: never listed
+        (output_dir / ".latex_build").mkdir()
+        assert sorted(book["id"] for book in index.list_books()) == ["first_book", "second_book"]
+
+        shutil.rmtree(output_dir / "first_book")
+        assert [book["id"] for book in index.list_books()] == ["second_book"]
+        # A fresh instance reads the same state from the saved index
+        assert [book["id"] for book in BookIndex(str(output_dir)).list_books()] == ["second_book"]
+    print("PASS: list_books follows disk")
+
+
+def test_completed_sections_tracked():
+    """record_section and clear_sections keep completed_sections and the section index correct"""
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        book_dir = _create_book(output_dir, "my_book")
+        index = BookIndex(str(output_dir))
+        assert index.get_book("my_book")["completed_sections"] == 0
+
+        for section_file in SECTION_FILES[:2]:
+            content = "y" * (COMPLETED_MIN_LENGTH + 50)
+            (book_dir / section_file).write_text(content)
+            index.record_section("my_book", section_file, len(content))
+        # Short content is only the template skeleton
+        index.record_section("my_book", SECTION_FILES[2], COMPLETED_MIN_LENGTH)
+
+        assert index.get_book("my_book")["completed_sections"] == 2
+        section_index = index.get_section_index("my_book")
+        assert [section_index[f]["status"] for f in SECTION_FILES] == ["completed", "completed", "pending"]
+        assert section_index[SECTION_FILES[0]]["size"] == COMPLETED_MIN_LENGTH + 50
+
+        (book_dir / SECTION_FILES[0]).unlink()
+        index.clear_sections("my_book", SECTION_FILES[:1])
+        assert index.get_book("my_book")["completed_sections"] == 1
+        assert index.get_section_index("my_book")[SECTION_FILES[0]] == {"status": "pending", "size": 0, "mtime": None}
+        assert [book["completed_sections"] for book in index.list_books()] == [1]
+
+        # Re-indexing from disk agrees with the incremental updates
+        assert index.rebuild_book("my_book")["completed_sections"] == 1
+    print("PASS: completed sections tracked")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING BOOK INDEX")
+    print("=" * 60)
+    tests = [
+        test_list_books_follows_disk,
+        test_completed_sections_tracked,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test the /compile endpoint: book name validation, empty selections,
+missing books and a missing TeX toolchain. No TeX installation needed.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from latex_compiler import LaTeXBookCompiler
+from main import app
+
+client = TestClient(app)
+
+
+class _InBooksDir:
+    """Run a test from a scratch directory holding generated_books/ with one book in it"""
+
+    def __enter__(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        root = Path(self.tmp.name)
+        (root / "generated_books" / "my_book").mkdir(parents=True)
+        (root / "generated_books" / "my_book" / "main.tex").write_text("\\documentclass{book}\n")
+        (root / "outside").mkdir()
+        os.chdir(root)
+        return root
+
+    def __exit__(self, *exc):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+
+def _compile(**payload):
+    response = client.post("/compile", json=payload)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_invalid_book_names():
+    """Names with path separators, leading dots or escaping symlinks are rejected before anything runs"""
+    with _InBooksDir() as root:
+        (root / "generated_books" / "linked").symlink_to(root / "outside")
+        for name in ["../outside", "my_book/../../outside", "a\\b", ".latex_build", "..", "", "linked"]:
+            result = _compile(book_name=name)
+            assert result["status"] == "invalid_request", (name, result)
+            assert not result["success"] and "Invalid book name" in result["error_message"]
+        assert not (root / "generated_books" / ".latex_build").exists()
+    print("PASS: invalid book names")
+
+
+def test_nothing_selected():
+    """A request that skips the full book and selects no chapters is rejected with a reason"""
+    with _InBooksDir():
+        result = _compile(book_name="my_book", full_book=False)
+        assert result["status"] == "invalid_request", result
+        assert "Nothing to compile" in result["error_message"]
+        result = _compile(book_name="my_book", full_book=False, chapter_numbers=[])
+        assert result["status"] == "invalid_request", result
+    print("PASS: nothing selected")
+
+
+def test_not_found():
+    """Unknown books and books without a main file are reported as not_found"""
+    with _InBooksDir() as root:
+        result = _compile(book_name="missing_book")
+        assert result["status"] == "not_found" and "Book directory not found" in result["error_message"], result
+        (root / "generated_books" / "empty_book").mkdir()
+        result = _compile(book_name="empty_book")
+        assert result["status"] == "not_found" and "main.tex" in result["error_message"], result
+    print("PASS: not found")
+
+
+def test_toolchain_missing():
+    """Without latexmk/pdflatex on PATH an existing book fails fast with toolchain_missing"""
+    with _InBooksDir() as root:
+        path = os.environ.get("PATH", "")
+        os.environ["PATH"] = str(root / "outside")
+        try:
+            result = _compile(book_name="my_book", chapter_numbers=[1])
+        finally:
+            os.environ["PATH"] = path
+        assert result["status"] == "toolchain_missing", result
+        assert "latexmk" in result["error_message"] and "pdflatex" in result["error_message"]
+        assert not (root / "generated_books" / ".latex_build").exists()
+    print("PASS: toolchain missing")
+
+
+def test_book_lock_shared():
+    """Every compiler instance uses the same lock for a book, and different books get different locks"""
+    with _InBooksDir():
+        first = LaTeXBookCompiler()._book_lock(Path("generated_books") / "my_book")
+        second = LaTeXBookCompiler()._book_lock(Path("generated_books") / "my_book")
+        other = LaTeXBookCompiler()._book_lock(Path("generated_books") / "other_book")
+        assert first is second and first is not other
+    print("PASS: book lock shared")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING /compile")
+    print("=" * 60)
+    tests = [
+        test_invalid_book_names,
+        test_nothing_selected,
+        test_not_found,
+        test_toolchain_missing,
+        test_book_lock_shared,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test the section journal, atomic writes and resumed chapter generation.
+Runs offline, no Educative credentials needed.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import main as app_main
+from atomic_io import atomic_write_json
+from section_journal import JOURNAL_FILE_NAME, SectionJournal
+
+SECTION_FILES = ["files/chapter_1_intro/section_s1.tex", "files/chapter_1_intro/section_s2.tex"]
+
+
+def _metadata():
+    return {
+        "book_title": "My Book",
+        "content_type": "course",
+        "chapters": [{
+            "chapter_number": 1,
+            "chapter_title": "Intro",
+            "chapter_slug": "intro",
+            "sections": [
+                {"section_id": section_file[-6:-4], "section_title": f"Section {number}",
+                 "section_file": section_file, "content_status": "pending"}
+                for number, section_file in enumerate(SECTION_FILES, start=1)
+            ]
+        }]
+    }
+
+
+def test_torn_last_line_ignored():
+    """A half-written last entry is skipped on read, and the next append starts on a fresh line"""
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = SectionJournal(Path(tmp))
+        journal.append(1, "s1", content_status="generated", ignored_field="x")
+        with open(journal.path, "a", encoding="utf-8") as f:
+            f.write('{"chapter_number": 1, "section_id": "s2", "content_st')
+
+        assert journal.entries() == [{"chapter_number": 1, "section_id": "s1", "content_status": "generated"}]
+
+        journal.append(1, "s3", content_status="generated")
+        assert [entry["section_id"] for entry in journal.entries()] == ["s1", "s3"]
+    print("PASS: torn last line ignored")
+
+
+def test_compact_merges_and_removes_journal():
+    """compact() folds entries into section_metadata.json atomically and deletes the journal"""
+    with tempfile.TemporaryDirectory() as tmp:
+        sections_dir = Path(tmp)
+        metadata_file = sections_dir / "section_metadata.json"
+        atomic_write_json(metadata_file, _metadata())
+
+        journal = SectionJournal(sections_dir)
+        journal.append(1, "s2", content_status="generated", generated_timestamp="2026-01-01T00:00:00",
+                       component_types=["SlateHTML"])
+        journal.append(9, "s1", content_status="generated")  # Unknown chapter: skipped
+
+        merged = journal.compact(metadata_file)
+
+        on_disk = json.loads(metadata_file.read_text(encoding="utf-8"))
+        assert on_disk == merged
+        sections = {s["section_id"]: s for s in on_disk["chapters"][0]["sections"]}
+        assert sections["s1"]["content_status"] == "pending"
+        assert sections["s2"]["content_status"] == "generated"
+        assert sections["s2"]["component_types"] == ["SlateHTML"]
+        assert not (sections_dir / JOURNAL_FILE_NAME).exists()
+        # No temp files left behind by the atomic write
+        assert sorted(os.listdir(sections_dir)) == ["section_metadata.json"]
+    print("PASS: compact merges and removes journal")
+
+
+def test_resume_skips_generated_sections():
+    """A resumed run keeps sections an interrupted run already wrote and journaled"""
+    assert app_main.GenerateSectionContentRequest(book_name="b", chapter_number=1,
+                                                  educative_course_name="c").resume is False
+
+    async def offline_book_content(request):
+        raise RuntimeError("offline")
+
+    cwd = os.getcwd()
+    fetch_book_content = app_main.generate_book_content
+    with tempfile.TemporaryDirectory() as tmp:
+        book_dir = Path(tmp) / "generated_books" / "my_book"
+        atomic_write_json(book_dir / "sections" / "section_metadata.json", _metadata())
+        for section_file in SECTION_FILES:
+            (book_dir / section_file).parent.mkdir(parents=True, exist_ok=True)
+            (book_dir / section_file).write_text("\\section{Generated}\n")
+
+        # The interrupted run journaled both sections but never compacted the journal
+        journal = SectionJournal(book_dir / "sections")
+        for section_id in ("s1", "s2"):
+            journal.append(1, section_id, content_status="generated", generated_timestamp="2026-01-01T00:00:00")
+
+        os.chdir(tmp)
+        app_main.generate_book_content = offline_book_content
+        try:
+            response = TestClient(app_main.app).post("/generate-section-content", json={
+                "book_name": "my_book", "chapter_number": 1, "educative_course_name": "my-book", "resume": True
+            })
+        finally:
+            app_main.generate_book_content = fetch_book_content
+            os.chdir(cwd)
+
+        result = response.json()
+        assert result["success"], result
+        assert result["total_sections_generated"] == 0 and not result["failed_sections"], result
+        assert [s["section_id"] for s in result["skipped_sections"]] == ["s1", "s2"]
+        assert result["chapter_info"]["skipped_sections"] == 2
+        assert not (book_dir / "sections" / JOURNAL_FILE_NAME).exists()
+        metadata = json.loads((book_dir / "sections" / "section_metadata.json").read_text(encoding="utf-8"))
+        assert all(s["content_status"] == "generated" for s in metadata["chapters"][0]["sections"])
+    print("PASS: resume skips generated sections")
+
+
+def main():
+    print("=" * 60)
+    print("TESTING SECTION JOURNAL")
+    print("=" * 60)
+    tests = [
+        test_torn_last_line_ignored,
+        test_compact_merges_and_removes_journal,
+        test_resume_skips_generated_sections,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL: {test.__name__}: {e}")
+    print("=" * 60)
+    print(f"RESULT: {'PASSED' if not failed else f'{failed} FAILED'}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,325 @@
+"""
+LaTeX PDF Compiler for generated books
+Runs latexmk in a per-book build directory so auxiliary files are reused between runs
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Directory (inside output_dir) holding per-book build sandboxes
+BUILD_DIR_NAME = ".latex_build"
+
+# Files and directories that never need to be copied into the sandbox
+SYNC_IGNORE = {BUILD_DIR_NAME, "__pycache__", ".git"}
+
+
+class LaTeXToolchainError(RuntimeError):
+    """Raised when latexmk or the TeX engine is not installed"""
+
+
+class LaTeXBookCompiler:
+    """Compile generated LaTeX books to PDF with latexmk"""
+
+    # One lock per book directory, shared by every compiler instance (the API creates one per request)
+    _book_locks: Dict[str, threading.Lock] = {}
+    _book_locks_guard = threading.Lock()
+
+    def __init__(self, output_dir: str = "generated_books", timeout: int = 600, max_workers: Optional[int] = None):
+        self.output_dir = Path(output_dir)
+        self.build_root = self.output_dir / BUILD_DIR_NAME
+        self.timeout = timeout
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+
+    @staticmethod
+    def check_toolchain() -> Dict[str, Optional[str]]:
+        """
+        Check whether latexmk and pdflatex are available on PATH
+
+        Returns:
+            Dictionary with availability flag, tool paths and a message
+        """
+        latexmk = shutil.which("latexmk")
+        pdflatex = shutil.which("pdflatex")
+
+        missing = [name for name, path in (("latexmk", latexmk), ("pdflatex", pdflatex)) if not path]
+        if missing:
+            message = f"TeX toolchain not available: {', '.join(missing)} not found in PATH"
+        else:
+            message = "TeX toolchain available"
+
+        return {
+            "available": not missing,
+            "latexmk": latexmk,
+            "pdflatex": pdflatex,
+            "message": message
+        }
+
+    def compile_book(self, book_name: str, full_book: bool = True, chapter_numbers: Optional[List[int]] = None,
+                     all_chapters: bool = False) -> Dict:
+        """
+        Compile a generated book and/or chapter previews
+
+        Args:
+            book_name: Name of the book directory inside output_dir
+            full_book: Compile the main document
+            chapter_numbers: Chapter numbers to compile as standalone subfile previews
+            all_chapters: Compile every chapter as a preview (overrides chapter_numbers)
+
+        Returns:
+            Dictionary with overall status, PDF path and per-run timings
+
+        Raises:
+            ValueError: If the book name is not a plain directory name or nothing is selected to compile
+            LaTeXToolchainError: If latexmk/pdflatex are not installed
+            FileNotFoundError: If the book, its main file or the requested chapters do not exist
+        """
+        book_dir = self._book_dir(book_name)
+        if not full_book and not all_chapters and not chapter_numbers:
+            raise ValueError("Nothing to compile: select the full book, chapter numbers or all chapters")
+
+        if not book_dir.is_dir():
+            raise FileNotFoundError(f"Book directory not found: {book_dir}")
+
+        main_file = self._find_main_file(book_dir)
+        if main_file is None:
+            raise FileNotFoundError(f"No Main.tex or main.tex found in {book_dir}")
+
+        toolchain = self.check_toolchain()
+        if not toolchain["available"]:
+            raise LaTeXToolchainError(toolchain["message"])
+
+        # Concurrent requests for the same book would sync into and build in the same sandbox
+        with self._book_lock(book_dir):
+            return self._compile(book_name, book_dir, main_file, full_book, chapter_numbers, all_chapters)
+
+    def _compile(self, book_name: str, book_dir: Path, main_file: Path, full_book: bool,
+                 chapter_numbers: Optional[List[int]], all_chapters: bool) -> Dict:
+        """Sync the sandbox and run latexmk; the caller holds the book's lock"""
+        started = time.perf_counter()
+        work_dir = self._prepare_workdir(book_name, book_dir)
+        sync_seconds = time.perf_counter() - started
+
+        runs = []
+        if full_book:
+            runs.append(self._run_latexmk(
+                work_dir / "src", main_file.name, work_dir / "out" / "main", "book", work_dir / "src"
+            ))
+
+        chapter_files = self._select_chapter_files(work_dir / "src" / "files", chapter_numbers, all_chapters)
+        if not full_book and not chapter_files:
+            raise FileNotFoundError(f"No chapter files found for the requested chapters in {book_dir}")
+        if chapter_files:
+            # Each chapter gets its own output directory so parallel runs never share aux files
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        self._run_latexmk,
+                        chapter_file.parent,
+                        chapter_file.name,
+                        work_dir / "out" / chapter_file.stem,
+                        f"chapter_{number}",
+                        work_dir / "src"
+                    )
+                    for number, chapter_file in chapter_files
+                ]
+                runs.extend(future.result() for future in futures)
+
+        # Copy the full-book PDF next to the sources for convenience
+        pdf_path = None
+        book_run = next((run for run in runs if run["target"] == "book"), None)
+        if book_run and book_run["success"]:
+            pdf_path = str(book_dir / Path(book_run["pdf_path"]).name)
+            shutil.copy2(book_run["pdf_path"], pdf_path)
+
+        return {
+            "success": all(run["success"] for run in runs),
+            "book_name": book_name,
+            "pdf_path": pdf_path,
+            "build_dir": str(work_dir),
+            "sync_duration_seconds": round(sync_seconds, 3),
+            "total_duration_seconds": round(time.perf_counter() - started, 3),
+            "runs": runs
+        }
+
+    def _book_dir(self, book_name: str) -> Path:
+        """Resolve a book name to its directory, rejecting names that could reach outside output_dir"""
+        separators = {"/", "\\", os.sep} | ({os.altsep} if os.altsep else set())
+        if not book_name or book_name.startswith(".") or any(sep in book_name for sep in separators):
+            raise ValueError(f"Invalid book name: {book_name!r}")
+
+        book_dir = self.output_dir / book_name
+        # Also catches a book directory that is a symlink to somewhere else
+        if book_dir.resolve().parent != self.output_dir.resolve():
+            raise ValueError(f"Invalid book name: {book_name!r} resolves outside {self.output_dir}")
+        return book_dir
+
+    @classmethod
+    def _book_lock(cls, book_dir: Path) -> threading.Lock:
+        """Return the lock serialising builds of one book"""
+        key = str(book_dir.resolve())
+        with cls._book_locks_guard:
+            return cls._book_locks.setdefault(key, threading.Lock())
+
+    def _find_main_file(self, book_dir: Path) -> Optional[Path]:
+        """Locate the book's main document (educative uses main.tex, markdown uses Main.tex)"""
+        for name in ("Main.tex", "main.tex"):
+            candidate = book_dir / name
+            if candidate.exists():
+                return candidate
+        return None
+
+    def _prepare_workdir(self, book_name: str, book_dir: Path) -> Path:
+        """
+        Mirror the book sources into its build sandbox
+
+        Only new or changed files are copied, so latexmk sees stable inputs and
+        the aux/bbl files under out/ from the previous run stay valid.
+        """
+        work_dir = self.build_root / book_name
+        src_dir = work_dir / "src"
+        src_dir.mkdir(parents=True, exist_ok=True)
+        (work_dir / "out").mkdir(exist_ok=True)
+
+        for root, dirs, files in os.walk(book_dir):
+            dirs[:] = [d for d in dirs if d not in SYNC_IGNORE]
+            relative_root = Path(root).relative_to(book_dir)
+            (src_dir / relative_root).mkdir(parents=True, exist_ok=True)
+
+            for file_name in files:
+                # Skip PDFs copied back from earlier builds
+                if relative_root == Path(".") and file_name.endswith(".pdf"):
+                    continue
+                source = Path(root) / file_name
+                target = src_dir / relative_root / file_name
+                if self._is_stale(source, target):
+                    shutil.copy2(source, target)
+
+        # Chapter subfiles point at ../Main.tex; make sure that name resolves in the sandbox
+        if not (book_dir / "Main.tex").exists() and (src_dir / "main.tex").exists():
+            if self._is_stale(src_dir / "main.tex", src_dir / "Main.tex"):
+                shutil.copy2(src_dir / "main.tex", src_dir / "Main.tex")
+
+        return work_dir
+
+    @staticmethod
+    def _is_stale(source: Path, target: Path) -> bool:
+        """Check whether a sandbox copy is missing or differs from its source"""
+        if not target.exists():
+            return True
+        source_stat = source.stat()
+        target_stat = target.stat()
+        return source_stat.st_size != target_stat.st_size or int(source_stat.st_mtime) != int(target_stat.st_mtime)
+
+    def _select_chapter_files(self, files_dir: Path, chapter_numbers: Optional[List[int]],
+                              all_chapters: bool) -> List[tuple]:
+        """Return (chapter_number, path) pairs for the requested chapter previews"""
+        if not all_chapters and not chapter_numbers:
+            return []
+
+        selected = []
+        for chapter_file in sorted(files_dir.glob("chapter_*.tex")):
+            parts = chapter_file.stem.split("_")
+            if len(parts) < 2 or not parts[1].isdigit():
+                continue
+            number = int(parts[1])
+            if all_chapters or number in chapter_numbers:
+                selected.append((number, chapter_file))
+
+        return sorted(selected)
+
+    def _run_latexmk(self, cwd: Path, tex_file: str, out_dir: Path, target: str, src_dir: Path) -> Dict:
+        """Run latexmk for a single document and time it"""
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        # Chapter previews run from files/, so style and bib files must be found via the search path
+        env = os.environ.copy()
+        search_path = f"{src_dir.resolve()}{os.pathsep}"
+        env["TEXINPUTS"] = search_path + env.get("TEXINPUTS", "")
+        env["BIBINPUTS"] = search_path + env.get("BIBINPUTS", "")
+        command = [
+            "latexmk",
+            "-norc",  # Ignore latexmkrc files, including any shipped with the book sources
+            "-pdf",
+            "-interaction=nonstopmode",
+            "-halt-on-error",
+            "-file-line-error",
+            f"-outdir={out_dir.resolve()}",
+            tex_file
+        ]
+
+        started = time.perf_counter()
+        try:
+            result = subprocess.run(command, cwd=cwd, env=env, capture_output=True, text=True,
+                                    errors="replace", timeout=self.timeout)
+            returncode = result.returncode
+            output = result.stdout + result.stderr
+        except subprocess.TimeoutExpired:
+            returncode = None
+            output = f"latexmk timed out after {self.timeout}s"
+
+        pdf_path = out_dir / f"{Path(tex_file).stem}.pdf"
+        success = returncode == 0 and pdf_path.exists()
+
+        return {
+            "target": target,
+            "tex_file": str(cwd / tex_file),
+            "success": success,
+            "returncode": returncode,
+            "pdf_path": str(pdf_path) if success else None,
+            "duration_seconds": round(time.perf_counter() - started, 3),
+            "log_tail": "\n".join(output.splitlines()[-20:]) if not success else None
+        }
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Compile a generated LaTeX book to PDF with latexmk")
+    parser.add_argument("book_name", help="Book directory name inside the output directory")
+    parser.add_argument("--output-dir", default="generated_books", help="Directory containing generated books")
+    parser.add_argument("--chapter", type=int, action="append", dest="chapters",
+                        help="Compile this chapter as a standalone preview (repeatable)")
+    parser.add_argument("--all-chapters", action="store_true", help="Compile every chapter as a preview")
+    parser.add_argument("--no-book", action="store_true", help="Skip compiling the full book")
+    parser.add_argument("--timeout", type=int, default=600, help="Per-run latexmk timeout in seconds")
+    parser.add_argument("--jobs", type=int, default=None, help="Parallel chapter compilations")
+    args = parser.parse_args()
+
+    compiler = LaTeXBookCompiler(output_dir=args.output_dir, timeout=args.timeout, max_workers=args.jobs)
+
+    try:
+        result = compiler.compile_book(
+            args.book_name,
+            full_book=not args.no_book,
+            chapter_numbers=args.chapters,
+            all_chapters=args.all_chapters
+        )
+    except LaTeXToolchainError as e:
+        print(f"ERROR: {e}")
+        sys.exit(2)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    for run in result["runs"]:
+        status = "OK" if run["success"] else "FAILED"
+        print(f"{status:6} {run['target']:<14} {run['duration_seconds']:8.2f}s  {run['pdf_path'] or run['tex_file']}")
+        if run["log_tail"]:
+            print(run["log_tail"])
+
+    print(f"Sync: {result['sync_duration_seconds']:.2f}s, total: {result['total_duration_seconds']:.2f}s")
+    if result["pdf_path"]:
+        print(f"Book PDF: {result['pdf_path']}")
+
+    sys.exit(0 if result["success"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,107 @@ LaTeX Book Generator for Markdown Content Processor
 Generates LaTeX books from markdown content using Jinja2 templates
 """
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-from typing import Dict, List
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from typing import Dict, List, Optional
 import os
 import shutil
 import re
+import threading
 from pathlib import Path
 from datetime import datetime
 
+# Set LATEX_TEMPLATES_DEV_MODE=1 to pick up template edits without restarting the server
+TEMPLATE_DEV_MODE = os.getenv("LATEX_TEMPLATES_DEV_MODE", "").lower() in ("1", "true", "yes")
+
+# Optional directory for compiled template bytecode (defaults to a per-user temp directory)
+TEMPLATE_BYTECODE_CACHE_DIR = os.getenv("LATEX_TEMPLATES_CACHE_DIR")
+
+# Process-wide Jinja2 environments keyed by resolved template directory
+_template_environments: Dict[str, Environment] = {}
+_template_environments_lock = threading.Lock()
+
+
+def slugify(text: str) -> str:
+    """Convert text to a valid file slug"""
+    if not text:
+        return ""
+    
+    slug = text.lower()
+    slug = re.sub(r'[^\w\s-]', '', slug)
+    slug = re.sub(r'[-\s]+', '_', slug)
+    return slug.strip('_')
+
+
+def escape_latex(text: str) -> str:
+    """Escape special LaTeX characters"""
+    if not text:
+        return ""
+    
+    latex_special_chars = {
+        '&': r'\&',
+        '%': r'\%',
+        '$': r'\$',
+        '#': r'\#',
+        '^': r'\textasciicircum{}',
+        '_': r'\_',
+        '{': r'\{',
+        '}': r'\}',
+        '~': r'\textasciitilde{}',
+        '\\': r'\textbackslash{}',
+    }
+    
+    for char, escaped in latex_special_chars.items():
+        text = text.replace(char, escaped)
+    
+    return text
+
+
+def create_template_environment(template_dir: str, bytecode_cache_dir: Optional[str] = None,
+                                auto_reload: bool = TEMPLATE_DEV_MODE) -> Environment:
+    """
+    Build a Jinja2 environment with LaTeX-friendly settings
+    
+    Args:
+        template_dir: Directory containing the .j2 templates
+        bytecode_cache_dir: Where compiled templates are stored between processes
+        auto_reload: Re-check template files for changes on every lookup (dev mode)
+        
+    Returns:
+        Configured Jinja2 environment
+    """
+    env = Environment(
+        loader=FileSystemLoader(str(template_dir)),
+        autoescape=select_autoescape(['html', 'xml']),
+        block_start_string='{% ',
+        block_end_string=' %}',
+        variable_start_string='{{',
+        variable_end_string='}}',
+        comment_start_string='{#',
+        comment_end_string='#}',
+        trim_blocks=True,
+        lstrip_blocks=True,
+        bytecode_cache=FileSystemBytecodeCache(bytecode_cache_dir),
+        auto_reload=auto_reload
+    )
+    
+    # Add custom LaTeX filters
+    env.filters['escape_latex'] = escape_latex
+    env.filters['slugify'] = slugify
+    return env
+
+
+def get_template_environment(template_dir: str) -> Environment:
+    """Return the shared Jinja2 environment for a template directory, creating it once per process"""
+    key = str(Path(template_dir).resolve())
+    
+    with _template_environments_lock:
+        env = _template_environments.get(key)
+        if env is None:
+            env = create_template_environment(key, TEMPLATE_BYTECODE_CACHE_DIR)
+            _template_environments[key] = env
+    return env
+
+
 class LaTeXBookGenerator:
     """Generate LaTeX books from markdown content using Jinja2 templates"""
     
@@ -18,56 +111,16 @@ class LaTeXBookGenerator:
         self.template_dir = Path(template_dir)
         self.output_dir = Path(output_dir)
         
-        # Initialize Jinja2 environment with LaTeX-friendly settings
-        self.env = Environment(
-            loader=FileSystemLoader(self.template_dir),
-            autoescape=select_autoescape(['html', 'xml']),
-            block_start_string='{% ',
-            block_end_string=' %}',
-            variable_start_string='{{',
-            variable_end_string='}}',
-            comment_start_string='{#',
-            comment_end_string='#}',
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
-        
-        # Add custom LaTeX filters
-        self.env.filters['escape_latex'] = self._escape_latex
-        self.env.filters['slugify'] = self._slugify
+        # Shared across requests so templates are loaded and compiled only once
+        self.env = get_template_environment(self.template_dir)
         
     def _slugify(self, text: str) -> str:
         """Convert text to a valid file slug"""
-        if not text:
-            return ""
-        
-        slug = text.lower()
-        slug = re.sub(r'[^\w\s-]', '', slug)
-        slug = re.sub(r'[-\s]+', '_', slug)
-        return slug.strip('_')
+        return slugify(text)
         
     def _escape_latex(self, text: str) -> str:
         """Escape special LaTeX characters"""
-        if not text:
-            return ""
-        
-        latex_special_chars = {
-            '&': r'\&',
-            '%': r'\%',
-            '$': r'\$',
-            '#': r'\#',
-            '^': r'\textasciicircum{}',
-            '_': r'\_',
-            '{': r'\{',
-            '}': r'\}',
-            '~': r'\textasciitilde{}',
-            '\\': r'\textbackslash{}',
-        }
-        
-        for char, escaped in latex_special_chars.items():
-            text = text.replace(char, escaped)
-        
-        return text
+        return escape_latex(text)
     
     def generate_book(self, book_data: dict, book_id: str) -> Dict[str, str]:
         """
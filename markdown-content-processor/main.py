@@ -1,14 +1,17 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse, Response
 from pydantic import BaseModel
 from typing import List, Optional
 import uvicorn
+import asyncio
 import json
 import os
 from datetime import datetime
 from pathlib import Path
 
+from compression import CompressionMiddleware
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Markdown Content Processor",
@@ -21,6 +24,9 @@ static_dir = Path("static")
 static_dir.mkdir(exist_ok=True)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+# Compress JSON/markdown responses (brotli when available, otherwise gzip)
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+
 # Pydantic models for request/response
 class CreateBookRequest(BaseModel):
     book_name: str
@@ -120,6 +126,20 @@ class LaTeXGenerationResponse(BaseModel):
     generated_files: Optional[List[str]] = None
     error_message: Optional[str] = None
 
+class CompileBookRequest(BaseModel):
+    book_id: str
+    full_book: bool = True  # Compile Main.tex
+    chapter_numbers: Optional[List[int]] = None  # Chapters to compile as standalone previews
+    all_chapters: bool = False  # Compile every chapter as a preview
+
+class CompileBookResponse(BaseModel):
+    success: bool
+    status: str  # "compiled", "failed", "invalid_request", "toolchain_missing" or "not_found"
+    pdf_path: Optional[str] = None
+    runs: Optional[List[dict]] = None  # Per-document latexmk runs with timings
+    total_duration_seconds: Optional[float] = None
+    error_message: Optional[str] = None
+
 # Helper functions
 def get_books_db_path() -> Path:
     """Get the path to the books database file"""
@@ -161,6 +181,26 @@ def create_book_directory(book_id: str):
     
     return book_dir
 
+def paginate(items: list, offset: int, limit: int) -> list:
+    """Return a page of items, clamping offset/limit to sane values"""
+    offset = max(offset, 0)
+    limit = max(min(limit, 500), 1)
+    return items[offset:offset + limit]
+
+def make_etag(file_path: Path) -> str:
+    """Build a weak ETag from a file's mtime and size (no need to read the file)"""
+    stat = file_path.stat()
+    return f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
 # API Endpoints
 
 # Root endpoint - Serve the main UI
@@ -193,8 +233,13 @@ async def list_books():
 
 # Get book details
 @app.get("/api/books/{book_id}")
-async def get_book_details(book_id: str):
-    """Get detailed information about a specific book"""
+async def get_book_details(book_id: str, include_chapters: bool = True):
+    """
+    Get detailed information about a specific book
+    
+    Pass include_chapters=false to get only the book header; chapters and
+    sections can then be loaded lazily through the paginated endpoints below.
+    """
     try:
         db = load_books_db()
         books = db.get("books", [])
@@ -203,12 +248,133 @@ async def get_book_details(book_id: str):
         if not book:
             raise HTTPException(status_code=404, detail="Book not found")
         
+        if not include_chapters:
+            summary = {key: value for key, value in book.items() if key != "chapters"}
+            summary["chapter_count"] = len(book.get("chapters", []))
+            return summary
+        
         return book
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting book details: {str(e)}")
 
+# List chapters of a book (without section records)
+@app.get("/api/books/{book_id}/chapters")
+async def list_book_chapters(book_id: str, offset: int = 0, limit: int = 50):
+    """List a page of chapters with section counts but without section records"""
+    try:
+        db = load_books_db()
+        books = db.get("books", [])
+        
+        book = next((b for b in books if b["id"] == book_id), None)
+        if not book:
+            raise HTTPException(status_code=404, detail="Book not found")
+        
+        chapters = book.get("chapters", [])
+        indexed_chapters = list(enumerate(chapters))
+        
+        chapter_summaries = []
+        for chapter_index, chapter in paginate(indexed_chapters, offset, limit):
+            sections = chapter.get("sections", [])
+            chapter_summaries.append({
+                "chapter_index": chapter_index,
+                "chapter_number": chapter.get("chapter_number", chapter_index + 1),
+                "title": chapter.get("title", ""),
+                "summary": chapter.get("summary", ""),
+                "created_at": chapter.get("created_at"),
+                "updated_at": chapter.get("updated_at"),
+                "section_count": len(sections),
+                "completed_sections": sum(1 for s in sections if s.get("content_status") == "completed")
+            })
+        
+        return {
+            "book_id": book_id,
+            "total": len(chapters),
+            "offset": offset,
+            "limit": limit,
+            "chapters": chapter_summaries
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error listing chapters: {str(e)}")
+
+# List sections of a chapter
+@app.get("/api/books/{book_id}/chapters/{chapter_index}/sections")
+async def list_chapter_sections(book_id: str, chapter_index: int, offset: int = 0, limit: int = 100):
+    """List a page of section records for a single chapter"""
+    try:
+        db = load_books_db()
+        books = db.get("books", [])
+        
+        book = next((b for b in books if b["id"] == book_id), None)
+        if not book:
+            raise HTTPException(status_code=404, detail="Book not found")
+        
+        chapters = book.get("chapters", [])
+        if chapter_index < 0 or chapter_index >= len(chapters):
+            raise HTTPException(status_code=404, detail="Chapter not found")
+        
+        sections = chapters[chapter_index].get("sections", [])
+        
+        return {
+            "book_id": book_id,
+            "chapter_index": chapter_index,
+            "total": len(sections),
+            "offset": offset,
+            "limit": limit,
+            "sections": paginate(sections, offset, limit)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error listing sections: {str(e)}")
+
+# Get the markdown content of a single section
+@app.get("/api/books/{book_id}/chapters/{chapter_index}/sections/{section_id}/content")
+async def get_section_content(book_id: str, chapter_index: int, section_id: str, request: Request):
+    """
+    Get the markdown content of a section
+    
+    Responses carry an ETag so the UI can revalidate cheaply; a matching
+    If-None-Match header returns 304 without reading the file.
+    """
+    try:
+        db = load_books_db()
+        books = db.get("books", [])
+        
+        book = next((b for b in books if b["id"] == book_id), None)
+        if not book:
+            raise HTTPException(status_code=404, detail="Book not found")
+        
+        chapters = book.get("chapters", [])
+        if chapter_index < 0 or chapter_index >= len(chapters):
+            raise HTTPException(status_code=404, detail="Chapter not found")
+        
+        sections = chapters[chapter_index].get("sections", [])
+        section = next((s for s in sections if s["id"] == section_id), None)
+        if not section:
+            raise HTTPException(status_code=404, detail="Section not found")
+        
+        book_dir = Path("generated_books") / book_id
+        content_file = book_dir / section["content_file"] if section.get("content_file") else None
+        if not content_file or not content_file.is_file():
+            raise HTTPException(status_code=404, detail="Section has no content yet")
+        
+        etag = make_etag(content_file)
+        cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=cache_headers)
+        
+        content = content_file.read_text(encoding='utf-8')
+        return PlainTextResponse(content, media_type="text/markdown", headers=cache_headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting section content: {str(e)}")
+
 # Create a new book
 @app.post("/api/books", response_model=CreateBookResponse)
 async def create_book(request: CreateBookRequest):
@@ -692,6 +858,63 @@ async def generate_latex_book(request: GenerateLatexBookRequest):
             error_message=f"Failed to generate LaTeX: {str(e)}"
         )
 
+# Compile LaTeX book to PDF
+@app.post("/api/compile", response_model=CompileBookResponse)
+async def compile_book(request: CompileBookRequest):
+    """
+    Compile a book's Main.tex to PDF with latexmk
+    
+    Builds run in a per-book sandbox under generated_books/.latex_build so
+    auxiliary files are reused between runs. Chapter previews are compiled
+    in parallel as standalone subfiles.
+    """
+    try:
+        from latex_compiler import LaTeXBookCompiler, LaTeXToolchainError
+        
+        compiler = LaTeXBookCompiler()
+        result = await asyncio.to_thread(
+            compiler.compile_book,
+            request.book_id,
+            full_book=request.full_book,
+            chapter_numbers=request.chapter_numbers,
+            all_chapters=request.all_chapters
+        )
+        
+        failed_runs = [run["target"] for run in result["runs"] if not run["success"]]
+        return CompileBookResponse(
+            success=result["success"],
+            status="compiled" if result["success"] else "failed",
+            pdf_path=result["pdf_path"],
+            runs=result["runs"],
+            total_duration_seconds=result["total_duration_seconds"],
+            error_message=f"Compilation failed for: {', '.join(failed_runs)}" if failed_runs else None
+        )
+        
+    except ValueError as e:
+        return CompileBookResponse(
+            success=False,
+            status="invalid_request",
+            error_message=str(e)
+        )
+    except LaTeXToolchainError as e:
+        return CompileBookResponse(
+            success=False,
+            status="toolchain_missing",
+            error_message=str(e)
+        )
+    except FileNotFoundError as e:
+        return CompileBookResponse(
+            success=False,
+            status="not_found",
+            error_message=str(e)
+        )
+    except Exception as e:
+        return CompileBookResponse(
+            success=False,
+            status="failed",
+            error_message=f"Failed to compile book: {str(e)}"
+        )
+
 # Run the application
 if __name__ == "__main__":
     # Ensure required directories exist